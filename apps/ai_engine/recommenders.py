@@ -1754,15 +1754,15 @@ class ModuleRecommender:
         Returns:
             Filtered QuerySet
         """
-        from apps.courses.models import ModulePrerequisite
+        from apps.courses.services import PrerequisiteService
         
-        # Get all modules with their prerequisite status
-        valid_module_ids = []
-        
-        for module in module_query:
-            prereqs_met, _ = module.are_prerequisites_met(self.user, check_type='REQUIRED')
-            if prereqs_met:
-                valid_module_ids.append(module.id)
+        # Get all modules with their prerequisite status in one batch
+        results = PrerequisiteService.evaluate_modules(
+            self.user, list(module_query), check_type='REQUIRED'
+        )
+        valid_module_ids = [
+            module_id for module_id, (prereqs_met, _) in results.items() if prereqs_met
+        ]
         
         return module_query.filter(id__in=valid_module_ids)
     
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Dashboard, Event, Report
+from .models import AnalyticsPipelineRun, Dashboard, Event, Report
 
 
 @admin.register(Event)
@@ -76,3 +76,27 @@ class DashboardAdmin(admin.ModelAdmin):
         )
 
     description_snippet.short_description = "Description"
+
+
+@admin.register(AnalyticsPipelineRun)
+class AnalyticsPipelineRunAdmin(admin.ModelAdmin):
+    list_display = ("stage", "tenant", "date", "status", "rows", "duration_ms", "attempts", "finished_at")
+    list_filter = ("status", "stage", "tenant")
+    search_fields = ("tenant__name", "stage", "error")
+    list_select_related = ("tenant",)
+    readonly_fields = (
+        "id",
+        "created_at",
+        "updated_at",
+        "tenant",
+        "date",
+        "stage",
+        "status",
+        "attempts",
+        "started_at",
+        "finished_at",
+        "duration_ms",
+        "rows",
+        "error",
+    )
+    date_hierarchy = "date"
@@ -0,0 +1,254 @@
+"""
+Dashboard composition.
+
+A dashboard is a set of independent sections. Each section declares which
+parts of the shared context it needs (course ids, enrolled user ids), the
+context is resolved once, and the sections then run concurrently on a
+bounded, process-wide thread pool. Every worker thread uses its own
+database connection, which is closed when the section finishes. Sections
+can be cached individually and have their own timeout, and one failing or
+slow section degrades to an empty value instead of failing the dashboard.
+
+A section's timeout counts from when a worker starts it, not from when it
+was queued, so busy pools don't time out sections that never got to run;
+time spent waiting for a worker is bounded separately by
+ANALYTICS_DASHBOARD_QUEUE_TIMEOUT, after which the section is cancelled
+before it starts. A running thread cannot be cancelled, so on PostgreSQL
+each section's connection gets a statement_timeout equal to its timeout and
+abandoned sections stop querying soon after the dashboard gives up on them.
+
+Composers built with parallel=False, and every composer when
+ANALYTICS_DASHBOARD_WORKERS <= 1, run sections inline in the calling
+thread; tests use the latter (worker connections cannot see data inside a
+test transaction).
+"""
+
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, connections
+
+from apps.core.models import Tenant
+from apps.courses.models import Course
+from apps.enrollments.models import Enrollment
+
+logger = logging.getLogger(__name__)
+
+DASHBOARD_CACHE_PREFIX = "analytics:dashboard"
+# How often a request re-checks its sections' queue and run deadlines
+QUEUE_POLL_SECONDS = 0.05
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+@dataclass
+class InstructorContext:
+    """What the instructor dashboard sections share, resolved once per request."""
+
+    instructor_id: uuid.UUID
+    tenant: Optional[Tenant]
+    course_ids: List[uuid.UUID] = field(default_factory=list)
+    student_ids: List[uuid.UUID] = field(default_factory=list)
+    active_student_ids: List[uuid.UUID] = field(default_factory=list)
+
+    @classmethod
+    def resolve(cls, instructor_id: uuid.UUID, tenant: Optional[Tenant], requires: Iterable[str]) -> 'InstructorContext':
+        """Loads only the requested parts (at most two queries)."""
+        requires = set(requires)
+        context = cls(instructor_id=instructor_id, tenant=tenant)
+
+        courses = Course.objects.filter(instructor_id=instructor_id)
+        if tenant:
+            courses = courses.filter(tenant=tenant)
+        if requires & {'course_ids', 'student_ids', 'active_student_ids'}:
+            context.course_ids = list(courses.values_list('id', flat=True))
+
+        if requires & {'student_ids', 'active_student_ids'}:
+            enrolled = Enrollment.objects.filter(
+                course_id__in=context.course_ids
+            ).values_list('user_id', 'status').distinct()
+            students, active = set(), set()
+            for user_id, status in enrolled:
+                students.add(user_id)
+                if status == Enrollment.Status.ACTIVE:
+                    active.add(user_id)
+            context.student_ids = list(students)
+            context.active_student_ids = list(active)
+        return context
+
+    @property
+    def course_keys(self) -> List[str]:
+        """Course ids as strings, for lookups into JSON event context."""
+        return [str(course_id) for course_id in self.course_ids]
+
+    @property
+    def cache_scope(self) -> str:
+        return f"{self.instructor_id}:{self.tenant.id if self.tenant else 'all'}"
+
+
+@dataclass(frozen=True)
+class DashboardSection:
+    """
+    One independently computed part of a dashboard.
+
+    `builder` takes the resolved context and returns the section's data.
+    `requires` names the context attributes it reads; `cache_timeout` is in
+    seconds (None disables caching); `timeout` overrides the default;
+    `default` is returned when the section fails or times out.
+    """
+
+    name: str
+    builder: Callable
+    requires: Tuple[str, ...] = ()
+    cache_timeout: Optional[int] = None
+    timeout: Optional[float] = None
+    default: Any = None
+
+
+def _get_executor() -> Optional[ThreadPoolExecutor]:
+    global _executor
+    workers = getattr(settings, 'ANALYTICS_DASHBOARD_WORKERS', 4)
+    if workers <= 1:
+        return None
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='dashboard')
+    return _executor
+
+
+def _run_in_worker(builder: Callable, context, timeout: float, on_start: Callable) -> Tuple[dict, float]:
+    started = time.perf_counter()
+    on_start(started)
+    try:
+        if connection.vendor == 'postgresql':
+            # Session-level; the connection is closed when the section finishes
+            with connection.cursor() as cursor:
+                cursor.execute("SET statement_timeout = %s", [max(1, int(timeout * 1000))])
+        return builder(context), time.perf_counter() - started
+    finally:
+        # Worker threads keep their own connections; do not leak them between sections
+        connections.close_all()
+
+
+def _timing(status: str, seconds: float = 0.0) -> dict:
+    return {'status': status, 'duration_ms': round(seconds * 1000, 2)}
+
+
+class DashboardComposer:
+    """
+    Runs a fixed set of sections against a context and collects data and timings.
+
+    `name` namespaces the composer's cache keys; the context supplies a
+    `cache_scope` (whose data it is). With parallel=False sections always
+    run inline, for dashboards made of many cheap queries.
+    """
+
+    def __init__(self, name: str, sections: List[DashboardSection], parallel: bool = True):
+        self.name = name
+        self.parallel = parallel
+        self.sections = {section.name: section for section in sections}
+
+    def select(self, names: Optional[Iterable[str]] = None) -> List[DashboardSection]:
+        """Sections to build; unknown names are ignored."""
+        if not names:
+            return list(self.sections.values())
+        return [self.sections[name] for name in names if name in self.sections]
+
+    def requirements(self, sections: List[DashboardSection]) -> set:
+        return {key for section in sections for key in section.requires}
+
+    def cache_key(self, scope: str, section: DashboardSection) -> str:
+        return f"{DASHBOARD_CACHE_PREFIX}:{self.name}:{scope}:{section.name}"
+
+    def compose(self, context, sections: List[DashboardSection]) -> Tuple[Dict[str, dict], Dict[str, dict]]:
+        """Returns ({section: data}, {section: {status, duration_ms}})."""
+        results, timings, pending = {}, {}, []
+
+        cached = cache.get_many([
+            self.cache_key(context.cache_scope, section) for section in sections if section.cache_timeout
+        ])
+        for section in sections:
+            key = self.cache_key(context.cache_scope, section)
+            if section.cache_timeout and key in cached:
+                results[section.name] = cached[key]
+                timings[section.name] = _timing('cached')
+            else:
+                pending.append(section)
+
+        executor = _get_executor() if self.parallel else None
+        if executor is None:
+            for section in pending:
+                started = time.perf_counter()
+                try:
+                    results[section.name] = section.builder(context)
+                    timings[section.name] = _timing('ok', time.perf_counter() - started)
+                except Exception as e:
+                    logger.error(f"Dashboard section {section.name} failed: {e}", exc_info=True)
+                    results[section.name] = section.default
+                    timings[section.name] = _timing('error', time.perf_counter() - started)
+        else:
+            self._collect(executor, context, pending, results, timings)
+
+        for section in pending:
+            if section.cache_timeout and timings[section.name]['status'] == 'ok':
+                cache.set(self.cache_key(context.cache_scope, section), results[section.name], section.cache_timeout)
+        return results, timings
+
+    def _collect(self, executor, context, pending: List[DashboardSection], results: dict, timings: dict) -> None:
+        """
+        Runs sections on the pool, waiting on all of them at once.
+
+        Each section may wait up to ANALYTICS_DASHBOARD_QUEUE_TIMEOUT for a
+        worker (it is cancelled, never having run, once that passes) and
+        then its own timeout from the moment a worker starts it.
+        """
+        default_timeout = getattr(settings, 'ANALYTICS_DASHBOARD_SECTION_TIMEOUT', 10)
+        queue_deadline = time.perf_counter() + getattr(settings, 'ANALYTICS_DASHBOARD_QUEUE_TIMEOUT', 5)
+        started_at = {}
+        running = {}
+        for section in pending:
+            timeout = section.timeout or default_timeout
+            on_start = partial(started_at.__setitem__, section.name)
+            future = executor.submit(_run_in_worker, section.builder, context, timeout, on_start)
+            running[future] = (section, timeout)
+
+        while running:
+            wait(running, timeout=QUEUE_POLL_SECONDS, return_when=FIRST_COMPLETED)
+            now = time.perf_counter()
+            for future, (section, timeout) in list(running.items()):
+                began = started_at.get(section.name)
+                if future.done():
+                    del running[future]
+                    try:
+                        data, seconds = future.result()
+                        results[section.name] = data
+                        timings[section.name] = _timing('ok', seconds)
+                    except Exception as e:
+                        logger.error(f"Dashboard section {section.name} failed: {e}", exc_info=True)
+                        results[section.name] = section.default
+                        timings[section.name] = _timing('error', now - (began or now))
+                elif began is None and now >= queue_deadline and future.cancel():
+                    del running[future]
+                    logger.warning(f"Dashboard section {section.name} got no worker in time for {context.cache_scope}")
+                    results[section.name] = section.default
+                    timings[section.name] = _timing('timeout')
+                elif began is not None and now >= began + timeout:
+                    # The thread keeps running; statement_timeout bounds its queries
+                    del running[future]
+                    logger.warning(f"Dashboard section {section.name} timed out for {context.cache_scope}")
+                    results[section.name] = section.default
+                    timings[section.name] = _timing('timeout', now - began)
+
+    def invalidate(self, scopes: Iterable[str], names: Optional[Iterable[str]] = None) -> None:
+        """Drops cached sections (all when `names` is empty) for each scope."""
+        sections = self.select(names)
+        cache.delete_many([self.cache_key(scope, section) for scope in scopes for section in sections])
@@ -11,6 +11,8 @@ from apps.courses.models import Course
 from apps.enrollments.models import Enrollment
 from apps.core.models import Tenant
 from apps.assessments.models import Assessment
+from apps.discussions.models import DiscussionActivity
+from apps.discussions.services import DiscussionActivityService
 
 
 class Command(BaseCommand):
@@ -34,6 +36,8 @@ class Command(BaseCommand):
             ActivityFeed.objects.all().delete()
             StudySession.objects.all().delete()
             DiscussionInteraction.objects.all().delete()
+            # Generated activity has no thread; real discussion activity is kept
+            DiscussionActivity.objects.filter(thread__isnull=True).delete()
             
             # Get existing users and courses
             users = User.objects.filter(role=User.Role.LEARNER)[:10]
@@ -83,11 +87,12 @@ class Command(BaseCommand):
                         
                         # Generate discussion interactions
                         for i in range(random.randint(2, 8)):
+                            interaction_type = random.choice(['post', 'reply', 'like', 'view'])
                             DiscussionInteraction.objects.create(
                                 tenant=tenant,
                                 user=user,
                                 course=course,
-                                interaction_type=random.choice(['post', 'reply', 'like', 'view']),
+                                interaction_type=interaction_type,
                                 discussion_id=f"discussion_{random.randint(1, 10)}",
                                 post_id=f"post_{random.randint(1, 100)}",
                                 content_length=random.randint(50, 500),
@@ -96,6 +101,14 @@ class Command(BaseCommand):
                                 quality_score=random.randint(60, 100),
                                 helpfulness_rating=random.randint(3, 5)
                             )
+                            activity_type = DiscussionActivityService.INTERACTION_ACTIVITY_TYPES.get(interaction_type)
+                            if activity_type:
+                                DiscussionActivity.objects.create(
+                                    tenant=tenant,
+                                    course=course,
+                                    actor=user,
+                                    activity_type=activity_type,
+                                )
                         
                         # Generate activity feed entries
                         activity_types = [
@@ -0,0 +1,51 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.analytics.pipeline import AnalyticsPipelineService
+from apps.core.models import Tenant
+
+
+class Command(BaseCommand):
+    help = 'Run or backfill the nightly analytics pipeline for a day or a range of days'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start-date', help='First day to process, YYYY-MM-DD (default: each tenant\'s yesterday)')
+        parser.add_argument('--end-date', help='Last day to process, YYYY-MM-DD (default: --start-date)')
+        parser.add_argument('--tenant', help='Slug of the tenant to process (default: all active tenants)')
+        parser.add_argument('--force', action='store_true', help='Re-run units that already completed')
+        parser.add_argument('--inline', action='store_true', help='Run in this process instead of queueing tasks')
+
+    def handle(self, *args, **options):
+        tenants = Tenant.objects.filter(is_active=True)
+        if options['tenant']:
+            tenants = tenants.filter(slug=options['tenant'])
+            if not tenants.exists():
+                raise CommandError(f"Tenant '{options['tenant']}' not found")
+
+        try:
+            start_date = date.fromisoformat(options['start_date']) if options['start_date'] else None
+            end_date = date.fromisoformat(options['end_date']) if options['end_date'] else start_date
+        except ValueError as e:
+            raise CommandError(f"Invalid date: {e}")
+
+        if start_date is None:
+            if end_date is not None:
+                raise CommandError('--end-date requires --start-date')
+            units = AnalyticsPipelineService.daily_units(tenants=tenants)
+        else:
+            try:
+                units = AnalyticsPipelineService.backfill_units(start_date, end_date, tenants)
+            except ValueError as e:
+                raise CommandError(str(e))
+
+        if options['inline']:
+            summary = AnalyticsPipelineService.run_inline(units, force=options['force'])
+            for stage, totals in summary['stages'].items():
+                self.stdout.write(
+                    f"{stage}: {totals['statuses']} rows={totals['rows']} duration_ms={totals['duration_ms']}"
+                )
+            self.stdout.write(self.style.SUCCESS(f"Analytics pipeline ran for {len(units)} tenant-days"))
+        else:
+            AnalyticsPipelineService.dispatch(units, force=options['force'])
+            self.stdout.write(self.style.SUCCESS(f"Analytics pipeline queued for {len(units)} tenant-days"))
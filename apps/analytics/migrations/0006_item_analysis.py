@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:10
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0005_add_dashboard_widgets'),
+        ('assessments', '0005_assessmentattempt_question_results'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assessmentanalytics',
+            name='item_state',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='assessmentanalytics',
+            name='processed_through',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='assessmentanalytics',
+            name='processed_through_attempt',
+            field=models.UUIDField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='assessmentanalytics',
+            name='time_percentiles',
+            field=models.JSONField(blank=True, help_text='Estimated time-to-complete percentiles in seconds', null=True),
+        ),
+        migrations.CreateModel(
+            name='QuestionAnalytics',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('responses', models.PositiveIntegerField(default=0, help_text='Graded responses folded in')),
+                ('correct_count', models.PositiveIntegerField(default=0)),
+                ('avg_score', models.DecimalField(decimal_places=2, default=0, max_digits=7)),
+                ('p_value', models.DecimalField(blank=True, decimal_places=4, help_text='Mean proportion of points earned (0-1)', max_digits=5, null=True)),
+                ('discrimination', models.DecimalField(blank=True, decimal_places=4, help_text='Corrected point-biserial correlation (-1 to 1)', max_digits=5, null=True)),
+                ('distractor_frequencies', models.JSONField(blank=True, default=dict, help_text='Selection counts per option')),
+                ('item_state', models.JSONField(blank=True, default=dict)),
+                ('assessment_analytics', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='question_analytics', to='analytics.assessmentanalytics')),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='item_analytics', to='assessments.question')),
+            ],
+            options={
+                'ordering': ['assessment_analytics', 'question__order'],
+                'unique_together': {('assessment_analytics', 'question')},
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:35
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0006_item_analysis'),
+        ('core', '0004_ltilineitem_ltigradesubmission'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['tenant', 'created_at', 'id'], name='analytics_e_tenant__e76399_idx'),
+        ),
+    ]
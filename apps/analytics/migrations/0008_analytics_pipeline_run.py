@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:44
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0007_keyset_pagination_indexes'),
+        ('core', '0004_ltilineitem_ltigradesubmission'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnalyticsPipelineRun',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('date', models.DateField()),
+                ('stage', models.CharField(max_length=50)),
+                ('status', models.CharField(choices=[('RUNNING', 'Running'), ('COMPLETED', 'Completed'), ('FAILED', 'Failed'), ('BLOCKED', 'Blocked by an unfinished dependency')], db_index=True, default='RUNNING', max_length=20)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('duration_ms', models.PositiveIntegerField(default=0)),
+                ('rows', models.PositiveIntegerField(default=0, help_text='Rows written by the stage for this tenant and day')),
+                ('error', models.TextField(blank=True)),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='analytics_pipeline_runs', to='core.tenant')),
+            ],
+            options={
+                'verbose_name': 'Analytics Pipeline Run',
+                'verbose_name_plural': 'Analytics Pipeline Runs',
+                'ordering': ['-date', 'tenant', 'stage'],
+                'indexes': [models.Index(fields=['date', 'status'], name='analytics_a_date_a0d779_idx')],
+                'unique_together': {('tenant', 'date', 'stage')},
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:50
+
+from django.db import migrations, models
+
+
+def drop_duplicate_instructor_rows(apps, schema_editor):
+    """Keeps the most recently updated instructor-wide row per (tenant, instructor, date)."""
+    LearningEfficiency = apps.get_model('analytics', 'LearningEfficiency')
+
+    seen = set()
+    duplicates = []
+    rows = LearningEfficiency.objects.filter(course_id__isnull=True).order_by('-updated_at').values_list(
+        'id', 'tenant_id', 'instructor_id', 'date'
+    )
+    for row_id, *key in rows.iterator():
+        key = tuple(key)
+        if key in seen:
+            duplicates.append(row_id)
+        else:
+            seen.add(key)
+    LearningEfficiency.objects.filter(id__in=duplicates).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0008_analytics_pipeline_run'),
+        ('core', '0004_ltilineitem_ltigradesubmission'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicate_instructor_rows, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='learningefficiency',
+            constraint=models.UniqueConstraint(condition=models.Q(('course_id__isnull', True)), fields=('tenant', 'instructor_id', 'date'), name='unique_instructor_learning_efficiency'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:55
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0009_learning_efficiency_instructor_unique'),
+        ('core', '0004_ltilineitem_ltigradesubmission'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnalyticsExportRun',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('dataset', models.CharField(max_length=50)),
+                ('file_format', models.CharField(choices=[('parquet', 'Parquet'), ('npz', 'NumPy .npz')], max_length=10)),
+                ('start_date', models.DateField(blank=True, null=True)),
+                ('end_date', models.DateField(blank=True, null=True)),
+                ('incremental', models.BooleanField(default=False)),
+                ('status', models.CharField(choices=[('RUNNING', 'Running'), ('COMPLETED', 'Completed'), ('FAILED', 'Failed')], default='RUNNING', max_length=20)),
+                ('watermark', models.DateTimeField(blank=True, help_text='Rows updated up to this time were exported', null=True)),
+                ('rows', models.PositiveIntegerField(default=0)),
+                ('files', models.JSONField(blank=True, default=list, help_text='Storage paths of the written part files')),
+                ('error', models.TextField(blank=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='analytics_export_runs', to='core.tenant')),
+            ],
+            options={
+                'verbose_name': 'Analytics Export Run',
+                'verbose_name_plural': 'Analytics Export Runs',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['tenant', 'dataset', 'status', 'watermark'], name='analytics_a_tenant__f48696_idx')],
+            },
+        ),
+    ]
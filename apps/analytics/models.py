@@ -86,6 +86,7 @@ class Event(TimestampedModel):
             models.Index(fields=["user", "event_type", "created_at"]),
             models.Index(fields=["device_type", "created_at"]),
             models.Index(fields=["country", "created_at"]),
+            models.Index(fields=["tenant", "created_at", "id"]),
         ]
         verbose_name = _("Tracked Event")
         verbose_name_plural = _("Tracked Events")
@@ -379,6 +380,14 @@ class LearningEfficiency(TimestampedModel):
     
     class Meta:
         unique_together = ('tenant', 'instructor_id', 'course_id', 'date')
+        constraints = [
+            # Instructor-wide rows have no course_id, and NULLs never collide in unique_together
+            models.UniqueConstraint(
+                fields=['tenant', 'instructor_id', 'date'],
+                condition=models.Q(course_id__isnull=True),
+                name='unique_instructor_learning_efficiency'
+            ),
+        ]
         ordering = ['-date', 'instructor_id']
         verbose_name = _("Learning Efficiency")
         verbose_name_plural = _("Learning Efficiency")
@@ -420,6 +429,87 @@ class SocialLearningMetrics(TimestampedModel):
         verbose_name_plural = _("Social Learning Metrics")
 
 
+class AnalyticsPipelineRun(TimestampedModel):
+    """
+    Checkpoint of one nightly analytics pipeline unit: a stage for a tenant and day.
+
+    Completed units are skipped when the pipeline is re-run or backfilled;
+    duration and row counts are kept for monitoring.
+    """
+
+    class Status(models.TextChoices):
+        RUNNING = "RUNNING", _("Running")
+        COMPLETED = "COMPLETED", _("Completed")
+        FAILED = "FAILED", _("Failed")
+        BLOCKED = "BLOCKED", _("Blocked by an unfinished dependency")
+
+    tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE, related_name="analytics_pipeline_runs")
+    date = models.DateField()
+    stage = models.CharField(max_length=50)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.RUNNING, db_index=True)
+    attempts = models.PositiveIntegerField(default=0)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    duration_ms = models.PositiveIntegerField(default=0)
+    rows = models.PositiveIntegerField(default=0, help_text="Rows written by the stage for this tenant and day")
+    error = models.TextField(blank=True)
+
+    def __str__(self):
+        return f"{self.stage} for tenant {self.tenant_id} on {self.date} ({self.status})"
+
+    class Meta:
+        unique_together = ('tenant', 'date', 'stage')
+        ordering = ['-date', 'tenant', 'stage']
+        indexes = [
+            models.Index(fields=['date', 'status']),
+        ]
+        verbose_name = _("Analytics Pipeline Run")
+        verbose_name_plural = _("Analytics Pipeline Runs")
+
+
+class AnalyticsExportRun(TimestampedModel):
+    """
+    One columnar snapshot export of a dataset for a tenant.
+
+    `watermark` is the updated_at cut-off the export covered; the next
+    incremental export of the dataset over the same start_date..end_date
+    picks up rows updated after it.
+    """
+
+    class Status(models.TextChoices):
+        RUNNING = "RUNNING", _("Running")
+        COMPLETED = "COMPLETED", _("Completed")
+        FAILED = "FAILED", _("Failed")
+
+    class Format(models.TextChoices):
+        PARQUET = "parquet", _("Parquet")
+        NPZ = "npz", _("NumPy .npz")
+
+    tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE, related_name="analytics_export_runs")
+    dataset = models.CharField(max_length=50)
+    file_format = models.CharField(max_length=10, choices=Format.choices)
+    start_date = models.DateField(null=True, blank=True)
+    end_date = models.DateField(null=True, blank=True)
+    incremental = models.BooleanField(default=False)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.RUNNING)
+    watermark = models.DateTimeField(null=True, blank=True, help_text="Rows updated up to this time were exported")
+    rows = models.PositiveIntegerField(default=0)
+    files = models.JSONField(default=list, blank=True, help_text="Storage paths of the written part files")
+    error = models.TextField(blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.dataset} export for tenant {self.tenant_id} ({self.status})"
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['tenant', 'dataset', 'status', 'watermark']),
+        ]
+        verbose_name = _("Analytics Export Run")
+        verbose_name_plural = _("Analytics Export Runs")
+
+
 # --- Reporting / Dashboard Models (Simplified representation) ---
 # These might store definitions or cached results. Actual report generation
 # would query the Event model or aggregated data.
@@ -647,12 +737,39 @@ class AssessmentAnalytics(TimestampedModel):
     
     # Distribution data
     score_distribution = models.JSONField(blank=True, null=True, help_text="Score distribution buckets")
+    time_percentiles = models.JSONField(blank=True, null=True, help_text="Estimated time-to-complete percentiles in seconds")
+    
+    # Incremental item analysis: running sums and the last attempt folded in
+    item_state = models.JSONField(default=dict, blank=True)
+    processed_through = models.DateTimeField(null=True, blank=True)
+    processed_through_attempt = models.UUIDField(null=True, blank=True)
     
     class Meta:
         unique_together = ['assessment', 'tenant']
         ordering = ['-created_at']
 
 
+class QuestionAnalytics(TimestampedModel):
+    """Item analysis statistics for a single assessment question."""
+    
+    assessment_analytics = models.ForeignKey(AssessmentAnalytics, on_delete=models.CASCADE, related_name='question_analytics')
+    question = models.ForeignKey('assessments.Question', on_delete=models.CASCADE, related_name='item_analytics')
+    
+    responses = models.PositiveIntegerField(default=0, help_text="Graded responses folded in")
+    correct_count = models.PositiveIntegerField(default=0)
+    avg_score = models.DecimalField(max_digits=7, decimal_places=2, default=0)
+    p_value = models.DecimalField(max_digits=5, decimal_places=4, null=True, blank=True, help_text="Mean proportion of points earned (0-1)")
+    discrimination = models.DecimalField(max_digits=5, decimal_places=4, null=True, blank=True, help_text="Corrected point-biserial correlation (-1 to 1)")
+    distractor_frequencies = models.JSONField(default=dict, blank=True, help_text="Selection counts per option")
+    
+    # Running sums used to fold in new attempts
+    item_state = models.JSONField(default=dict, blank=True)
+    
+    class Meta:
+        unique_together = ['assessment_analytics', 'question']
+        ordering = ['assessment_analytics', 'question__order']
+
+
 class LearningPathProgress(TimestampedModel):
     """Tracks progress through learning paths."""
     
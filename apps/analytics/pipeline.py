@@ -0,0 +1,313 @@
+"""
+Nightly analytics pipeline.
+
+The daily aggregation used to run every step for every tenant one after
+another inside a single call. Here each step is a stage in a dependency
+graph (engagement -> course -> instructor -> insights) and the unit of work
+is one stage for one (tenant, day). Units run as Celery tasks: every
+(tenant, day) is a chain of its stage levels (stages sharing a level run as
+a group), and all chains fan out together as the header of a chord whose
+callback summarises the run. A backfill is the same chord over every day of
+a range.
+
+Each unit is checkpointed in AnalyticsPipelineRun with its duration and the
+rows it wrote, so a re-run or an overlapping backfill skips completed units,
+and a unit whose dependencies did not complete is recorded as blocked rather
+than run against missing inputs.
+"""
+
+import logging
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from django.utils import timezone
+
+from apps.core.models import Tenant
+from apps.users.models import User
+
+from .models import (
+    AIInsights,
+    AnalyticsPipelineRun,
+    CourseAnalytics,
+    InstructorAnalytics,
+    PredictiveAnalytics,
+    StudentEngagementMetric,
+)
+from .services import AnalyticsService
+from .timewindow import local_today, tenant_timezone
+
+logger = logging.getLogger(__name__)
+
+Unit = Tuple[str, date]  # (tenant id, tenant-local day)
+
+
+@dataclass(frozen=True)
+class PipelineStage:
+    """A pipeline step run for one tenant and day; `count_rows` reports what it wrote."""
+
+    name: str
+    run: Callable[[Tenant, date], None]
+    count_rows: Callable[[Tenant, date], int]
+    depends_on: Tuple[str, ...] = ()
+
+
+def _run_insights(tenant: Tenant, day: date) -> None:
+    instructor_ids = User.objects.filter(
+        role=User.Role.INSTRUCTOR,
+        courses_authored__tenant=tenant
+    ).distinct().values_list('id', flat=True)
+
+    for instructor_id in instructor_ids:
+        AnalyticsService.generate_ai_insights(tenant, instructor_id, day)
+        AnalyticsService.generate_predictive_analytics(tenant, instructor_id, day)
+
+
+def _count_insights(tenant: Tenant, day: date) -> int:
+    return (
+        AIInsights.objects.filter(tenant=tenant, date=day).count()
+        + PredictiveAnalytics.objects.filter(tenant=tenant, prediction_date=day).count()
+    )
+
+
+# Service methods are looked up at call time so they can be patched
+STAGES: Dict[str, PipelineStage] = {stage.name: stage for stage in (
+    PipelineStage(
+        'engagement',
+        run=lambda tenant, day: AnalyticsService.process_student_engagement_metrics(tenant, day),
+        count_rows=lambda tenant, day: StudentEngagementMetric.objects.filter(tenant=tenant, date=day).count(),
+    ),
+    PipelineStage(
+        'course',
+        run=lambda tenant, day: AnalyticsService.process_course_analytics(tenant, day),
+        count_rows=lambda tenant, day: CourseAnalytics.objects.filter(tenant=tenant, date=day).count(),
+        depends_on=('engagement',),
+    ),
+    PipelineStage(
+        'instructor',
+        run=lambda tenant, day: AnalyticsService.process_instructor_analytics(tenant, day),
+        count_rows=lambda tenant, day: InstructorAnalytics.objects.filter(tenant=tenant, date=day).count(),
+        depends_on=('course',),
+    ),
+    PipelineStage(
+        'insights',
+        run=_run_insights,
+        count_rows=_count_insights,
+        depends_on=('instructor',),
+    ),
+)}
+
+
+def stage_levels(stages: Dict[str, PipelineStage] = STAGES) -> List[List[str]]:
+    """
+    Groups stages into levels that can run in order, each level in parallel.
+
+    Every stage lands one level after the last of its dependencies. Raises
+    ValueError for unknown dependencies or cycles.
+    """
+    for stage in stages.values():
+        unknown = set(stage.depends_on) - set(stages)
+        if unknown:
+            raise ValueError(f"Stage '{stage.name}' depends on unknown stages: {', '.join(sorted(unknown))}")
+
+    levels: List[List[str]] = []
+    placed: set = set()
+    remaining = list(stages)
+    while remaining:
+        ready = [name for name in remaining if set(stages[name].depends_on) <= placed]
+        if not ready:
+            raise ValueError(f"Pipeline stages form a cycle: {', '.join(remaining)}")
+        levels.append(ready)
+        placed.update(ready)
+        remaining = [name for name in remaining if name not in placed]
+    return levels
+
+
+class AnalyticsPipelineService:
+    """Plans, dispatches and runs the checkpointed nightly analytics pipeline."""
+
+    @staticmethod
+    def daily_units(day: Optional[date] = None, tenants: Optional[Iterable[Tenant]] = None) -> List[Unit]:
+        """One unit per active tenant; without `day`, each tenant's local yesterday."""
+        if tenants is None:
+            tenants = Tenant.objects.filter(is_active=True)
+        return [
+            (str(tenant.pk), day or local_today(tenant_timezone(tenant)) - timedelta(days=1))
+            for tenant in tenants
+        ]
+
+    @staticmethod
+    def backfill_units(start_date: date, end_date: date, tenants: Optional[Iterable[Tenant]] = None) -> List[Unit]:
+        """One unit per active tenant and day from `start_date` through `end_date`."""
+        if end_date < start_date:
+            raise ValueError("end_date must not be before start_date")
+        if tenants is None:
+            tenants = Tenant.objects.filter(is_active=True)
+        tenant_ids = [str(tenant.pk) for tenant in tenants]
+        days = [start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
+        return [(tenant_id, day) for day in days for tenant_id in tenant_ids]
+
+    @staticmethod
+    def run_stage(tenant_id, day: date, stage_name: str, force: bool = False) -> dict:
+        """
+        Runs one stage for a tenant and day unless its checkpoint says it completed.
+
+        Records the unit as blocked, without running it, when a dependency has
+        not completed. Failures are recorded on the checkpoint and re-raised.
+        """
+        stage = STAGES[stage_name]
+        tenant = Tenant.objects.get(pk=tenant_id)
+        run, _ = AnalyticsPipelineRun.objects.get_or_create(tenant=tenant, date=day, stage=stage_name)
+
+        if run.status == AnalyticsPipelineRun.Status.COMPLETED and not force:
+            logger.info(f"Analytics pipeline: '{stage_name}' for {tenant.name} on {day} already completed, skipping")
+            return AnalyticsPipelineService._result(run, skipped=True)
+
+        completed = set(AnalyticsPipelineRun.objects.filter(
+            tenant=tenant, date=day, stage__in=stage.depends_on, status=AnalyticsPipelineRun.Status.COMPLETED
+        ).values_list('stage', flat=True))
+        missing = [name for name in stage.depends_on if name not in completed]
+        if missing:
+            run.status = AnalyticsPipelineRun.Status.BLOCKED
+            run.error = f"Waiting on: {', '.join(missing)}"
+            run.save(update_fields=['status', 'error', 'updated_at'])
+            logger.warning(f"Analytics pipeline: '{stage_name}' for {tenant.name} on {day} blocked by {missing}")
+            return AnalyticsPipelineService._result(run)
+
+        run.status = AnalyticsPipelineRun.Status.RUNNING
+        run.attempts += 1
+        run.started_at = timezone.now()
+        run.finished_at = None
+        run.error = ''
+        run.save(update_fields=['status', 'attempts', 'started_at', 'finished_at', 'error', 'updated_at'])
+
+        started = time.perf_counter()
+        try:
+            stage.run(tenant, day)
+            run.rows = stage.count_rows(tenant, day)
+        except Exception as e:
+            run.status = AnalyticsPipelineRun.Status.FAILED
+            run.error = str(e)
+            logger.error(f"Analytics pipeline: '{stage_name}' for {tenant.name} on {day} failed: {e}", exc_info=True)
+            raise
+        else:
+            run.status = AnalyticsPipelineRun.Status.COMPLETED
+            logger.info(
+                f"Analytics pipeline: '{stage_name}' for {tenant.name} on {day} wrote {run.rows} rows"
+            )
+        finally:
+            run.duration_ms = int((time.perf_counter() - started) * 1000)
+            run.finished_at = timezone.now()
+            run.save(update_fields=['status', 'rows', 'error', 'duration_ms', 'finished_at', 'updated_at'])
+
+        return AnalyticsPipelineService._result(run)
+
+    @staticmethod
+    def checkpoint(tenant_id, day: date, stage_name: str) -> dict:
+        """The recorded outcome of a unit, e.g. after its task gave up retrying."""
+        run = AnalyticsPipelineRun.objects.get(tenant_id=tenant_id, date=day, stage=stage_name)
+        return AnalyticsPipelineService._result(run)
+
+    @staticmethod
+    def _result(run: AnalyticsPipelineRun, skipped: bool = False) -> dict:
+        return {
+            'tenant_id': str(run.tenant_id),
+            'date': run.date.isoformat(),
+            'stage': run.stage,
+            'status': 'SKIPPED' if skipped else run.status,
+            'rows': run.rows,
+            'duration_ms': run.duration_ms,
+        }
+
+    @staticmethod
+    def build_canvas(units: Sequence[Unit], force: bool = False):
+        """
+        The Celery canvas for a set of units: a chord over per-(tenant, day)
+        chains of stage levels, summarised once every chain has finished.
+        """
+        from celery import chain, chord, group
+
+        from .tasks import run_pipeline_stage_task, summarize_pipeline_task
+
+        levels = stage_levels()
+        chains = []
+        for tenant_id, day in units:
+            steps = []
+            for level in levels:
+                signatures = [
+                    run_pipeline_stage_task.si(str(tenant_id), day.isoformat(), name, force) for name in level
+                ]
+                steps.append(signatures[0] if len(signatures) == 1 else group(signatures))
+            chains.append(chain(*steps))
+
+        return chord(chains, summarize_pipeline_task.si(AnalyticsPipelineService._serialize_units(units)))
+
+    @staticmethod
+    def dispatch(units: Sequence[Unit], force: bool = False):
+        """Queues the pipeline for `units`, running it inline if the broker is unavailable."""
+        if not units:
+            logger.info("Analytics pipeline: nothing to run")
+            return None
+        try:
+            return AnalyticsPipelineService.build_canvas(units, force=force).apply_async()
+        except Exception as e:
+            logger.warning(f"Could not queue analytics pipeline for {len(units)} units, running inline: {e}")
+            return AnalyticsPipelineService.run_inline(units, force=force)
+
+    @staticmethod
+    def run_inline(units: Sequence[Unit], force: bool = False, raise_errors: bool = False) -> dict:
+        """Runs every unit in this process, in dependency order, and returns the summary."""
+        for tenant_id, day in units:
+            for level in stage_levels():
+                for name in level:
+                    try:
+                        AnalyticsPipelineService.run_stage(tenant_id, day, name, force=force)
+                    except Exception:
+                        if raise_errors:
+                            raise
+                        # The failure is checkpointed; dependent stages record themselves as blocked
+        return AnalyticsPipelineService.summarize(units)
+
+    @staticmethod
+    def summarize(units: Sequence[Unit]) -> dict:
+        """Per-stage status counts, rows written and durations for a set of units."""
+        # One OR term per unit exceeds SQLite's expression depth limit on long
+        # backfills, so filter by tenants and date range and match units here
+        wanted = {(str(tenant_id), day) for tenant_id, day in units}
+        runs = AnalyticsPipelineRun.objects.none()
+        if wanted:
+            days = [day for _, day in wanted]
+            runs = AnalyticsPipelineRun.objects.filter(
+                tenant_id__in={tenant_id for tenant_id, _ in wanted}, date__range=(min(days), max(days))
+            )
+
+        stages = defaultdict(lambda: {'statuses': defaultdict(int), 'rows': 0, 'duration_ms': 0, 'max_duration_ms': 0})
+        for tenant_id, day, status, stage, rows, duration_ms in runs.values_list(
+            'tenant_id', 'date', 'status', 'stage', 'rows', 'duration_ms'
+        ):
+            if (str(tenant_id), day) not in wanted:
+                continue
+            totals = stages[stage]
+            totals['statuses'][status] += 1
+            totals['rows'] += rows
+            totals['duration_ms'] += duration_ms
+            totals['max_duration_ms'] = max(totals['max_duration_ms'], duration_ms)
+
+        summary = {
+            'units': len(units),
+            'stages': {
+                name: {**totals, 'statuses': dict(totals['statuses'])} for name, totals in stages.items()
+            },
+        }
+        logger.info(f"Analytics pipeline finished {len(units)} units: {summary['stages']}")
+        return summary
+
+    @staticmethod
+    def _serialize_units(units: Sequence[Unit]) -> List[List[str]]:
+        return [[str(tenant_id), day.isoformat()] for tenant_id, day in units]
+
+    @staticmethod
+    def deserialize_units(units: Sequence[Sequence[str]]) -> List[Unit]:
+        return [(tenant_id, date.fromisoformat(day)) for tenant_id, day in units]
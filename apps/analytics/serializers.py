@@ -16,6 +16,7 @@ from .models import (
     StudentPerformance,
     EngagementMetrics,
     AssessmentAnalytics,
+    QuestionAnalytics,
     LearningPathProgress,
     ContentInteraction,
     CourseCompletion,
@@ -400,9 +401,18 @@ class AssessmentAnalyticsSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = AssessmentAnalytics
-        fields = '__all__'
+        exclude = ('item_state', 'processed_through_attempt')
         read_only_fields = ('tenant',)
 
+
+class QuestionAnalyticsSerializer(serializers.ModelSerializer):
+    question_text = serializers.CharField(source='question.question_text', read_only=True)
+    question_type = serializers.CharField(source='question.question_type', read_only=True)
+    
+    class Meta:
+        model = QuestionAnalytics
+        exclude = ('item_state', 'assessment_analytics')
+
 # Learning Path Progress Serializer
 class LearningPathProgressSerializer(serializers.ModelSerializer):
     student_name = serializers.CharField(source='student.get_full_name', read_only=True)
@@ -10,23 +10,31 @@ from django.db import models
 from django.core.exceptions import ObjectDoesNotExist
 from django.core.paginator import Paginator
 from django.db.models import Avg, Count, Max, Min, Sum, Q, F, Case, When, IntegerField, Value
+from django.db.models.functions import ExtractHour, ExtractWeekDay
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 import random
+import time
+
+import numpy as np
 
 # Import models from other apps
 from apps.core.models import Tenant
 from apps.courses.models import Course
+from apps.discussions.services import DiscussionActivityService
 from apps.enrollments.models import Enrollment
 from apps.users.models import User
 from apps.assessments.models import AssessmentAttempt
 
 # Import analytics models
+from .dashboard import DashboardComposer, DashboardSection, InstructorContext
+from .timewindow import TimeWindow, local_today, tenant_timezone
+from .upsert import BulkUpsertWriter
 from .models import (
     Event, Report, Dashboard, StudentEngagementMetric, CourseAnalytics,
     InstructorAnalytics, PredictiveAnalytics, AIInsights, RealTimeMetrics,
     LearningEfficiency, SocialLearningMetrics, StudySession, PeerReview,
-    CollaborativeProject, StudyGroup, DiscussionInteraction, RevenueAnalytics
+    CollaborativeProject, StudyGroup, RevenueAnalytics
 )
 
 logger = logging.getLogger(__name__)
@@ -120,9 +128,11 @@ class AnalyticsService:
 
     @staticmethod
     def process_student_engagement_metrics(tenant: Tenant, date: datetime.date = None):
-        """Process and store student engagement metrics for a specific date."""
+        """Process and store student engagement metrics for a specific (tenant-local) date."""
+        tz = tenant_timezone(tenant)
         if date is None:
-            date = timezone.now().date() - timedelta(days=1)  # Previous day
+            date = local_today(tz) - timedelta(days=1)  # Previous day
+        day = TimeWindow.for_day(date, tz)
         
         # Get all active enrollments for the tenant
         enrollments = Enrollment.objects.filter(
@@ -130,6 +140,7 @@ class AnalyticsService:
             status__in=[Enrollment.Status.ACTIVE, Enrollment.Status.COMPLETED]
         ).select_related('user', 'course')
         
+        writer = BulkUpsertWriter(StudentEngagementMetric)
         for enrollment in enrollments:
             user = enrollment.user
             course = enrollment.course
@@ -138,8 +149,8 @@ class AnalyticsService:
             events = Event.objects.filter(
                 tenant=tenant,
                 user=user,
-                created_at__date=date,
-                context_data__course_id=str(course.id)
+                context_data__course_id=str(course.id),
+                **day.lookups('created_at')
             )
             
             daily_active_time = AnalyticsService._calculate_active_time(events)
@@ -154,44 +165,28 @@ class AnalyticsService:
             # Calculate session metrics
             sessions = events.filter(event_type='SESSION_START')
             session_count = sessions.count()
-            avg_session_duration = AnalyticsService._calculate_avg_session_duration(user, date)
+            avg_session_duration = AnalyticsService._calculate_avg_session_duration(user, date, tz)
             
             # Calculate risk score
             risk_score = AnalyticsService._calculate_risk_score(user, course, date)
             
-            # Get or create engagement metric
-            engagement_metric, created = StudentEngagementMetric.objects.get_or_create(
+            writer.add(
                 tenant=tenant,
                 user=user,
                 course_id=course.id,
                 date=date,
-                defaults={
-                    'daily_active_time': daily_active_time,
-                    'content_views': content_views,
-                    'video_watches': video_watches,
-                    'quiz_attempts': quiz_attempts,
-                    'discussion_posts': discussion_posts,
-                    'assignments_submitted': assignments_submitted,
-                    'session_count': session_count,
-                    'avg_session_duration': avg_session_duration,
-                    'risk_score': risk_score,
-                    'last_activity_date': timezone.now(),
-                }
+                daily_active_time=daily_active_time,
+                content_views=content_views,
+                video_watches=video_watches,
+                quiz_attempts=quiz_attempts,
+                discussion_posts=discussion_posts,
+                assignments_submitted=assignments_submitted,
+                session_count=session_count,
+                avg_session_duration=avg_session_duration,
+                risk_score=risk_score,
+                last_activity_date=timezone.now(),
             )
-            
-            if not created:
-                # Update existing metric
-                engagement_metric.daily_active_time = daily_active_time
-                engagement_metric.content_views = content_views
-                engagement_metric.video_watches = video_watches
-                engagement_metric.quiz_attempts = quiz_attempts
-                engagement_metric.discussion_posts = discussion_posts
-                engagement_metric.assignments_submitted = assignments_submitted
-                engagement_metric.session_count = session_count
-                engagement_metric.avg_session_duration = avg_session_duration
-                engagement_metric.risk_score = risk_score
-                engagement_metric.last_activity_date = timezone.now()
-                engagement_metric.save()
+        writer.flush()
 
     @staticmethod
     def _calculate_active_time(events):
@@ -219,15 +214,16 @@ class AnalyticsService:
         return int(total_time)
 
     @staticmethod
-    def _calculate_avg_session_duration(user: User, date: datetime.date):
-        """Calculate average session duration for a user on a specific date."""
+    def _calculate_avg_session_duration(user: User, date: datetime.date, tz=None):
+        """Calculate average session duration for a user on a specific date (in `tz`, default the user's tenant's)."""
         from .models import StudySession
         
+        day = TimeWindow.for_day(date, tz or tenant_timezone(user.tenant_id))
         # Try to get actual session data first
         sessions = StudySession.objects.filter(
             user=user,
-            started_at__date=date,
-            duration__isnull=False
+            duration__isnull=False,
+            **day.lookups('started_at')
         )
         
         if sessions.exists():
@@ -239,7 +235,7 @@ class AnalyticsService:
             return int(total_duration / sessions.count())
         
         # Fallback: estimate from events by grouping SESSION_START/SESSION_END pairs
-        events = Event.objects.filter(user=user, created_at__date=date).order_by('created_at')
+        events = Event.objects.filter(user=user, **day.lookups('created_at')).order_by('created_at')
         if not events.exists():
             return 0
         
@@ -332,6 +328,7 @@ class AnalyticsService:
         
         courses = Course.objects.filter(tenant=tenant, status=Course.Status.PUBLISHED)
         
+        writer = BulkUpsertWriter(CourseAnalytics)
         for course in courses:
             # Get enrollment metrics
             total_enrollments = Enrollment.objects.filter(course=course).count()
@@ -370,35 +367,21 @@ class AnalyticsService:
                 total_revenue / total_enrollments if total_enrollments > 0 else 0
             )
             
-            # Get or create course analytics
-            course_analytics, created = CourseAnalytics.objects.get_or_create(
+            writer.add(
                 tenant=tenant,
                 course_id=course.id,
                 date=date,
-                defaults={
-                    'instructor_id': course.instructor.id,
-                    'total_enrollments': total_enrollments,
-                    'active_enrollments': active_enrollments,
-                    'completed_enrollments': completed_enrollments,
-                    'dropped_enrollments': dropped_enrollments,
-                    'avg_completion_rate': avg_completion_rate,
-                    'avg_engagement_score': 100 - avg_engagement_score, # Invert risk score
-                    'total_revenue': total_revenue,
-                    'avg_revenue_per_student': avg_revenue_per_student,
-                }
+                instructor_id=course.instructor.id,
+                total_enrollments=total_enrollments,
+                active_enrollments=active_enrollments,
+                completed_enrollments=completed_enrollments,
+                dropped_enrollments=dropped_enrollments,
+                avg_completion_rate=avg_completion_rate,
+                avg_engagement_score=100 - avg_engagement_score,  # Invert risk score
+                total_revenue=total_revenue,
+                avg_revenue_per_student=avg_revenue_per_student,
             )
-            
-            if not created:
-                # Update existing analytics
-                course_analytics.total_enrollments = total_enrollments
-                course_analytics.active_enrollments = active_enrollments
-                course_analytics.completed_enrollments = completed_enrollments
-                course_analytics.dropped_enrollments = dropped_enrollments
-                course_analytics.avg_completion_rate = avg_completion_rate
-                course_analytics.avg_engagement_score = 100 - avg_engagement_score
-                course_analytics.total_revenue = total_revenue
-                course_analytics.avg_revenue_per_student = avg_revenue_per_student
-                course_analytics.save()
+        writer.flush()
 
     @staticmethod
     def process_instructor_analytics(tenant: Tenant, date: datetime.date = None):
@@ -408,10 +391,11 @@ class AnalyticsService:
         
         # Get all instructors in the tenant
         instructors = User.objects.filter(
-            role='instructor',
+            role=User.Role.INSTRUCTOR,
             courses_authored__tenant=tenant
         ).distinct()
         
+        writer = BulkUpsertWriter(InstructorAnalytics)
         for instructor in instructors:
             # Get instructor's courses
             courses = Course.objects.filter(instructor=instructor, tenant=tenant)
@@ -464,40 +448,23 @@ class AnalyticsService:
                 total_revenue / total_students if total_students > 0 else 0
             )
             
-            # Get or create instructor analytics
-            instructor_analytics, created = InstructorAnalytics.objects.get_or_create(
+            writer.add(
                 tenant=tenant,
                 instructor_id=instructor.id,
                 date=date,
-                defaults={
-                    'total_courses': total_courses,
-                    'published_courses': published_courses,
-                    'draft_courses': draft_courses,
-                    'total_students': total_students,
-                    'active_students': active_students,
-                    'new_students': new_students,
-                    'avg_completion_rate': avg_completion_rate,
-                    'avg_engagement_rate': avg_engagement_rate,
-                    'total_revenue': total_revenue,
-                    'monthly_revenue': monthly_revenue,
-                    'avg_revenue_per_student': avg_revenue_per_student,
-                }
+                total_courses=total_courses,
+                published_courses=published_courses,
+                draft_courses=draft_courses,
+                total_students=total_students,
+                active_students=active_students,
+                new_students=new_students,
+                avg_completion_rate=avg_completion_rate,
+                avg_engagement_rate=avg_engagement_rate,
+                total_revenue=total_revenue,
+                monthly_revenue=monthly_revenue,
+                avg_revenue_per_student=avg_revenue_per_student,
             )
-            
-            if not created:
-                # Update existing analytics
-                instructor_analytics.total_courses = total_courses
-                instructor_analytics.published_courses = published_courses
-                instructor_analytics.draft_courses = draft_courses
-                instructor_analytics.total_students = total_students
-                instructor_analytics.active_students = active_students
-                instructor_analytics.new_students = new_students
-                instructor_analytics.avg_completion_rate = avg_completion_rate
-                instructor_analytics.avg_engagement_rate = avg_engagement_rate
-                instructor_analytics.total_revenue = total_revenue
-                instructor_analytics.monthly_revenue = monthly_revenue
-                instructor_analytics.avg_revenue_per_student = avg_revenue_per_student
-                instructor_analytics.save()
+        writer.flush()
 
     @staticmethod
     def generate_ai_insights(tenant: Tenant, instructor_id: uuid.UUID, date: datetime.date = None):
@@ -1618,24 +1585,10 @@ class DataProcessorService:
         logger.info(f"Processing daily analytics for {tenant.name} on {date}")
         
         try:
-            # Process student engagement metrics
-            AnalyticsService.process_student_engagement_metrics(tenant, date)
-            
-            # Process course analytics
-            AnalyticsService.process_course_analytics(tenant, date)
-            
-            # Process instructor analytics
-            AnalyticsService.process_instructor_analytics(tenant, date)
-            
-            # Generate AI insights for all instructors
-            instructors = User.objects.filter(
-                role='instructor',
-                courses_authored__tenant=tenant
-            ).distinct()
-            
-            for instructor in instructors:
-                AnalyticsService.generate_ai_insights(tenant, instructor.id, date)
-                AnalyticsService.generate_predictive_analytics(tenant, instructor.id, date)
+            # Same checkpointed stages as the nightly pipeline, re-run in this process
+            from .pipeline import AnalyticsPipelineService
+
+            AnalyticsPipelineService.run_inline([(tenant.pk, date)], force=True, raise_errors=True)
             
             logger.info(f"Successfully processed daily analytics for {tenant.name}")
             
@@ -1647,7 +1600,7 @@ class DataProcessorService:
     def process_real_time_metrics(tenant: Tenant):
         """Process real-time metrics for all instructors in a tenant."""
         instructors = User.objects.filter(
-            role='instructor',
+            role=User.Role.INSTRUCTOR,
             courses_authored__tenant=tenant
         ).distinct()
         
@@ -1840,102 +1793,48 @@ class ComprehensiveAnalyticsService:
     """Service for comprehensive analytics data processing and aggregation."""
 
     @staticmethod
-    def get_instructor_dashboard_data(instructor_id: str, tenant: Optional[Tenant] = None) -> Dict[str, Any]:
+    def get_instructor_dashboard_data(
+        instructor_id: str, tenant: Optional[Tenant] = None, sections: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
         """
         Get comprehensive instructor dashboard data including all analytics.
+
+        Sections are built concurrently from one shared InstructorContext (see
+        dashboard.py); `sections` limits the response to the named ones.
+        Per-section timings are returned under "section_timings".
         """
         try:
             instructor_uuid = uuid.UUID(instructor_id)
         except ValueError:
             raise ValueError(f"Invalid instructor ID format: {instructor_id}")
 
-        # Get current date for filtering
-        today = timezone.now().date()
-        week_ago = today - timedelta(days=7)
-        month_ago = today - timedelta(days=30)
-
-        # Get basic course statistics
-        course_stats = ComprehensiveAnalyticsService._get_course_statistics(
-            instructor_uuid, tenant
-        )
-
-        # Get student analytics
-        student_analytics = ComprehensiveAnalyticsService._get_student_analytics(
-            instructor_uuid, tenant
-        )
-
-        # Get performance metrics
-        performance_metrics = ComprehensiveAnalyticsService._get_performance_metrics(
-            instructor_uuid, tenant
-        )
-
-        # Get AI insights
-        ai_insights = ComprehensiveAnalyticsService._get_ai_insights(
-            instructor_uuid, tenant
-        )
-
-        # Get predictive analytics
-        predictive_data = ComprehensiveAnalyticsService._get_predictive_analytics(
-            instructor_uuid, tenant
-        )
-
-        # Get real-time metrics
-        realtime_metrics = ComprehensiveAnalyticsService._get_realtime_metrics(
-            instructor_uuid, tenant
-        )
-
-        # Get learning efficiency data
-        learning_efficiency = ComprehensiveAnalyticsService._get_learning_efficiency(
-            instructor_uuid, tenant
-        )
-
-        # Get social learning metrics
-        social_metrics = ComprehensiveAnalyticsService._get_social_learning_metrics(
-            instructor_uuid, tenant
-        )
-
-        # Get revenue and financial data
-        revenue_data = ComprehensiveAnalyticsService._get_revenue_analytics(
-            instructor_uuid, tenant
-        )
-
-        # Get engagement trends
-        engagement_trends = ComprehensiveAnalyticsService._get_engagement_trends(
-            instructor_uuid, tenant
+        selected = INSTRUCTOR_DASHBOARD.select(sections)
+        started = time.perf_counter()
+        context = InstructorContext.resolve(
+            instructor_uuid, tenant, INSTRUCTOR_DASHBOARD.requirements(selected)
         )
+        context_seconds = time.perf_counter() - started
+        results, timings = INSTRUCTOR_DASHBOARD.compose(context, selected)
+        timings['context'] = {'status': 'ok', 'duration_ms': round(context_seconds * 1000, 2)}
 
         return {
             "instructor_id": instructor_id,
             "generated_at": timezone.now().isoformat(),
-            "course_statistics": course_stats,
-            "student_analytics": student_analytics,
-            "performance_metrics": performance_metrics,
-            "ai_insights": ai_insights,
-            "predictive_analytics": predictive_data,
-            "realtime_metrics": realtime_metrics,
-            "learning_efficiency": learning_efficiency,
-            "social_learning": social_metrics,
-            "revenue_analytics": revenue_data,
-            "engagement_trends": engagement_trends,
+            **results,
+            "section_timings": timings,
         }
 
     @staticmethod
-    def _get_course_statistics(instructor_id: uuid.UUID, tenant: Optional[Tenant]) -> Dict[str, Any]:
+    def _get_course_statistics(context: InstructorContext) -> Dict[str, Any]:
         """Get basic course statistics for an instructor."""
-        course_qs = Course.objects.filter(instructor_id=instructor_id)
-        if tenant:
-            course_qs = course_qs.filter(tenant=tenant)
+        course_qs = Course.objects.filter(id__in=context.course_ids)
 
-        total_courses = course_qs.count()
-        published_courses = course_qs.filter(is_published=True).count()
+        total_courses = len(context.course_ids)
+        published_courses = course_qs.filter(status=Course.Status.PUBLISHED).count()
         draft_courses = total_courses - published_courses
 
         # Get enrollment statistics
-        enrollment_stats = Enrollment.objects.filter(
-            course__instructor_id=instructor_id
-        )
-        if tenant:
-            enrollment_stats = enrollment_stats.filter(course__tenant=tenant)
+        enrollment_stats = Enrollment.objects.filter(course_id__in=context.course_ids)
 
         total_enrollments = enrollment_stats.count()
         active_enrollments = enrollment_stats.filter(
@@ -1959,20 +1858,17 @@ class ComprehensiveAnalyticsService:
         }
 
     @staticmethod
-    def _get_student_analytics(instructor_id: uuid.UUID, tenant: Optional[Tenant]) -> Dict[str, Any]:
+    def _get_student_analytics(context: InstructorContext) -> Dict[str, Any]:
         """Get student analytics for an instructor."""
+        tenant = context.tenant
         today = timezone.now().date()
         week_ago = today - timedelta(days=7)
         month_ago = today - timedelta(days=30)
 
         # Get unique students across all instructor's courses
-        student_qs = User.objects.filter(
-            enrollments__course__instructor_id=instructor_id
-        ).distinct()
-        if tenant:
-            student_qs = student_qs.filter(enrollments__course__tenant=tenant)
+        student_qs = User.objects.filter(id__in=context.student_ids)
 
-        total_students = student_qs.count()
+        total_students = len(context.student_ids)
 
         # Get recent activity
         recent_activity = Event.objects.filter(
@@ -1986,11 +1882,9 @@ class ComprehensiveAnalyticsService:
 
         # Get new students (enrolled in the last 30 days)
         new_students = Enrollment.objects.filter(
-            course__instructor_id=instructor_id,
+            course_id__in=context.course_ids,
             enrolled_at__gte=timezone.now() - timedelta(days=30)
         )
-        if tenant:
-            new_students = new_students.filter(course__tenant=tenant)
         
         new_students_count = new_students.values('user_id').distinct().count()
 
@@ -2011,15 +1905,14 @@ class ComprehensiveAnalyticsService:
         }
 
     @staticmethod
-    def _get_performance_metrics(instructor_id: uuid.UUID, tenant: Optional[Tenant]) -> Dict[str, Any]:
+    def _get_performance_metrics(context: InstructorContext) -> Dict[str, Any]:
         """Get performance metrics for an instructor's courses."""
+        instructor_id, tenant = context.instructor_id, context.tenant
         # Get assessments for instructor's courses
         assessments = AssessmentAttempt.objects.filter(
-            assessment__course__instructor_id=instructor_id,
+            assessment__course_id__in=context.course_ids,
             status=AssessmentAttempt.AttemptStatus.GRADED
         )
-        if tenant:
-            assessments = assessments.filter(assessment__course__tenant=tenant)
 
         avg_score = assessments.aggregate(avg_score=Avg('score'))['avg_score'] or 0
         pass_rate = assessments.filter(is_passed=True).count()
@@ -2051,8 +1944,9 @@ class ComprehensiveAnalyticsService:
         }
 
     @staticmethod
-    def _get_ai_insights(instructor_id: uuid.UUID, tenant: Optional[Tenant]) -> Dict[str, Any]:
+    def _get_ai_insights(context: InstructorContext) -> Dict[str, Any]:
         """Get AI-generated insights for an instructor."""
+        instructor_id, tenant = context.instructor_id, context.tenant
         # Query the AIInsights model for stored insights
         today = timezone.now().date()
         
@@ -2083,8 +1977,9 @@ class ComprehensiveAnalyticsService:
         }
 
     @staticmethod
-    def _get_predictive_analytics(instructor_id: uuid.UUID, tenant: Optional[Tenant]) -> Dict[str, Any]:
+    def _get_predictive_analytics(context: InstructorContext) -> Dict[str, Any]:
         """Get predictive analytics for an instructor."""
+        instructor_id, tenant = context.instructor_id, context.tenant
         today = timezone.now().date()
         
         # Query the PredictiveAnalytics model for stored predictions
@@ -2099,20 +1994,17 @@ class ComprehensiveAnalyticsService:
         predictive_data = predictive_query.first()
         
         # Get students at risk from StudentEngagementMetric
-        instructor_courses = Course.objects.filter(instructor_id=instructor_id)
-        if tenant:
-            instructor_courses = instructor_courses.filter(tenant=tenant)
-        
-        course_ids = list(instructor_courses.values_list('id', flat=True))
+        course_ids = context.course_ids
         
         # Find students with high risk scores
         at_risk_students = StudentEngagementMetric.objects.filter(
             course_id__in=course_ids,
             risk_score__gte=60  # Risk threshold
-        ).order_by('-risk_score')[:10]
+        ).select_related('user').order_by('-risk_score')
         
         if tenant:
             at_risk_students = at_risk_students.filter(tenant=tenant)
+        at_risk_students = at_risk_students[:10]
         
         students_at_risk = []
         for student_metric in at_risk_students:
@@ -2158,20 +2050,18 @@ class ComprehensiveAnalyticsService:
         }
 
     @staticmethod
-    def _get_realtime_metrics(instructor_id: uuid.UUID, tenant: Optional[Tenant]) -> Dict[str, Any]:
+    def _get_realtime_metrics(context: InstructorContext) -> Dict[str, Any]:
         """Get real-time metrics for an instructor."""
+        instructor_id, tenant = context.instructor_id, context.tenant
         # Get current active users from recent events
         now = timezone.now()
         last_hour = now - timedelta(hours=1)
         
-        instructor_courses = Course.objects.filter(instructor_id=instructor_id)
-        if tenant:
-            instructor_courses = instructor_courses.filter(tenant=tenant)
-        course_ids = list(instructor_courses.values_list('id', flat=True))
+        course_ids = context.course_ids
         
         recent_events = Event.objects.filter(
             created_at__gte=last_hour,
-            context_data__course_id__in=course_ids
+            context_data__course_id__in=context.course_keys
         )
         if tenant:
             recent_events = recent_events.filter(tenant=tenant)
@@ -2187,10 +2077,7 @@ class ComprehensiveAnalyticsService:
         current_quiz_attempts = recent_events.filter(event_type='QUIZ_ATTEMPT').count()
         
         # Calculate live engagement rate based on active users vs total enrolled
-        total_enrolled = Enrollment.objects.filter(
-            course__in=instructor_courses,
-            status=Enrollment.Status.ACTIVE
-        ).values('user_id').distinct().count()
+        total_enrolled = len(context.active_student_ids)
         
         live_engagement_rate = 0
         if total_enrolled > 0:
@@ -2221,8 +2108,9 @@ class ComprehensiveAnalyticsService:
         }
 
     @staticmethod
-    def _get_learning_efficiency(instructor_id: uuid.UUID, tenant: Optional[Tenant]) -> Dict[str, Any]:
+    def _get_learning_efficiency(context: InstructorContext) -> Dict[str, Any]:
         """Get learning efficiency metrics for an instructor."""
+        instructor_id, tenant = context.instructor_id, context.tenant
         today = timezone.now().date()
         
         # Query the LearningEfficiency model for stored efficiency data
@@ -2252,35 +2140,34 @@ class ComprehensiveAnalyticsService:
             }
         
         # If no stored data, calculate from events
-        instructor_courses = Course.objects.filter(instructor_id=instructor_id)
-        if tenant:
-            instructor_courses = instructor_courses.filter(tenant=tenant)
-        course_ids = list(instructor_courses.values_list('id', flat=True))
+        course_ids = context.course_ids
         
         # Get study sessions to calculate optimal times
-        last_30_days = today - timedelta(days=30)
+        recent = TimeWindow.since_days_ago(30, tenant_timezone(tenant))
         study_sessions = StudySession.objects.filter(
             course_id__in=course_ids,
-            started_at__date__gte=last_30_days
+            **recent.lookups('started_at')
         )
         if tenant:
             study_sessions = study_sessions.filter(tenant=tenant)
         
         # Calculate hourly efficiency based on session engagement scores
-        hourly_engagement = study_sessions.values('started_at__hour').annotate(
+        hourly_engagement = study_sessions.annotate(
+            hour=ExtractHour('started_at', tzinfo=recent.tz)
+        ).values('hour').annotate(
             avg_engagement=Avg('engagement_score')
         ).order_by('-avg_engagement')[:5]
         
         optimal_study_times = [
-            {"hour": item['started_at__hour'], "efficiency": float(item['avg_engagement'] or 0)}
+            {"hour": item['hour'], "efficiency": float(item['avg_engagement'] or 0)}
             for item in hourly_engagement
         ]
         
         # Calculate content effectiveness from events
         content_events = Event.objects.filter(
-            context_data__course_id__in=course_ids,
-            created_at__date__gte=last_30_days,
-            event_type__in=['VIDEO_COMPLETE', 'ASSESSMENT_PASS', 'CONTENT_COMPLETE']
+            context_data__course_id__in=context.course_keys,
+            event_type__in=['VIDEO_COMPLETE', 'ASSESSMENT_PASS', 'CONTENT_COMPLETE'],
+            **recent.lookups('created_at')
         )
         if tenant:
             content_events = content_events.filter(tenant=tenant)
@@ -2299,12 +2186,14 @@ class ComprehensiveAnalyticsService:
             ]
         
         # Calculate peak learning days
-        daily_sessions = study_sessions.values('started_at__week_day').annotate(
+        daily_sessions = study_sessions.annotate(
+            week_day=ExtractWeekDay('started_at', tzinfo=recent.tz)
+        ).values('week_day').annotate(
             session_count=Count('id')
         ).order_by('-session_count')[:3]
         
         day_names = ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
-        peak_days = [day_names[item['started_at__week_day'] - 1] for item in daily_sessions]
+        peak_days = [day_names[item['week_day'] - 1] for item in daily_sessions]
         
         # Calculate average session length
         avg_session_duration = study_sessions.filter(
@@ -2330,15 +2219,13 @@ class ComprehensiveAnalyticsService:
         }
 
     @staticmethod
-    def _get_social_learning_metrics(instructor_id: uuid.UUID, tenant: Optional[Tenant]) -> Dict[str, Any]:
+    def _get_social_learning_metrics(context: InstructorContext) -> Dict[str, Any]:
         """Get social learning metrics for an instructor."""
-        today = timezone.now().date()
-        last_30_days = today - timedelta(days=30)
+        instructor_id, tenant = context.instructor_id, context.tenant
+        recent = TimeWindow.since_days_ago(30, tenant_timezone(tenant))
+        last_30_days = recent.start_date
         
-        instructor_courses = Course.objects.filter(instructor_id=instructor_id)
-        if tenant:
-            instructor_courses = instructor_courses.filter(tenant=tenant)
-        course_ids = list(instructor_courses.values_list('id', flat=True))
+        course_ids = context.course_ids
         
         # First check for aggregated SocialLearningMetrics data
         social_metrics = SocialLearningMetrics.objects.filter(
@@ -2377,38 +2264,24 @@ class ComprehensiveAnalyticsService:
             }
         else:
             # Query raw data from individual models
-            # Discussion activity
-            discussion_interactions = DiscussionInteraction.objects.filter(
-                course_id__in=course_ids,
-                created_at__date__gte=last_30_days
-            )
-            if tenant:
-                discussion_interactions = discussion_interactions.filter(tenant=tenant)
-            
-            total_messages = discussion_interactions.filter(
-                interaction_type__in=['post', 'reply']
-            ).count()
-            
-            active_participants = discussion_interactions.values('user_id').distinct().count()
-            threads_created = discussion_interactions.filter(
-                interaction_type='post'
-            ).values('discussion_id').distinct().count()
+            # Discussion activity, aggregated from the discussion activity log
+            summary = DiscussionActivityService.summarize(course_ids, last_30_days, tenant=tenant)
             
             # Calculate average response time (time between posts in same thread)
             # This is simplified - would need more complex query for accurate calculation
             avg_response_time = 0
             
             discussion_activity = {
-                "total_messages": total_messages,
-                "active_participants": active_participants,
-                "threads_created": threads_created,
+                "total_messages": summary['messages'],
+                "active_participants": summary['participants'],
+                "threads_created": summary['threads'],
                 "avg_response_time": avg_response_time
             }
             
             # Peer review activity
             peer_reviews = PeerReview.objects.filter(
                 course_id__in=course_ids,
-                created_at__date__gte=last_30_days
+                **recent.lookups('created_at')
             )
             if tenant:
                 peer_reviews = peer_reviews.filter(tenant=tenant)
@@ -2418,10 +2291,7 @@ class ComprehensiveAnalyticsService:
             avg_rating = peer_reviews.aggregate(avg=Avg('rating'))['avg'] or 0
             
             # Calculate participation rate
-            total_enrolled = Enrollment.objects.filter(
-                course__in=instructor_courses,
-                status=Enrollment.Status.ACTIVE
-            ).values('user_id').distinct().count()
+            total_enrolled = len(context.active_student_ids)
             
             reviewers_count = peer_reviews.values('reviewer_id').distinct().count()
             participation_rate = 0
@@ -2477,16 +2347,14 @@ class ComprehensiveAnalyticsService:
         }
 
     @staticmethod
-    def _get_revenue_analytics(instructor_id: uuid.UUID, tenant: Optional[Tenant]) -> Dict[str, Any]:
+    def _get_revenue_analytics(context: InstructorContext) -> Dict[str, Any]:
         """Get revenue analytics for an instructor."""
+        instructor_id, tenant = context.instructor_id, context.tenant
         today = timezone.now().date()
         last_30_days = today - timedelta(days=30)
         first_of_month = today.replace(day=1)
         
-        instructor_courses = Course.objects.filter(instructor_id=instructor_id)
-        if tenant:
-            instructor_courses = instructor_courses.filter(tenant=tenant)
-        course_ids = list(instructor_courses.values_list('id', flat=True))
+        course_ids = context.course_ids
         
         # Query RevenueAnalytics model for revenue data
         revenue_records = RevenueAnalytics.objects.filter(
@@ -2537,23 +2405,25 @@ class ComprehensiveAnalyticsService:
         if tenant:
             course_revenue = course_revenue.filter(tenant=tenant)
         
-        top_courses = course_revenue.values('course_id').annotate(
+        top_courses = list(course_revenue.values('course_id').annotate(
             revenue=Sum('total_revenue')
-        ).order_by('-revenue')[:5]
+        ).order_by('-revenue')[:5])
+        titles = dict(Course.objects.filter(
+            id__in=[item['course_id'] for item in top_courses]
+        ).values_list('id', 'title'))
         
         top_earning_courses = []
         for item in top_courses:
-            course = Course.objects.filter(id=item['course_id']).first()
-            if course:
+            if item['course_id'] in titles:
                 top_earning_courses.append({
                     "course_id": str(item['course_id']),
-                    "title": course.title,
+                    "title": titles[item['course_id']],
                     "revenue": float(item['revenue'] or 0)
                 })
         
         # If no course-level revenue data, still show courses with zero revenue
         if not top_earning_courses:
-            for course in instructor_courses[:5]:
+            for course in Course.objects.filter(id__in=course_ids)[:5]:
                 top_earning_courses.append({
                     "course_id": str(course.id),
                     "title": course.title,
@@ -2576,36 +2446,30 @@ class ComprehensiveAnalyticsService:
         }
 
     @staticmethod
-    def _get_engagement_trends(instructor_id: uuid.UUID, tenant: Optional[Tenant]) -> Dict[str, Any]:
+    def _get_engagement_trends(context: InstructorContext) -> Dict[str, Any]:
         """Get engagement trends for an instructor."""
-        # Get engagement data over the last 30 days
-        today = timezone.now().date()
-        thirty_days_ago = today - timedelta(days=30)
+        tenant = context.tenant
+        # Get engagement data over the last 30 (tenant-local) days
+        recent = TimeWindow.since_days_ago(30, tenant_timezone(tenant))
         
-        instructor_courses = Course.objects.filter(instructor_id=instructor_id)
-        if tenant:
-            instructor_courses = instructor_courses.filter(tenant=tenant)
-        course_ids = list(instructor_courses.values_list('id', flat=True))
+        course_ids = context.course_ids
         
         # Get events for the last 30 days
         events = Event.objects.filter(
-            created_at__date__gte=thirty_days_ago,
-            context_data__course_id__in=course_ids
+            context_data__course_id__in=context.course_keys,
+            **recent.lookups('created_at')
         )
         if tenant:
             events = events.filter(tenant=tenant)
         
         # Calculate daily engagement
-        daily_events = events.values('created_at__date').annotate(
+        daily_events = events.annotate(day=recent.trunc_date('created_at')).values('day').annotate(
             event_count=Count('id'),
             unique_users=Count('user_id', distinct=True)
-        ).order_by('created_at__date')
+        ).order_by('day')
         
         # Get total enrolled for engagement rate calculation
-        total_enrolled = Enrollment.objects.filter(
-            course__in=instructor_courses,
-            status=Enrollment.Status.ACTIVE
-        ).values('user_id').distinct().count()
+        total_enrolled = len(context.active_student_ids)
         
         daily_engagement = []
         for item in daily_events:
@@ -2613,20 +2477,22 @@ class ComprehensiveAnalyticsService:
             if total_enrolled > 0:
                 engagement_rate = round((item['unique_users'] / total_enrolled) * 100, 2)
             daily_engagement.append({
-                "date": item['created_at__date'].isoformat(),
+                "date": item['day'].isoformat(),
                 "engagement_rate": engagement_rate
             })
         
         # Calculate weekly patterns (by day of week)
-        weekly_events = events.values('created_at__week_day').annotate(
+        weekly_events = events.annotate(
+            week_day=ExtractWeekDay('created_at', tzinfo=recent.tz)
+        ).values('week_day').annotate(
             unique_users=Count('user_id', distinct=True)
-        ).order_by('created_at__week_day')
+        ).order_by('week_day')
         
         day_names = ['sunday', 'monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday']
         weekly_patterns = {day: 0 for day in day_names}
         
         for item in weekly_events:
-            day_index = item['created_at__week_day'] - 1  # Django weekday is 1-7
+            day_index = item['week_day'] - 1  # Django weekday is 1-7
             if 0 <= day_index < 7:
                 engagement_rate = 0
                 if total_enrolled > 0:
@@ -2634,12 +2500,12 @@ class ComprehensiveAnalyticsService:
                 weekly_patterns[day_names[day_index]] = engagement_rate
         
         # Calculate hourly patterns
-        hourly_events = events.values('created_at__hour').annotate(
+        hourly_events = events.annotate(hour=ExtractHour('created_at', tzinfo=recent.tz)).values('hour').annotate(
             activity=Count('id')
-        ).order_by('created_at__hour')
+        ).order_by('hour')
         
         hourly_patterns = [
-            {"hour": item['created_at__hour'], "activity": item['activity']}
+            {"hour": item['hour'], "activity": item['activity']}
             for item in hourly_events
         ]
         
@@ -2706,7 +2572,7 @@ class ComprehensiveAnalyticsService:
         Update/refresh analytics data for an instructor.
         This would typically be called by a background task.
         """
-        today = timezone.now().date()
+        today = local_today(tenant_timezone(tenant))
         
         # Update course analytics
         ComprehensiveAnalyticsService._update_course_analytics(instructor_id, tenant, today)
@@ -2726,61 +2592,40 @@ class ComprehensiveAnalyticsService:
         if tenant:
             courses = courses.filter(tenant=tenant)
         
+        writer = BulkUpsertWriter(CourseAnalytics)
         for course in courses:
-            # Get or create course analytics record
-            analytics, created = CourseAnalytics.objects.get_or_create(
-                tenant=tenant,
-                course_id=course.id,
-                instructor_id=instructor_id,
-                date=date,
-                defaults={
-                    'total_enrollments': 0,
-                    'active_enrollments': 0,
-                    'completed_enrollments': 0,
-                }
-            )
-            
             # Update enrollment statistics
             enrollments = Enrollment.objects.filter(course=course)
-            analytics.total_enrollments = enrollments.count()
-            analytics.active_enrollments = enrollments.filter(
-                status=Enrollment.Status.ACTIVE
-            ).count()
-            analytics.completed_enrollments = enrollments.filter(
+            total_enrollments = enrollments.count()
+            completed_enrollments = enrollments.filter(
                 status=Enrollment.Status.COMPLETED
             ).count()
             
-            # Calculate completion rate
-            if analytics.total_enrollments > 0:
-                analytics.avg_completion_rate = (
-                    analytics.completed_enrollments / analytics.total_enrollments * 100
-                )
-            
-            analytics.save()
+            writer.add(
+                tenant_id=course.tenant_id,
+                course_id=course.id,
+                date=date,
+                instructor_id=instructor_id,
+                total_enrollments=total_enrollments,
+                active_enrollments=enrollments.filter(status=Enrollment.Status.ACTIVE).count(),
+                completed_enrollments=completed_enrollments,
+                # Calculate completion rate
+                avg_completion_rate=(
+                    completed_enrollments / total_enrollments * 100 if total_enrollments > 0 else 0
+                ),
+            )
+        writer.flush()
 
     @staticmethod
     def _update_instructor_analytics(instructor_id: uuid.UUID, tenant: Optional[Tenant], date):
         """Update instructor analytics for a specific date."""
-        # Get or create instructor analytics record
-        analytics, created = InstructorAnalytics.objects.get_or_create(
-            tenant=tenant,
-            instructor_id=instructor_id,
-            date=date,
-            defaults={
-                'total_courses': 0,
-                'published_courses': 0,
-                'total_students': 0,
-            }
-        )
-        
         # Update course statistics
         courses = Course.objects.filter(instructor_id=instructor_id)
         if tenant:
             courses = courses.filter(tenant=tenant)
             
-        analytics.total_courses = courses.count()
-        analytics.published_courses = courses.filter(is_published=True).count()
-        analytics.draft_courses = analytics.total_courses - analytics.published_courses
+        total_courses = courses.count()
+        published_courses = courses.filter(status=Course.Status.PUBLISHED).count()
         
         # Update student statistics
         students = User.objects.filter(
@@ -2788,8 +2633,6 @@ class ComprehensiveAnalyticsService:
         ).distinct()
         if tenant:
             students = students.filter(enrollments__course__tenant=tenant)
-            
-        analytics.total_students = students.count()
         
         # Calculate active students (activity in last 7 days)
         week_ago = timezone.now() - timedelta(days=7)
@@ -2798,9 +2641,17 @@ class ComprehensiveAnalyticsService:
             created_at__gte=week_ago
         ).values('user_id').distinct().count()
         
-        analytics.active_students = active_students
-        
-        analytics.save()
+        with BulkUpsertWriter(InstructorAnalytics) as writer:
+            writer.add(
+                tenant=tenant,
+                instructor_id=instructor_id,
+                date=date,
+                total_courses=total_courses,
+                published_courses=published_courses,
+                draft_courses=total_courses - published_courses,
+                total_students=students.count(),
+                active_students=active_students,
+            )
 
     @staticmethod
     def _update_student_engagement_metrics(instructor_id: uuid.UUID, tenant: Optional[Tenant], date):
@@ -2813,6 +2664,8 @@ class ComprehensiveAnalyticsService:
         if tenant:
             students = students.filter(enrollments__course__tenant=tenant)
         
+        day = TimeWindow.for_day(date, tenant_timezone(tenant))
+        writer = BulkUpsertWriter(StudentEngagementMetric)
         for student in students:
             # Get student's courses with this instructor
             courses = Course.objects.filter(
@@ -2821,46 +2674,27 @@ class ComprehensiveAnalyticsService:
             )
             
             for course in courses:
-                # Get or create engagement metric record
-                engagement, created = StudentEngagementMetric.objects.get_or_create(
-                    tenant=tenant,
-                    user=student,
-                    course_id=course.id,
-                    date=date,
-                    defaults={
-                        'daily_active_time': 0,
-                        'content_views': 0,
-                        'video_watches': 0,
-                    }
-                )
-                
                 # Update engagement metrics from events
-                day_start = timezone.make_aware(datetime.combine(date, datetime.min.time()))
-                day_end = day_start + timedelta(days=1)
-                
                 daily_events = Event.objects.filter(
                     user=student,
-                    created_at__gte=day_start,
-                    created_at__lt=day_end,
-                    context_data__course_id=str(course.id)
+                    context_data__course_id=str(course.id),
+                    **day.lookups('created_at')
                 )
                 
-                engagement.content_views = daily_events.filter(
-                    event_type='CONTENT_VIEW'
-                ).count()
-                engagement.video_watches = daily_events.filter(
-                    event_type='VIDEO_WATCH'
-                ).count()
-                engagement.quiz_attempts = daily_events.filter(
-                    event_type='QUIZ_ATTEMPT'
-                ).count()
-                
-                # Calculate risk score (simple heuristic)
-                engagement.risk_score = ComprehensiveAnalyticsService._calculate_risk_score(
-                    student, course, date
+                writer.add(
+                    tenant_id=course.tenant_id,
+                    user=student,
+                    course_id=course.id,
+                    date=date,
+                    content_views=daily_events.filter(event_type='CONTENT_VIEW').count(),
+                    video_watches=daily_events.filter(event_type='VIDEO_WATCH').count(),
+                    quiz_attempts=daily_events.filter(event_type='QUIZ_ATTEMPT').count(),
+                    # Calculate risk score (simple heuristic)
+                    risk_score=ComprehensiveAnalyticsService._calculate_risk_score(
+                        student, course, date
+                    ),
                 )
-                
-                engagement.save()
+        writer.flush()
 
     @staticmethod
     def _calculate_risk_score(student: User, course: Course, date) -> float:
@@ -2896,6 +2730,31 @@ class ComprehensiveAnalyticsService:
         
         return min(risk_score, 100)  # Cap at 100
 
+# Instructor dashboard sections. Stored daily rollups are cached longer than
+# sections computed from live events; real-time metrics are never cached.
+INSTRUCTOR_DASHBOARD = DashboardComposer("instructor_analytics", [
+    DashboardSection("course_statistics", ComprehensiveAnalyticsService._get_course_statistics,
+                     requires=("course_ids",), cache_timeout=300),
+    DashboardSection("student_analytics", ComprehensiveAnalyticsService._get_student_analytics,
+                     requires=("course_ids", "student_ids"), cache_timeout=120),
+    DashboardSection("performance_metrics", ComprehensiveAnalyticsService._get_performance_metrics,
+                     requires=("course_ids",), cache_timeout=300),
+    DashboardSection("ai_insights", ComprehensiveAnalyticsService._get_ai_insights, cache_timeout=900),
+    DashboardSection("predictive_analytics", ComprehensiveAnalyticsService._get_predictive_analytics,
+                     requires=("course_ids",), cache_timeout=900),
+    DashboardSection("realtime_metrics", ComprehensiveAnalyticsService._get_realtime_metrics,
+                     requires=("course_ids", "active_student_ids")),
+    DashboardSection("learning_efficiency", ComprehensiveAnalyticsService._get_learning_efficiency,
+                     requires=("course_ids",), cache_timeout=900),
+    DashboardSection("social_learning", ComprehensiveAnalyticsService._get_social_learning_metrics,
+                     requires=("course_ids", "active_student_ids"), cache_timeout=300),
+    DashboardSection("revenue_analytics", ComprehensiveAnalyticsService._get_revenue_analytics,
+                     requires=("course_ids",), cache_timeout=900),
+    DashboardSection("engagement_trends", ComprehensiveAnalyticsService._get_engagement_trends,
+                     requires=("course_ids", "active_student_ids"), cache_timeout=300),
+])
+
+
 class LearnerInsightsService:
     """
     Service for generating personalized analytics and insights for individual learners.
@@ -2956,12 +2815,11 @@ class LearnerInsightsService:
         total_progress = enrollments.aggregate(avg_progress=Avg('progress'))['avg_progress'] or 0
         
         # Calculate total learning hours from study sessions
-        today = timezone.now().date()
-        last_30_days = today - timedelta(days=30)
+        recent = TimeWindow.since_days_ago(30, tenant_timezone(tenant or user.tenant_id))
         
         study_sessions = StudySession.objects.filter(
             user=user,
-            started_at__date__gte=last_30_days
+            **recent.lookups('started_at')
         )
         if tenant:
             study_sessions = study_sessions.filter(tenant=tenant)
@@ -2993,21 +2851,17 @@ class LearnerInsightsService:
 
     @staticmethod
     def _calculate_learning_streak(user: User, tenant: Optional[Tenant]) -> int:
-        """Calculate consecutive days with learning activity."""
-        today = timezone.now().date()
+        """Calculate consecutive (tenant-local) days with learning activity."""
+        tz = tenant_timezone(tenant or user.tenant_id)
         streak = 0
-        current_date = today
+        current_date = local_today(tz)
         
         # Check up to 365 days back
         for _ in range(365):
             # Check if there was any activity on this date
-            day_start = timezone.make_aware(datetime.combine(current_date, datetime.min.time()))
-            day_end = day_start + timedelta(days=1)
-            
             activity_exists = Event.objects.filter(
                 user=user,
-                created_at__gte=day_start,
-                created_at__lt=day_end
+                **TimeWindow.for_day(current_date, tz).lookups('created_at')
             )
             if tenant:
                 activity_exists = activity_exists.filter(tenant=tenant)
@@ -3023,21 +2877,18 @@ class LearnerInsightsService:
     @staticmethod
     def _get_learning_activity(user: User, tenant: Optional[Tenant]) -> Dict[str, Any]:
         """Get recent learning activity and engagement metrics."""
-        today = timezone.now().date()
-        last_7_days = today - timedelta(days=7)
-        last_30_days = today - timedelta(days=30)
+        tz = tenant_timezone(tenant or user.tenant_id)
+        today = local_today(tz)
         
         # Get daily activity for the last 7 days
         daily_activity = []
         for i in range(7):
             date = today - timedelta(days=i)
-            day_start = timezone.make_aware(datetime.combine(date, datetime.min.time()))
-            day_end = day_start + timedelta(days=1)
+            day = TimeWindow.for_day(date, tz)
             
             events = Event.objects.filter(
                 user=user,
-                created_at__gte=day_start,
-                created_at__lt=day_end
+                **day.lookups('created_at')
             )
             if tenant:
                 events = events.filter(tenant=tenant)
@@ -3045,7 +2896,7 @@ class LearnerInsightsService:
             # Calculate time spent from study sessions
             sessions = StudySession.objects.filter(
                 user=user,
-                started_at__date=date
+                **day.lookups('started_at')
             )
             if tenant:
                 sessions = sessions.filter(tenant=tenant)
@@ -3066,7 +2917,7 @@ class LearnerInsightsService:
         # Get activity breakdown by type for last 30 days
         events_30d = Event.objects.filter(
             user=user,
-            created_at__date__gte=last_30_days
+            **TimeWindow.since_days_ago(30, tz).lookups('created_at')
         )
         if tenant:
             events_30d = events_30d.filter(tenant=tenant)
@@ -3218,30 +3069,33 @@ class LearnerInsightsService:
     @staticmethod
     def _get_learning_patterns(user: User, tenant: Optional[Tenant]) -> Dict[str, Any]:
         """Analyze learning patterns and study habits."""
-        today = timezone.now().date()
-        last_30_days = today - timedelta(days=30)
+        recent = TimeWindow.since_days_ago(30, tenant_timezone(tenant or user.tenant_id))
         
         # Get study sessions from the last 30 days
         sessions = StudySession.objects.filter(
             user=user,
-            started_at__date__gte=last_30_days
+            **recent.lookups('started_at')
         )
         if tenant:
             sessions = sessions.filter(tenant=tenant)
         
         # Calculate optimal study times based on engagement scores
-        hourly_engagement = sessions.values('started_at__hour').annotate(
+        hourly_engagement = sessions.annotate(
+            hour=ExtractHour('started_at', tzinfo=recent.tz)
+        ).values('hour').annotate(
             avg_engagement=Avg('engagement_score'),
             session_count=Count('id')
         ).order_by('-avg_engagement')
         
         optimal_hours = [
-            {"hour": item['started_at__hour'], "engagement_score": float(item['avg_engagement'] or 0)}
+            {"hour": item['hour'], "engagement_score": float(item['avg_engagement'] or 0)}
             for item in hourly_engagement[:3]  # Top 3 hours
         ]
         
         # Calculate preferred study days
-        daily_sessions = sessions.values('started_at__week_day').annotate(
+        daily_sessions = sessions.annotate(
+            week_day=ExtractWeekDay('started_at', tzinfo=recent.tz)
+        ).values('week_day').annotate(
             session_count=Count('id'),
             total_minutes=Sum(
                 Case(
@@ -3255,7 +3109,7 @@ class LearnerInsightsService:
         day_names = ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
         preferred_days = []
         for item in daily_sessions[:3]:  # Top 3 days
-            day_index = item['started_at__week_day'] - 1
+            day_index = item['week_day'] - 1
             if 0 <= day_index < 7:
                 preferred_days.append(day_names[day_index])
         
@@ -3271,7 +3125,7 @@ class LearnerInsightsService:
         # Get device usage from events
         events = Event.objects.filter(
             user=user,
-            created_at__date__gte=last_30_days
+            **recent.lookups('created_at')
         )
         if tenant:
             events = events.filter(tenant=tenant)
@@ -3387,6 +3241,370 @@ class LearnerInsightsService:
         }
 
 
+class ItemAnalysisService:
+    """
+    Batch item analysis for assessments.
+
+    Folds graded attempts into AssessmentAnalytics and QuestionAnalytics
+    incrementally: each run streams only attempts graded after the stored
+    watermark, reduces them chunk by chunk with NumPy into running sums, and
+    derives p-values, corrected point-biserial discrimination, distractor
+    counts, score histograms and time-to-complete percentiles from those sums.
+    Item scores come from the per-question result vectors stored at grading
+    time, so nothing is re-graded.
+    """
+
+    CHUNK_SIZE = 2000
+    # Attempts graded this recently may still be committing; pick them up next run
+    SETTLE_SECONDS = 60
+    SCORE_BUCKETS = 10
+    # Time-to-complete histogram edges in seconds; longer attempts land in the last bin
+    TIME_BIN_EDGES = (
+        0, 30, 60, 120, 300, 600, 900, 1200, 1800, 2700, 3600, 5400, 7200, 10800, 86400,
+    )
+    TIME_PERCENTILES = (25, 50, 75, 90)
+    DISTRACTOR_TYPES = ('MC', 'TF')
+    QUESTION_SUMS = ('n', 'correct', 'sx', 'sxx', 'sxt', 'st', 'stt')
+
+    @classmethod
+    def run_all(cls, tenant: Optional[Tenant] = None) -> int:
+        """Runs item analysis for every assessment with graded attempts."""
+        from apps.assessments.models import Assessment
+
+        assessments = Assessment.objects.filter(
+            attempts__status=AssessmentAttempt.AttemptStatus.GRADED
+        ).select_related('course__tenant').distinct()
+        if tenant is not None:
+            assessments = assessments.filter(course__tenant=tenant)
+
+        folded = 0
+        for assessment in assessments:
+            try:
+                folded += cls.run_for_assessment(assessment)
+            except Exception as e:
+                logger.error(
+                    f"Item analysis failed for assessment {assessment.id}: {e}", exc_info=True
+                )
+        return folded
+
+    @classmethod
+    def run_for_assessment(cls, assessment, chunk_size: Optional[int] = None) -> int:
+        """
+        Folds newly graded attempts of one assessment into its item analysis.
+
+        Returns the number of attempts folded in.
+        """
+        from django.db import transaction
+        from apps.assessments.models import Question
+        from .models import AssessmentAnalytics, QuestionAnalytics
+
+        chunk_size = chunk_size or cls.CHUNK_SIZE
+        with transaction.atomic():
+            analytics, _ = AssessmentAnalytics.objects.select_for_update().get_or_create(
+                assessment=assessment,
+                tenant=assessment.course.tenant,
+                defaults={'course': assessment.course},
+            )
+            questions = list(
+                Question.objects.filter(assessment=assessment)
+                .order_by('order', 'pk')
+                .values('id', 'question_type', 'points')
+            )
+            items = cls._get_question_analytics(analytics, questions)
+
+            if analytics.processed_through is None:
+                # First run or invalidated: rebuild from scratch
+                analytics.item_state = {}
+                for item in items:
+                    item.item_state = {}
+                    item.distractor_frequencies = {}
+
+            state = cls._AssessmentState(analytics.item_state, len(cls.TIME_BIN_EDGES) - 1, cls.SCORE_BUCKETS)
+            sums = np.array(
+                [[item.item_state.get(key, 0.0) for key in cls.QUESTION_SUMS] for item in items],
+                dtype=float,
+            ).reshape(len(items), len(cls.QUESTION_SUMS))
+
+            attempts = cls._new_attempts(assessment, analytics)
+            folded = 0
+            chunk = []
+            last_row = None
+            for last_row in attempts.iterator(chunk_size=chunk_size):
+                chunk.append(last_row)
+                if len(chunk) >= chunk_size:
+                    sums += cls._fold_chunk(assessment, chunk, questions, items, state)
+                    folded += len(chunk)
+                    chunk = []
+            if chunk:
+                sums += cls._fold_chunk(assessment, chunk, questions, items, state)
+                folded += len(chunk)
+
+            if last_row is not None:
+                analytics.processed_through_attempt, analytics.processed_through = last_row[:2]
+
+            for item, item_sums in zip(items, sums):
+                item.item_state = dict(zip(cls.QUESTION_SUMS, item_sums.tolist()))
+            cls._finalize_items(items, questions, sums)
+            cls._finalize_assessment(analytics, assessment, state, items)
+
+            analytics.item_state = state.as_dict()
+            analytics.save()
+            QuestionAnalytics.objects.bulk_update(
+                items,
+                [
+                    'responses', 'correct_count', 'avg_score', 'p_value',
+                    'discrimination', 'distractor_frequencies', 'item_state', 'updated_at',
+                ],
+            )
+
+        logger.info(f"Item analysis folded {folded} attempts for assessment {assessment.id}")
+        return folded
+
+    @staticmethod
+    def invalidate(assessment_id) -> None:
+        """Forces the next run to rebuild an assessment's item analysis from scratch."""
+        from .models import AssessmentAnalytics
+
+        AssessmentAnalytics.objects.filter(assessment_id=assessment_id).update(
+            processed_through=None, processed_through_attempt=None
+        )
+
+    # --- Internals ---
+
+    class _AssessmentState:
+        """Attempt-level running sums, stored in AssessmentAnalytics.item_state."""
+
+        def __init__(self, data: dict, time_bins: int, score_bins: int):
+            self.n = int(data.get('n', 0))
+            self.score_pct_sum = float(data.get('score_pct_sum', 0.0))
+            self.passed = int(data.get('passed', 0))
+            self.pass_known = int(data.get('pass_known', 0))
+            self.time_count = int(data.get('time_count', 0))
+            self.time_sum = float(data.get('time_sum', 0.0))
+            self.score_histogram = np.array(data.get('score_histogram') or [0] * score_bins, dtype=np.int64)
+            self.time_histogram = np.array(data.get('time_histogram') or [0] * time_bins, dtype=np.int64)
+
+        def as_dict(self) -> dict:
+            return {
+                'n': self.n,
+                'score_pct_sum': self.score_pct_sum,
+                'passed': self.passed,
+                'pass_known': self.pass_known,
+                'time_count': self.time_count,
+                'time_sum': self.time_sum,
+                'score_histogram': self.score_histogram.tolist(),
+                'time_histogram': self.time_histogram.tolist(),
+            }
+
+    @staticmethod
+    def _get_question_analytics(analytics, questions: list) -> list:
+        """Returns QuestionAnalytics rows aligned with `questions`, creating missing ones."""
+        from .models import QuestionAnalytics
+
+        existing = {
+            item.question_id: item
+            for item in QuestionAnalytics.objects.filter(assessment_analytics=analytics)
+        }
+        missing = [
+            QuestionAnalytics(assessment_analytics=analytics, question_id=q['id'])
+            for q in questions if q['id'] not in existing
+        ]
+        for item in QuestionAnalytics.objects.bulk_create(missing):
+            existing[item.question_id] = item
+        return [existing[q['id']] for q in questions]
+
+    @classmethod
+    def _new_attempts(cls, assessment, analytics):
+        """Graded attempts after the watermark, oldest first, as value tuples."""
+        attempts = AssessmentAttempt.objects.filter(
+            assessment=assessment,
+            status=AssessmentAttempt.AttemptStatus.GRADED,
+            graded_at__isnull=False,
+            graded_at__lt=timezone.now() - timedelta(seconds=cls.SETTLE_SECONDS),
+        )
+        if analytics.processed_through is not None:
+            attempts = attempts.filter(
+                Q(graded_at__gt=analytics.processed_through)
+                | Q(
+                    graded_at=analytics.processed_through,
+                    id__gt=analytics.processed_through_attempt,
+                )
+            )
+        return attempts.order_by('graded_at', 'id').values_list(
+            'id', 'graded_at', 'start_time', 'end_time', 'score', 'max_score',
+            'is_passed', 'answers', 'question_results',
+        )
+
+    @classmethod
+    def _fold_chunk(cls, assessment, rows: list, questions: list, items: list, state) -> 'np.ndarray':
+        """
+        Reduces a chunk of attempt rows into per-question sums.
+
+        Returns an (n_questions, len(QUESTION_SUMS)) array to add to the running
+        totals; attempt-level sums and distractor counts are updated in place.
+        """
+        from apps.assessments.services import GradingService
+
+        index = {str(q['id']): j for j, q in enumerate(questions)}
+        k, m = len(rows), len(questions)
+
+        # Item score matrix; NaN where a question has no score (manual or unknown)
+        scores = np.full((k, m), np.nan)
+        correct = np.zeros((k, m), dtype=bool)
+        totals = np.zeros(k)
+        max_scores = np.zeros(k)
+        passed = []
+        durations = []
+
+        for i, (attempt_id, _, start, end, score, max_score, is_passed, answers, results) in enumerate(rows):
+            if not results:
+                # Graded before result vectors were stored
+                results = GradingService.get_question_results(
+                    AssessmentAttempt(id=attempt_id, assessment=assessment, answers=answers)
+                )
+            for result in results:
+                j = index.get(result.get('question_id'))
+                if j is None or result.get('score') is None:
+                    continue
+                scores[i, j] = result['score']
+                correct[i, j] = bool(result.get('correct'))
+            totals[i] = float(score or 0)
+            max_scores[i] = float(max_score or 0)
+            if is_passed is not None:
+                passed.append(bool(is_passed))
+            if start and end:
+                durations.append((end - start).total_seconds())
+            cls._count_distractors(answers or {}, questions, items)
+
+        # Attempt level
+        state.n += k
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pct = np.where(max_scores > 0, totals / max_scores * 100, 0.0)
+        pct = np.clip(pct, 0, 100)
+        state.score_pct_sum += float(pct.sum())
+        state.score_histogram += np.histogram(
+            pct, bins=np.linspace(0, 100, cls.SCORE_BUCKETS + 1)
+        )[0]
+        state.passed += sum(passed)
+        state.pass_known += len(passed)
+        if durations:
+            seconds = np.clip(np.array(durations), 0, cls.TIME_BIN_EDGES[-1])
+            state.time_count += len(seconds)
+            state.time_sum += float(seconds.sum())
+            state.time_histogram += np.histogram(seconds, bins=cls.TIME_BIN_EDGES)[0]
+
+        # Question level
+        mask = ~np.isnan(scores)
+        x = np.where(mask, scores, 0.0)
+        t = np.where(mask, totals[:, None], 0.0)
+        return np.column_stack([
+            mask.sum(axis=0),
+            (correct & mask).sum(axis=0),
+            x.sum(axis=0),
+            (x * x).sum(axis=0),
+            (x * t).sum(axis=0),
+            t.sum(axis=0),
+            (t * t).sum(axis=0),
+        ])
+
+    @classmethod
+    def _count_distractors(cls, answers: dict, questions: list, items: list) -> None:
+        for question, item in zip(questions, items):
+            if question['question_type'] not in cls.DISTRACTOR_TYPES:
+                continue
+            answer = answers.get(str(question['id']))
+            if answer is None:
+                continue
+            selected = answer if isinstance(answer, list) else [answer]
+            counts = item.distractor_frequencies
+            for option in selected:
+                key = str(option).lower() if isinstance(option, bool) else str(option)
+                counts[key] = counts.get(key, 0) + 1
+
+    @staticmethod
+    def _finalize_items(items: list, questions: list, sums: 'np.ndarray') -> None:
+        """Derives per-question statistics from the running sums."""
+        if not items:
+            return
+        n, correct, sx, sxx, sxt, st, stt = sums.T
+        points = np.array([float(q['points']) for q in questions])
+
+        # Corrected point-biserial: correlate the item with the rest score (total - item)
+        sy = st - sx
+        syy = stt - 2 * sxt + sxx
+        sxy = sxt - sxx
+        with np.errstate(divide='ignore', invalid='ignore'):
+            avg = sx / n
+            p_value = sx / (n * points)
+            denominator = np.sqrt((n * sxx - sx ** 2) * (n * syy - sy ** 2))
+            discrimination = (n * sxy - sx * sy) / denominator
+
+        for j, item in enumerate(items):
+            item.responses = int(n[j])
+            item.correct_count = int(correct[j])
+            item.avg_score = Decimal(str(round(avg[j], 2))) if n[j] else Decimal(0)
+            item.p_value = (
+                Decimal(str(round(p_value[j], 4))) if np.isfinite(p_value[j]) else None
+            )
+            item.discrimination = (
+                Decimal(str(round(float(np.clip(discrimination[j], -1, 1)), 4)))
+                if np.isfinite(discrimination[j]) else None
+            )
+
+    @classmethod
+    def _finalize_assessment(cls, analytics, assessment, state, items: list) -> None:
+        """Derives assessment-level statistics from the running sums."""
+        analytics.total_attempts = state.n
+        started = AssessmentAttempt.objects.filter(assessment=assessment).count()
+        analytics.completion_rate = (
+            Decimal(str(round(state.n / started * 100, 2))) if started else Decimal(0)
+        )
+        analytics.avg_score = (
+            Decimal(str(round(state.score_pct_sum / state.n, 2))) if state.n else Decimal(0)
+        )
+        analytics.pass_rate = (
+            Decimal(str(round(state.passed / state.pass_known * 100, 2)))
+            if state.pass_known else Decimal(0)
+        )
+
+        p_values = [float(item.p_value) for item in items if item.p_value is not None]
+        if p_values:
+            analytics.difficulty_score = Decimal(str(round((1 - sum(p_values) / len(p_values)) * 100, 2)))
+        else:
+            analytics.difficulty_score = Decimal(100) - analytics.avg_score if state.n else Decimal(0)
+
+        bucket = 100 // cls.SCORE_BUCKETS
+        analytics.score_distribution = {
+            f"{i * bucket}-{(i + 1) * bucket}": int(count)
+            for i, count in enumerate(state.score_histogram)
+        }
+
+        if state.time_count:
+            analytics.avg_completion_time = timedelta(seconds=state.time_sum / state.time_count)
+            analytics.time_percentiles = {
+                f"p{q}": cls._histogram_percentile(state.time_histogram, cls.TIME_BIN_EDGES, q)
+                for q in cls.TIME_PERCENTILES
+            }
+        else:
+            analytics.avg_completion_time = None
+            analytics.time_percentiles = None
+
+    @staticmethod
+    def _histogram_percentile(counts, edges, q: float) -> float:
+        """Estimates a percentile by linear interpolation within histogram bins."""
+        counts = np.asarray(counts, dtype=float)
+        total = counts.sum()
+        if not total:
+            return 0.0
+        target = total * q / 100
+        cumulative = np.cumsum(counts)
+        j = int(np.searchsorted(cumulative, target))
+        j = min(j, len(counts) - 1)
+        below = cumulative[j] - counts[j]
+        fraction = (target - below) / counts[j] if counts[j] else 0.0
+        return round(edges[j] + fraction * (edges[j + 1] - edges[j]), 1)
+
+
 # --- Async Task Definitions (if logging events asynchronously) ---
 # from celery import shared_task
 # @shared_task(name="analytics.log_event")
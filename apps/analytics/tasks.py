@@ -1,4 +1,5 @@
 import logging
+from datetime import date
 
 from celery import shared_task
 
@@ -8,17 +9,117 @@ logger = logging.getLogger(__name__)
 
 
 @shared_task(name="analytics.process_daily_events")
-def process_daily_events_task():
+def process_daily_events_task(day=None):
     """
-    Celery task to trigger daily (or periodic) aggregation/processing of analytics data.
+    Celery task that starts the nightly analytics pipeline for every active tenant.
+    Without `day` (ISO date), each tenant's previous local day is processed.
     """
     logger.info("Celery task received: Process daily analytics events/metrics")
-    from .services import DataProcessorService
+    from .pipeline import AnalyticsPipelineService
 
+    units = AnalyticsPipelineService.daily_units(date.fromisoformat(day) if day else None)
+    AnalyticsPipelineService.dispatch(units)
+    return len(units)
+
+
+@shared_task(
+    bind=True,
+    name="analytics.pipeline.run_stage",
+    max_retries=2,
+    default_retry_delay=60,
+)
+def run_pipeline_stage_task(self, tenant_id, day, stage, force=False):
+    """One analytics pipeline stage for a tenant and day (ISO date)."""
+    from .pipeline import AnalyticsPipelineService
+
+    day = date.fromisoformat(day)
     try:
-        DataProcessorService.process_events_task()
+        return AnalyticsPipelineService.run_stage(tenant_id, day, stage, force=force)
     except Exception as e:
+        if self.request.retries < self.max_retries:
+            # Completed stages are skipped on retry, so retrying is safe
+            raise self.retry(exc=e)
         logger.error(
-            f"Celery task failed during daily analytics processing: {e}", exc_info=True
+            f"Celery task gave up on analytics stage '{stage}' for tenant {tenant_id} on {day}: {e}"
         )
-        # Decide if retry is appropriate for aggregation tasks
+        # Return the failed checkpoint so the chord still completes; dependants record themselves as blocked
+        return AnalyticsPipelineService.checkpoint(tenant_id, day, stage)
+
+
+@shared_task(name="analytics.pipeline.summarize")
+def summarize_pipeline_task(units):
+    """Chord callback: logs and returns per-stage totals for the units of a pipeline run."""
+    from .pipeline import AnalyticsPipelineService
+
+    return AnalyticsPipelineService.summarize(AnalyticsPipelineService.deserialize_units(units))
+
+
+@shared_task(name="analytics.pipeline.backfill")
+def backfill_pipeline_task(start_date, end_date, tenant_ids=None, force=False):
+    """
+    Runs the analytics pipeline for every day from start_date through end_date
+    (ISO dates); all days and tenants fan out in parallel.
+    """
+    from apps.core.models import Tenant
+    from .pipeline import AnalyticsPipelineService
+
+    tenants = Tenant.objects.filter(is_active=True)
+    if tenant_ids:
+        tenants = tenants.filter(pk__in=tenant_ids)
+    units = AnalyticsPipelineService.backfill_units(
+        date.fromisoformat(start_date), date.fromisoformat(end_date), tenants
+    )
+    logger.info(f"Celery task received: Backfill analytics {start_date}..{end_date} ({len(units)} units)")
+    AnalyticsPipelineService.dispatch(units, force=force)
+    return len(units)
+
+
+@shared_task(name="analytics.export_snapshot")
+def export_snapshot_task(tenant_id, datasets=None, start_date=None, end_date=None, incremental=True, file_format=None):
+    """
+    Exports analytics datasets for a tenant as partitioned columnar files.
+    Dates are ISO tenant-local days; by default only rows changed since the last export are read.
+    """
+    from apps.core.models import Tenant
+    from .snapshots import ColumnarExportService
+
+    try:
+        tenant = Tenant.objects.get(pk=tenant_id)
+    except Tenant.DoesNotExist:
+        logger.warning(f"Columnar export skipped: tenant {tenant_id} not found")
+        return 0
+
+    runs = ColumnarExportService.export(
+        tenant,
+        datasets=datasets,
+        start_date=date.fromisoformat(start_date) if start_date else None,
+        end_date=date.fromisoformat(end_date) if end_date else None,
+        incremental=incremental,
+        file_format=file_format,
+    )
+    return sum(run.rows for run in runs)
+
+
+@shared_task(name="analytics.run_item_analysis")
+def run_item_analysis_task(assessment_id=None):
+    """
+    Folds newly graded attempts into assessment item analysis.
+    Runs for a single assessment when given, otherwise for all assessments.
+    """
+    from apps.assessments.models import Assessment
+    from .services import ItemAnalysisService
+
+    if assessment_id is None:
+        folded = ItemAnalysisService.run_all()
+    else:
+        try:
+            assessment = Assessment.objects.select_related("course__tenant").get(
+                pk=assessment_id
+            )
+        except Assessment.DoesNotExist:
+            logger.warning(f"Item analysis skipped: assessment {assessment_id} not found")
+            return 0
+        folded = ItemAnalysisService.run_for_assessment(assessment)
+
+    logger.info(f"Item analysis task folded {folded} attempts")
+    return folded
@@ -0,0 +1,194 @@
+"""
+Tests for dashboard composition and the instructor dashboard built on it.
+"""
+import time
+import uuid
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from apps.analytics.dashboard import DashboardComposer, DashboardSection, InstructorContext
+from apps.analytics.services import INSTRUCTOR_DASHBOARD, ComprehensiveAnalyticsService
+from apps.core.models import Tenant
+from apps.courses.models import Course
+from apps.enrollments.models import Enrollment
+from apps.users.models import User
+
+
+class DashboardComposerTestCase(TestCase):
+    """Tests for DashboardComposer."""
+
+    def setUp(self):
+        cache.clear()
+        self.context = InstructorContext(instructor_id=uuid.uuid4(), tenant=None)
+
+    def tearDown(self):
+        cache.clear()
+
+    @staticmethod
+    def _sleeper(seconds, value):
+        def build(context):
+            time.sleep(seconds)
+            return value
+        return build
+
+    @override_settings(ANALYTICS_DASHBOARD_WORKERS=4)
+    def test_sections_run_concurrently(self):
+        composer = DashboardComposer("test", [
+            DashboardSection(name, self._sleeper(0.2, name)) for name in ("a", "b", "c")
+        ])
+
+        started = time.perf_counter()
+        results, timings = composer.compose(self.context, composer.select())
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(results, {"a": "a", "b": "b", "c": "c"})
+        self.assertLess(elapsed, 0.5)
+        self.assertTrue(all(timing["status"] == "ok" for timing in timings.values()))
+        self.assertGreaterEqual(timings["a"]["duration_ms"], 200)
+
+    @override_settings(ANALYTICS_DASHBOARD_WORKERS=4)
+    def test_slow_section_times_out_without_failing_others(self):
+        composer = DashboardComposer("test", [
+            DashboardSection("slow", self._sleeper(0.5, "late"), timeout=0.05),
+            DashboardSection("fast", self._sleeper(0, "done")),
+        ])
+
+        results, timings = composer.compose(self.context, composer.select())
+
+        self.assertIsNone(results["slow"])
+        self.assertEqual(timings["slow"]["status"], "timeout")
+        self.assertEqual(results["fast"], "done")
+
+    @override_settings(ANALYTICS_DASHBOARD_WORKERS=4)
+    def test_timeout_counts_from_start_not_from_queueing(self):
+        composer = DashboardComposer("test", [
+            DashboardSection(name, self._sleeper(0.15, name), timeout=0.25) for name in "abcdef"
+        ])
+
+        results, timings = composer.compose(self.context, composer.select())
+
+        # Two sections wait ~0.15s for a worker, then still get their full 0.25s to run
+        self.assertEqual(results, {name: name for name in "abcdef"})
+        self.assertTrue(all(timing["status"] == "ok" for timing in timings.values()))
+
+    @override_settings(ANALYTICS_DASHBOARD_WORKERS=4, ANALYTICS_DASHBOARD_QUEUE_TIMEOUT=0.05)
+    def test_sections_still_queued_after_queue_timeout_are_cancelled(self):
+        calls = []
+
+        def build(context):
+            calls.append(1)
+            time.sleep(0.2)
+            return True
+
+        composer = DashboardComposer("test", [DashboardSection(name, build) for name in "abcde"])
+
+        results, timings = composer.compose(self.context, composer.select())
+
+        self.assertEqual(sum(timing["status"] == "ok" for timing in timings.values()), 4)
+        self.assertEqual(timings["e"]["status"], "timeout")
+        self.assertIsNone(results["e"])
+        self.assertEqual(len(calls), 4)
+
+    @override_settings(ANALYTICS_DASHBOARD_WORKERS=1)
+    def test_failing_section_is_isolated(self):
+        def broken(context):
+            raise RuntimeError("boom")
+
+        composer = DashboardComposer("test", [
+            DashboardSection("broken", broken),
+            DashboardSection("fine", lambda context: {"ok": True}),
+        ])
+
+        results, timings = composer.compose(self.context, composer.select())
+
+        self.assertIsNone(results["broken"])
+        self.assertEqual(timings["broken"]["status"], "error")
+        self.assertEqual(results["fine"], {"ok": True})
+
+    @override_settings(ANALYTICS_DASHBOARD_WORKERS=1)
+    def test_cached_sections_are_not_rebuilt(self):
+        calls = []
+
+        def build(context):
+            calls.append(1)
+            return len(calls)
+
+        composer = DashboardComposer("test", [
+            DashboardSection("cached", build, cache_timeout=60),
+            DashboardSection("live", build),
+        ])
+
+        composer.compose(self.context, composer.select())
+        results, timings = composer.compose(self.context, composer.select())
+
+        self.assertEqual(timings["cached"]["status"], "cached")
+        self.assertEqual(results["cached"], 1)
+        self.assertEqual(len(calls), 3)
+
+        composer.invalidate([self.context.cache_scope], ["cached"])
+        _, timings = composer.compose(self.context, composer.select(["cached"]))
+        self.assertEqual(timings["cached"]["status"], "ok")
+
+    def test_select_ignores_unknown_sections(self):
+        composer = DashboardComposer("test", [DashboardSection("a", lambda context: 1)])
+
+        self.assertEqual([section.name for section in composer.select(["a", "missing"])], ["a"])
+
+
+@override_settings(ANALYTICS_DASHBOARD_WORKERS=1)
+class InstructorDashboardTestCase(TestCase):
+    """Tests for ComprehensiveAnalyticsService.get_instructor_dashboard_data."""
+
+    def setUp(self):
+        cache.clear()
+        self.tenant = Tenant.objects.create(name="Test Tenant", slug="test-tenant")
+        self.instructor = User.objects.create_user(
+            email="instructor@test.com",
+            password="testpass123",
+            role=User.Role.INSTRUCTOR,
+            tenant=self.tenant
+        )
+        self.learners = [
+            User.objects.create_user(email=f"learner{i}@test.com", password="testpass123", tenant=self.tenant)
+            for i in range(3)
+        ]
+        published = Course.objects.create(
+            tenant=self.tenant, title="Published", instructor=self.instructor, status=Course.Status.PUBLISHED
+        )
+        Course.objects.create(tenant=self.tenant, title="Draft", instructor=self.instructor)
+        Enrollment.objects.create(user=self.learners[0], course=published, status=Enrollment.Status.ACTIVE)
+        Enrollment.objects.create(user=self.learners[1], course=published, status=Enrollment.Status.COMPLETED)
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_all_sections_built_with_timings(self):
+        data = ComprehensiveAnalyticsService.get_instructor_dashboard_data(str(self.instructor.id), self.tenant)
+
+        for name in INSTRUCTOR_DASHBOARD.sections:
+            self.assertIsNotNone(data[name], name)
+            self.assertEqual(data["section_timings"][name]["status"], "ok")
+        self.assertIn("context", data["section_timings"])
+        stats = data["course_statistics"]
+        self.assertEqual((stats["total_courses"], stats["published_courses"], stats["draft_courses"]), (2, 1, 1))
+        self.assertEqual(stats["completed_enrollments"], 1)
+        self.assertEqual(data["student_analytics"]["total_students"], 2)
+
+    def test_context_is_resolved_once_for_all_sections(self):
+        context = InstructorContext.resolve(
+            self.instructor.id, self.tenant, INSTRUCTOR_DASHBOARD.requirements(INSTRUCTOR_DASHBOARD.select())
+        )
+
+        self.assertEqual(len(context.course_ids), 2)
+        self.assertCountEqual(context.student_ids, [self.learners[0].id, self.learners[1].id])
+        self.assertEqual(context.active_student_ids, [self.learners[0].id])
+
+    def test_sections_parameter_limits_response(self):
+        data = ComprehensiveAnalyticsService.get_instructor_dashboard_data(
+            str(self.instructor.id), self.tenant, sections=["course_statistics"]
+        )
+
+        self.assertIn("course_statistics", data)
+        self.assertNotIn("revenue_analytics", data)
+        self.assertEqual(set(data["section_timings"]), {"course_statistics", "context"})
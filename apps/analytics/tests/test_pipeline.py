@@ -0,0 +1,179 @@
+"""Tests for the checkpointed nightly analytics pipeline."""
+
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from celery import current_app
+from django.test import TestCase
+
+from apps.analytics.models import AnalyticsPipelineRun, CourseAnalytics, StudentEngagementMetric
+from apps.analytics.pipeline import STAGES, AnalyticsPipelineService, PipelineStage, stage_levels
+from apps.analytics.services import AnalyticsService
+from apps.analytics.tasks import backfill_pipeline_task, process_daily_events_task
+from apps.core.models import Tenant
+from apps.courses.models import Course
+from apps.enrollments.models import Enrollment
+from apps.users.models import User
+
+DAY = date(2026, 3, 10)
+
+
+def _noop(tenant, day):
+    return None
+
+
+class StageLevelsTests(TestCase):
+    """Tests for ordering stages by their dependencies."""
+
+    def test_default_stages_run_in_sequence(self):
+        self.assertEqual(stage_levels(), [['engagement'], ['course'], ['instructor'], ['insights']])
+
+    def test_independent_stages_share_a_level(self):
+        stages = {
+            name: PipelineStage(name, _noop, _noop, depends_on)
+            for name, depends_on in (('a', ()), ('b', ('a',)), ('c', ('a',)), ('d', ('b', 'c')))
+        }
+
+        self.assertEqual(stage_levels(stages), [['a'], ['b', 'c'], ['d']])
+
+    def test_cycles_are_rejected(self):
+        stages = {
+            'a': PipelineStage('a', _noop, _noop, ('b',)),
+            'b': PipelineStage('b', _noop, _noop, ('a',)),
+        }
+
+        with self.assertRaises(ValueError):
+            stage_levels(stages)
+
+
+class AnalyticsPipelineServiceTests(TestCase):
+    """Tests for running, checkpointing and dispatching pipeline units."""
+
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Test Tenant", slug="test-tenant", is_active=True)
+        self.instructor = User.objects.create_user(
+            email="instructor@test.com", password="testpass123", role=User.Role.INSTRUCTOR, tenant=self.tenant
+        )
+        self.learner = User.objects.create_user(
+            email="learner@test.com", password="testpass123", tenant=self.tenant
+        )
+        self.course = Course.objects.create(
+            tenant=self.tenant, title="Test Course", instructor=self.instructor, status=Course.Status.PUBLISHED
+        )
+        Enrollment.objects.create(user=self.learner, course=self.course, status=Enrollment.Status.ACTIVE)
+        self.units = [(str(self.tenant.pk), DAY)]
+
+    def _runs(self):
+        return {
+            run.stage: run for run in AnalyticsPipelineRun.objects.filter(tenant=self.tenant, date=DAY)
+        }
+
+    def test_run_records_checkpoints_with_row_counts(self):
+        summary = AnalyticsPipelineService.run_inline(self.units)
+
+        runs = self._runs()
+        self.assertEqual(set(runs), set(STAGES))
+        self.assertEqual({run.status for run in runs.values()}, {AnalyticsPipelineRun.Status.COMPLETED})
+        self.assertEqual(runs['engagement'].rows, StudentEngagementMetric.objects.filter(date=DAY).count())
+        self.assertEqual(runs['course'].rows, 1)
+        self.assertEqual(runs['instructor'].rows, 1)
+        self.assertIsNotNone(runs['course'].finished_at)
+        self.assertEqual(summary['stages']['course'], {
+            'statuses': {'COMPLETED': 1}, 'rows': 1,
+            'duration_ms': runs['course'].duration_ms, 'max_duration_ms': runs['course'].duration_ms,
+        })
+
+    def test_rerun_skips_completed_units(self):
+        AnalyticsPipelineService.run_inline(self.units)
+
+        with patch.object(AnalyticsService, 'process_course_analytics') as course_stage:
+            AnalyticsPipelineService.run_inline(self.units)
+            course_stage.assert_not_called()
+
+            AnalyticsPipelineService.run_inline(self.units, force=True)
+            course_stage.assert_called_once_with(self.tenant, DAY)
+
+    def test_failed_stage_blocks_dependants_until_rerun(self):
+        with patch.object(AnalyticsService, 'process_course_analytics', side_effect=RuntimeError("boom")):
+            AnalyticsPipelineService.run_inline(self.units)
+
+        runs = self._runs()
+        self.assertEqual(runs['engagement'].status, AnalyticsPipelineRun.Status.COMPLETED)
+        self.assertEqual(runs['course'].status, AnalyticsPipelineRun.Status.FAILED)
+        self.assertEqual(runs['course'].error, "boom")
+        self.assertEqual(runs['instructor'].status, AnalyticsPipelineRun.Status.BLOCKED)
+        self.assertEqual(runs['insights'].status, AnalyticsPipelineRun.Status.BLOCKED)
+        self.assertFalse(CourseAnalytics.objects.filter(date=DAY).exists())
+
+        with patch.object(AnalyticsService, 'process_student_engagement_metrics') as engagement_stage:
+            AnalyticsPipelineService.run_inline(self.units)
+        engagement_stage.assert_not_called()
+
+        runs = self._runs()
+        self.assertEqual({run.status for run in runs.values()}, {AnalyticsPipelineRun.Status.COMPLETED})
+        self.assertEqual(runs['course'].attempts, 2)
+
+    def test_insights_run_for_each_instructor(self):
+        with patch.object(AnalyticsService, 'generate_ai_insights') as insights, \
+                patch.object(AnalyticsService, 'generate_predictive_analytics'):
+            AnalyticsPipelineService.run_inline(self.units)
+
+        insights.assert_called_once_with(self.tenant, self.instructor.id, DAY)
+
+    def test_summary_of_a_long_backfill(self):
+        days = [DAY - timedelta(days=offset) for offset in range(1100)]
+        AnalyticsPipelineRun.objects.bulk_create([
+            AnalyticsPipelineRun(
+                tenant=self.tenant, date=day, stage='course', status=AnalyticsPipelineRun.Status.COMPLETED, rows=1
+            )
+            for day in days
+        ])
+        other = Tenant.objects.create(name="Other Tenant", slug="other-tenant")
+        AnalyticsPipelineRun.objects.create(
+            tenant=other, date=DAY, stage='course', status=AnalyticsPipelineRun.Status.COMPLETED, rows=1
+        )
+
+        summary = AnalyticsPipelineService.summarize([(str(self.tenant.pk), day) for day in days])
+
+        self.assertEqual(summary['stages']['course']['statuses'], {'COMPLETED': 1100})
+        self.assertEqual(summary['stages']['course']['rows'], 1100)
+
+    def test_backfill_units_cover_every_tenant_and_day(self):
+        other = Tenant.objects.create(name="Other", slug="other", is_active=True)
+        Tenant.objects.create(name="Inactive", slug="inactive", is_active=False)
+
+        units = AnalyticsPipelineService.backfill_units(date(2026, 3, 1), date(2026, 3, 3))
+
+        self.assertEqual(len(units), 6)
+        self.assertEqual({tenant_id for tenant_id, _ in units}, {str(self.tenant.pk), str(other.pk)})
+        with self.assertRaises(ValueError):
+            AnalyticsPipelineService.backfill_units(date(2026, 3, 3), date(2026, 3, 1))
+
+    def test_canvas_fans_out_units_as_a_chord(self):
+        units = AnalyticsPipelineService.backfill_units(date(2026, 3, 9), DAY)
+
+        canvas = AnalyticsPipelineService.build_canvas(units)
+
+        self.assertEqual(canvas.body.task, 'analytics.pipeline.summarize')
+        self.assertEqual(len(canvas.tasks), 2)
+        self.assertEqual(
+            [step.args[2] for step in canvas.tasks[0].tasks], ['engagement', 'course', 'instructor', 'insights']
+        )
+
+    def test_backfill_task_runs_the_chord(self):
+        eager = current_app.conf.task_always_eager
+        current_app.conf.task_always_eager = True
+        self.addCleanup(setattr, current_app.conf, 'task_always_eager', eager)
+
+        backfill_pipeline_task.delay(DAY.isoformat(), DAY.isoformat())
+
+        self.assertEqual(
+            {run.status for run in self._runs().values()}, {AnalyticsPipelineRun.Status.COMPLETED}
+        )
+
+    def test_daily_task_runs_inline_when_broker_is_unavailable(self):
+        with patch('celery.canvas._chord.apply_async', side_effect=ConnectionError('broker down')):
+            queued = process_daily_events_task(DAY.isoformat())
+
+        self.assertEqual(queued, 1)
+        self.assertEqual(len(self._runs()), len(STAGES))
@@ -6,6 +6,8 @@ from datetime import datetime, timedelta
 from decimal import Decimal
 from unittest.mock import patch, MagicMock
 
+import numpy as np
+
 from django.test import TestCase
 from django.utils import timezone
 
@@ -13,16 +15,17 @@ from apps.core.models import Tenant
 from apps.users.models import User
 from apps.courses.models import Course
 from apps.enrollments.models import Enrollment
-from apps.assessments.models import Assessment, AssessmentAttempt
+from apps.assessments.models import Assessment, AssessmentAttempt, Question
+from apps.assessments.services import GradingService
 
 from apps.analytics.models import (
     Event, Report, StudentEngagementMetric, CourseAnalytics,
     InstructorAnalytics, PredictiveAnalytics, AIInsights, RealTimeMetrics,
-    StudySession
+    StudySession, AssessmentAnalytics, QuestionAnalytics
 )
 from apps.analytics.services import (
     AnalyticsService, ReportGeneratorService, ReportGenerationError,
-    DataProcessorService, ExportService, VisualizationService
+    DataProcessorService, ExportService, VisualizationService, ItemAnalysisService
 )
 
 
@@ -40,7 +43,7 @@ class AnalyticsServiceTestCase(TestCase):
             password="testpass123",
             first_name="Test",
             last_name="Instructor",
-            role="instructor",
+            role=User.Role.INSTRUCTOR,
             tenant=self.tenant
         )
         self.learner = User.objects.create_user(
@@ -346,7 +349,7 @@ class ProcessStudentEngagementMetricsTestCase(TestCase):
         self.instructor = User.objects.create_user(
             email="instructor@test.com",
             password="testpass123",
-            role="instructor",
+            role=User.Role.INSTRUCTOR,
             tenant=self.tenant
         )
         self.learner = User.objects.create_user(
@@ -446,7 +449,7 @@ class ProcessCourseAnalyticsTestCase(TestCase):
         self.instructor = User.objects.create_user(
             email="instructor@test.com",
             password="testpass123",
-            role="instructor",
+            role=User.Role.INSTRUCTOR,
             tenant=self.tenant
         )
         self.course = Course.objects.create(
@@ -502,7 +505,7 @@ class ProcessInstructorAnalyticsTestCase(TestCase):
         self.instructor = User.objects.create_user(
             email="instructor@test.com",
             password="testpass123",
-            role="instructor",
+            role=User.Role.INSTRUCTOR,
             tenant=self.tenant
         )
         self.course1 = Course.objects.create(
@@ -564,7 +567,7 @@ class GenerateAIInsightsTestCase(TestCase):
         self.instructor = User.objects.create_user(
             email="instructor@test.com",
             password="testpass123",
-            role="instructor",
+            role=User.Role.INSTRUCTOR,
             tenant=self.tenant
         )
 
@@ -652,7 +655,7 @@ class UpdateRealTimeMetricsTestCase(TestCase):
         self.instructor = User.objects.create_user(
             email="instructor@test.com",
             password="testpass123",
-            role="instructor",
+            role=User.Role.INSTRUCTOR,
             tenant=self.tenant
         )
         self.course = Course.objects.create(
@@ -715,7 +718,7 @@ class ReportGeneratorServiceTestCase(TestCase):
         self.instructor = User.objects.create_user(
             email="instructor@test.com",
             password="testpass123",
-            role="instructor",
+            role=User.Role.INSTRUCTOR,
             tenant=self.tenant
         )
         self.learner = User.objects.create_user(
@@ -786,7 +789,7 @@ class ReportGeneratorServiceTestCase(TestCase):
         other_instructor = User.objects.create_user(
             email="other@test.com",
             password="testpass123",
-            role="instructor",
+            role=User.Role.INSTRUCTOR,
             tenant=self.tenant
         )
         other_course = Course.objects.create(
@@ -1082,7 +1085,7 @@ class DataProcessorServiceTestCase(TestCase):
         self.instructor = User.objects.create_user(
             email="instructor@test.com",
             password="testpass123",
-            role="instructor",
+            role=User.Role.INSTRUCTOR,
             tenant=self.tenant
         )
         self.course = Course.objects.create(
@@ -1142,3 +1145,136 @@ class DataProcessorServiceTestCase(TestCase):
 
         # Should be called for both active tenants
         self.assertEqual(mock_process.call_count, 2)
+
+
+class ItemAnalysisServiceTestCase(TestCase):
+    """Tests for the batch ItemAnalysisService."""
+
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Test Tenant", slug="test-tenant")
+        self.instructor = User.objects.create_user(
+            email="instructor@test.com",
+            password="testpass123",
+            role=User.Role.INSTRUCTOR,
+            tenant=self.tenant,
+        )
+        self.course = Course.objects.create(
+            tenant=self.tenant,
+            title="Test Course",
+            instructor=self.instructor,
+        )
+        self.assessment = Assessment.objects.create(
+            course=self.course, title="Quiz", pass_mark_percentage=50
+        )
+        self.mc = Question.objects.create(
+            assessment=self.assessment,
+            question_text="Pick A",
+            question_type=Question.QuestionType.MULTIPLE_CHOICE,
+            points=2,
+            order=1,
+            type_specific_data={
+                "options": [
+                    {"id": "a", "text": "A", "is_correct": True},
+                    {"id": "b", "text": "B", "is_correct": False},
+                    {"id": "c", "text": "C", "is_correct": False},
+                ]
+            },
+        )
+        self.tf = Question.objects.create(
+            assessment=self.assessment,
+            question_text="Is the sky blue?",
+            question_type=Question.QuestionType.TRUE_FALSE,
+            points=1,
+            order=2,
+            type_specific_data={"correct_answer": True},
+        )
+        self.assessment.refresh_from_db()
+        self.learner_count = 0
+
+    def _graded(self, mc_answer, tf_answer, minutes=10):
+        self.learner_count += 1
+        learner = User.objects.create_user(
+            email=f"learner{self.learner_count}@test.com",
+            password="testpass123",
+            role=User.Role.LEARNER,
+            tenant=self.tenant,
+        )
+        attempt = AssessmentAttempt.objects.create(
+            assessment=self.assessment,
+            user=learner,
+            status=AssessmentAttempt.AttemptStatus.SUBMITTED,
+            answers={str(self.mc.id): [mc_answer], str(self.tf.id): tf_answer},
+        )
+        GradingService.grade_attempt(attempt)
+        # Settle the attempt so the batch job picks it up
+        AssessmentAttempt.objects.filter(pk=attempt.pk).update(
+            graded_at=timezone.now() - timedelta(hours=1),
+            end_time=attempt.start_time + timedelta(minutes=minutes),
+        )
+        return attempt
+
+    def _seed(self):
+        answers = [("a", "true"), ("a", "true"), ("a", "false"), ("b", "true"), ("c", "false")]
+        for index, (mc_answer, tf_answer) in enumerate(answers):
+            self._graded(mc_answer, tf_answer, minutes=5 * (index + 1))
+
+    def test_run_computes_item_statistics(self):
+        """Test p-values, discrimination, distractors and distributions."""
+        self._seed()
+
+        with patch("apps.assessments.grading.QuestionPlan.grade") as mock_grade:
+            folded = ItemAnalysisService.run_for_assessment(self.assessment)
+        mock_grade.assert_not_called()
+        self.assertEqual(folded, 5)
+
+        analytics = AssessmentAnalytics.objects.get(assessment=self.assessment)
+        self.assertEqual(analytics.total_attempts, 5)
+        self.assertEqual(sum(analytics.score_distribution.values()), 5)
+        self.assertEqual(analytics.pass_rate, Decimal("60.00"))
+        self.assertEqual(analytics.avg_completion_time, timedelta(minutes=15))
+        self.assertEqual(set(analytics.time_percentiles), {"p25", "p50", "p75", "p90"})
+
+        mc_stats = QuestionAnalytics.objects.get(question=self.mc)
+        self.assertEqual(mc_stats.responses, 5)
+        self.assertEqual(mc_stats.correct_count, 3)
+        self.assertEqual(mc_stats.p_value, Decimal("0.6000"))
+        self.assertEqual(mc_stats.distractor_frequencies, {"a": 3, "b": 1, "c": 1})
+
+        # Corrected point-biserial: item score vs. the rest of the total score
+        mc_scores = np.array([2, 2, 2, 0, 0], dtype=float)
+        rest_scores = np.array([1, 1, 0, 1, 0], dtype=float)
+        expected = np.corrcoef(mc_scores, rest_scores)[0, 1]
+        self.assertAlmostEqual(float(mc_stats.discrimination), expected, places=4)
+
+    def test_run_folds_only_new_attempts(self):
+        """Test incremental runs match a full recompute."""
+        self._seed()
+        ItemAnalysisService.run_for_assessment(self.assessment, chunk_size=2)
+
+        self._graded("b", "false")
+        self.assertEqual(ItemAnalysisService.run_for_assessment(self.assessment), 1)
+        self.assertEqual(ItemAnalysisService.run_for_assessment(self.assessment), 0)
+
+        incremental = QuestionAnalytics.objects.get(question=self.mc)
+        self.assertEqual(incremental.responses, 6)
+
+        ItemAnalysisService.invalidate(self.assessment.id)
+        self.assertEqual(ItemAnalysisService.run_for_assessment(self.assessment), 6)
+        rebuilt = QuestionAnalytics.objects.get(question=self.mc)
+        self.assertEqual(rebuilt.responses, 6)
+        self.assertEqual(rebuilt.p_value, incremental.p_value)
+        self.assertEqual(rebuilt.discrimination, incremental.discrimination)
+        self.assertEqual(rebuilt.distractor_frequencies, incremental.distractor_frequencies)
+
+    def test_unsettled_attempts_wait_for_next_run(self):
+        """Test that just-graded attempts are left for a later run."""
+        attempt = self._graded("a", "true")
+        AssessmentAttempt.objects.filter(pk=attempt.pk).update(graded_at=timezone.now())
+
+        self.assertEqual(ItemAnalysisService.run_for_assessment(self.assessment), 0)
+
+    def test_histogram_percentile_interpolates_within_bins(self):
+        """Test percentile estimation from a histogram."""
+        edges = (0, 10, 20, 30)
+        self.assertEqual(ItemAnalysisService._histogram_percentile([0, 4, 0], edges, 50), 15.0)
+        self.assertEqual(ItemAnalysisService._histogram_percentile([0, 0, 0], edges, 50), 0.0)
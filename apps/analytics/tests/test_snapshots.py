@@ -0,0 +1,130 @@
+"""Tests for columnar snapshot exports."""
+
+import shutil
+import tempfile
+from datetime import date, datetime
+from datetime import timezone as dt_timezone
+from io import StringIO
+from unittest import skipIf
+from unittest.mock import patch
+
+import numpy as np
+from django.core.files.storage import FileSystemStorage
+from django.core.management import call_command
+from django.test import TestCase
+
+from apps.analytics.models import AnalyticsExportRun, Event, StudentEngagementMetric
+from apps.analytics.snapshots import ColumnarExportService, parquet_available
+from apps.core.models import PlatformSettings, Tenant
+from apps.users.models import User
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=dt_timezone.utc)
+
+
+@patch.object(ColumnarExportService, 'SETTLE_SECONDS', 0)
+class ColumnarExportServiceTests(TestCase):
+    """Tests for ColumnarExportService."""
+
+    def setUp(self):
+        self.location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.location, ignore_errors=True)
+        self.storage = FileSystemStorage(location=self.location)
+        self.tenant = Tenant.objects.create(name="Test Tenant", slug="test-tenant")
+        PlatformSettings.objects.create(tenant=self.tenant, timezone="America/New_York")
+        other = Tenant.objects.create(name="Other", slug="other")
+        Event.objects.create(tenant=other, event_type='PAGE_VIEW')
+
+        self.events = []
+        for created_at in (utc(2026, 1, 16, 3), utc(2026, 1, 16, 4), utc(2026, 1, 16, 6)):  # 15th, 15th, 16th locally
+            event = Event.objects.create(
+                tenant=self.tenant, event_type='PAGE_VIEW', context_data={"course_id": "abc"}
+            )
+            Event.objects.filter(pk=event.pk).update(created_at=created_at)
+            self.events.append(event)
+
+    def _export(self, **kwargs):
+        return ColumnarExportService.export_dataset(
+            self.tenant, 'events', file_format='npz', storage=self.storage, **kwargs
+        )
+
+    def _load(self, path):
+        with self.storage.open(path) as handle:
+            with np.load(handle) as archive:
+                return {name: archive[name] for name in archive.files}
+
+    def test_events_are_partitioned_by_local_day(self):
+        run = self._export()
+
+        self.assertEqual(run.status, AnalyticsExportRun.Status.COMPLETED)
+        self.assertEqual(run.rows, 3)
+        self.assertEqual([path.split('/')[3] for path in run.files], ['date=2026-01-15', 'date=2026-01-16'])
+        first = self._load(run.files[0])
+        self.assertEqual(list(first['id']), [str(self.events[0].id), str(self.events[1].id)])
+        self.assertEqual(first['created_at'].dtype, np.dtype('datetime64[us]'))
+        self.assertEqual(first['created_at'][0], np.datetime64('2026-01-16T03:00:00'))
+        self.assertEqual(first['context_data'][0], '{"course_id": "abc"}')
+
+    def test_chunk_size_bounds_part_files(self):
+        run = self._export(chunk_size=1)
+
+        self.assertEqual(len(run.files), 3)
+        self.assertEqual(sum(len(self._load(path)['id']) for path in run.files), 3)
+
+    def test_date_range_uses_tenant_local_days(self):
+        run = self._export(start_date=date(2026, 1, 16), end_date=date(2026, 1, 16))
+
+        self.assertEqual(run.rows, 1)
+        self.assertEqual(list(self._load(run.files[0])['id']), [str(self.events[2].id)])
+
+    def test_incremental_export_reads_rows_updated_since_watermark(self):
+        self._export(incremental=True)
+        self.assertEqual(self._export(incremental=True).rows, 0)
+
+        self.events[1].event_type = 'CONTENT_VIEW'
+        self.events[1].save()
+        run = self._export(incremental=True)
+
+        self.assertEqual(run.rows, 1)
+        self.assertEqual(list(self._load(run.files[0])['event_type']), ['CONTENT_VIEW'])
+
+    def test_bounded_export_does_not_advance_incremental_watermark(self):
+        self._export(start_date=date(2026, 1, 16), end_date=date(2026, 1, 16))
+        run = self._export(incremental=True)
+
+        self.assertEqual(run.rows, 3)
+        self.assertEqual(self._export(incremental=True).rows, 0)
+
+    def test_nullable_numbers_become_nan(self):
+        learner = User.objects.create_user(email="learner@test.com", password="testpass123", tenant=self.tenant)
+        StudentEngagementMetric.objects.create(
+            tenant=self.tenant, user=learner, course_id=self.events[0].id, date=date(2026, 1, 15), content_views=4
+        )
+
+        run = ColumnarExportService.export_dataset(
+            self.tenant, 'engagement_metrics', file_format='npz', storage=self.storage
+        )
+
+        columns = self._load(run.files[0])
+        self.assertEqual(columns['content_views'].dtype, np.dtype('int64'))
+        self.assertTrue(np.isnan(columns['avg_quiz_score'][0]))
+        self.assertEqual(columns['date'][0], np.datetime64('2026-01-15'))
+
+    @skipIf(parquet_available(), "pyarrow is installed")
+    def test_parquet_requires_pyarrow(self):
+        with self.assertRaises(ValueError):
+            ColumnarExportService.export_dataset(self.tenant, 'events', file_format='parquet', storage=self.storage)
+
+    def test_command_exports_requested_datasets(self):
+        out = StringIO()
+        with patch('apps.analytics.snapshots.default_storage', self.storage):
+            call_command(
+                'export_analytics_snapshot', '--tenant', self.tenant.slug, '--dataset', 'events',
+                '--dataset', 'course_analytics', '--format', 'npz', stdout=out,
+            )
+
+        self.assertIn("events: 3 rows in 2 files", out.getvalue())
+        self.assertEqual(
+            set(AnalyticsExportRun.objects.values_list('dataset', flat=True)), {'events', 'course_analytics'}
+        )
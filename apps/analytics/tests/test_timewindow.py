@@ -0,0 +1,158 @@
+"""Tests for tenant-local time windows and their use in analytics queries."""
+
+from datetime import date, datetime
+from datetime import timezone as dt_timezone
+from unittest import skipUnless
+from zoneinfo import ZoneInfo
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.analytics.models import Event
+from apps.analytics.timewindow import TimeWindow, tenant_timezone
+from apps.core.models import PlatformSettings, Tenant
+from apps.users.models import User
+
+NEW_YORK = ZoneInfo("America/New_York")
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=dt_timezone.utc)
+
+
+class TimeWindowTests(TestCase):
+    """Tests for TimeWindow bounds and tenant timezone resolution."""
+
+    def setUp(self):
+        cache.clear()
+        self.tenant = Tenant.objects.create(name="Test Tenant", slug="test-tenant")
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_day_is_half_open_range_in_local_time(self):
+        window = TimeWindow.for_day(date(2026, 1, 15), NEW_YORK)
+
+        self.assertEqual(window.lookups('created_at'), {
+            'created_at__gte': utc(2026, 1, 15, 5),
+            'created_at__lt': utc(2026, 1, 16, 5),
+        })
+
+    def test_daylight_saving_day_is_23_hours(self):
+        window = TimeWindow.for_day(date(2026, 3, 8), NEW_YORK)
+
+        self.assertEqual(window.start, utc(2026, 3, 8, 5))
+        self.assertEqual(window.end, utc(2026, 3, 9, 4))
+
+    def test_open_ended_window_has_only_lower_bound(self):
+        window = TimeWindow(date(2026, 1, 1), None, NEW_YORK)
+
+        self.assertEqual(list(window.lookups('started_at')), ['started_at__gte'])
+
+    def test_tenant_timezone_falls_back_to_global_then_default(self):
+        self.assertEqual(tenant_timezone(self.tenant), ZoneInfo("UTC"))
+
+        PlatformSettings.objects.create(tenant=None, timezone="Europe/Berlin")
+        self.assertEqual(tenant_timezone(self.tenant), ZoneInfo("Europe/Berlin"))
+
+        PlatformSettings.objects.create(tenant=self.tenant, timezone="America/New_York")
+        self.assertEqual(tenant_timezone(self.tenant.id), NEW_YORK)
+        self.assertEqual(tenant_timezone(None), ZoneInfo("Europe/Berlin"))
+
+    def test_unknown_timezone_uses_default(self):
+        PlatformSettings.objects.create(tenant=self.tenant, timezone="Mars/Olympus_Mons")
+
+        self.assertEqual(tenant_timezone(self.tenant), ZoneInfo("UTC"))
+
+    def test_window_counts_events_on_their_local_day(self):
+        late_evening = Event.objects.create(tenant=self.tenant, event_type='PAGE_VIEW')
+        Event.objects.filter(pk=late_evening.pk).update(created_at=utc(2026, 1, 16, 3, 30))  # 22:30 on the 15th
+        next_morning = Event.objects.create(tenant=self.tenant, event_type='PAGE_VIEW')
+        Event.objects.filter(pk=next_morning.pk).update(created_at=utc(2026, 1, 16, 5, 30))  # 00:30 on the 16th
+
+        window = TimeWindow.for_day(date(2026, 1, 15), NEW_YORK)
+        ids = set(Event.objects.filter(tenant=self.tenant, **window.lookups()).values_list('id', flat=True))
+
+        self.assertEqual(ids, {late_evening.id})
+
+
+class TimeWindowQueryPlanTests(TestCase):
+    """Window filters must be served by the composite Event indexes."""
+
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Test Tenant", slug="test-tenant")
+        self.window = TimeWindow(date(2026, 1, 1), date(2026, 1, 31), NEW_YORK)
+
+    def _plan(self, queryset):
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                # Tiny test tables would otherwise always be scanned sequentially
+                cursor.execute("SET LOCAL enable_seqscan = off")
+        return queryset.explain()
+
+    def _index_name(self, fields):
+        return next(index.name for index in Event._meta.indexes if index.fields == fields)
+
+    @skipUnless(connection.vendor in ('sqlite', 'postgresql'), "Plan format is database specific")
+    def test_tenant_event_type_range_uses_composite_index(self):
+        plan = self._plan(Event.objects.filter(
+            tenant=self.tenant, event_type='USER_LOGIN', **self.window.lookups('created_at')
+        ))
+
+        self.assertIn(self._index_name(["tenant", "event_type", "created_at"]), plan)
+        if connection.vendor == 'sqlite':
+            self.assertIn("created_at>?", plan)
+            self.assertIn("created_at<?", plan)
+        else:
+            self.assertRegex(plan, r"Index Cond: .*created_at >=")
+
+    @skipUnless(connection.vendor == 'sqlite', "Plan format is database specific")
+    def test_date_cast_filter_cannot_use_range_index(self):
+        plan = Event.objects.filter(
+            tenant=self.tenant, event_type='USER_LOGIN', created_at__date__gte=date(2026, 1, 1)
+        ).explain()
+
+        self.assertNotIn("created_at>?", plan)
+
+
+class EventLogDateFilterTests(TestCase):
+    """EventLogViewSet filters start_date/end_date on tenant-local days."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.tenant = Tenant.objects.create(name="Test Tenant", slug="test-tenant")
+        PlatformSettings.objects.create(tenant=self.tenant, timezone="America/New_York")
+        self.admin = User.objects.create_user(
+            email="admin@example.com", password="testpass123", role=User.Role.ADMIN, tenant=self.tenant
+        )
+        self.inside = Event.objects.create(tenant=self.tenant, event_type='PAGE_VIEW')
+        Event.objects.filter(pk=self.inside.pk).update(created_at=utc(2026, 1, 16, 3, 30))
+        outside = Event.objects.create(tenant=self.tenant, event_type='PAGE_VIEW')
+        Event.objects.filter(pk=outside.pk).update(created_at=utc(2026, 1, 15, 4, 30))
+        self.client.force_authenticate(user=self.admin)
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_list_filters_by_local_dates(self):
+        response = self.client.get(
+            reverse("analytics:event-log-list"),
+            {"start_date": "2026-01-15", "end_date": "2026-01-15"},
+            HTTP_X_TENANT_SLUG=self.tenant.slug,
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['id'] for item in response.data['results']], [str(self.inside.id)])
+
+    def test_invalid_dates_are_ignored(self):
+        response = self.client.get(
+            reverse("analytics:event-log-list"), {"start_date": "not-a-date"}, HTTP_X_TENANT_SLUG=self.tenant.slug
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 2)
@@ -0,0 +1,134 @@
+"""Tests for the bulk upsert writer used by the analytics aggregations."""
+
+import uuid
+from datetime import date
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.analytics.models import CourseAnalytics, InstructorAnalytics, LearningEfficiency
+from apps.analytics.services import AnalyticsService
+from apps.analytics.upsert import BulkUpsertWriter
+from apps.core.models import Tenant
+from apps.courses.models import Course
+from apps.enrollments.models import Enrollment
+from apps.users.models import User
+
+DAY = date(2026, 3, 10)
+
+
+class BulkUpsertWriterTests(TestCase):
+    """Tests for BulkUpsertWriter."""
+
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Test Tenant", slug="test-tenant")
+        self.instructor_id = uuid.uuid4()
+        self.course_ids = [uuid.uuid4() for _ in range(5)]
+
+    def _course_rows(self, total):
+        return [
+            {
+                'tenant': self.tenant, 'course_id': course_id, 'date': DAY,
+                'instructor_id': self.instructor_id, 'total_enrollments': total,
+            }
+            for course_id in self.course_ids
+        ]
+
+    def _inserts(self, queries):
+        return [query for query in queries if query['sql'].lstrip().upper().startswith('INSERT')]
+
+    def test_rows_are_inserted_then_updated_in_one_statement_per_batch(self):
+        with BulkUpsertWriter(CourseAnalytics) as writer:
+            writer.extend(self._course_rows(total=1))
+
+        with CaptureQueriesContext(connection) as queries:
+            with BulkUpsertWriter(CourseAnalytics) as writer:
+                writer.extend(self._course_rows(total=7))
+
+        self.assertEqual(len(self._inserts(queries.captured_queries)), 1)
+        self.assertEqual(writer.written, 5)
+        self.assertEqual(CourseAnalytics.objects.count(), 5)
+        self.assertEqual(set(CourseAnalytics.objects.values_list('total_enrollments', flat=True)), {7})
+
+    def test_batch_size_splits_statements(self):
+        with CaptureQueriesContext(connection) as queries:
+            with BulkUpsertWriter(CourseAnalytics, batch_size=2) as writer:
+                writer.extend(self._course_rows(total=1))
+
+        self.assertEqual(len(self._inserts(queries.captured_queries)), 3)
+        self.assertEqual(CourseAnalytics.objects.count(), 5)
+
+    def test_only_supplied_fields_are_updated(self):
+        CourseAnalytics.objects.create(
+            tenant=self.tenant, course_id=self.course_ids[0], date=DAY,
+            instructor_id=self.instructor_id, total_enrollments=1, total_reviews=9,
+        )
+
+        with BulkUpsertWriter(CourseAnalytics) as writer:
+            writer.extend(self._course_rows(total=4)[:1])
+
+        analytics = CourseAnalytics.objects.get(course_id=self.course_ids[0])
+        self.assertEqual(analytics.total_enrollments, 4)
+        self.assertEqual(analytics.total_reviews, 9)
+
+    def test_repeated_key_keeps_last_row(self):
+        with BulkUpsertWriter(CourseAnalytics) as writer:
+            writer.extend(self._course_rows(total=1)[:1] + self._course_rows(total=2)[:1])
+
+        self.assertEqual(CourseAnalytics.objects.get().total_enrollments, 2)
+
+    def test_rows_must_supply_the_same_fields(self):
+        writer = BulkUpsertWriter(CourseAnalytics)
+        writer.extend(self._course_rows(total=1)[:1])
+
+        with self.assertRaises(ValueError):
+            writer.add(tenant=self.tenant, course_id=uuid.uuid4(), date=DAY, instructor_id=self.instructor_id)
+        with self.assertRaises(ValueError):
+            BulkUpsertWriter(CourseAnalytics).add(tenant=self.tenant, date=DAY)
+
+    def test_null_key_rows_are_updated_not_duplicated(self):
+        for patterns in ({"sessions": 1}, {"sessions": 2}):
+            with BulkUpsertWriter(LearningEfficiency) as writer:
+                writer.add(
+                    tenant=self.tenant, instructor_id=self.instructor_id, course_id=None, date=DAY,
+                    learning_patterns=patterns,
+                )
+
+        self.assertEqual(LearningEfficiency.objects.get().learning_patterns, {"sessions": 2})
+
+
+class CourseAnalyticsUpsertTests(TestCase):
+    """The daily aggregations re-run onto their existing rows."""
+
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Test Tenant", slug="test-tenant")
+        self.instructor = User.objects.create_user(
+            email="instructor@test.com", password="testpass123", role=User.Role.INSTRUCTOR, tenant=self.tenant
+        )
+        self.course = Course.objects.create(
+            tenant=self.tenant, title="Test Course", instructor=self.instructor, status=Course.Status.PUBLISHED
+        )
+
+    def test_rerun_updates_existing_row(self):
+        AnalyticsService.process_course_analytics(self.tenant, DAY)
+        learner = User.objects.create_user(email="learner@test.com", password="testpass123", tenant=self.tenant)
+        Enrollment.objects.create(user=learner, course=self.course, status=Enrollment.Status.COMPLETED)
+
+        AnalyticsService.process_course_analytics(self.tenant, DAY)
+
+        analytics = CourseAnalytics.objects.get(course_id=self.course.id, date=DAY)
+        self.assertEqual(analytics.total_enrollments, 1)
+        self.assertEqual(analytics.avg_completion_rate, 100)
+
+    def test_instructor_rows_are_written_and_rerun_in_place(self):
+        learner = User.objects.create_user(email="learner@test.com", password="testpass123", tenant=self.tenant)
+        Enrollment.objects.create(user=learner, course=self.course, status=Enrollment.Status.ACTIVE)
+
+        AnalyticsService.process_instructor_analytics(self.tenant, DAY)
+        AnalyticsService.process_instructor_analytics(self.tenant, DAY)
+
+        analytics = InstructorAnalytics.objects.get(tenant=self.tenant, date=DAY)
+        self.assertEqual(analytics.instructor_id, self.instructor.id)
+        self.assertEqual(analytics.total_courses, 1)
+        self.assertEqual(analytics.total_students, 1)
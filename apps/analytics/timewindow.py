@@ -0,0 +1,143 @@
+"""
+Tenant-local date windows for analytics queries.
+
+Filtering a datetime column with `created_at__date=...` or
+`created_at__date__gte=...` wraps the column in a timezone conversion and a
+cast, so the composite indexes on Event ((tenant, event_type, created_at),
+(tenant, created_at, id), ...) cannot be used and every row of the tenant is
+read. A TimeWindow turns tenant-local calendar dates into a half-open
+[start, end) range of aware datetimes and filters the raw column with
+`__gte` / `__lt`, which those indexes serve.
+
+Local days follow the tenant's PlatformSettings.timezone, falling back to
+the global settings row and then to TIME_ZONE. The lookup is cached under
+the PlatformSettings tags of the tenant and of the global row, which are
+invalidated when either row changes (see apps/core/signals.py).
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, tzinfo
+from datetime import timezone as dt_timezone
+from typing import Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.conf import settings
+from django.db.models import Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from apps.common.cache import cached
+from apps.core.models import PlatformSettings
+
+logger = logging.getLogger(__name__)
+
+TENANT_TIMEZONE_CACHE_TIMEOUT = 3600
+
+_REQUEST_TENANT = object()
+
+
+@cached(
+    key_fn=lambda tenant_id: str(tenant_id or 'global'),
+    ttl=TENANT_TIMEZONE_CACHE_TIMEOUT,
+    tags=lambda tenant_id: {PlatformSettings.cache_tag(tenant_id), PlatformSettings.cache_tag(None)},
+    namespace='analytics.tenant_timezone',
+)
+def _configured_timezone(tenant_id) -> str:
+    """The tenant's configured timezone name, else the global one, else ''."""
+    scope = Q(tenant__isnull=True)
+    if tenant_id:
+        scope |= Q(tenant_id=tenant_id)
+    configured = {
+        row_tenant_id and str(row_tenant_id): name
+        for row_tenant_id, name in PlatformSettings.objects.filter(scope).values_list('tenant_id', 'timezone')
+    }
+    return (tenant_id and configured.get(str(tenant_id))) or configured.get(None) or ''
+
+
+def tenant_timezone(tenant=None) -> tzinfo:
+    """The timezone a tenant's calendar days are counted in (tenant, tenant id or None)."""
+    tenant_id = getattr(tenant, 'pk', tenant)
+    name = _configured_timezone(tenant_id) or settings.TIME_ZONE
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        logger.warning(f"Unknown timezone '{name}' configured for tenant {tenant_id}; using {settings.TIME_ZONE}")
+        return ZoneInfo(settings.TIME_ZONE)
+
+
+def local_today(tz: tzinfo) -> date:
+    return timezone.localdate(timezone=tz)
+
+
+def local_midnight(day: date, tz: tzinfo) -> datetime:
+    """Start of `day` in `tz`, as an aware UTC datetime."""
+    return datetime.combine(day, time.min, tzinfo=tz).astimezone(dt_timezone.utc)
+
+
+@dataclass(frozen=True)
+class TimeWindow:
+    """
+    Local calendar days from `start_date` through `end_date` (inclusive) in `tz`.
+
+    Either bound may be None for an open-ended window.
+    """
+
+    start_date: Optional[date]
+    end_date: Optional[date]
+    tz: tzinfo
+
+    @classmethod
+    def for_day(cls, day: date, tz: tzinfo) -> 'TimeWindow':
+        return cls(day, day, tz)
+
+    @classmethod
+    def since_days_ago(cls, days: int, tz: tzinfo) -> 'TimeWindow':
+        """From local midnight `days` days ago, open-ended."""
+        return cls(local_today(tz) - timedelta(days=days), None, tz)
+
+    @property
+    def start(self) -> Optional[datetime]:
+        return local_midnight(self.start_date, self.tz) if self.start_date else None
+
+    @property
+    def end(self) -> Optional[datetime]:
+        """Exclusive upper bound: local midnight after `end_date`."""
+        return local_midnight(self.end_date + timedelta(days=1), self.tz) if self.end_date else None
+
+    def lookups(self, field: str = 'created_at') -> dict:
+        """Filter kwargs bounding `field`, e.g. filter(tenant=t, **window.lookups())."""
+        lookups = {}
+        if self.start_date:
+            lookups[f'{field}__gte'] = self.start
+        if self.end_date:
+            lookups[f'{field}__lt'] = self.end
+        return lookups
+
+    def q(self, field: str = 'created_at') -> Q:
+        return Q(**self.lookups(field))
+
+    def trunc_date(self, field: str = 'created_at') -> TruncDate:
+        """Groups `field` by local calendar day (use in values()/annotate(), not filters)."""
+        return TruncDate(field, tzinfo=self.tz)
+
+
+class TimeWindowViewMixin:
+    """
+    For analytics views whose helpers take tenant-local (start_date, end_date).
+
+    Call `resolve_timezone()` at the top of the handler; helpers then build
+    their filters with `self.window(start_date, end_date)`.
+    """
+
+    tz = ZoneInfo(settings.TIME_ZONE)
+
+    def resolve_timezone(self, tenant=_REQUEST_TENANT) -> tzinfo:
+        """Uses the request's tenant unless one is given (None for the global timezone)."""
+        if tenant is _REQUEST_TENANT:
+            tenant = getattr(self.request, 'tenant', None) or getattr(self.request.user, 'tenant_id', None)
+        self.tz = tenant_timezone(tenant)
+        return self.tz
+
+    def window(self, start_date: Optional[date], end_date: Optional[date] = None) -> TimeWindow:
+        return TimeWindow(start_date, end_date, self.tz)
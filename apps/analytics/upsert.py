@@ -0,0 +1,138 @@
+"""
+Bulk upserts for the analytics fact tables.
+
+The daily aggregations compute one row per (tenant, course, day) or similar
+natural key. Writing each with get_or_create followed by save() costs two or
+three statements and row locks per row; BulkUpsertWriter buffers the rows and
+writes each batch as a single INSERT ... ON CONFLICT (natural key) DO UPDATE.
+
+The conflict target defaults to the model's unique_together. Only the fields
+the rows supply are updated on conflict, so a writer that computes a subset
+of the metrics leaves the others as they were.
+"""
+
+import logging
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from django.db import models, transaction
+
+logger = logging.getLogger(__name__)
+
+
+class BulkUpsertWriter:
+    """
+    Buffers rows for one model and upserts them in batches on its natural key.
+
+    Use as a context manager so the remainder is flushed on exit:
+
+        with BulkUpsertWriter(CourseAnalytics) as writer:
+            for course in courses:
+                writer.add(tenant=tenant, course_id=course.id, date=day, total_enrollments=...)
+
+    Rows must all supply the same fields. A row added twice for the same key
+    replaces the earlier one. Rows whose key contains NULL never conflict in a
+    unique index, so those are written one by one with update_or_create.
+    """
+
+    BATCH_SIZE = 500
+
+    def __init__(
+        self,
+        model,
+        unique_fields: Optional[Sequence[str]] = None,
+        update_fields: Optional[Sequence[str]] = None,
+        batch_size: Optional[int] = None,
+    ):
+        self.model = model
+        self.unique_fields = [
+            model._meta.get_field(name) for name in (unique_fields or self.natural_key(model))
+        ]
+        self.update_fields = (
+            [model._meta.get_field(name) for name in update_fields] if update_fields is not None else None
+        )
+        self.batch_size = batch_size or self.BATCH_SIZE
+        self.written = 0
+        self._row_fields: Optional[frozenset] = None
+        self._rows: Dict[Tuple, models.Model] = {}
+
+    @staticmethod
+    def natural_key(model) -> Tuple[str, ...]:
+        if not model._meta.unique_together:
+            raise ValueError(f"{model.__name__} has no unique_together to upsert on; pass unique_fields")
+        return tuple(model._meta.unique_together[0])
+
+    def add(self, **values) -> None:
+        """Buffers one row (field names or attnames), flushing when the batch is full."""
+        fields = frozenset(self.model._meta.get_field(name).name for name in values)
+        if self._row_fields is None:
+            missing = {field.name for field in self.unique_fields} - fields
+            if missing:
+                raise ValueError(f"Rows for {self.model.__name__} must include {', '.join(sorted(missing))}")
+            self._row_fields = fields
+            if self.update_fields is None:
+                self.update_fields = self._default_update_fields(fields)
+        elif fields != self._row_fields:
+            raise ValueError(f"All rows for {self.model.__name__} must supply the same fields")
+
+        obj = self.model(**values)
+        self._rows[self._key(obj)] = obj
+        if len(self._rows) >= self.batch_size:
+            self.flush()
+
+    def extend(self, rows: Iterable[dict]) -> None:
+        for row in rows:
+            self.add(**row)
+
+    def flush(self) -> int:
+        """Writes the buffered rows; returns how many were written."""
+        if not self._rows:
+            return 0
+
+        rows = list(self._rows.values())
+        self._rows = {}
+        keyed = [obj for obj in rows if None not in self._key(obj)]
+        null_keyed = [obj for obj in rows if None in self._key(obj)]
+
+        with transaction.atomic():
+            if keyed:
+                self.model.objects.bulk_create(
+                    keyed,
+                    update_conflicts=True,
+                    unique_fields=[field.name for field in self.unique_fields],
+                    update_fields=[field.name for field in self.update_fields],
+                )
+            for obj in null_keyed:
+                self.model.objects.update_or_create(
+                    **{field.attname: getattr(obj, field.attname) for field in self.unique_fields},
+                    defaults={
+                        field.attname: getattr(obj, field.attname)
+                        for field in self.update_fields if not getattr(field, 'auto_now', False)
+                    },
+                )
+
+        self.written += len(rows)
+        logger.debug(f"Upserted {len(rows)} {self.model.__name__} rows")
+        return len(rows)
+
+    def _key(self, obj) -> Tuple:
+        return tuple(getattr(obj, field.attname) for field in self.unique_fields)
+
+    def _default_update_fields(self, row_fields: frozenset) -> List[models.Field]:
+        unique = {field.name for field in self.unique_fields}
+        fields = [
+            field for field in self.model._meta.concrete_fields
+            if field.name in row_fields and field.name not in unique
+        ]
+        # bulk_create sets auto_now values but an upsert only writes the listed fields
+        fields += [
+            field for field in self.model._meta.concrete_fields
+            if getattr(field, 'auto_now', False) and field not in fields
+        ]
+        return fields
+
+    def __enter__(self) -> 'BulkUpsertWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.flush()
@@ -5,8 +5,9 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.db.models import Count, Q, Avg, Sum, Max, Min
 from django.utils import timezone
+from django.utils.dateparse import parse_date
 from datetime import datetime, timedelta
-from django.db.models.functions import TruncDate, TruncWeek, TruncMonth, TruncYear
+from django.db.models.functions import TruncWeek, TruncMonth, TruncYear
 from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from .models import (
@@ -26,7 +27,7 @@ from .serializers import (
     DashboardListSerializer, DashboardDetailSerializer, DashboardCreateUpdateSerializer,
     DashboardWidgetSerializer, WidgetCreateUpdateSerializer,
     StudentPerformanceSerializer, EngagementMetricsSerializer,
-    AssessmentAnalyticsSerializer, LearningPathProgressSerializer,
+    AssessmentAnalyticsSerializer, QuestionAnalyticsSerializer, LearningPathProgressSerializer,
     ContentInteractionSerializer, CourseCompletionSerializer,
     LearningObjectiveProgressSerializer, RevenueAnalyticsSerializer,
     DeviceUsageAnalyticsSerializer, GeographicAnalyticsSerializer,
@@ -35,7 +36,10 @@ from .serializers import (
     LearningEfficiencyDataSerializer, EventLogSerializer
 )
 from .services import AnalyticsService
+from .timewindow import TimeWindowViewMixin, local_today
+from apps.common.pagination import KeysetPagination
 from apps.courses.models import Course
+from apps.discussions.services import DiscussionActivityService
 from apps.enrollments.models import Enrollment
 from apps.users.models import User
 from apps.users.permissions import IsAdmin
@@ -43,7 +47,7 @@ from apps.core.models import Tenant
 
 
 @extend_schema(tags=['Analytics - Admin'])
-class AdminAnalyticsView(APIView):
+class AdminAnalyticsView(TimeWindowViewMixin, APIView):
     """
     Main API view for admin analytics dashboard.
     Provides platform-wide analytics data across all tenants (for superusers)
@@ -66,7 +70,9 @@ class AdminAnalyticsView(APIView):
         tenant_id = request.query_params.get('tenant_id')
         
         # Calculate date range
-        end_date = timezone.now().date()
+        # Calendar days are counted in the scoped tenant's timezone (the global one platform-wide)
+        scope_tenant = tenant_id if user.is_superuser else user.tenant_id
+        end_date = local_today(self.resolve_timezone(scope_tenant))
         if time_range == '7d':
             start_date = end_date - timedelta(days=7)
         elif time_range == '30d':
@@ -137,6 +143,7 @@ class AdminAnalyticsView(APIView):
 
     def _get_overview_metrics(self, tenants, start_date, end_date):
         """Get overview metrics for admin dashboard."""
+        window = self.window(start_date, end_date)
         tenant_ids = list(tenants.values_list('id', flat=True))
         
         # Total users across selected tenants
@@ -164,15 +171,13 @@ class AdminAnalyticsView(APIView):
         # New users in date range
         new_users = User.objects.filter(
             tenant_id__in=tenant_ids,
-            created_at__date__gte=start_date,
-            created_at__date__lte=end_date
+            **window.lookups('created_at')
         ).count()
         
         # New enrollments in date range
         new_enrollments = Enrollment.objects.filter(
             course__instructor__tenant_id__in=tenant_ids,
-            enrolled_at__date__gte=start_date,
-            enrolled_at__date__lte=end_date
+            **window.lookups('enrolled_at')
         ).count()
         
         # Average completion rate
@@ -200,15 +205,15 @@ class AdminAnalyticsView(APIView):
 
     def _get_user_growth(self, tenants, start_date, end_date):
         """Get user registration trends over time."""
+        window = self.window(start_date, end_date)
         tenant_ids = list(tenants.values_list('id', flat=True))
         
         # Group registrations by date
         user_registrations = User.objects.filter(
             tenant_id__in=tenant_ids,
-            created_at__date__gte=start_date,
-            created_at__date__lte=end_date
+            **window.lookups('created_at')
         ).annotate(
-            date=TruncDate('created_at')
+            date=window.trunc_date('created_at')
         ).values('date').annotate(
             count=Count('id')
         ).order_by('date')
@@ -225,40 +230,42 @@ class AdminAnalyticsView(APIView):
     def _get_tenant_comparison(self, tenants, start_date, end_date):
         """Get comparison metrics across tenants."""
         comparison_data = []
+        tenants = list(tenants)
+        tenant_ids = [tenant.id for tenant in tenants]
+        
+        # Per-tenant counts, one grouped query each
+        users_by_tenant = dict(
+            User.objects.filter(tenant_id__in=tenant_ids).values('tenant_id').annotate(
+                count=Count('id')
+            ).order_by().values_list('tenant_id', 'count')
+        )
+        courses_by_tenant = dict(
+            Course.objects.filter(instructor__tenant_id__in=tenant_ids).values('instructor__tenant_id').annotate(
+                count=Count('id')
+            ).order_by().values_list('instructor__tenant_id', 'count')
+        )
+        enrollments_by_tenant = {
+            row['course__instructor__tenant_id']: row
+            for row in Enrollment.objects.filter(
+                course__instructor__tenant_id__in=tenant_ids
+            ).values('course__instructor__tenant_id').annotate(
+                total=Count('id'),
+                active=Count('id', filter=Q(status=Enrollment.Status.ACTIVE)),
+                completed=Count('id', filter=Q(status=Enrollment.Status.COMPLETED)),
+            ).order_by()
+        }
         
         for tenant in tenants:
-            # Users count
-            users_count = User.objects.filter(tenant=tenant).count()
-            
-            # Courses count
-            courses_count = Course.objects.filter(instructor__tenant=tenant).count()
-            
-            # Enrollments count
-            enrollments_count = Enrollment.objects.filter(
-                course__instructor__tenant=tenant
-            ).count()
-            
-            # Active enrollments
-            active_enrollments = Enrollment.objects.filter(
-                course__instructor__tenant=tenant,
-                status=Enrollment.Status.ACTIVE
-            ).count()
-            
-            # Completed enrollments
-            completed_enrollments = Enrollment.objects.filter(
-                course__instructor__tenant=tenant,
-                status=Enrollment.Status.COMPLETED
-            ).count()
-            
+            enrollments = enrollments_by_tenant.get(tenant.id, {'total': 0, 'active': 0, 'completed': 0})
             comparison_data.append({
                 'id': str(tenant.id),
                 'name': tenant.name,
                 'slug': tenant.slug,
-                'users': users_count,
-                'courses': courses_count,
-                'enrollments': enrollments_count,
-                'activeEnrollments': active_enrollments,
-                'completedEnrollments': completed_enrollments,
+                'users': users_by_tenant.get(tenant.id, 0),
+                'courses': courses_by_tenant.get(tenant.id, 0),
+                'enrollments': enrollments['total'],
+                'activeEnrollments': enrollments['active'],
+                'completedEnrollments': enrollments['completed'],
             })
         
         # Sort by enrollments descending
@@ -268,13 +275,13 @@ class AdminAnalyticsView(APIView):
 
     def _get_system_activity(self, tenants, start_date, end_date):
         """Get system activity metrics."""
+        window = self.window(start_date, end_date)
         tenant_ids = list(tenants.values_list('id', flat=True))
         
         # Events by type
         events_by_type = Event.objects.filter(
             tenant_id__in=tenant_ids,
-            created_at__date__gte=start_date,
-            created_at__date__lte=end_date
+            **window.lookups('created_at')
         ).values('event_type').annotate(
             count=Count('id')
         ).order_by('-count')[:10]
@@ -288,10 +295,9 @@ class AdminAnalyticsView(APIView):
         login_frequency = Event.objects.filter(
             tenant_id__in=tenant_ids,
             event_type='USER_LOGIN',
-            created_at__date__gte=start_date,
-            created_at__date__lte=end_date
+            **window.lookups('created_at')
         ).annotate(
-            date=TruncDate('created_at')
+            date=window.trunc_date('created_at')
         ).values('date').annotate(
             count=Count('id')
         ).order_by('date')
@@ -305,10 +311,9 @@ class AdminAnalyticsView(APIView):
         from django.db.models.functions import ExtractHour
         peak_times = Event.objects.filter(
             tenant_id__in=tenant_ids,
-            created_at__date__gte=start_date,
-            created_at__date__lte=end_date
+            **window.lookups('created_at')
         ).annotate(
-            hour=ExtractHour('created_at')
+            hour=ExtractHour('created_at', tzinfo=window.tz)
         ).values('hour').annotate(
             count=Count('id')
         ).order_by('hour')
@@ -331,7 +336,7 @@ class AdminAnalyticsView(APIView):
         # Most popular courses (by enrollment)
         popular_courses = Course.objects.filter(
             instructor__tenant_id__in=tenant_ids
-        ).annotate(
+        ).select_related('instructor__tenant').annotate(
             enrollment_count=Count('enrollments')
         ).order_by('-enrollment_count')[:10]
         
@@ -433,13 +438,13 @@ class AdminAnalyticsView(APIView):
 
     def _get_event_distribution(self, tenants, start_date, end_date):
         """Get event type distribution."""
+        window = self.window(start_date, end_date)
         tenant_ids = list(tenants.values_list('id', flat=True))
         
         # Events by type for pie chart
         event_distribution = Event.objects.filter(
             tenant_id__in=tenant_ids,
-            created_at__date__gte=start_date,
-            created_at__date__lte=end_date
+            **window.lookups('created_at')
         ).values('event_type').annotate(
             count=Count('id')
         ).order_by('-count')
@@ -459,13 +464,13 @@ class AdminAnalyticsView(APIView):
 
     def _get_geographic_distribution(self, tenants, start_date, end_date):
         """Get geographic distribution of users."""
+        window = self.window(start_date, end_date)
         tenant_ids = list(tenants.values_list('id', flat=True))
         
         # Get geographic data from events
         geo_data = Event.objects.filter(
             tenant_id__in=tenant_ids,
-            created_at__date__gte=start_date,
-            created_at__date__lte=end_date,
+            **window.lookups('created_at'),
             country__isnull=False
         ).exclude(country='').values('country', 'region').annotate(
             users=Count('user_id', distinct=True),
@@ -485,13 +490,13 @@ class AdminAnalyticsView(APIView):
 
     def _get_device_usage(self, tenants, start_date, end_date):
         """Get device usage statistics."""
+        window = self.window(start_date, end_date)
         tenant_ids = list(tenants.values_list('id', flat=True))
         
         # Device distribution from events
         device_stats = Event.objects.filter(
             tenant_id__in=tenant_ids,
-            created_at__date__gte=start_date,
-            created_at__date__lte=end_date,
+            **window.lookups('created_at'),
             device_type__isnull=False
         ).exclude(device_type='').values('device_type').annotate(
             users=Count('user_id', distinct=True),
@@ -839,7 +844,7 @@ class DashboardWidgetViewSet(viewsets.ModelViewSet):
 
 
 @extend_schema(tags=['Analytics - Widget Data'])
-class WidgetDataView(APIView):
+class WidgetDataView(TimeWindowViewMixin, APIView):
     """
     API view for fetching widget data based on data source.
     This endpoint returns the actual data for a widget to display.
@@ -869,7 +874,8 @@ class WidgetDataView(APIView):
         tenant_id = request.query_params.get('tenant_id')
         
         # Calculate date range
-        end_date = timezone.now().date()
+        scope_tenant = tenant_id if request.user.is_superuser else request.user.tenant_id
+        end_date = local_today(self.resolve_timezone(scope_tenant))
         if time_range == '7d':
             start_date = end_date - timedelta(days=7)
         elif time_range == '30d':
@@ -938,12 +944,12 @@ class WidgetDataView(APIView):
 
     def _get_user_growth_data(self, tenant_ids, start_date, end_date, config):
         """Get user registration trends over time."""
+        window = self.window(start_date, end_date)
         user_registrations = User.objects.filter(
             tenant_id__in=tenant_ids,
-            created_at__date__gte=start_date,
-            created_at__date__lte=end_date
+            **window.lookups('created_at')
         ).annotate(
-            date=TruncDate('created_at')
+            date=window.trunc_date('created_at')
         ).values('date').annotate(
             count=Count('id')
         ).order_by('date')
@@ -955,12 +961,12 @@ class WidgetDataView(APIView):
 
     def _get_enrollment_stats(self, tenant_ids, start_date, end_date, config):
         """Get enrollment statistics."""
+        window = self.window(start_date, end_date)
         enrollments = Enrollment.objects.filter(
             course__instructor__tenant_id__in=tenant_ids,
-            enrolled_at__date__gte=start_date,
-            enrolled_at__date__lte=end_date
+            **window.lookups('enrolled_at')
         ).annotate(
-            date=TruncDate('enrolled_at')
+            date=window.trunc_date('enrolled_at')
         ).values('date').annotate(
             count=Count('id')
         ).order_by('date')
@@ -991,10 +997,10 @@ class WidgetDataView(APIView):
 
     def _get_completion_rates(self, tenant_ids, start_date, end_date, config):
         """Get completion rate trends."""
+        window = self.window(start_date, end_date)
         completion_data = Enrollment.objects.filter(
             course__instructor__tenant_id__in=tenant_ids,
-            enrolled_at__date__gte=start_date,
-            enrolled_at__date__lte=end_date
+            **window.lookups('enrolled_at')
         ).annotate(
             month=TruncMonth('enrolled_at')
         ).values('month').annotate(
@@ -1012,13 +1018,13 @@ class WidgetDataView(APIView):
 
     def _get_login_frequency(self, tenant_ids, start_date, end_date, config):
         """Get login frequency data."""
+        window = self.window(start_date, end_date)
         login_data = Event.objects.filter(
             tenant_id__in=tenant_ids,
             event_type='USER_LOGIN',
-            created_at__date__gte=start_date,
-            created_at__date__lte=end_date
+            **window.lookups('created_at')
         ).annotate(
-            date=TruncDate('created_at')
+            date=window.trunc_date('created_at')
         ).values('date').annotate(
             count=Count('id')
         ).order_by('date')
@@ -1030,14 +1036,14 @@ class WidgetDataView(APIView):
 
     def _get_peak_usage(self, tenant_ids, start_date, end_date, config):
         """Get peak usage times by hour."""
+        window = self.window(start_date, end_date)
         from django.db.models.functions import ExtractHour
         
         peak_data = Event.objects.filter(
             tenant_id__in=tenant_ids,
-            created_at__date__gte=start_date,
-            created_at__date__lte=end_date
+            **window.lookups('created_at')
         ).annotate(
-            hour=ExtractHour('created_at')
+            hour=ExtractHour('created_at', tzinfo=window.tz)
         ).values('hour').annotate(
             count=Count('id')
         ).order_by('hour')
@@ -1070,10 +1076,10 @@ class WidgetDataView(APIView):
 
     def _get_device_usage(self, tenant_ids, start_date, end_date, config):
         """Get device usage distribution."""
+        window = self.window(start_date, end_date)
         device_stats = Event.objects.filter(
             tenant_id__in=tenant_ids,
-            created_at__date__gte=start_date,
-            created_at__date__lte=end_date,
+            **window.lookups('created_at'),
             device_type__isnull=False
         ).exclude(device_type='').values('device_type').annotate(
             count=Count('id')
@@ -1086,10 +1092,10 @@ class WidgetDataView(APIView):
 
     def _get_geographic_data(self, tenant_ids, start_date, end_date, config):
         """Get geographic distribution of users."""
+        window = self.window(start_date, end_date)
         geo_data = Event.objects.filter(
             tenant_id__in=tenant_ids,
-            created_at__date__gte=start_date,
-            created_at__date__lte=end_date,
+            **window.lookups('created_at'),
             country__isnull=False
         ).exclude(country='').values('country').annotate(
             users=Count('user_id', distinct=True)
@@ -1102,10 +1108,10 @@ class WidgetDataView(APIView):
 
     def _get_events_by_type(self, tenant_ids, start_date, end_date, config):
         """Get event distribution by type."""
+        window = self.window(start_date, end_date)
         event_data = Event.objects.filter(
             tenant_id__in=tenant_ids,
-            created_at__date__gte=start_date,
-            created_at__date__lte=end_date
+            **window.lookups('created_at')
         ).values('event_type').annotate(
             count=Count('id')
         ).order_by('-count')[:10]
@@ -1134,12 +1140,12 @@ class WidgetDataView(APIView):
 
     def _get_active_users(self, tenant_ids, start_date, end_date, config):
         """Get active user counts over time."""
+        window = self.window(start_date, end_date)
         active_users = Event.objects.filter(
             tenant_id__in=tenant_ids,
-            created_at__date__gte=start_date,
-            created_at__date__lte=end_date
+            **window.lookups('created_at')
         ).annotate(
-            date=TruncDate('created_at')
+            date=window.trunc_date('created_at')
         ).values('date').annotate(
             active_users=Count('user_id', distinct=True)
         ).order_by('date')
@@ -1151,10 +1157,10 @@ class WidgetDataView(APIView):
 
     def _get_recent_activity(self, tenant_ids, start_date, end_date, config):
         """Get recent activity feed."""
+        window = self.window(start_date, end_date)
         events = Event.objects.filter(
             tenant_id__in=tenant_ids,
-            created_at__date__gte=start_date,
-            created_at__date__lte=end_date
+            **window.lookups('created_at')
         ).select_related('user').order_by('-created_at')[:20]
         
         return [
@@ -1232,7 +1238,7 @@ class WidgetMetaView(APIView):
             'recent_activity': 'Recent user activity feed',
         }
         return descriptions.get(data_source, '')
-class InstructorAnalyticsView(APIView):
+class InstructorAnalyticsView(TimeWindowViewMixin, APIView):
     """
     Main API view for instructor analytics dashboard.
     This serves the complete analytics data structure for the frontend.
@@ -1254,7 +1260,7 @@ class InstructorAnalyticsView(APIView):
         course_id = request.query_params.get('course_id', 'all')
         
         # Calculate date range
-        end_date = timezone.now().date()
+        end_date = local_today(self.resolve_timezone(user.tenant_id))
         if time_range == '7d':
             start_date = end_date - timedelta(days=7)
         elif time_range == '30d':
@@ -1376,16 +1382,11 @@ class InstructorAnalyticsView(APIView):
         
         # Get average completion rate per course (consistent with Dashboard)
         # Dashboard calculates completion rate per course, then averages them
-        course_completion_rates = []
-        for course in courses:
-            total_enrollments_course = Enrollment.objects.filter(course=course).count()
-            completed_enrollments = Enrollment.objects.filter(
-                course=course,
-                status=Enrollment.Status.COMPLETED
-            ).count()
-            if total_enrollments_course > 0:
-                rate = (completed_enrollments / total_enrollments_course) * 100
-                course_completion_rates.append(rate)
+        course_completion_rates = [
+            counts['completed'] / counts['total'] * 100
+            for counts in self._enrollment_counts_by_course(courses).values()
+            if counts['total'] > 0
+        ]
         
         completion_rate = sum(course_completion_rates) / len(course_completion_rates) if course_completion_rates else 0
         
@@ -1421,42 +1422,60 @@ class InstructorAnalyticsView(APIView):
             'engagementRate': round(engagement_rate, 1),
         }
 
+    def _enrollment_counts_by_course(self, courses):
+        """{course id: total, completed and distinct learner enrollments}, in one query."""
+        return {
+            row['course_id']: row
+            for row in Enrollment.objects.filter(course__in=courses).values('course_id').annotate(
+                total=Count('id'),
+                completed=Count('id', filter=Q(status=Enrollment.Status.COMPLETED)),
+                learners=Count('user', filter=Q(user__role=User.Role.LEARNER), distinct=True),
+            ).order_by()
+        }
+
+    def _revenue_by_course(self, courses, start_date, end_date):
+        """{course id: revenue and enrolled students in the window}, in one query."""
+        return {
+            row['course_id']: row
+            for row in RevenueAnalytics.objects.filter(
+                course__in=courses,
+                period_start__gte=start_date,
+                period_end__lte=end_date
+            ).values('course_id').annotate(
+                total_revenue=Sum('total_revenue'),
+                total_students=Sum('enrolled_students')
+            ).order_by()
+        }
+
     def _get_course_performance(self, courses, start_date, end_date):
         """Get course performance data."""
         performance_data = []
+        enrollment_counts = self._enrollment_counts_by_course(courses)
+        revenue_by_course = self._revenue_by_course(courses, start_date, end_date)
+        analytics_by_course = {
+            row['course_id']: row
+            for row in CourseAnalytics.objects.filter(
+                course_id__in=courses.values('id'),
+                date__gte=start_date,
+                date__lte=end_date
+            ).values('course_id').annotate(
+                avg_rating=Avg('avg_rating'),
+                avg_engagement=Avg('avg_engagement_score')
+            ).order_by()
+        }
         
         for course in courses:
-            # Get students count
-            students_count = User.objects.filter(
-                enrollments__course=course,
-                role=User.Role.LEARNER
-            ).distinct().count()
-            
-            # Get completion rate using Enrollment.Status.COMPLETED (consistent with Dashboard)
-            total_enrollments = Enrollment.objects.filter(course=course).count()
-            completed_enrollments = Enrollment.objects.filter(
-                course=course,
-                status=Enrollment.Status.COMPLETED
-            ).count()
+            counts = enrollment_counts.get(course.id, {'total': 0, 'completed': 0, 'learners': 0})
+            students_count = counts['learners']
             
-            completion_rate = (completed_enrollments / total_enrollments * 100) if total_enrollments > 0 else 0
+            # Completion rate using Enrollment.Status.COMPLETED (consistent with Dashboard)
+            total_enrollments = counts['total']
+            completion_rate = (counts['completed'] / total_enrollments * 100) if total_enrollments > 0 else 0
             
-            # Get revenue
-            revenue = RevenueAnalytics.objects.filter(
-                course=course,
-                period_start__gte=start_date,
-                period_end__lte=end_date
-            ).aggregate(total=Sum('total_revenue'))['total'] or 0
+            revenue = revenue_by_course.get(course.id, {}).get('total_revenue') or 0
             
-            # Get rating and engagement from CourseAnalytics
-            course_analytics = CourseAnalytics.objects.filter(
-                course_id=course.id,
-                date__gte=start_date,
-                date__lte=end_date
-            ).aggregate(
-                avg_rating=Avg('avg_rating'),
-                avg_engagement=Avg('avg_engagement_score')
-            )
+            # Rating and engagement from CourseAnalytics
+            course_analytics = analytics_by_course.get(course.id, {'avg_rating': None, 'avg_engagement': None})
             rating = float(course_analytics['avg_rating']) if course_analytics['avg_rating'] else 0
             engagement = float(course_analytics['avg_engagement']) if course_analytics['avg_engagement'] else 0
             
@@ -1477,19 +1496,22 @@ class InstructorAnalyticsView(APIView):
         # Daily engagement
         daily_engagement = []
         current_date = start_date
-        
-        while current_date <= end_date:
-            # Get engagement metrics for this date
-            engagement_data = EngagementMetrics.objects.filter(
+        engagement_by_date = {
+            row['date']: row
+            for row in EngagementMetrics.objects.filter(
                 course__in=courses,
-                date=current_date
-            ).aggregate(
+                date__gte=start_date,
+                date__lte=end_date
+            ).values('date').annotate(
                 active_students=Sum('active_users'),
                 total_time=Sum('session_duration')
-            )
-            
-            active_students = engagement_data['active_students'] or 0
-            time_spent = engagement_data['total_time'] or timedelta(0)
+            ).order_by()
+        }
+        
+        while current_date <= end_date:
+            engagement_data = engagement_by_date.get(current_date, {})
+            active_students = engagement_data.get('active_students') or 0
+            time_spent = engagement_data.get('total_time') or timedelta(0)
             time_spent_hours = time_spent.total_seconds() / 3600 if time_spent else 0
             
             daily_engagement.append({
@@ -1536,17 +1558,11 @@ class InstructorAnalyticsView(APIView):
         
         # Revenue by course
         revenue_by_course = []
+        revenue_totals = self._revenue_by_course(courses, start_date, end_date)
         for course in courses:
-            revenue = RevenueAnalytics.objects.filter(
-                course=course,
-                period_start__gte=start_date,
-                period_end__lte=end_date
-            ).aggregate(
-                total_revenue=Sum('total_revenue'),
-                total_students=Sum('enrolled_students')
-            )
+            revenue = revenue_totals.get(course.id)
             
-            if revenue['total_revenue']:
+            if revenue and revenue['total_revenue']:
                 revenue_by_course.append({
                     'courseTitle': course.title,
                     'revenue': float(revenue['total_revenue']),
@@ -1560,14 +1576,19 @@ class InstructorAnalyticsView(APIView):
 
     def _get_top_performers(self, courses, start_date, end_date):
         """Get top performing courses and students."""
+        window = self.window(start_date, end_date)
         # Top courses by completion rate
         top_courses = []
-        for course in courses:
-            enrollments = User.objects.filter(enrollments__course=course).count()
-            completions = CourseCompletion.objects.filter(
-                course=course,
+        enrollment_counts = self._enrollment_counts_by_course(courses)
+        completion_counts = dict(
+            CourseCompletion.objects.filter(
+                course__in=courses,
                 completion_date__isnull=False
-            ).count()
+            ).values('course_id').annotate(count=Count('id')).order_by().values_list('course_id', 'count')
+        )
+        for course in courses:
+            enrollments = enrollment_counts.get(course.id, {}).get('total', 0)
+            completions = completion_counts.get(course.id, 0)
             
             completion_rate = (completions / enrollments * 100) if enrollments > 0 else 0
             
@@ -1580,11 +1601,10 @@ class InstructorAnalyticsView(APIView):
         # Sort by completion rate
         top_courses.sort(key=lambda x: x['value'], reverse=True)
         
-        # Top students (use __date for proper date comparison with datetime fields)
+        # Top students
         top_students = StudentPerformance.objects.filter(
             course__in=courses,
-            created_at__date__gte=start_date,
-            created_at__date__lte=end_date
+            **window.lookups('created_at')
         ).select_related('student', 'course').order_by('-score')[:10]
         
         top_students_data = []
@@ -1685,6 +1705,7 @@ class InstructorAnalyticsView(APIView):
     def _get_activity_heatmap(self, courses, start_date, end_date):
         """Generate activity heatmap data from real Event data."""
         from django.db.models.functions import ExtractHour, ExtractWeekDay
+        window = self.window(start_date, end_date)
         
         heatmap_data = []
         days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
@@ -1695,12 +1716,11 @@ class InstructorAnalyticsView(APIView):
         # Query events grouped by weekday and hour
         # Note: ExtractWeekDay returns 1=Sunday, 2=Monday, ..., 7=Saturday in Django
         event_counts = Event.objects.filter(
-            created_at__date__gte=start_date,
-            created_at__date__lte=end_date,
+            **window.lookups('created_at'),
             context_data__course_id__in=[str(cid) for cid in course_ids]
         ).annotate(
-            weekday=ExtractWeekDay('created_at'),
-            hour=ExtractHour('created_at')
+            weekday=ExtractWeekDay('created_at', tzinfo=window.tz),
+            hour=ExtractHour('created_at', tzinfo=window.tz)
         ).values('weekday', 'hour').annotate(
             count=Count('id')
         ).order_by('weekday', 'hour')
@@ -1735,6 +1755,7 @@ class InstructorAnalyticsView(APIView):
 
     def _get_device_usage(self, courses, start_date, end_date):
         """Get device usage analytics."""
+        window = self.window(start_date, end_date)
         device_usage = DeviceUsageAnalytics.objects.filter(
             tenant=courses.first().instructor.tenant if courses.exists() else None,
             date__gte=start_date,
@@ -1755,8 +1776,7 @@ class InstructorAnalyticsView(APIView):
             # Fallback to Event model device_type data
             course_ids = list(courses.values_list('id', flat=True))
             event_device_counts = Event.objects.filter(
-                created_at__date__gte=start_date,
-                created_at__date__lte=end_date,
+                **window.lookups('created_at'),
                 device_type__isnull=False
             ).filter(
                 Q(context_data__course_id__in=[str(cid) for cid in course_ids]) |
@@ -1799,6 +1819,7 @@ class InstructorAnalyticsView(APIView):
 
     def _get_geographic_data(self, courses, start_date, end_date):
         """Get geographic distribution data."""
+        window = self.window(start_date, end_date)
         geo_data = GeographicAnalytics.objects.filter(
             tenant=courses.first().instructor.tenant if courses.exists() else None
         ).values('region').annotate(
@@ -1818,8 +1839,7 @@ class InstructorAnalyticsView(APIView):
             # Fallback: Try to get geographic data from Event model
             course_ids = list(courses.values_list('id', flat=True))
             event_geo_data = Event.objects.filter(
-                created_at__date__gte=start_date,
-                created_at__date__lte=end_date,
+                **window.lookups('created_at'),
                 country__isnull=False
             ).filter(
                 Q(context_data__course_id__in=[str(cid) for cid in course_ids]) |
@@ -1841,6 +1861,7 @@ class InstructorAnalyticsView(APIView):
 
     def _get_learning_paths(self, courses, start_date, end_date):
         """Get learning path analytics from real data."""
+        window = self.window(start_date, end_date)
         from apps.learning_paths.models import LearningPath, LearningPathStep
         from django.contrib.contenttypes.models import ContentType
         
@@ -1862,8 +1883,7 @@ class InstructorAnalyticsView(APIView):
         # It has status field and progress_percentage property calculated from step_progress
         learning_path_data = LearningPathProgress.objects.filter(
             learning_path_id__in=learning_path_ids,
-            created_at__date__gte=start_date,
-            created_at__date__lte=end_date
+            **window.lookups('created_at')
         ).values('learning_path__title').annotate(
             total_count=Count('id'),
             completed_count=Count('id', filter=Q(status='COMPLETED'))
@@ -1986,11 +2006,12 @@ class InstructorAnalyticsView(APIView):
 
     def _get_social_learning(self, courses, start_date, end_date):
         """Get social learning metrics from real data."""
-        from .models import DiscussionInteraction, PeerReview, CollaborativeProject
+        window = self.window(start_date, end_date)
+        from .models import PeerReview, CollaborativeProject
         
         course_ids = list(courses.values_list('id', flat=True))
         
-        # Get discussion data from SocialLearningMetrics or DiscussionInteraction
+        # Get discussion data from SocialLearningMetrics or the discussion activity log
         discussions_data = SocialLearningMetrics.objects.filter(
             course_id__in=course_ids,
             date__gte=start_date,
@@ -2008,11 +2029,22 @@ class InstructorAnalyticsView(APIView):
                 'participants': item['participants'] or 0,
             })
         
+        # Courses without aggregated rows fall back to the discussion activity log
+        covered = {item['course_id'] for item in discussions_data}
+        missing = [course_id for course_id in course_ids if course_id not in covered]
+        if missing:
+            activity = DiscussionActivityService.summarize_by_course(missing, start_date, end_date)
+            for course_id, summary in activity.items():
+                discussions.append({
+                    'courseId': str(course_id),
+                    'messages': summary['messages'],
+                    'participants': summary['participants'],
+                })
+        
         # Get peer review data
         peer_reviews_data = PeerReview.objects.filter(
             course__in=courses,
-            created_at__date__gte=start_date,
-            created_at__date__lte=end_date,
+            **window.lookups('created_at'),
             status='submitted'
         ).values('course_id').annotate(
             reviews=Count('id'),
@@ -2030,8 +2062,7 @@ class InstructorAnalyticsView(APIView):
         # Get collaborative projects data
         projects_data = CollaborativeProject.objects.filter(
             course__in=courses,
-            created_at__date__gte=start_date,
-            created_at__date__lte=end_date
+            **window.lookups('created_at')
         ).values('id', 'title').annotate(
             participant_count=Count('participants'),
             completion=Avg('completion_rate')
@@ -2137,6 +2168,18 @@ class AssessmentAnalyticsViewSet(viewsets.ReadOnlyModelViewSet):
             return AssessmentAnalytics.objects.filter(assessment__course__instructor=user)
         return AssessmentAnalytics.objects.none()
 
+    @extend_schema(
+        summary="Assessment item analysis",
+        description="Per-question p-values, discrimination and distractor counts from the latest item analysis run.",
+        responses={200: QuestionAnalyticsSerializer(many=True)},
+    )
+    @action(detail=True, methods=['get'])
+    def items(self, request, pk=None):
+        """Return question-level statistics for the analysed assessment."""
+        analytics = self.get_object()
+        items = analytics.question_analytics.select_related('question')
+        return Response(QuestionAnalyticsSerializer(items, many=True).data)
+
 
 @extend_schema(tags=['Analytics - Tracking'])
 class AnalyticsTrackingView(APIView):
@@ -2159,13 +2202,14 @@ class AnalyticsTrackingView(APIView):
 
 
 @extend_schema(tags=['Analytics - Event Log'])
-class EventLogViewSet(viewsets.ReadOnlyModelViewSet):
+class EventLogViewSet(TimeWindowViewMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for viewing and filtering event logs (admin only).
     Provides list and detail views with filtering by event type, user, date range.
     """
     serializer_class = EventLogSerializer
     permission_classes = [IsAdmin]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         """
@@ -2188,13 +2232,12 @@ class EventLogViewSet(viewsets.ReadOnlyModelViewSet):
         if user_id:
             queryset = queryset.filter(user_id=user_id)
 
-        # Filter by date range
-        start_date = self.request.query_params.get('start_date')
-        end_date = self.request.query_params.get('end_date')
-        if start_date:
-            queryset = queryset.filter(created_at__date__gte=start_date)
-        if end_date:
-            queryset = queryset.filter(created_at__date__lte=end_date)
+        # Filter by tenant-local date range
+        start_date = parse_date(self.request.query_params.get('start_date') or '')
+        end_date = parse_date(self.request.query_params.get('end_date') or '')
+        if start_date or end_date:
+            self.resolve_timezone()
+            queryset = queryset.filter(**self.window(start_date, end_date).lookups('created_at'))
 
         # Filter by device type
         device_type = self.request.query_params.get('device_type')
@@ -2249,15 +2292,12 @@ class EventLogViewSet(viewsets.ReadOnlyModelViewSet):
         queryset = self.get_queryset()
         
         # Get date range from params or default to last 7 days
-        end_date = timezone.now().date()
+        end_date = local_today(self.resolve_timezone())
         start_date = end_date - timedelta(days=7)
         
-        start_date_param = request.query_params.get('start_date')
-        end_date_param = request.query_params.get('end_date')
-        if start_date_param:
-            start_date = start_date_param
-        if end_date_param:
-            end_date = end_date_param
+        start_date = parse_date(request.query_params.get('start_date') or '') or start_date
+        end_date = parse_date(request.query_params.get('end_date') or '') or end_date
+        window = self.window(start_date, end_date)
 
         # Total events
         total_events = queryset.count()
@@ -2269,10 +2309,9 @@ class EventLogViewSet(viewsets.ReadOnlyModelViewSet):
 
         # Events by day
         events_by_day = queryset.filter(
-            created_at__date__gte=start_date,
-            created_at__date__lte=end_date
+            **window.lookups('created_at')
         ).annotate(
-            date=TruncDate('created_at')
+            date=window.trunc_date('created_at')
         ).values('date').annotate(
             count=Count('id')
         ).order_by('date')
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Assessment, AssessmentAttempt, Question
+from .models import Assessment, AssessmentAttempt, AttemptSubmission, Question
 
 
 class QuestionInline(admin.StackedInline):  # Or TabularInline
@@ -142,3 +142,20 @@ class AssessmentAttemptAdmin(admin.ModelAdmin):
             },
         ),
     )
+
+
+@admin.register(AttemptSubmission)
+class AttemptSubmissionAdmin(admin.ModelAdmin):
+    list_display = ("attempt", "status", "current_stage", "created_at", "completed_at")
+    list_filter = ("status", "current_stage")
+    search_fields = ("attempt__user__email", "attempt__assessment__title", "idempotency_key")
+    list_select_related = ("attempt", "attempt__user", "attempt__assessment")
+    readonly_fields = (
+        "attempt",
+        "idempotency_key",
+        "status",
+        "current_stage",
+        "completed_stages",
+        "error",
+        "completed_at",
+    )
@@ -5,3 +5,7 @@ class AssessmentsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.assessments"
     verbose_name = "Assessments and Quizzes"
+
+    def ready(self):
+        """Import signal handlers when the app is ready."""
+        import apps.assessments.signals  # noqa: F401
@@ -0,0 +1,349 @@
+"""
+Compiled grading plans.
+
+A GradingPlan is an immutable, precomputed view of an assessment's answer key:
+per-question grader callables, correct option sets, normalised accepted answers
+and point values. Plans are cached in-process per (assessment, grading_version),
+so grading many attempts for the same assessment only derives the answer key once.
+Any Question save/delete bumps Assessment.grading_version (see signals.py),
+which naturally invalidates cached plans.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, Callable, Optional
+
+from .models import Assessment, Question
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of compiled plans kept per process
+GRADING_PLAN_CACHE_SIZE = 256
+
+MANUAL_QUESTION_TYPES = frozenset(
+    [Question.QuestionType.ESSAY, Question.QuestionType.CODE]
+)
+
+
+@dataclass(frozen=True)
+class QuestionPlan:
+    """Precomputed grading data for a single question."""
+
+    question_id: str
+    question_type: str
+    points: Decimal
+    grader: Optional[Callable[["QuestionPlan", Any], Decimal]] = None
+    requires_manual_grading: bool = False
+    # MC / TF (options format)
+    correct_option_ids: frozenset = frozenset()
+    allow_multiple: bool = False
+    # TF (direct boolean format)
+    correct_answer: Optional[bool] = None
+    # SA
+    accepted_answers: frozenset = frozenset()
+    case_sensitive: bool = False
+    # MT: ((prompt_id, match_id), ...)
+    correct_pairs: tuple = ()
+    # FB: ((blank_id, frozenset(accepted)), ...)
+    blanks: tuple = ()
+    # Points awarded per matched pair / filled blank
+    partial_points: Decimal = Decimal(0)
+    compile_error: str = ""
+
+    def grade(self, user_answer) -> Decimal:
+        """Scores a single answer. Raises on malformed answers or answer keys."""
+        if self.compile_error:
+            raise ValueError(self.compile_error)
+        if self.grader is None:
+            return Decimal(0)
+        return self.grader(self, user_answer)
+
+
+@dataclass(frozen=True)
+class GradingPlan:
+    """Immutable grading plan for one version of an assessment."""
+
+    assessment_id: str
+    version: int
+    max_score: Decimal
+    questions: tuple = field(default_factory=tuple)
+
+
+def _normalise(text: str, case_sensitive: bool) -> str:
+    text = text.strip()
+    return text if case_sensitive else text.lower()
+
+
+# --- Graders ---
+
+
+def _grade_multiple_choice(plan: QuestionPlan, user_answer) -> Decimal:
+    if not isinstance(user_answer, list):
+        user_answer = [user_answer]  # Ensure list for consistency
+    user_selected_ids = set(user_answer)
+
+    if plan.allow_multiple:
+        # Simple exact match scoring for multiple answers (could implement partial credit)
+        is_correct = user_selected_ids == plan.correct_option_ids
+    else:
+        # Single choice
+        is_correct = (
+            len(user_selected_ids) == 1
+            and next(iter(user_selected_ids)) in plan.correct_option_ids
+        )
+
+    return plan.points if is_correct else Decimal(0)
+
+
+def _as_bool(value) -> bool:
+    if isinstance(value, str):
+        return value.lower() == "true"
+    return bool(value)
+
+
+def _grade_true_false_boolean(plan: QuestionPlan, user_answer) -> Decimal:
+    # Normalize user answer to boolean
+    if isinstance(user_answer, list) and len(user_answer) == 1:
+        user_answer_bool = _as_bool(user_answer[0])
+    else:
+        user_answer_bool = _as_bool(user_answer)
+
+    return plan.points if user_answer_bool == plan.correct_answer else Decimal(0)
+
+
+def _grade_true_false_options(plan: QuestionPlan, user_answer) -> Decimal:
+    # Normalize user answer to option ID
+    if isinstance(user_answer, list):
+        user_selected_id = user_answer[0] if user_answer else None
+    else:
+        user_selected_id = user_answer
+
+    return plan.points if user_selected_id in plan.correct_option_ids else Decimal(0)
+
+
+def _grade_short_answer(plan: QuestionPlan, user_answer) -> Decimal:
+    if not isinstance(user_answer, str):
+        return Decimal(0)
+    if _normalise(user_answer, plan.case_sensitive) in plan.accepted_answers:
+        return plan.points
+    return Decimal(0)
+
+
+def _grade_matching(plan: QuestionPlan, user_answer) -> Decimal:
+    if not plan.correct_pairs or not isinstance(user_answer, list):
+        return Decimal(0)
+
+    user_answers_map = {
+        ua.get("prompt_id"): ua.get("selected_match_id") for ua in user_answer
+    }
+    earned_score = Decimal(0)
+    for prompt_id, correct_match_id in plan.correct_pairs:
+        if user_answers_map.get(prompt_id) == correct_match_id:
+            earned_score += plan.partial_points
+
+    return earned_score.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+
+def _grade_fill_blanks(plan: QuestionPlan, user_answer) -> Decimal:
+    if not plan.blanks or not isinstance(user_answer, dict):
+        return Decimal(0)
+
+    earned_score = Decimal(0)
+    for blank_id, accepted in plan.blanks:
+        user_text = _normalise(user_answer.get(blank_id, ""), plan.case_sensitive)
+        if user_text in accepted:
+            earned_score += plan.partial_points
+
+    return earned_score.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+
+# --- Compilation ---
+
+
+def compile_question(question: Question) -> QuestionPlan:
+    """
+    Compiles a question's answer key into a QuestionPlan.
+
+    Malformed answer keys don't raise here; the returned plan raises when an
+    answer is graded, so the attempt is flagged for manual review exactly as
+    if grading had failed.
+    """
+    question_id = str(question.id)
+    points = Decimal(question.points)
+
+    if question.question_type in MANUAL_QUESTION_TYPES:
+        return QuestionPlan(
+            question_id=question_id,
+            question_type=question.question_type,
+            points=points,
+            requires_manual_grading=True,
+        )
+
+    data = question.type_specific_data or {}
+    try:
+        return _compile_auto_question(question, question_id, points, data)
+    except Exception as e:
+        logger.warning(f"Cannot compile grading data for question {question_id}: {e}")
+        return QuestionPlan(
+            question_id=question_id,
+            question_type=question.question_type,
+            points=points,
+            compile_error=f"Invalid grading data for question {question_id}: {e}",
+        )
+
+
+def _compile_auto_question(
+    question: Question, question_id: str, points: Decimal, data: dict
+) -> QuestionPlan:
+    question_type = question.question_type
+    QuestionType = Question.QuestionType
+
+    if question_type == QuestionType.MULTIPLE_CHOICE:
+        return QuestionPlan(
+            question_id=question_id,
+            question_type=question_type,
+            points=points,
+            grader=_grade_multiple_choice,
+            correct_option_ids=frozenset(
+                opt.get("id") for opt in data.get("options", []) if opt.get("is_correct")
+            ),
+            allow_multiple=data.get("allow_multiple", False),
+        )
+
+    if question_type == QuestionType.TRUE_FALSE:
+        # Format 1: Direct boolean correct_answer
+        if "correct_answer" in data:
+            return QuestionPlan(
+                question_id=question_id,
+                question_type=question_type,
+                points=points,
+                grader=_grade_true_false_boolean,
+                correct_answer=data["correct_answer"],
+            )
+        # Format 2: Options format (similar to multiple choice)
+        options = data.get("options", [])
+        if options:
+            return QuestionPlan(
+                question_id=question_id,
+                question_type=question_type,
+                points=points,
+                grader=_grade_true_false_options,
+                correct_option_ids=frozenset(
+                    opt.get("id") for opt in options if opt.get("is_correct")
+                ),
+            )
+        logger.warning(
+            f"Cannot grade TF question {question_id}: no 'correct_answer' or 'options' in type_specific_data."
+        )
+        return QuestionPlan(
+            question_id=question_id, question_type=question_type, points=points
+        )
+
+    if question_type == QuestionType.SHORT_ANSWER:
+        case_sensitive = data.get("case_sensitive", False)
+        return QuestionPlan(
+            question_id=question_id,
+            question_type=question_type,
+            points=points,
+            grader=_grade_short_answer,
+            accepted_answers=frozenset(
+                _normalise(correct, case_sensitive)
+                for correct in data.get("correct_answers", [])
+            ),
+            case_sensitive=case_sensitive,
+        )
+
+    if question_type == QuestionType.MATCHING:
+        # Requires 'correct_pairs': [{'prompt_id': 'p1', 'match_id': 'm1'}, ...]
+        correct_pairs_map = {
+            p["prompt_id"]: p["match_id"] for p in data.get("correct_pairs", [])
+        }
+        return QuestionPlan(
+            question_id=question_id,
+            question_type=question_type,
+            points=points,
+            grader=_grade_matching,
+            correct_pairs=tuple(correct_pairs_map.items()),
+            partial_points=(
+                points / Decimal(len(correct_pairs_map))
+                if correct_pairs_map
+                else Decimal(0)
+            ),
+        )
+
+    if question_type == QuestionType.FILL_BLANKS:
+        # Requires 'blanks': {'blank1': {'correct': ['ans1', 'ans2']}, ...}
+        blanks_data = data.get("blanks", {})
+        case_sensitive = data.get("case_sensitive", False)
+        return QuestionPlan(
+            question_id=question_id,
+            question_type=question_type,
+            points=points,
+            grader=_grade_fill_blanks,
+            blanks=tuple(
+                (
+                    blank_id,
+                    frozenset(
+                        _normalise(correct, case_sensitive)
+                        for correct in blank_info.get("correct", [])
+                    ),
+                )
+                for blank_id, blank_info in blanks_data.items()
+            ),
+            case_sensitive=case_sensitive,
+            partial_points=(
+                points / Decimal(len(blanks_data)) if blanks_data else Decimal(0)
+            ),
+        )
+
+    # Unknown auto-gradable type: scores zero
+    return QuestionPlan(question_id=question_id, question_type=question_type, points=points)
+
+
+def compile_plan(assessment: Assessment) -> GradingPlan:
+    """Builds a GradingPlan from the assessment's current questions (one query)."""
+    questions = tuple(
+        compile_question(question)
+        for question in Question.objects.filter(assessment_id=assessment.pk)
+    )
+    return GradingPlan(
+        assessment_id=str(assessment.pk),
+        version=assessment.grading_version,
+        max_score=sum((q.points for q in questions if q.points), Decimal(0)),
+        questions=questions,
+    )
+
+
+_plan_cache: "OrderedDict[tuple, GradingPlan]" = OrderedDict()
+_plan_cache_lock = threading.Lock()
+
+
+def get_grading_plan(assessment: Assessment) -> GradingPlan:
+    """Returns the cached GradingPlan for the assessment's current grading version."""
+    key = (str(assessment.pk), assessment.grading_version)
+    with _plan_cache_lock:
+        plan = _plan_cache.get(key)
+        if plan is not None:
+            _plan_cache.move_to_end(key)
+            return plan
+
+    plan = compile_plan(assessment)
+    with _plan_cache_lock:
+        _plan_cache[key] = plan
+        _plan_cache.move_to_end(key)
+        while len(_plan_cache) > GRADING_PLAN_CACHE_SIZE:
+            _plan_cache.popitem(last=False)
+    return plan
+
+
+def invalidate_grading_plans(assessment_id=None) -> None:
+    """Drops cached plans for one assessment (or all plans) in this process."""
+    with _plan_cache_lock:
+        if assessment_id is None:
+            _plan_cache.clear()
+            return
+        for key in [k for k in _plan_cache if k[0] == str(assessment_id)]:
+            del _plan_cache[key]
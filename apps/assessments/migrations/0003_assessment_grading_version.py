@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0002_question_skills'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assessment',
+            name='grading_version',
+            field=models.PositiveIntegerField(default=1, editable=False, help_text='Incremented whenever questions change; keys compiled grading plans.'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:59
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0003_assessment_grading_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttemptSubmission',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('idempotency_key', models.CharField(help_text='Client-supplied Idempotency-Key, or derived from the attempt ID', max_length=255, unique=True)),
+                ('status', models.CharField(choices=[('QUEUED', 'Queued'), ('PROCESSING', 'Processing'), ('COMPLETED', 'Completed'), ('FAILED', 'Failed')], db_index=True, default='QUEUED', max_length=20)),
+                ('current_stage', models.CharField(blank=True, max_length=50)),
+                ('completed_stages', models.JSONField(blank=True, default=list, help_text='Names of pipeline stages already completed')),
+                ('error', models.TextField(blank=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('attempt', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='submission', to='assessments.assessmentattempt')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
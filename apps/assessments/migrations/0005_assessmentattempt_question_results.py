@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0004_attemptsubmission'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assessmentattempt',
+            name='question_results',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
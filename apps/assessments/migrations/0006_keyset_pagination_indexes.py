@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:35
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0005_assessmentattempt_question_results'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='assessmentattempt',
+            index=models.Index(fields=['user', 'created_at', 'id'], name='assessments_user_id_9a5442_idx'),
+        ),
+    ]
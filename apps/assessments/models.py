@@ -60,10 +60,27 @@ class Assessment(TimestampedModel):
         default=False, help_text="Randomize question order for each attempt"
     )
     is_published = models.BooleanField(default=False, db_index=True)
+    grading_version = models.PositiveIntegerField(
+        default=1,
+        editable=False,
+        help_text="Incremented whenever questions change; keys compiled grading plans.",
+    )
 
     def __str__(self):
         return f"{self.title} ({self.course.title})"
 
+    def save(self, *args, **kwargs):
+        # grading_version is only bumped atomically (see signals.py); saving an
+        # instance loaded before a question change must not write it back.
+        if not self._state.adding and not kwargs.get("force_insert"):
+            update_fields = kwargs.get("update_fields")
+            if update_fields is None:
+                update_fields = [
+                    field.name for field in self._meta.concrete_fields if not field.primary_key
+                ]
+            kwargs["update_fields"] = [name for name in update_fields if name != "grading_version"]
+        super().save(*args, **kwargs)
+
     @property
     def total_points(self):
         """Calculates the total possible points for the assessment."""
@@ -181,6 +198,12 @@ class AssessmentAttempt(TimestampedModel):
     is_passed = models.BooleanField(
         null=True, blank=True, help_text="Whether the attempt met the pass mark"
     )
+    # Per-question outcome written once at grading time and reused by skills
+    # and item analytics instead of re-grading the answers.
+    # Structure: [{'question_id': 'uuid', 'score': 1.0, 'correct': True,
+    #              'max_points': 1.0, 'answered': True}, ...]
+    # score/correct are None for questions awaiting manual grading.
+    question_results = models.JSONField(default=list, blank=True)
     graded_by = models.ForeignKey(
         User, on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
     )  # User who manually graded
@@ -201,8 +224,8 @@ class AssessmentAttempt(TimestampedModel):
             return (timezone.now() - self.start_time).total_seconds()
         return None
 
-    def submit(self, submitted_answers: dict):
-        """Marks the attempt as submitted and saves answers."""
+    def record_submission(self, submitted_answers: dict):
+        """Marks the attempt as submitted and saves answers without grading it."""
         if self.status == self.AttemptStatus.IN_PROGRESS:
             self.answers = submitted_answers
             self.end_time = timezone.now()
@@ -210,6 +233,12 @@ class AssessmentAttempt(TimestampedModel):
             # Calculate max score at time of submission
             self.max_score = self.assessment.total_points
             self.save()
+            return True
+        return False  # Already submitted or graded
+
+    def submit(self, submitted_answers: dict):
+        """Marks the attempt as submitted, saves answers and grades it synchronously."""
+        if self.record_submission(submitted_answers):
             # Trigger auto-grading if applicable
             from .services import GradingService  # Avoid circular import
 
@@ -219,4 +248,48 @@ class AssessmentAttempt(TimestampedModel):
 
     class Meta:
         ordering = ["assessment", "user", "-start_time"]
+        indexes = [
+            # Keyset pagination of a learner's attempt history
+            models.Index(fields=["user", "created_at", "id"]),
+        ]
         # Potentially add constraint for number of attempts per user per assessment
+
+
+class AttemptSubmission(TimestampedModel):
+    """
+    Durable record of an asynchronous attempt submission.
+
+    Created when a learner submits; the grading, skill update, remedial path
+    and notification stages then run as ordered Celery tasks and record their
+    progress here so clients can poll and retried stages are skipped.
+    """
+
+    class Status(models.TextChoices):
+        QUEUED = "QUEUED", _("Queued")
+        PROCESSING = "PROCESSING", _("Processing")
+        COMPLETED = "COMPLETED", _("Completed")
+        FAILED = "FAILED", _("Failed")
+
+    attempt = models.OneToOneField(
+        AssessmentAttempt, related_name="submission", on_delete=models.CASCADE
+    )
+    idempotency_key = models.CharField(
+        max_length=255,
+        unique=True,
+        help_text="Client-supplied Idempotency-Key, or derived from the attempt ID",
+    )
+    status = models.CharField(
+        max_length=20, choices=Status.choices, default=Status.QUEUED, db_index=True
+    )
+    current_stage = models.CharField(max_length=50, blank=True)
+    completed_stages = models.JSONField(
+        default=list, blank=True, help_text="Names of pipeline stages already completed"
+    )
+    error = models.TextField(blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Submission of attempt {self.attempt_id} ({self.status})"
+
+    class Meta:
+        ordering = ["-created_at"]
@@ -4,7 +4,7 @@ from rest_framework import serializers
 
 from apps.users.serializers import UserSerializer  # For user/graded_by info
 
-from .models import Assessment, AssessmentAttempt, Question
+from .models import Assessment, AssessmentAttempt, AttemptSubmission, Question
 
 # from apps.courses.serializers import CourseSerializer # If needed for nested course info
 
@@ -545,6 +545,52 @@ class AssessmentAttemptSubmitSerializer(serializers.Serializer):
         return attempt
 
 
+class AttemptSubmissionSerializer(serializers.ModelSerializer):
+    """Status of an asynchronous attempt submission, for client polling."""
+
+    attempt_status = serializers.CharField(source="attempt.status", read_only=True)
+    status_display = serializers.CharField(source="get_status_display", read_only=True)
+    score = serializers.SerializerMethodField()
+    max_score = serializers.SerializerMethodField()
+    is_passed = serializers.SerializerMethodField()
+
+    class Meta:
+        model = AttemptSubmission
+        fields = (
+            "id",
+            "attempt",
+            "idempotency_key",
+            "status",
+            "status_display",
+            "current_stage",
+            "completed_stages",
+            "error",
+            "attempt_status",
+            "score",
+            "max_score",
+            "is_passed",
+            "created_at",
+            "completed_at",
+        )
+        read_only_fields = fields
+
+    def _results_visible(self, obj):
+        attempt = obj.attempt
+        return (
+            attempt.status == AssessmentAttempt.AttemptStatus.GRADED
+            and attempt.assessment.show_results_immediately
+        )
+
+    def get_score(self, obj):
+        return obj.attempt.score if self._results_visible(obj) else None
+
+    def get_max_score(self, obj):
+        return obj.attempt.max_score if self._results_visible(obj) else None
+
+    def get_is_passed(self, obj):
+        return obj.attempt.is_passed if self._results_visible(obj) else None
+
+
 class ManualGradeSerializer(serializers.Serializer):
     """Serializer for manual grading of assessment attempts."""
 
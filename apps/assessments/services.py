@@ -1,9 +1,11 @@
 import logging
 from decimal import ROUND_HALF_UP, Decimal
 
+from django.db import transaction
 from django.utils import timezone
 
-from .models import AssessmentAttempt, Question
+from .grading import GradingPlan, compile_question, get_grading_plan
+from .models import Assessment, AssessmentAttempt, AttemptSubmission, Question
 
 logger = logging.getLogger(__name__)
 
@@ -28,73 +30,152 @@ class GradingService:
             )
             return
 
-        assessment = attempt.assessment
-        questions = Question.objects.filter(assessment=assessment)
+        plan = get_grading_plan(attempt.assessment)
+        cls._apply_grading_plan(attempt, plan)
+        attempt.save()
+
+    @classmethod
+    def regrade_assessment(cls, assessment: Assessment, chunk_size: int = 500) -> int:
+        """
+        Re-grades every submitted or auto-graded attempt of an assessment in bulk.
+
+        Attempts are streamed in chunks, scored against a single compiled plan and
+        written back with bulk_update. Manually graded attempts (graded_by set) are
+        left untouched. bulk_update does not fire post_save, so downstream signal
+        receivers are not re-run for regraded attempts.
+
+        Returns the number of attempts re-graded.
+        """
+        if assessment.grading_type == Assessment.GradingType.MANUAL:
+            return 0
+
+        plan = get_grading_plan(assessment)
+        attempts = (
+            AssessmentAttempt.objects.filter(
+                assessment=assessment,
+                status__in=[
+                    AssessmentAttempt.AttemptStatus.SUBMITTED,
+                    AssessmentAttempt.AttemptStatus.GRADED,
+                ],
+                graded_by__isnull=True,
+            )
+            .only(
+                "id", "assessment_id", "status", "answers", "question_results",
+                "score", "max_score", "is_passed", "graded_at",
+            )
+            .order_by("pk")
+        )
+
+        regraded = 0
+        batch = []
+        for attempt in attempts.iterator(chunk_size=chunk_size):
+            # Reuse the already-loaded assessment rather than lazily refetching it
+            attempt.assessment = assessment
+            cls._apply_grading_plan(attempt, plan)
+            attempt.updated_at = timezone.now()
+            batch.append(attempt)
+            if len(batch) >= chunk_size:
+                regraded += cls._flush_regraded(batch)
+                batch = []
+        if batch:
+            regraded += cls._flush_regraded(batch)
+
+        if regraded:
+            # Item analysis already folded in the old scores
+            from apps.analytics.services import ItemAnalysisService
+
+            ItemAnalysisService.invalidate(assessment.id)
+
+        logger.info(f"Re-graded {regraded} attempts for assessment {assessment.id}")
+        return regraded
+
+    @staticmethod
+    def _flush_regraded(attempts: list) -> int:
+        AssessmentAttempt.objects.bulk_update(
+            attempts,
+            [
+                "score", "max_score", "is_passed", "status", "question_results",
+                "graded_at", "updated_at",
+            ],
+        )
+        return len(attempts)
+
+    @classmethod
+    def get_question_results(cls, attempt: AssessmentAttempt) -> list:
+        """
+        Returns the per-question result vector for an attempt.
+
+        Attempts graded before the vector was persisted have it derived from the
+        cached grading plan; nothing is written back.
+        """
+        if attempt.question_results:
+            return attempt.question_results
+        plan = get_grading_plan(attempt.assessment)
+        _, results, _ = cls._score_answers(attempt, plan)
+        return results
+
+    @staticmethod
+    def _score_answers(attempt: AssessmentAttempt, plan: GradingPlan) -> tuple:
+        """
+        Scores every question in the plan against the attempt's answers.
+
+        Returns (total_score, question_results, requires_manual_grading).
+        """
         submitted_answers = attempt.answers or {}
+        auto_grade = attempt.assessment.grading_type != Assessment.GradingType.MANUAL
 
         total_score = Decimal(0)
-        max_score = Decimal(
-            assessment.total_points or 0
-        )  # Use points at time of attempt? Or current? Using current for now.
-        requires_manual_grading = False
-
-        if assessment.grading_type == assessment.GradingType.MANUAL:
-            requires_manual_grading = True
-        else:  # AUTO or HYBRID
-            for question in questions:
-                question_id_str = str(question.id)
-                user_answer = submitted_answers.get(question_id_str)
-                question_score = Decimal(0)
+        results = []
+        requires_manual_grading = not auto_grade
+
+        for question_plan in plan.questions:
+            user_answer = submitted_answers.get(question_plan.question_id)
+            result = {
+                "question_id": question_plan.question_id,
+                "score": None,
+                "correct": None,
+                "max_points": float(question_plan.points),
+                "answered": user_answer is not None,
+            }
+            results.append(result)
+
+            if not auto_grade:
+                continue
+            if question_plan.requires_manual_grading:
+                # Skip auto-grading for manual types
+                requires_manual_grading = True
+                continue
+            if user_answer is None:  # Only grade if an answer was provided
+                result["score"] = 0.0
+                result["correct"] = False
+                continue
+
+            try:
+                score = question_plan.grade(user_answer)
+            except Exception as e:
+                logger.error(
+                    f"Error auto-grading question {question_plan.question_id} for attempt {attempt.id}: {e}",
+                    exc_info=True,
+                )
+                # Mark for review if error occurs
+                requires_manual_grading = True
+                continue
+
+            total_score += score
+            result["score"] = float(score)
+            # Question is correct if score equals full points
+            result["correct"] = score >= question_plan.points
+
+        return total_score, results, requires_manual_grading
 
-                try:
-                    if question.question_type in [
-                        Question.QuestionType.ESSAY,
-                        Question.QuestionType.CODE,
-                    ]:
-                        requires_manual_grading = True
-                        # Store placeholder or skip score calculation for manual parts
-                        continue  # Skip auto-grading for manual types
-
-                    elif (
-                        user_answer is not None
-                    ):  # Only grade if an answer was provided
-                        # --- Auto-Grading Logic ---
-                        if (
-                            question.question_type
-                            == Question.QuestionType.MULTIPLE_CHOICE
-                        ):
-                            question_score = cls._grade_multiple_choice(
-                                question, user_answer
-                            )
-                        elif question.question_type == Question.QuestionType.TRUE_FALSE:
-                            question_score = cls._grade_true_false(
-                                question, user_answer
-                            )
-                        elif (
-                            question.question_type == Question.QuestionType.SHORT_ANSWER
-                        ):
-                            question_score = cls._grade_short_answer(
-                                question, user_answer
-                            )
-                        elif question.question_type == Question.QuestionType.MATCHING:
-                            question_score = cls._grade_matching(question, user_answer)
-                        elif (
-                            question.question_type == Question.QuestionType.FILL_BLANKS
-                        ):
-                            question_score = cls._grade_fill_blanks(
-                                question, user_answer
-                            )
-                        # Add logic for other auto-gradable types
-
-                        total_score += question_score
-
-                except Exception as e:
-                    logger.error(
-                        f"Error auto-grading question {question.id} for attempt {attempt.id}: {e}",
-                        exc_info=True,
-                    )
-                    # Decide how to handle grading errors - mark as needing manual review? Assign 0?
-                    requires_manual_grading = True  # Mark for review if error occurs
+    @classmethod
+    def _apply_grading_plan(cls, attempt: AssessmentAttempt, plan: GradingPlan) -> None:
+        """Scores an attempt against a compiled plan, updating it in memory only."""
+        assessment = attempt.assessment
+        max_score = plan.max_score  # Use points at time of grading
+        total_score, attempt.question_results, requires_manual_grading = (
+            cls._score_answers(attempt, plan)
+        )
 
         attempt.score = total_score.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
         attempt.max_score = int(max_score)  # Store as integer
@@ -124,197 +205,243 @@ class GradingService:
                 f"Attempt {attempt.id} requires manual grading. Auto-score part: {attempt.score}"
             )
 
-        attempt.save()
-
     # --- Private Helper Methods for Auto-Grading ---
+    # Single-question graders kept for callers grading outside a full attempt.
+    # They compile the question on the fly; prefer get_grading_plan for batches.
 
     @staticmethod
     def _get_correct_options(question: Question) -> set:
         """Gets the set of correct option IDs for MC/TF questions."""
-        options = question.type_specific_data.get("options", [])
-        return {opt.get("id") for opt in options if opt.get("is_correct")}
+        return set(compile_question(question).correct_option_ids)
+
+    @staticmethod
+    def _grade_question(question: Question, user_answer) -> Decimal:
+        return compile_question(question).grade(user_answer)
 
     @classmethod
     def _grade_multiple_choice(cls, question: Question, user_answer) -> Decimal:
-        correct_option_ids = cls._get_correct_options(question)
-        allow_multiple = question.type_specific_data.get("allow_multiple", False)
-        points = Decimal(question.points)
-
-        if not isinstance(user_answer, list):
-            user_answer = [user_answer]  # Ensure list for consistency
-        user_selected_ids = set(user_answer)
-
-        if allow_multiple:
-            # Simple exact match scoring for multiple answers (could implement partial credit)
-            is_correct = user_selected_ids == correct_option_ids
-        else:
-            # Single choice
-            is_correct = (
-                len(user_selected_ids) == 1
-                and list(user_selected_ids)[0] in correct_option_ids
-            )
-
-        return points if is_correct else Decimal(0)
+        return cls._grade_question(question, user_answer)
 
     @classmethod
     def _grade_true_false(cls, question: Question, user_answer) -> Decimal:
         """
         Grades True/False questions.
-        
+
         Supports two data formats:
         1. Direct boolean: type_specific_data = {'correct_answer': True/False}
            user_answer can be: True, False, 'true', 'false', 'True', 'False'
-        
+
         2. Options format (like MC): type_specific_data = {'options': [
                {'id': 'opt_true', 'text': 'True', 'value': True, 'is_correct': True},
                {'id': 'opt_false', 'text': 'False', 'value': False, 'is_correct': False}
            ]}
            user_answer can be: option ID string or list with single option ID
         """
-        points = Decimal(question.points)
-        type_data = question.type_specific_data or {}
-        
-        # Format 1: Direct boolean correct_answer
-        if "correct_answer" in type_data:
-            correct_answer = type_data["correct_answer"]
-            
-            # Normalize user answer to boolean
-            if isinstance(user_answer, str):
-                user_answer_bool = user_answer.lower() == "true"
-            elif isinstance(user_answer, bool):
-                user_answer_bool = user_answer
-            elif isinstance(user_answer, list) and len(user_answer) == 1:
-                # Single item list - extract and convert
-                item = user_answer[0]
-                if isinstance(item, str):
-                    user_answer_bool = item.lower() == "true"
-                else:
-                    user_answer_bool = bool(item)
-            else:
-                user_answer_bool = bool(user_answer)
-            
-            return points if user_answer_bool == correct_answer else Decimal(0)
-        
-        # Format 2: Options format (similar to multiple choice)
-        options = type_data.get("options", [])
-        if options:
-            # Build mapping of option ID to its correctness and value
-            correct_option_ids = set()
-            option_values = {}  # Maps option ID to its boolean value
-            
-            for opt in options:
-                opt_id = opt.get("id")
-                if opt.get("is_correct"):
-                    correct_option_ids.add(opt_id)
-                # Store the boolean value associated with this option
-                if "value" in opt:
-                    option_values[opt_id] = opt["value"]
-                elif opt.get("text", "").lower() == "true":
-                    option_values[opt_id] = True
-                elif opt.get("text", "").lower() == "false":
-                    option_values[opt_id] = False
-            
-            # Normalize user answer to option ID
-            if isinstance(user_answer, list):
-                user_selected_id = user_answer[0] if user_answer else None
-            else:
-                user_selected_id = user_answer
-            
-            # Check if user selected the correct option
-            if user_selected_id in correct_option_ids:
-                return points
-            
-            return Decimal(0)
-        
-        logger.warning(
-            f"Cannot grade TF question {question.id}: no 'correct_answer' or 'options' in type_specific_data."
-        )
-        return Decimal(0)
+        return cls._grade_question(question, user_answer)
 
-    @staticmethod
-    def _grade_short_answer(question: Question, user_answer) -> Decimal:
-        if not isinstance(user_answer, str):
-            return Decimal(0)
-
-        correct_answers = question.type_specific_data.get("correct_answers", [])
-        case_sensitive = question.type_specific_data.get("case_sensitive", False)
-        points = Decimal(question.points)
-
-        processed_user_answer = user_answer.strip()
-        if not case_sensitive:
-            processed_user_answer = processed_user_answer.lower()
-
-        for correct in correct_answers:
-            processed_correct = correct.strip()
-            if not case_sensitive:
-                processed_correct = processed_correct.lower()
-            if processed_user_answer == processed_correct:
-                return points
-        return Decimal(0)
+    @classmethod
+    def _grade_short_answer(cls, question: Question, user_answer) -> Decimal:
+        return cls._grade_question(question, user_answer)
 
-    @staticmethod
-    def _grade_matching(question: Question, user_answer) -> Decimal:
+    @classmethod
+    def _grade_matching(cls, question: Question, user_answer) -> Decimal:
         # Requires 'correct_pairs': [{'prompt_id': 'p1', 'match_id': 'm1'}, ...] in type_specific_data
         # Requires user_answer: [{'prompt_id': 'p1', 'selected_match_id': 'm1'}, ...]
-        correct_pairs_map = {
-            p["prompt_id"]: p["match_id"]
-            for p in question.type_specific_data.get("correct_pairs", [])
-        }
-        if not correct_pairs_map or not isinstance(user_answer, list):
-            return Decimal(0)
-
-        points_per_match = (
-            Decimal(question.points) / Decimal(len(correct_pairs_map))
-            if correct_pairs_map
-            else Decimal(0)
+        return cls._grade_question(question, user_answer)
+
+    @classmethod
+    def _grade_fill_blanks(cls, question: Question, user_answer) -> Decimal:
+        # Requires type_specific_data: {'blanks': {'blank1': {'correct': ['ans1', 'ans2']}, ...}}
+        # Requires user_answer: {'blank1': 'user_text1', 'blank2': 'user_text2'}
+        return cls._grade_question(question, user_answer)
+
+
+def send_assessment_submission_notification(attempt: AssessmentAttempt):
+    """Send notification to the learner confirming their assessment submission."""
+    from apps.notifications.models import NotificationType
+    from apps.notifications.services import NotificationService
+
+    try:
+        content = NotificationService.generate_content_for_type(
+            NotificationType.ASSESSMENT_SUBMISSION,
+            {
+                "user_name": attempt.user.get_full_name() or attempt.user.email,
+                "assessment_title": attempt.assessment.title,
+                "course_name": attempt.assessment.course.title,
+            }
+        )
+        NotificationService.create_notification(
+            user=attempt.user,
+            notification_type=NotificationType.ASSESSMENT_SUBMISSION,
+            subject=content["subject"],
+            message=content["message"],
+            action_url=f"/courses/{attempt.assessment.course.slug}/assessments/{attempt.assessment.id}/attempts/{attempt.id}",
         )
-        earned_score = Decimal(0)
+    except Exception as e:
+        logger.error(f"Failed to send assessment submission notification for attempt {attempt.id}: {e}", exc_info=True)
+
+
+class SubmissionPipelineService:
+    """
+    Runs the post-submission work for an attempt as ordered, idempotent stages.
+
+    The submit request only records the answers and an AttemptSubmission row;
+    grading, skill updates, remedial path suggestions and notifications then run
+    as a Celery chain. Each stage records itself in completed_stages, so a
+    retried or re-dispatched pipeline skips work that already happened.
+    """
+
+    STAGE_GRADE = "grade"
+    STAGE_UPDATE_SKILLS = "update_skills"
+    STAGE_SUGGEST_REMEDIAL_PATH = "suggest_remedial_path"
+    STAGE_SEND_NOTIFICATIONS = "send_notifications"
+    STAGES = (
+        STAGE_GRADE,
+        STAGE_UPDATE_SKILLS,
+        STAGE_SUGGEST_REMEDIAL_PATH,
+        STAGE_SEND_NOTIFICATIONS,
+    )
+    # Stages whose writes commit together with their completion marker, so a
+    # stage that fails part-way leaves nothing behind to be applied twice
+    ATOMIC_STAGES = (STAGE_UPDATE_SKILLS,)
+
+    @staticmethod
+    def default_idempotency_key(attempt: AssessmentAttempt) -> str:
+        return f"attempt-{attempt.id}"
+
+    @classmethod
+    @transaction.atomic
+    def submit(
+        cls,
+        attempt: AssessmentAttempt,
+        submitted_answers: dict,
+        idempotency_key: str | None = None,
+    ) -> AttemptSubmission | None:
+        """
+        Durably records a submission and queues the pipeline after commit.
 
-        user_answers_map = {
-            ua.get("prompt_id"): ua.get("selected_match_id") for ua in user_answer
-        }
+        Returns None if the attempt is no longer in progress. Raises
+        IntegrityError if the idempotency key is already used by another
+        submission.
+        """
+        # Lock the attempt so concurrent submits serialise on its status
+        locked = AssessmentAttempt.objects.select_for_update().get(pk=attempt.pk)
+        if not locked.record_submission(submitted_answers):
+            return None
+
+        submission = AttemptSubmission.objects.create(
+            attempt=locked,
+            idempotency_key=idempotency_key or cls.default_idempotency_key(attempt),
+        )
+        attempt.refresh_from_db()
+        transaction.on_commit(lambda: cls.dispatch(submission.id))
+        return submission
 
-        for prompt_id, correct_match_id in correct_pairs_map.items():
-            if user_answers_map.get(prompt_id) == correct_match_id:
-                earned_score += points_per_match
+    @classmethod
+    def dispatch(cls, submission_id) -> None:
+        """
+        Queues the stage chain, running it inline if the broker is unavailable.
 
-        # Round final score for the question? Or let total round? Rounding here.
-        return earned_score.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+        Publishing does not retry, so the fallback runs without first waiting
+        out the broker's connection retries.
+        """
+        from celery import chain
 
-    @staticmethod
-    def _grade_fill_blanks(question: Question, user_answer) -> Decimal:
-        # Requires type_specific_data: {'blanks': {'blank1': {'correct': ['ans1', 'ans2']}, ...}}
-        # Requires user_answer: {'blank1': 'user_text1', 'blank2': 'user_text2'}
-        blanks_data = question.type_specific_data.get("blanks", {})
-        if not blanks_data or not isinstance(user_answer, dict):
-            return Decimal(0)
-
-        points_per_blank = (
-            Decimal(question.points) / Decimal(len(blanks_data))
-            if blanks_data
-            else Decimal(0)
+        from .tasks import (
+            submission_grade_task,
+            submission_send_notifications_task,
+            submission_suggest_remedial_path_task,
+            submission_update_skills_task,
         )
-        earned_score = Decimal(0)
-        case_sensitive = question.type_specific_data.get(
-            "case_sensitive", False
-        )  # Global or per-blank? Assume global.
-
-        for blank_id, blank_info in blanks_data.items():
-            user_text = user_answer.get(blank_id, "").strip()
-            correct_options = blank_info.get("correct", [])
-
-            if not case_sensitive:
-                user_text = user_text.lower()
-
-            is_correct_blank = False
-            for correct in correct_options:
-                processed_correct = correct.strip()
-                if not case_sensitive:
-                    processed_correct = processed_correct.lower()
-                if user_text == processed_correct:
-                    is_correct_blank = True
-                    break
-            if is_correct_blank:
-                earned_score += points_per_blank
-
-        return earned_score.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+        submission_id = str(submission_id)
+        try:
+            chain(
+                submission_grade_task.si(submission_id),
+                submission_update_skills_task.si(submission_id),
+                submission_suggest_remedial_path_task.si(submission_id),
+                submission_send_notifications_task.si(submission_id),
+            ).apply_async(retry=False)
+        except Exception as e:
+            logger.warning(
+                f"Could not queue submission pipeline {submission_id}, running inline: {e}"
+            )
+            for stage in cls.STAGES:
+                try:
+                    cls.run_stage(submission_id, stage)
+                except Exception:
+                    break  # Failure is recorded on the submission; later stages depend on it
+
+    @classmethod
+    def run_stage(cls, submission_id, stage: str) -> None:
+        """Runs one stage unless it has already completed for this submission."""
+        submission = AttemptSubmission.objects.select_related(
+            "attempt__assessment__course", "attempt__user"
+        ).get(pk=submission_id)
+
+        if stage in submission.completed_stages:
+            logger.info(f"Submission {submission_id}: stage '{stage}' already completed, skipping")
+            return
+
+        submission.status = AttemptSubmission.Status.PROCESSING
+        submission.current_stage = stage
+        submission.save(update_fields=["status", "current_stage", "updated_at"])
+
+        attempt = submission.attempt
+        handler = getattr(cls, f"_stage_{stage}")
+        try:
+            if stage in cls.ATOMIC_STAGES:
+                with transaction.atomic():
+                    # A concurrently re-delivered stage waits here, then skips
+                    locked = AttemptSubmission.objects.select_for_update().get(pk=submission.pk)
+                    if stage in locked.completed_stages:
+                        return
+                    handler(attempt)
+                    cls._complete_stage(locked, stage)
+            else:
+                handler(attempt)
+                cls._complete_stage(submission, stage)
+        except Exception as e:
+            logger.error(
+                f"Submission {submission_id}: stage '{stage}' failed: {e}", exc_info=True
+            )
+            submission.status = AttemptSubmission.Status.FAILED
+            submission.error = f"{stage}: {e}"
+            submission.save(update_fields=["status", "error", "updated_at"])
+            raise
+
+    @classmethod
+    def _complete_stage(cls, submission: AttemptSubmission, stage: str) -> None:
+        submission.completed_stages = [*submission.completed_stages, stage]
+        update_fields = ["completed_stages", "updated_at"]
+        if all(s in submission.completed_stages for s in cls.STAGES):
+            submission.status = AttemptSubmission.Status.COMPLETED
+            submission.current_stage = ""
+            submission.error = ""
+            submission.completed_at = timezone.now()
+            update_fields += ["status", "current_stage", "error", "completed_at"]
+        submission.save(update_fields=update_fields)
+
+    # --- Stage handlers ---
+
+    @staticmethod
+    def _stage_grade(attempt: AssessmentAttempt) -> None:
+        # Side effects that post_save receivers would trigger run as later stages
+        attempt._pipeline_managed = True
+        GradingService.grade_attempt(attempt)
+
+    @staticmethod
+    def _stage_update_skills(attempt: AssessmentAttempt) -> None:
+        from apps.skills.signals import update_skills_for_attempt
+
+        update_skills_for_attempt(attempt)
+
+    @staticmethod
+    def _stage_suggest_remedial_path(attempt: AssessmentAttempt) -> None:
+        from apps.learning_paths.signals import suggest_remedial_path_for_attempt
+
+        suggest_remedial_path_for_attempt(attempt)
+
+    @staticmethod
+    def _stage_send_notifications(attempt: AssessmentAttempt) -> None:
+        send_assessment_submission_notification(attempt)
@@ -0,0 +1,29 @@
+"""
+Signal handlers for the Assessments app.
+
+Keeps compiled grading plans fresh: any change to a question's answer key,
+points or type bumps the owning assessment's grading_version, so plans cached
+under the old version are never used again.
+"""
+
+import logging
+
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .grading import invalidate_grading_plans
+from .models import Assessment, Question
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def bump_grading_version_on_question_change(sender, instance: Question, **kwargs):
+    """Invalidate grading plans for the question's assessment."""
+    Assessment.objects.filter(pk=instance.assessment_id).update(
+        grading_version=F("grading_version") + 1
+    )
+    invalidate_grading_plans(instance.assessment_id)
+    logger.debug(f"Grading plan invalidated for assessment {instance.assessment_id}")
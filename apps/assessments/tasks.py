@@ -0,0 +1,92 @@
+import logging
+import uuid
+
+from celery import shared_task
+
+# from .services import GradingService # Avoid circular import
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name="assessments.regrade_assessment")
+def regrade_assessment_task(assessment_id: uuid.UUID, chunk_size: int = 500):
+    """
+    Celery task that re-grades all auto-graded attempts of an assessment in bulk.
+    """
+    logger.info(f"Celery task received: Regrade assessment {assessment_id}")
+    from .models import Assessment
+    from .services import GradingService
+
+    try:
+        assessment = Assessment.objects.get(pk=assessment_id)
+    except Assessment.DoesNotExist:
+        logger.warning(f"Assessment {assessment_id} not found for regrading.")
+        return 0
+
+    try:
+        return GradingService.regrade_assessment(assessment, chunk_size=chunk_size)
+    except Exception as e:
+        logger.error(
+            f"Celery task failed while regrading assessment {assessment_id}: {e}",
+            exc_info=True,
+        )
+        raise
+
+
+def _run_submission_stage(task, submission_id: uuid.UUID, stage: str):
+    from .services import SubmissionPipelineService
+
+    logger.info(f"Celery task received: Submission {submission_id} stage '{stage}'")
+    try:
+        SubmissionPipelineService.run_stage(submission_id, stage)
+    except Exception as e:
+        logger.error(
+            f"Celery task failed for submission {submission_id} stage '{stage}': {e}",
+            exc_info=True,
+        )
+        # Completed stages are skipped on retry, so retrying is safe
+        raise task.retry(exc=e)
+
+
+@shared_task(
+    bind=True,
+    name="assessments.submission.grade",
+    max_retries=3,
+    default_retry_delay=30,
+)
+def submission_grade_task(self, submission_id: uuid.UUID):
+    """Stage 1 of the submission pipeline: grade the attempt."""
+    _run_submission_stage(self, submission_id, "grade")
+
+
+@shared_task(
+    bind=True,
+    name="assessments.submission.update_skills",
+    max_retries=3,
+    default_retry_delay=30,
+)
+def submission_update_skills_task(self, submission_id: uuid.UUID):
+    """Stage 2 of the submission pipeline: update learner skill progress."""
+    _run_submission_stage(self, submission_id, "update_skills")
+
+
+@shared_task(
+    bind=True,
+    name="assessments.submission.suggest_remedial_path",
+    max_retries=3,
+    default_retry_delay=30,
+)
+def submission_suggest_remedial_path_task(self, submission_id: uuid.UUID):
+    """Stage 3 of the submission pipeline: suggest a remedial path on failure."""
+    _run_submission_stage(self, submission_id, "suggest_remedial_path")
+
+
+@shared_task(
+    bind=True,
+    name="assessments.submission.send_notifications",
+    max_retries=3,
+    default_retry_delay=60,
+)
+def submission_send_notifications_task(self, submission_id: uuid.UUID):
+    """Stage 4 of the submission pipeline: send learner notifications."""
+    _run_submission_stage(self, submission_id, "send_notifications")
@@ -0,0 +1,309 @@
+"""
+Tests for compiled grading plans and bulk regrading.
+"""
+
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.assessments.grading import compile_question, get_grading_plan
+from apps.assessments.models import Assessment, AssessmentAttempt, Question
+from apps.assessments.services import GradingService
+from apps.core.models import Tenant
+from apps.courses.models import Course
+from apps.users.models import User
+
+
+class GradingPlanTestCase(TestCase):
+    """Base setup with an assessment covering every auto-gradable type."""
+
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Test Tenant", slug="test-tenant")
+        self.instructor = User.objects.create_user(
+            email="instructor@test.com",
+            password="testpass123",
+            role=User.Role.INSTRUCTOR,
+            tenant=self.tenant,
+        )
+        self.learner = User.objects.create_user(
+            email="learner@test.com",
+            password="testpass123",
+            role=User.Role.LEARNER,
+            tenant=self.tenant,
+        )
+        self.course = Course.objects.create(
+            tenant=self.tenant,
+            title="Test Course",
+            slug="test-course",
+            instructor=self.instructor,
+            status=Course.Status.PUBLISHED,
+        )
+        self.assessment = Assessment.objects.create(
+            course=self.course,
+            title="Quiz",
+            pass_mark_percentage=50,
+            is_published=True,
+        )
+        self.mc = Question.objects.create(
+            assessment=self.assessment,
+            question_text="Pick A",
+            question_type=Question.QuestionType.MULTIPLE_CHOICE,
+            points=2,
+            order=1,
+            type_specific_data={
+                "options": [
+                    {"id": "a", "text": "A", "is_correct": True},
+                    {"id": "b", "text": "B", "is_correct": False},
+                ]
+            },
+        )
+        self.sa = Question.objects.create(
+            assessment=self.assessment,
+            question_text="Capital of France?",
+            question_type=Question.QuestionType.SHORT_ANSWER,
+            points=1,
+            order=2,
+            type_specific_data={"correct_answers": [" Paris "]},
+        )
+        self.fb = Question.objects.create(
+            assessment=self.assessment,
+            question_text="[b1] and [b2]",
+            question_type=Question.QuestionType.FILL_BLANKS,
+            points=2,
+            order=3,
+            type_specific_data={
+                "blanks": {"b1": {"correct": ["Salt"]}, "b2": {"correct": ["Pepper"]}}
+            },
+        )
+        self.assessment.refresh_from_db()
+
+    def _attempt(self, answers):
+        return AssessmentAttempt.objects.create(
+            assessment=self.assessment,
+            user=self.learner,
+            status=AssessmentAttempt.AttemptStatus.SUBMITTED,
+            answers=answers,
+        )
+
+
+class CompileQuestionTests(GradingPlanTestCase):
+    """Tests for compile_question."""
+
+    def test_precomputes_correct_options_and_normalised_answers(self):
+        """Test that answer keys are derived once at compile time."""
+        self.assertEqual(compile_question(self.mc).correct_option_ids, frozenset({"a"}))
+        self.assertEqual(compile_question(self.sa).accepted_answers, frozenset({"paris"}))
+        fb_plan = compile_question(self.fb)
+        self.assertEqual(fb_plan.partial_points, Decimal(1))
+        self.assertEqual(dict(fb_plan.blanks)["b2"], frozenset({"pepper"}))
+
+    def test_malformed_answer_key_raises_on_grade(self):
+        """Test that a broken answer key is deferred to grading time."""
+        self.mc.question_type = Question.QuestionType.MATCHING
+        self.mc.type_specific_data = {"correct_pairs": [{"prompt_id": "p1"}]}
+        plan = compile_question(self.mc)
+        with self.assertRaises(ValueError):
+            plan.grade([])
+
+
+class GradingPlanCacheTests(GradingPlanTestCase):
+    """Tests for plan caching and invalidation."""
+
+    def test_plan_is_reused_for_same_version(self):
+        """Test that repeated lookups don't query questions again."""
+        get_grading_plan(self.assessment)
+        with self.assertNumQueries(0):
+            plan = get_grading_plan(self.assessment)
+        self.assertEqual(plan.max_score, Decimal(5))
+
+    def test_question_edit_invalidates_plan(self):
+        """Test that editing an answer key bumps the version and recompiles."""
+        old_plan = get_grading_plan(self.assessment)
+
+        self.sa.type_specific_data = {"correct_answers": ["Lyon"]}
+        self.sa.save()
+        self.assessment.refresh_from_db()
+
+        new_plan = get_grading_plan(self.assessment)
+        self.assertGreater(new_plan.version, old_plan.version)
+        sa_plan = next(q for q in new_plan.questions if q.question_id == str(self.sa.id))
+        self.assertEqual(sa_plan.accepted_answers, frozenset({"lyon"}))
+
+    def test_saving_stale_assessment_keeps_bumped_version(self):
+        """Test that a full save of an instance loaded before a question edit keeps the new version."""
+        stale = Assessment.objects.get(pk=self.assessment.pk)
+        self.sa.points = 3
+        self.sa.save()
+
+        stale.title = "Renamed quiz"
+        stale.save()
+
+        self.assessment.refresh_from_db()
+        self.assertEqual(self.assessment.title, "Renamed quiz")
+        self.assertGreater(self.assessment.grading_version, stale.grading_version)
+        self.assertEqual(get_grading_plan(self.assessment).max_score, Decimal(7))
+
+    def test_grade_attempt_matches_expected_score(self):
+        """Test that grading through the plan scores every question type."""
+        attempt = self._attempt({
+            str(self.mc.id): ["a"],
+            str(self.sa.id): "paris",
+            str(self.fb.id): {"b1": "salt", "b2": "sugar"},
+        })
+
+        GradingService.grade_attempt(attempt)
+
+        attempt.refresh_from_db()
+        self.assertEqual(attempt.status, AssessmentAttempt.AttemptStatus.GRADED)
+        self.assertEqual(attempt.score, Decimal("4.00"))
+        self.assertEqual(attempt.max_score, 5)
+        self.assertTrue(attempt.is_passed)
+
+
+    def test_grade_attempt_persists_question_results(self):
+        """Test that grading stores a per-question result vector."""
+        attempt = self._attempt({
+            str(self.mc.id): ["b"],
+            str(self.fb.id): {"b1": "salt", "b2": "sugar"},
+        })
+
+        GradingService.grade_attempt(attempt)
+
+        attempt.refresh_from_db()
+        results = {r["question_id"]: r for r in attempt.question_results}
+        self.assertEqual(
+            results[str(self.mc.id)],
+            {"question_id": str(self.mc.id), "score": 0.0, "correct": False,
+             "max_points": 2.0, "answered": True},
+        )
+        self.assertEqual(results[str(self.fb.id)]["score"], 1.0)
+        self.assertFalse(results[str(self.fb.id)]["correct"])
+        self.assertFalse(results[str(self.sa.id)]["answered"])
+
+    def test_manual_question_result_is_pending(self):
+        """Test that manually graded questions have no score in the vector."""
+        essay = Question.objects.create(
+            assessment=self.assessment,
+            question_text="Explain",
+            question_type=Question.QuestionType.ESSAY,
+            points=5,
+            order=4,
+        )
+        self.assessment.refresh_from_db()
+        attempt = self._attempt({str(essay.id): "Because."})
+
+        GradingService.grade_attempt(attempt)
+
+        result = next(
+            r for r in attempt.question_results if r["question_id"] == str(essay.id)
+        )
+        self.assertIsNone(result["score"])
+        self.assertIsNone(result["correct"])
+
+    def test_get_question_results_derives_vector_for_legacy_attempts(self):
+        """Test that attempts graded without a stored vector still get one."""
+        attempt = self._attempt({str(self.sa.id): "Paris"})
+        attempt.status = AssessmentAttempt.AttemptStatus.GRADED
+        attempt.save()
+
+        results = GradingService.get_question_results(attempt)
+
+        sa_result = next(r for r in results if r["question_id"] == str(self.sa.id))
+        self.assertTrue(sa_result["correct"])
+        attempt.refresh_from_db()
+        self.assertEqual(attempt.question_results, [])
+
+
+class RegradeAssessmentTests(GradingPlanTestCase):
+    """Tests for GradingService.regrade_assessment."""
+
+    def test_regrade_rescores_attempts_after_answer_key_change(self):
+        """Test that regrading applies the new answer key to all attempts."""
+        attempts = [
+            self._attempt({str(self.sa.id): "Lyon"}) for _ in range(5)
+        ]
+        for attempt in attempts:
+            GradingService.grade_attempt(attempt)
+        self.assertEqual(
+            AssessmentAttempt.objects.filter(score=Decimal("0.00")).count(), 5
+        )
+
+        self.sa.type_specific_data = {"correct_answers": ["Lyon"]}
+        self.sa.save()
+        self.assessment.refresh_from_db()
+
+        regraded = GradingService.regrade_assessment(self.assessment, chunk_size=2)
+
+        self.assertEqual(regraded, 5)
+        self.assertEqual(
+            AssessmentAttempt.objects.filter(score=Decimal("1.00")).count(), 5
+        )
+        attempt = AssessmentAttempt.objects.get(pk=attempts[0].pk)
+        sa_result = next(
+            r for r in attempt.question_results if r["question_id"] == str(self.sa.id)
+        )
+        self.assertTrue(sa_result["correct"])
+
+    def test_regrade_skips_manually_graded_attempts(self):
+        """Test that instructor-graded attempts keep their score."""
+        attempt = self._attempt({str(self.sa.id): "Lyon"})
+        attempt.status = AssessmentAttempt.AttemptStatus.GRADED
+        attempt.score = Decimal("3.00")
+        attempt.graded_by = self.instructor
+        attempt.save()
+
+        regraded = GradingService.regrade_assessment(self.assessment)
+
+        attempt.refresh_from_db()
+        self.assertEqual(regraded, 0)
+        self.assertEqual(attempt.score, Decimal("3.00"))
+
+    def test_regrade_query_count_is_chunked(self):
+        """Test that regrading writes in bulk rather than per attempt."""
+        for _ in range(10):
+            self._attempt({str(self.mc.id): ["a"]})
+        get_grading_plan(self.assessment)
+
+        # One read, one bulk_update per chunk of 5, then invalidating item analysis
+        with self.assertNumQueries(4):
+            GradingService.regrade_assessment(self.assessment, chunk_size=5)
+
+
+class RegradeEndpointTests(APITestCase):
+    """Tests for the instructor regrade action."""
+
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Test Tenant", slug="test-tenant")
+        self.instructor = User.objects.create_user(
+            email="instructor@test.com",
+            password="testpass123",
+            role=User.Role.INSTRUCTOR,
+            tenant=self.tenant,
+            status=User.Status.ACTIVE,
+        )
+        self.course = Course.objects.create(
+            tenant=self.tenant,
+            title="Test Course",
+            slug="test-course",
+            instructor=self.instructor,
+            status=Course.Status.PUBLISHED,
+        )
+        self.assessment = Assessment.objects.create(course=self.course, title="Quiz")
+
+    @patch("apps.assessments.tasks.regrade_assessment_task")
+    def test_regrade_queues_task(self, mock_task):
+        """Test that the endpoint dispatches the regrade task."""
+        mock_task.delay.return_value.id = "task-123"
+        self.client.force_authenticate(user=self.instructor)
+
+        response = self.client.post(
+            f"/api/v1/instructor/assessments/{self.assessment.id}/regrade/",
+            HTTP_X_TENANT_SLUG=self.tenant.slug,
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["task_id"], "task-123")
+        mock_task.delay.assert_called_once_with(str(self.assessment.id))
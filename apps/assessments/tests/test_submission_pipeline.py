@@ -0,0 +1,156 @@
+"""
+Tests for the asynchronous submission pipeline.
+"""
+
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from apps.assessments.models import Assessment, AssessmentAttempt, AttemptSubmission, Question
+from apps.assessments.services import SubmissionPipelineService
+from apps.core.models import Tenant
+from apps.courses.models import Course
+from apps.users.models import User
+
+
+class SubmissionPipelineServiceTests(TestCase):
+    """Tests for SubmissionPipelineService stages."""
+
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Test Tenant", slug="test-tenant")
+        self.instructor = User.objects.create_user(
+            email="instructor@test.com",
+            password="testpass123",
+            role=User.Role.INSTRUCTOR,
+            tenant=self.tenant,
+        )
+        self.learner = User.objects.create_user(
+            email="learner@test.com",
+            password="testpass123",
+            role=User.Role.LEARNER,
+            tenant=self.tenant,
+        )
+        self.course = Course.objects.create(
+            tenant=self.tenant,
+            title="Test Course",
+            instructor=self.instructor,
+            status=Course.Status.PUBLISHED,
+        )
+        self.assessment = Assessment.objects.create(
+            course=self.course,
+            title="Quiz",
+            pass_mark_percentage=50,
+            is_published=True,
+        )
+        self.question = Question.objects.create(
+            assessment=self.assessment,
+            question_text="Is the sky blue?",
+            question_type=Question.QuestionType.TRUE_FALSE,
+            points=1,
+            type_specific_data={"correct_answer": True},
+        )
+        self.attempt = AssessmentAttempt.objects.create(
+            assessment=self.assessment, user=self.learner
+        )
+
+    def _submit(self, answer):
+        with patch.object(SubmissionPipelineService, "dispatch"):
+            return SubmissionPipelineService.submit(
+                self.attempt, {str(self.question.id): answer}
+            )
+
+    def test_submit_records_without_grading(self):
+        """Test that submit only records answers and a queued submission."""
+        submission = self._submit("true")
+
+        self.attempt.refresh_from_db()
+        self.assertEqual(self.attempt.status, AssessmentAttempt.AttemptStatus.SUBMITTED)
+        self.assertEqual(submission.status, AttemptSubmission.Status.QUEUED)
+        self.assertEqual(submission.idempotency_key, f"attempt-{self.attempt.id}")
+
+    def test_dispatch_publishes_without_retries(self):
+        """Test that the chain is published once so a broker outage falls back inline at once."""
+        submission = self._submit("true")
+
+        with patch("celery.canvas._chain.apply_async") as mock_apply:
+            SubmissionPipelineService.dispatch(submission.id)
+
+        mock_apply.assert_called_once_with(retry=False)
+
+    def test_stages_complete_in_order(self):
+        """Test that running every stage grades the attempt and completes the submission."""
+        submission = self._submit("true")
+
+        for stage in SubmissionPipelineService.STAGES:
+            SubmissionPipelineService.run_stage(submission.id, stage)
+
+        submission.refresh_from_db()
+        self.attempt.refresh_from_db()
+        self.assertEqual(submission.status, AttemptSubmission.Status.COMPLETED)
+        self.assertEqual(submission.completed_stages, list(SubmissionPipelineService.STAGES))
+        self.assertIsNotNone(submission.completed_at)
+        self.assertEqual(self.attempt.status, AssessmentAttempt.AttemptStatus.GRADED)
+
+    def test_completed_stage_is_skipped_on_retry(self):
+        """Test that a re-delivered stage does not repeat its work."""
+        submission = self._submit("false")
+        SubmissionPipelineService.run_stage(submission.id, SubmissionPipelineService.STAGE_GRADE)
+
+        with patch("apps.assessments.services.GradingService.grade_attempt") as mock_grade:
+            SubmissionPipelineService.run_stage(submission.id, SubmissionPipelineService.STAGE_GRADE)
+        mock_grade.assert_not_called()
+
+    def test_grade_stage_defers_signal_side_effects(self):
+        """Test that grading in the pipeline leaves remedial suggestions to their own stage."""
+        submission = self._submit("false")
+
+        with patch(
+            "apps.learning_paths.signals.suggest_remedial_path_for_attempt"
+        ) as mock_remedial:
+            SubmissionPipelineService.run_stage(submission.id, SubmissionPipelineService.STAGE_GRADE)
+            mock_remedial.assert_not_called()
+
+            SubmissionPipelineService.run_stage(
+                submission.id, SubmissionPipelineService.STAGE_SUGGEST_REMEDIAL_PATH
+            )
+            mock_remedial.assert_called_once()
+
+    def test_failed_stage_is_recorded(self):
+        """Test that a failing stage marks the submission as failed."""
+        submission = self._submit("true")
+
+        with patch(
+            "apps.assessments.services.GradingService.grade_attempt",
+            side_effect=RuntimeError("boom"),
+        ):
+            with self.assertRaises(RuntimeError):
+                SubmissionPipelineService.run_stage(submission.id, SubmissionPipelineService.STAGE_GRADE)
+
+        submission.refresh_from_db()
+        self.assertEqual(submission.status, AttemptSubmission.Status.FAILED)
+        self.assertIn("boom", submission.error)
+
+    def test_update_skills_stage_rolls_back_partial_writes(self):
+        """Test that a failing skill update leaves no writes to repeat on retry."""
+        submission = self._submit("true")
+        SubmissionPipelineService.run_stage(submission.id, SubmissionPipelineService.STAGE_GRADE)
+
+        def partial_update(attempt):
+            Tenant.objects.create(name="Partial", slug="partial")
+            raise RuntimeError("boom")
+
+        with patch.object(SubmissionPipelineService, "_stage_update_skills", side_effect=partial_update):
+            with self.assertRaises(RuntimeError):
+                SubmissionPipelineService.run_stage(
+                    submission.id, SubmissionPipelineService.STAGE_UPDATE_SKILLS
+                )
+
+        submission.refresh_from_db()
+        self.assertFalse(Tenant.objects.filter(slug="partial").exists())
+        self.assertEqual(submission.status, AttemptSubmission.Status.FAILED)
+        self.assertNotIn(SubmissionPipelineService.STAGE_UPDATE_SKILLS, submission.completed_stages)
+
+        with patch.object(SubmissionPipelineService, "_stage_update_skills") as mock_update:
+            SubmissionPipelineService.run_stage(submission.id, SubmissionPipelineService.STAGE_UPDATE_SKILLS)
+            SubmissionPipelineService.run_stage(submission.id, SubmissionPipelineService.STAGE_UPDATE_SKILLS)
+        mock_update.assert_called_once()
@@ -3,6 +3,10 @@ Tests for Assessment views and viewsets.
 Tests cover permission checks, enrollment requirements, and assessment attempts.
 """
 
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.db import IntegrityError
 from django.test import TestCase
 from django.urls import reverse
 from django.utils import timezone
@@ -13,7 +17,8 @@ from apps.core.models import Tenant
 from apps.users.models import User
 from apps.courses.models import Course
 from apps.enrollments.models import Enrollment
-from apps.assessments.models import Assessment, AssessmentAttempt, Question
+from apps.assessments.models import Assessment, AssessmentAttempt, AttemptSubmission, Question
+from apps.assessments.services import SubmissionPipelineService
 
 
 class AssessmentTestCase(APITestCase):
@@ -412,15 +417,123 @@ class SubmitAssessmentAttemptViewTests(AssessmentTestCase):
                 str(self.question.id): ['opt2']  # Correct answer
             }
         }
-        response = self.client.post(url, data, format='json')
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        with patch('apps.assessments.services.SubmissionPipelineService.dispatch') as mock_dispatch, \
+                self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertIn('submission', response.data)
+        self.assertIn('status_url', response.data)
         
-        # Verify attempt updated - auto-graded assessments go to GRADED status
+        # Verify attempt updated - grading happens asynchronously in the pipeline
+        self.attempt.refresh_from_db()
+        self.assertEqual(self.attempt.status, AssessmentAttempt.AttemptStatus.SUBMITTED)
+        submission = AttemptSubmission.objects.get(attempt=self.attempt)
+        mock_dispatch.assert_called_once_with(submission.id)
+
+    def test_submit_is_idempotent_with_same_key(self):
+        """Test that retrying a submission with the same key returns the original."""
+        self.client.force_authenticate(user=self.learner_user)
+        url = reverse('assessments:assessment-attempt-submit', kwargs={'attempt_id': self.attempt.id})
+        data = {'answers': {str(self.question.id): ['opt2']}}
+
+        first = self.client.post(url, data, format='json', HTTP_IDEMPOTENCY_KEY='key-1')
+        retry = self.client.post(url, data, format='json', HTTP_IDEMPOTENCY_KEY='key-1')
+        conflict = self.client.post(url, data, format='json', HTTP_IDEMPOTENCY_KEY='key-2')
+
+        self.assertEqual(first.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(retry.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(retry.data['submission']['id'], first.data['submission']['id'])
+        self.assertEqual(conflict.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(AttemptSubmission.objects.filter(attempt=self.attempt).count(), 1)
+
+    def test_concurrent_submit_replays_the_winner(self):
+        """Test that a submit losing the race on the attempt returns the other request's submission."""
+        self.client.force_authenticate(user=self.learner_user)
+        url = reverse('assessments:assessment-attempt-submit', kwargs={'attempt_id': self.attempt.id})
+        data = {'answers': {str(self.question.id): ['opt2']}}
+        submit = SubmissionPipelineService.submit
+
+        def racing_submit(attempt, answers, idempotency_key=None):
+            # Another request submits the attempt after this one's replay check
+            submit(attempt, answers, idempotency_key=idempotency_key)
+            return submit(attempt, answers, idempotency_key=idempotency_key)
+
+        with patch('apps.assessments.services.SubmissionPipelineService.dispatch'), \
+                patch('apps.assessments.views.SubmissionPipelineService.submit', side_effect=racing_submit):
+            response = self.client.post(url, data, format='json', HTTP_IDEMPOTENCY_KEY='key-1')
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(
+            response.data['submission']['id'], str(AttemptSubmission.objects.get(attempt=self.attempt).id)
+        )
+
+    def test_idempotency_key_taken_concurrently_conflicts(self):
+        """Test that a key claimed by another attempt mid-request returns 409, not 500."""
+        other_attempt = AssessmentAttempt.objects.create(
+            assessment=self.assessment,
+            user=self.learner_user,
+            status=AssessmentAttempt.AttemptStatus.SUBMITTED,
+        )
+        self.client.force_authenticate(user=self.learner_user)
+        url = reverse('assessments:assessment-attempt-submit', kwargs={'attempt_id': self.attempt.id})
+        data = {'answers': {str(self.question.id): ['opt2']}}
+        submit = SubmissionPipelineService.submit
+
+        def racing_submit(attempt, answers, idempotency_key=None):
+            AttemptSubmission.objects.create(attempt=other_attempt, idempotency_key=idempotency_key)
+            return submit(attempt, answers, idempotency_key=idempotency_key)
+
+        with patch('apps.assessments.services.SubmissionPipelineService.dispatch'), \
+                patch('apps.assessments.views.SubmissionPipelineService.submit', side_effect=racing_submit):
+            response = self.client.post(url, data, format='json', HTTP_IDEMPOTENCY_KEY='key-1')
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
         self.attempt.refresh_from_db()
-        self.assertIn(
-            self.attempt.status, 
-            [AssessmentAttempt.AttemptStatus.SUBMITTED, AssessmentAttempt.AttemptStatus.GRADED]
+        self.assertEqual(self.attempt.status, AssessmentAttempt.AttemptStatus.IN_PROGRESS)
+
+    def test_integrity_error_without_conflicting_submission_conflicts(self):
+        """Test that a lost race whose winner is no longer visible returns 409, not 500."""
+        self.client.force_authenticate(user=self.learner_user)
+        url = reverse('assessments:assessment-attempt-submit', kwargs={'attempt_id': self.attempt.id})
+        data = {'answers': {str(self.question.id): ['opt2']}}
+
+        with patch('apps.assessments.views.SubmissionPipelineService.submit', side_effect=IntegrityError):
+            response = self.client.post(url, data, format='json', HTTP_IDEMPOTENCY_KEY='key-1')
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+    def test_submission_status_reports_pipeline_progress(self):
+        """Test that the status endpoint reflects completed pipeline stages."""
+        self.client.force_authenticate(user=self.learner_user)
+        url = reverse('assessments:assessment-attempt-submit', kwargs={'attempt_id': self.attempt.id})
+        data = {'answers': {str(self.question.id): ['opt2']}}
+
+        # Broker unavailable: the pipeline falls back to running inline on commit
+        with patch('celery.canvas._chain.apply_async', side_effect=ConnectionError('broker down')), \
+                self.captureOnCommitCallbacks(execute=True):
+            self.client.post(url, data, format='json')
+
+        status_url = reverse(
+            'assessments:assessment-attempt-submission-status',
+            kwargs={'attempt_id': self.attempt.id},
         )
+        response = self.client.get(status_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], AttemptSubmission.Status.COMPLETED)
+        self.assertEqual(response.data['attempt_status'], AssessmentAttempt.AttemptStatus.GRADED)
+        self.assertEqual(response.data['score'], Decimal('10.00'))
+        self.assertTrue(response.data['is_passed'])
+
+    def test_submission_status_requires_owner(self):
+        """Test that other learners cannot read a submission's status."""
+        AttemptSubmission.objects.create(attempt=self.attempt, idempotency_key='k')
+        self.client.force_authenticate(user=self.other_learner)
+        url = reverse(
+            'assessments:assessment-attempt-submission-status',
+            kwargs={'attempt_id': self.attempt.id},
+        )
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
     def test_cannot_submit_already_submitted(self):
         """Test that already submitted attempt cannot be resubmitted."""
@@ -4,6 +4,7 @@ from rest_framework_nested import routers
 from .views import (
     AssessmentAttemptResultView,
     AssessmentAttemptSkillBreakdownView,
+    AttemptSubmissionStatusView,
     MyAssessmentAttemptsView,
     RemedialPathAvailabilityView,
     RemedialRecommendationsView,
@@ -47,6 +48,11 @@ urlpatterns = [
         SubmitAssessmentAttemptView.as_view(),
         name="assessment-attempt-submit",
     ),
+    path(
+        "attempts/<uuid:attempt_id>/submission-status/",
+        AttemptSubmissionStatusView.as_view(),
+        name="assessment-attempt-submission-status",
+    ),
     path(
         "attempts/<uuid:attempt_id>/resume/",
         ResumeAssessmentAttemptView.as_view(),
@@ -1,22 +1,25 @@
 import logging
 import uuid # Import uuid for type hinting path params
+from django.db import IntegrityError
 from django.utils import timezone
 from django.shortcuts import get_object_or_404
-from rest_framework import generics, permissions, status, serializers
+from rest_framework import generics, permissions, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from .models import Assessment, AssessmentAttempt, Question
+from rest_framework.reverse import reverse
+from apps.common.pagination import KeysetPagination
+from .models import Assessment, AssessmentAttempt, AttemptSubmission, Question
+from .services import SubmissionPipelineService
 from .serializers import (
     AssessmentSerializer,
     AssessmentAttemptSerializer,
+    AttemptSubmissionSerializer,
     AssessmentAttemptStartSerializer,
     AssessmentAttemptSubmitSerializer,
     QuestionSerializer,
 )
 from apps.users.permissions import IsLearner
 from apps.enrollments.services import EnrollmentService
-from apps.notifications.models import NotificationType
-from apps.notifications.services import NotificationService
 from apps.ai_engine.services import PersonalizationService
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from drf_spectacular.types import OpenApiTypes
@@ -24,27 +27,6 @@ from drf_spectacular.types import OpenApiTypes
 logger = logging.getLogger(__name__)
 
 
-def send_assessment_submission_notification(attempt: AssessmentAttempt):
-    """Send notification to the learner confirming their assessment submission."""
-    try:
-        content = NotificationService.generate_content_for_type(
-            NotificationType.ASSESSMENT_SUBMISSION,
-            {
-                "user_name": attempt.user.get_full_name() or attempt.user.email,
-                "assessment_title": attempt.assessment.title,
-                "course_name": attempt.assessment.course.title,
-            }
-        )
-        NotificationService.create_notification(
-            user=attempt.user,
-            notification_type=NotificationType.ASSESSMENT_SUBMISSION,
-            subject=content["subject"],
-            message=content["message"],
-            action_url=f"/courses/{attempt.assessment.course.slug}/assessments/{attempt.assessment.id}/attempts/{attempt.id}",
-        )
-    except Exception as e:
-        logger.error(f"Failed to send assessment submission notification for attempt {attempt.id}: {e}", exc_info=True)
-
 @extend_schema(
     tags=['Assessment Attempts'], # Group in Swagger
     summary="Start Assessment Attempt",
@@ -197,13 +179,18 @@ class ResumeAssessmentAttemptView(APIView):
 @extend_schema(
     tags=['Assessment Attempts'],
     summary="Submit Assessment Attempt",
-    description="Submits answers for an ongoing assessment attempt.",
+    description=(
+        "Submits answers for an ongoing assessment attempt. The submission is recorded "
+        "immediately and graded asynchronously; poll the returned status_url for progress. "
+        "Send an Idempotency-Key header to make retries safe."
+    ),
     request=AssessmentAttemptSubmitSerializer, # Define request body serializer
     responses={
-        200: AssessmentAttemptSerializer, # Define successful response
+        202: AssessmentAttemptSerializer, # Submission accepted, grading queued
         400: OpenApiTypes.OBJECT, # Bad Request (e.g., already submitted, invalid data)
         403: OpenApiTypes.OBJECT, # Forbidden (e.g., not owner)
         404: OpenApiTypes.OBJECT, # Attempt not found
+        409: OpenApiTypes.OBJECT, # Idempotency key reused for a different submission
     }
 )
 class SubmitAssessmentAttemptView(APIView):
@@ -212,6 +199,11 @@ class SubmitAssessmentAttemptView(APIView):
 
     def post(self, request, attempt_id: uuid.UUID, format=None): # Add type hint
         attempt = get_object_or_404(AssessmentAttempt, pk=attempt_id, user=request.user)
+        idempotency_key = request.headers.get("Idempotency-Key")
+
+        replay = self._replay_response(request, attempt, idempotency_key)
+        if replay is not None:
+            return replay
 
         if attempt.status != AssessmentAttempt.AttemptStatus.IN_PROGRESS:
             return Response({"detail": "This attempt cannot be submitted in its current state."}, status=status.HTTP_400_BAD_REQUEST)
@@ -228,35 +220,104 @@ class SubmitAssessmentAttemptView(APIView):
         serializer = AssessmentAttemptSubmitSerializer(data=request.data)
         if serializer.is_valid():
             try:
-                # The save method in the serializer now handles the submit logic
-                serializer.save(attempt=attempt)
-                logger.info(f"User {request.user.id} submitted attempt {attempt.id}")
-
-                # Send submission confirmation notification
-                send_assessment_submission_notification(attempt)
+                # Record the answers; grading and side effects run in the pipeline
+                submission = SubmissionPipelineService.submit(
+                    attempt,
+                    serializer.validated_data["answers"],
+                    idempotency_key=idempotency_key,
+                )
+                if submission is None:
+                    # A concurrent request may have submitted it while we waited for the lock
+                    replay = self._replay_response(request, attempt, idempotency_key)
+                    if replay is not None:
+                        return replay
+                    return Response({"detail": "Attempt could not be submitted (e.g., already submitted or invalid status)."}, status=status.HTTP_400_BAD_REQUEST)
+                logger.info(f"User {request.user.id} submitted attempt {attempt.id} (submission {submission.id})")
 
-                # --- Prepare Response ---
                 attempt.refresh_from_db()
-                response_serializer = AssessmentAttemptSerializer(attempt, context={'request': request})
-                response_data = response_serializer.data
-
-                # Modify response based on settings AFTER serialization
-                if not attempt.assessment.show_results_immediately and attempt.status != AssessmentAttempt.AttemptStatus.GRADED:
-                    response_data.pop('score', None)
-                    response_data.pop('is_passed', None)
-                    response_data.pop('feedback', None)
-                    # response_data.pop('answers', None) # Maybe hide submitted answers too?
-
-                return Response(response_data, status=status.HTTP_200_OK)
-
-            except serializers.ValidationError as e:
-                 return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+                return self._accepted_response(request, attempt, submission)
+
+            except IntegrityError:
+                # Lost a race on the attempt or the idempotency key
+                replay = self._replay_response(request, attempt, idempotency_key)
+                if replay is not None:
+                    return replay
+                # The conflicting submission was rolled back before we could look it up
+                return Response(
+                    {"detail": "This attempt or idempotency key is being submitted by another request."},
+                    status=status.HTTP_409_CONFLICT,
+                )
             except Exception as e:
                  logger.error(f"Error submitting attempt {attempt.id}: {e}", exc_info=True)
                  return Response({"detail": "An unexpected error occurred during submission."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         else:
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    def _replay_response(self, request, attempt, idempotency_key):
+        """
+        Returns the existing submission for a retried request (202), a 409
+        if the attempt or key is already taken by a different submission, or
+        None if neither has been submitted yet.
+        """
+        existing_submission = AttemptSubmission.objects.filter(attempt=attempt).first()
+        if existing_submission:
+            if idempotency_key and idempotency_key != existing_submission.idempotency_key:
+                return Response(
+                    {"detail": "This attempt was already submitted with a different idempotency key."},
+                    status=status.HTTP_409_CONFLICT,
+                )
+            attempt.refresh_from_db()
+            return self._accepted_response(request, attempt, existing_submission)
+
+        if idempotency_key and AttemptSubmission.objects.filter(idempotency_key=idempotency_key).exists():
+            return Response(
+                {"detail": "This idempotency key was already used for another submission."},
+                status=status.HTTP_409_CONFLICT,
+            )
+        return None
+
+    def _accepted_response(self, request, attempt, submission):
+        response_serializer = AssessmentAttemptSerializer(attempt, context={'request': request})
+        response_data = response_serializer.data
+
+        # Modify response based on settings AFTER serialization
+        if not attempt.assessment.show_results_immediately and attempt.status != AssessmentAttempt.AttemptStatus.GRADED:
+            response_data.pop('score', None)
+            response_data.pop('is_passed', None)
+            response_data.pop('feedback', None)
+            # response_data.pop('answers', None) # Maybe hide submitted answers too?
+
+        response_data['submission'] = AttemptSubmissionSerializer(submission, context={'request': request}).data
+        response_data['status_url'] = reverse(
+            'assessments:assessment-attempt-submission-status',
+            kwargs={'attempt_id': attempt.id},
+            request=request,
+        )
+        return Response(response_data, status=status.HTTP_202_ACCEPTED)
+
+
+@extend_schema(
+    tags=['Assessment Attempts'],
+    summary="Submission Status",
+    description="Returns the progress of the asynchronous grading pipeline for a submitted attempt.",
+    responses={
+        200: AttemptSubmissionSerializer,
+        404: OpenApiTypes.OBJECT,  # Attempt or submission not found
+    }
+)
+class AttemptSubmissionStatusView(APIView):
+    """ Polling endpoint for the status of an attempt's submission pipeline. """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, attempt_id: uuid.UUID, format=None):
+        submission = get_object_or_404(
+            AttemptSubmission.objects.select_related('attempt__assessment'),
+            attempt_id=attempt_id,
+            attempt__user=request.user,
+        )
+        serializer = AttemptSubmissionSerializer(submission, context={'request': request})
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
 
 @extend_schema(
     tags=['Assessment Attempts'],
@@ -542,6 +603,11 @@ class AssessmentAttemptSkillBreakdownView(APIView):
         return Response(breakdown)
 
 
+class AttemptHistoryPagination(KeysetPagination):
+    page_size = 50
+    page_size_query_param = 'limit'
+
+
 @extend_schema(
     tags=['Assessment Attempts'],
     summary="Get My Assessment Attempts",
@@ -560,7 +626,14 @@ class AssessmentAttemptSkillBreakdownView(APIView):
             name='limit',
             type=OpenApiTypes.INT,
             location=OpenApiParameter.QUERY,
-            description='Maximum number of attempts to return (default: 50)',
+            description='Attempts per page (default: 50, max: 100)',
+            required=False,
+        ),
+        OpenApiParameter(
+            name='cursor',
+            type=OpenApiTypes.STR,
+            location=OpenApiParameter.QUERY,
+            description='Cursor from a previous response\'s next/previous link',
             required=False,
         ),
     ],
@@ -578,24 +651,18 @@ class MyAssessmentAttemptsView(APIView):
     - Getting graded attempts for remedial path generation
     """
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = AttemptHistoryPagination
 
     def get(self, request, format=None):
         user = request.user
         status_filter = request.query_params.get('status')
-        limit = request.query_params.get('limit', 50)
 
-        try:
-            limit = int(limit)
-            limit = min(max(limit, 1), 100)  # Clamp between 1 and 100
-        except (ValueError, TypeError):
-            limit = 50
-
-        # Build queryset
+        # Build queryset; the paginator orders newest first by (created_at, id)
         queryset = AssessmentAttempt.objects.filter(
             user=user
         ).select_related(
             'assessment', 'assessment__course', 'graded_by'
-        ).order_by('-start_time')
+        )
 
         # Apply tenant filtering if applicable
         if hasattr(request, 'tenant') and request.tenant:
@@ -605,11 +672,10 @@ class MyAssessmentAttemptsView(APIView):
         if status_filter and status_filter in ['IN_PROGRESS', 'SUBMITTED', 'GRADED']:
             queryset = queryset.filter(status=status_filter)
 
-        # Apply limit
-        attempts = queryset[:limit]
-
+        paginator = self.pagination_class()
+        attempts = paginator.paginate_queryset(queryset, request, view=self)
         serializer = AssessmentAttemptSerializer(attempts, many=True)
-        return Response({
-            'count': len(serializer.data),
-            'results': serializer.data,
-        })
+        response = paginator.get_paginated_response(serializer.data)
+        # Without ?count=, 'count' keeps its original meaning: attempts in this response
+        response.data.setdefault('count', len(serializer.data))
+        return response
@@ -266,6 +266,28 @@ class InstructorAssessmentViewSet(viewsets.ModelViewSet):
         serializer = AssessmentAttemptSerializer(attempts, many=True)
         return Response(serializer.data)
 
+    @extend_schema(
+        request=None,
+        responses={202: None},
+        description="Queue a bulk re-grade of all auto-graded attempts for this assessment",
+    )
+    @action(detail=True, methods=["post"])
+    def regrade(self, request, pk=None):
+        """
+        Queue a bulk re-grade after answer key changes.
+        POST /api/v1/instructor/assessments/{assessment_id}/regrade/
+        """
+        assessment = self.get_object()
+
+        from .tasks import regrade_assessment_task
+        task = regrade_assessment_task.delay(str(assessment.id))
+        logger.info(f"Dispatched regrade task {task.id} for assessment {assessment.id}")
+
+        return Response(
+            {"detail": "Regrade queued.", "task_id": task.id},
+            status=status.HTTP_202_ACCEPTED,
+        )
+
     @extend_schema(
         request=ManualGradeSerializer,
         responses={200: AssessmentAttemptSerializer},
@@ -311,6 +333,12 @@ class InstructorAssessmentViewSet(viewsets.ModelViewSet):
         )
         serializer.is_valid(raise_exception=True)
         
+        if attempt.status == AssessmentAttempt.AttemptStatus.GRADED:
+            # Re-grading changes a score item analysis may already have folded in
+            from apps.analytics.services import ItemAnalysisService
+
+            ItemAnalysisService.invalidate(assessment.id)
+
         # Update the attempt with grading information
         attempt.score = serializer.validated_data["score"]
         attempt.feedback = serializer.validated_data.get("feedback", "")
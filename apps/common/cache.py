@@ -0,0 +1,363 @@
+"""
+Two-tier cache-aside helpers.
+
+`django.core.cache.cache` is Redis when CACHE_URL is set, shared by every
+worker and host, and per-process LocMem otherwise. `cached()` puts a small
+in-process LRU with a short TTL (CACHE_LOCAL_TTL) in front of it so hot
+lookups such as tenant resolution skip the network round trip as well.
+
+Entries carry tags. `invalidate_tags()` bumps each tag's version in the
+shared cache, which turns every entry stored under an older version into a
+miss on every worker, and drops matching entries from this process's LRU.
+With a Redis CACHE_URL it also publishes the tags on a pub/sub channel that
+every process listens on, so their LRUs drop the entries immediately;
+without one (or while the listener reconnects) other processes may serve
+their local copy for up to CACHE_LOCAL_TTL seconds.
+
+On a miss only one caller computes the value: threads in a process wait on
+a per-key lock, and processes race for a short-lived lock key in the shared
+cache while the others poll for the result. Hits and misses are counted per
+namespace (see `cache_metrics()`).
+"""
+
+import functools
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Callable, Dict, Iterable, Optional, Union
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .perf import record_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "cached"
+TAG_PREFIX = "cache_tag"
+# Seconds a process may hold the fill lock, and how long others wait for its result
+LOCK_TIMEOUT = 10
+LOCK_WAIT = 2.0
+LOCK_POLL_INTERVAL = 0.05
+INVALIDATION_CHANNEL = "lms:cache_invalidations"
+
+_MISSING = object()
+
+Tags = Union[Iterable[str], Callable[..., Iterable[str]], None]
+
+
+class LocalLRU:
+    """A thread-safe, size-bounded in-process cache with per-entry expiry and tags."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            expires_at, value, _ = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return _MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value, ttl: float, tags: Iterable[str] = ()) -> None:
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value, frozenset(tags))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate_tags(self, tags: Iterable[str]) -> None:
+        tags = set(tags)
+        with self._lock:
+            for key in [key for key, (_, _, entry_tags) in self._entries.items() if entry_tags & tags]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class CacheMetrics:
+    """Per-namespace counters of local hits, shared hits, misses and single-flight waits."""
+
+    FIELDS = ('local_hits', 'hits', 'misses', 'waits')
+
+    def __init__(self):
+        self._counts: Dict[str, Dict[str, int]] = defaultdict(lambda: dict.fromkeys(self.FIELDS, 0))
+        self._lock = threading.Lock()
+
+    def record(self, namespace: str, field: str) -> None:
+        with self._lock:
+            self._counts[namespace][field] += 1
+        if field != 'waits':
+            record_cache_lookup(hit=field != 'misses')
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {namespace: dict(counts) for namespace, counts in self._counts.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+
+class InvalidationBus:
+    """
+    Broadcasts tag invalidations to the local LRUs of all processes over Redis pub/sub.
+
+    Each process starts one daemon listener thread on first use. Messages
+    missed while it reconnects are covered by clearing the whole LRU.
+    """
+
+    RECONNECT_DELAY = 1.0
+
+    def __init__(self, url: str):
+        import redis
+
+        self.url = url
+        self._client = redis.Redis.from_url(url)
+        self._listener: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def publish(self, tags: Iterable[str]) -> None:
+        try:
+            self._client.publish(INVALIDATION_CHANNEL, json.dumps(list(tags)))
+        except Exception as e:
+            logger.error(f"Publishing cache invalidation for {list(tags)} failed: {e}")
+
+    def ensure_listening(self) -> None:
+        if self._listener is not None and self._listener.is_alive():
+            return
+        with self._lock:
+            if self._listener is None or not self._listener.is_alive():
+                self._listener = threading.Thread(target=self._listen, name="cache-invalidations", daemon=True)
+                self._listener.start()
+
+    def _listen(self) -> None:
+        import redis
+
+        while True:
+            try:
+                pubsub = redis.Redis.from_url(self.url).pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(INVALIDATION_CHANNEL)
+                local_cache.clear()
+                for message in pubsub.listen():
+                    try:
+                        local_cache.invalidate_tags(json.loads(message['data']))
+                    except (TypeError, ValueError, KeyError) as e:
+                        logger.warning(f"Dropping malformed cache invalidation: {e}")
+            except Exception as e:
+                logger.error(f"Cache invalidation listener disconnected: {e}")
+                time.sleep(self.RECONNECT_DELAY)
+
+
+local_cache = LocalLRU(getattr(settings, 'CACHE_LOCAL_MAX_ENTRIES', 1024))
+metrics = CacheMetrics()
+
+_bus: Optional[InvalidationBus] = None
+_bus_checked = False
+_bus_guard = threading.Lock()
+
+_flights: Dict[str, threading.Lock] = {}
+_flights_guard = threading.Lock()
+
+
+def get_invalidation_bus() -> Optional[InvalidationBus]:
+    """The process's invalidation bus when the shared cache is Redis, else None."""
+    global _bus, _bus_checked
+    if not _bus_checked:
+        with _bus_guard:
+            if not _bus_checked:
+                url = getattr(settings, 'CACHE_URL', '')
+                if url.startswith(('redis://', 'rediss://', 'unix://')):
+                    try:
+                        _bus = InvalidationBus(url)
+                    except ImportError:
+                        logger.warning("redis is not installed; cache invalidations stay process-local")
+                _bus_checked = True
+    return _bus
+
+
+def cache_metrics() -> Dict[str, Dict[str, int]]:
+    return metrics.snapshot()
+
+
+def clear_local_cache() -> None:
+    """Drops this process's LRU tier, e.g. between tests that clear the shared cache."""
+    local_cache.clear()
+
+
+def _tag_key(tag: str) -> str:
+    return f"{TAG_PREFIX}:{tag}"
+
+
+def _tag_versions(tags: Iterable[str]) -> Dict[str, int]:
+    """Current version of each tag, creating missing ones."""
+    keys = {_tag_key(tag): tag for tag in tags}
+    if not keys:
+        return {}
+    found = cache.get_many(list(keys))
+    missing = [key for key in keys if key not in found]
+    for key in missing:
+        # Time-based so a version lost to eviction never repeats an older one
+        cache.add(key, time.time_ns(), timeout=None)
+    if missing:
+        found.update(cache.get_many(missing))
+    return {keys[key]: version for key, version in found.items()}
+
+
+def invalidate_tags(*tags: str) -> None:
+    """Expires every entry stored under any of `tags`, in all processes."""
+    for tag in tags:
+        key = _tag_key(tag)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), timeout=None)
+    local_cache.invalidate_tags(tags)
+    bus = get_invalidation_bus()
+    if bus is not None:
+        bus.publish(tags)
+
+
+def _shared_get(key: str, tags: Iterable[str]):
+    tag_keys = {_tag_key(tag): tag for tag in tags}
+    found = cache.get_many([key, *tag_keys])
+    entry = found.get(key)
+    if entry is None:
+        return _MISSING
+    for tag_key, tag in tag_keys.items():
+        if tag_key not in found or entry['tags'].get(tag) != found[tag_key]:
+            return _MISSING
+    return entry['value']
+
+
+def cached(
+    key_fn: Optional[Callable[..., str]] = None,
+    ttl: int = 300,
+    tags: Tags = None,
+    namespace: Optional[str] = None,
+    none_ttl: Optional[int] = None,
+    local_ttl: Optional[float] = None,
+):
+    """
+    Cache-aside decorator backed by the local LRU and the shared cache.
+
+    `key_fn` builds the key from the call's arguments (default: the
+    arguments joined with ':'); `tags` is a list of tags or a function of
+    the arguments returning one. None results are cached too, for
+    `none_ttl` seconds when given. Values must be picklable.
+
+    The wrapper gains `invalidate(*args, **kwargs)` for a single key and
+    `uncached` for the undecorated function.
+    """
+
+    def decorator(func):
+        ns = namespace or f"{func.__module__}.{func.__qualname__}"
+
+        def build_key(*args, **kwargs) -> str:
+            if key_fn is not None:
+                part = key_fn(*args, **kwargs)
+            else:
+                part = ":".join([*map(str, args), *(f"{name}={kwargs[name]}" for name in sorted(kwargs))])
+            return f"{KEY_PREFIX}:{ns}:{part}"
+
+        def resolve_tags(*args, **kwargs) -> list:
+            if tags is None:
+                return []
+            return list(tags(*args, **kwargs) if callable(tags) else tags)
+
+        def store(key, value, entry_tags, versions) -> None:
+            timeout = none_ttl if value is None and none_ttl is not None else ttl
+            cache.set(key, {'value': value, 'tags': versions}, timeout=timeout)
+            local_timeout = local_ttl if local_ttl is not None else getattr(settings, 'CACHE_LOCAL_TTL', 5)
+            local_cache.set(key, value, min(local_timeout, timeout), entry_tags)
+
+        def lookup(key, entry_tags):
+            value = local_cache.get(key)
+            if value is not _MISSING:
+                metrics.record(ns, 'local_hits')
+                return value
+            value = _shared_get(key, entry_tags)
+            if value is not _MISSING:
+                metrics.record(ns, 'hits')
+                local_timeout = local_ttl if local_ttl is not None else getattr(settings, 'CACHE_LOCAL_TTL', 5)
+                local_cache.set(key, value, local_timeout, entry_tags)
+            return value
+
+        def fill(key, entry_tags, args, kwargs):
+            # Snapshot tag versions first: an invalidation during the call leaves the result stale
+            versions = _tag_versions(entry_tags)
+            value = func(*args, **kwargs)
+            store(key, value, entry_tags, versions)
+            return value
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bus = get_invalidation_bus()
+            if bus is not None:
+                bus.ensure_listening()
+            key = build_key(*args, **kwargs)
+            entry_tags = resolve_tags(*args, **kwargs)
+            value = lookup(key, entry_tags)
+            if value is not _MISSING:
+                return value
+
+            with _flights_guard:
+                flight = _flights.setdefault(key, threading.Lock())
+            with flight:
+                try:
+                    # Another thread may have filled it while this one waited
+                    value = lookup(key, entry_tags)
+                    if value is not _MISSING:
+                        return value
+                    metrics.record(ns, 'misses')
+
+                    lock_key = f"{key}:lock"
+                    if cache.add(lock_key, 1, timeout=LOCK_TIMEOUT):
+                        try:
+                            return fill(key, entry_tags, args, kwargs)
+                        finally:
+                            cache.delete(lock_key)
+
+                    # Another process is computing it; wait briefly for its result
+                    metrics.record(ns, 'waits')
+                    deadline = time.monotonic() + LOCK_WAIT
+                    while time.monotonic() < deadline:
+                        time.sleep(LOCK_POLL_INTERVAL)
+                        value = _shared_get(key, entry_tags)
+                        if value is not _MISSING:
+                            return value
+                    logger.warning(f"Cache fill for {key} did not finish in {LOCK_WAIT}s; computing it here")
+                    return fill(key, entry_tags, args, kwargs)
+                finally:
+                    with _flights_guard:
+                        if _flights.get(key) is flight:
+                            del _flights[key]
+
+        def invalidate(*args, **kwargs) -> None:
+            key = build_key(*args, **kwargs)
+            cache.delete(key)
+            local_cache.delete(key)
+
+        wrapper.invalidate = invalidate
+        wrapper.uncached = func
+        wrapper.namespace = ns
+        return wrapper
+
+    return decorator
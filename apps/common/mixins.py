@@ -0,0 +1,168 @@
+import hashlib
+
+from django.db.models import Count, Max, QuerySet
+from django.utils.http import parse_etags
+from rest_framework import permissions, status
+from rest_framework.response import Response
+
+
+def parse_field_list(value) -> list:
+    """Splits a comma-separated query parameter into a list of names."""
+    if not value:
+        return []
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+class SparseFieldsetViewMixin:
+    """
+    View mixin pairing ?fields= / ?expand= with SparseFieldsetMixin serializers.
+
+    Views map serializer field names to the prefetch_related lookups they need
+    in `field_prefetches`; apply_field_prefetches() only adds lookups for fields
+    that will actually be rendered.
+
+    Fieldsets only apply to safe (read) methods: on writes the serializer keeps
+    every field, so ?fields= can never drop input from validation.
+    """
+
+    field_prefetches = {}
+
+    def uses_sparse_fieldset(self) -> bool:
+        request = getattr(self, 'request', None)
+        return request is not None and request.method in permissions.SAFE_METHODS
+
+    def get_sparse_fieldset(self):
+        params = self.request.query_params
+        return parse_field_list(params.get('fields')), parse_field_list(params.get('expand'))
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.uses_sparse_fieldset():
+            context['sparse_fields'], context['sparse_expand'] = self.get_sparse_fieldset()
+        return context
+
+    def get_requested_fields(self) -> set:
+        """Names of the fields the serializer will render for this request."""
+        serializer_class = self.get_serializer_class()
+        field_names = serializer_class(context={}).fields.keys()
+        if not self.uses_sparse_fieldset():
+            return set(field_names)
+        fields, expand = self.get_sparse_fieldset()
+        return serializer_class.get_sparse_field_names(field_names, fields, expand)
+
+    def apply_field_prefetches(self, queryset: QuerySet, requested=None) -> QuerySet:
+        requested = self.get_requested_fields() if requested is None else requested
+        for field_name, lookups in self.field_prefetches.items():
+            if field_name in requested:
+                queryset = queryset.prefetch_related(*lookups)
+        return queryset
+
+
+def etag_matches(request, etag: str) -> bool:
+    """Weak comparison of `etag` against the request's If-None-Match header."""
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return False
+
+    def opaque(tag):
+        return tag[2:] if tag.startswith('W/') else tag
+
+    candidates = parse_etags(header)
+    return '*' in candidates or opaque(etag) in {opaque(tag) for tag in candidates}
+
+
+def queryset_validator(queryset: QuerySet, field: str = 'updated_at') -> str:
+    """Max(field) and row count of a queryset, in one aggregate query."""
+    result = queryset.order_by().aggregate(last=Max(field), count=Count('pk'))
+    last = result['last'].isoformat() if result['last'] else ''
+    return f"{last}:{result['count']}"
+
+
+def rows_validator(rows) -> str:
+    """Primary keys and updated_at of already-fetched rows."""
+    return ','.join(
+        f"{row.pk}@{row.updated_at.isoformat() if row.updated_at else ''}" for row in rows
+    )
+
+
+def pagination_validator(paginator) -> str:
+    """Total count and neighbour state of the current page, as the paginator computed them."""
+    if paginator is None:
+        return ''
+    page = getattr(paginator, 'page', None)
+    if hasattr(page, 'paginator'):  # PageNumberPagination keeps a django Page
+        return f"{page.paginator.count}:{page.has_next()}"
+    return ':'.join(
+        str(getattr(paginator, name, '')) for name in ('count', 'has_next', 'has_previous')
+    )
+
+
+class ConditionalGetMixin:
+    """
+    Conditional GET (ETag / If-None-Match) for list and retrieve.
+
+    The validator is computed after the rows are fetched but before they are
+    serialised: the pk and updated_at of each listed row plus the paginator's
+    count (so lists cost no extra query over the whole table), or the
+    object's updated_at for detail views. Each queryset returned by
+    get_etag_dependencies() for related rows the payload renders adds its
+    Max(updated_at) and count. The requesting user, tenant, path and query
+    string and the negotiated media type are mixed in, and a matching
+    If-None-Match gets 304 Not Modified without serialising anything.
+
+    Writes that bypass save() (queryset.update(), update_fields) must set
+    updated_at themselves for the validator to change.
+    """
+
+    etag_cache_control = 'private, no-cache'
+
+    def get_etag_dependencies(self, scope: QuerySet) -> list:
+        """
+        Querysets of related rows rendered alongside `scope` (the listed rows,
+        or the retrieved object, as a queryset).
+        """
+        return []
+
+    def compute_etag(self, validator: str, scope: QuerySet) -> str:
+        request = self.request
+        parts = [
+            str(getattr(request.user, 'pk', '') or ''),
+            str(getattr(getattr(request, 'tenant', None), 'pk', '') or ''),
+            request.get_full_path(),
+            getattr(request, 'accepted_media_type', '') or '',
+            validator,
+        ]
+        parts.extend(queryset_validator(queryset) for queryset in self.get_etag_dependencies(scope))
+        return 'W/"{}"'.format(hashlib.sha256('|'.join(parts).encode()).hexdigest()[:32])
+
+    def _conditional_response(self, etag: str, render) -> Response:
+        if etag_matches(self.request, etag):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = render()
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response['ETag'] = etag
+            response['Cache-Control'] = self.etag_cache_control
+        return response
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        rows = list(queryset) if page is None else page
+        validator = f"{rows_validator(rows)}|{pagination_validator(self.paginator if page is not None else None)}"
+        scope = queryset.model._default_manager.filter(pk__in=[row.pk for row in rows])
+        etag = self.compute_etag(validator, scope)
+
+        def render():
+            serializer = self.get_serializer(rows, many=True)
+            if page is not None:
+                return self.get_paginated_response(serializer.data)
+            return Response(serializer.data)
+
+        return self._conditional_response(etag, render)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        scope = type(instance)._default_manager.filter(pk=instance.pk)
+        etag = self.compute_etag(rows_validator([instance]), scope)
+        return self._conditional_response(etag, lambda: Response(self.get_serializer(instance).data))
@@ -1,5 +1,14 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import json
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import connections
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination, _positive_int
 from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 
 class StandardResultsSetPagination(PageNumberPagination):
@@ -23,3 +32,199 @@ class StandardResultsSetPagination(PageNumberPagination):
 
 class SmallResultsSetPagination(StandardResultsSetPagination):
     page_size = 10
+
+
+def estimate_count(queryset) -> int:
+    """
+    Row count for queryset from planner statistics where available.
+
+    PostgreSQL returns the planner's row estimate (EXPLAIN, no execution);
+    other databases fall back to an exact COUNT(*).
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return queryset.count()
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination keyed on (created_at, id).
+
+    Each page is fetched with a range condition on the last row seen
+    ((created_at, id) < cursor) instead of an OFFSET, so every page costs the
+    same index range scan regardless of depth. No COUNT(*) runs unless the
+    client asks for one with ?count=estimate (planner statistics) or
+    ?count=exact.
+    """
+
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+    # (timestamp field, tie-breaker field); a leading "-" means newest first
+    ordering = ("-created_at", "-id")
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.fields = tuple(field.lstrip("-") for field in self.ordering)
+        cursor = self.decode_cursor(request)
+        reverse = bool(cursor and cursor["reverse"])
+
+        self.count = None
+        count_mode = request.query_params.get(self.count_query_param)
+        if count_mode == "estimate":
+            self.count = estimate_count(queryset)
+        elif count_mode == "exact":
+            self.count = queryset.count()
+        self.count_estimated = count_mode == "estimate"
+
+        # Walking backwards (previous page) flips the scan direction
+        descending = self.ordering[0].startswith("-") != reverse
+        prefix = "-" if descending else ""
+        queryset = queryset.order_by(*(f"{prefix}{field}" for field in self.fields))
+        if cursor:
+            queryset = queryset.filter(self._beyond(self._clean_position(queryset, cursor), descending))
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        self.has_next = True if reverse else has_more
+        self.has_previous = has_more if reverse else cursor is not None
+        self.page = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        payload = {
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "page_size": self.page_size,
+            "results": data,
+        }
+        if self.count is not None:
+            payload["count"] = self.count
+            payload["count_estimated"] = self.count_estimated
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "page_size": {"type": "integer"},
+                "count": {"type": "integer", "description": "Only with ?count=estimate|exact"},
+                "count_estimated": {"type": "boolean"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Opaque cursor from a previous response's next/previous link",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page",
+                "schema": {"type": "integer"},
+            },
+            {
+                "name": self.count_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Include a total: 'estimate' (planner statistics) or 'exact'",
+                "schema": {"type": "string", "enum": ["estimate", "exact"]},
+            },
+        ]
+
+    def get_page_size(self, request):
+        if self.page_size_query_param:
+            try:
+                return _positive_int(
+                    request.query_params[self.page_size_query_param],
+                    strict=True,
+                    cutoff=self.max_page_size,
+                )
+            except (KeyError, ValueError):
+                pass
+        return self.page_size
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self._link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            # Walked past the last row; restart from the first page
+            return remove_query_param(self.request.build_absolute_uri(), self.cursor_query_param)
+        return self._link(self.page[0], reverse=True)
+
+    # --- Cursor encoding ---
+
+    def _beyond(self, position, descending: bool) -> Q:
+        """Rows strictly after position in scan order."""
+        (timestamp_field, id_field), (timestamp, row_id) = self.fields, position
+        lookup = "lt" if descending else "gt"
+        return Q(**{f"{timestamp_field}__{lookup}": timestamp}) | Q(
+            **{timestamp_field: timestamp, f"{id_field}__{lookup}": row_id}
+        )
+
+    def _clean_position(self, queryset, cursor) -> tuple:
+        timestamp, row_id = cursor["position"]
+        try:
+            row_id = queryset.model._meta.get_field(self.fields[1]).to_python(row_id)
+        except DjangoValidationError:
+            raise NotFound(self.invalid_cursor_message)
+        return timestamp, row_id
+
+    def _link(self, row, reverse: bool) -> str:
+        timestamp_field, id_field = self.fields
+        payload = {
+            "t": getattr(row, timestamp_field).isoformat(),
+            "i": str(getattr(row, id_field)),
+            "r": int(reverse),
+        }
+        cursor = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            timestamp = parse_datetime(payload["t"])
+            if timestamp is None:
+                raise ValueError(payload["t"])
+            return {"position": (timestamp, payload["i"]), "reverse": bool(payload.get("r"))}
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+
+class OldestFirstKeysetPagination(KeysetPagination):
+    """Keyset pagination in chronological order (e.g. discussion replies)."""
+
+    ordering = ("created_at", "id")
@@ -0,0 +1,233 @@
+"""
+Per-request performance profiling.
+
+MetricsMiddleware (apps/core/middleware.py) runs every request inside a
+RequestProfile, which wraps the database connections to count queries, time
+them and group them by fingerprint: the SQL with literals and IN-lists
+collapsed, so the same query issued once per row (an N+1) shows up as one
+fingerprint with a high count. The profile also counts cache lookups made
+through apps.common.cache and the time spent rendering the response.
+
+Each finished request is recorded in the Prometheus registry by route. A
+request over one of the PERF_SLOW_* thresholds is counted as slow and, at
+PERF_TRACE_SAMPLE_RATE, captured as a trace with its most expensive query
+fingerprints: logged as a warning and kept in a small in-process buffer
+(`recent_traces()`).
+"""
+
+import contextvars
+import logging
+import random
+import re
+import threading
+import time
+from collections import deque
+from contextlib import ExitStack, contextmanager
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db import connections
+
+from .metrics import DEFAULT_BUCKETS, QUERY_COUNT_BUCKETS, Counter, registry
+
+logger = logging.getLogger(__name__)
+
+TOP_QUERIES = 5
+MAX_TRACES = 50
+
+_current_profile: contextvars.ContextVar = contextvars.ContextVar('request_profile', default=None)
+
+_FINGERPRINT_PATTERNS = (
+    (re.compile(r"'(?:[^']|'')*'"), '?'),
+    (re.compile(r'\b\d+(?:\.\d+)?\b'), '?'),
+    (re.compile(r'%s'), '?'),
+    (re.compile(r'\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)', re.IGNORECASE), 'IN (...)'),
+    (re.compile(r'\s+'), ' '),
+)
+
+REQUESTS = registry.counter('lms_http_requests', 'HTTP requests served.', ['method', 'route', 'status'])
+REQUEST_DURATION = registry.histogram(
+    'lms_http_request_duration_seconds', 'Request wall time.', ['method', 'route']
+)
+DB_QUERIES = registry.histogram(
+    'lms_db_queries_per_request', 'SQL queries run per request.', ['route'], QUERY_COUNT_BUCKETS
+)
+DB_TIME = registry.histogram('lms_db_time_seconds', 'Time spent in SQL per request.', ['route'])
+DUPLICATE_QUERIES = registry.counter(
+    'lms_db_duplicate_queries', 'Queries repeating a fingerprint already run in the same request.', ['route']
+)
+SERIALIZATION_TIME = registry.histogram(
+    'lms_serialization_seconds', 'Time spent rendering response bodies.', ['route'], DEFAULT_BUCKETS
+)
+TENANT_RESOLUTION_TIME = registry.histogram('lms_tenant_resolution_seconds', 'Time spent resolving the tenant.')
+REQUEST_CACHE_LOOKUPS = registry.counter(
+    'lms_request_cache_lookups', 'Cache lookups made while serving requests.', ['route', 'result']
+)
+SLOW_REQUESTS = registry.counter(
+    'lms_slow_requests', 'Requests over a PERF_SLOW_* threshold.', ['route', 'reason']
+)
+
+_traces: deque = deque(maxlen=MAX_TRACES)
+_traces_lock = threading.Lock()
+
+
+def fingerprint(sql: str) -> str:
+    """The statement with literals, placeholders and IN-lists normalised."""
+    for pattern, replacement in _FINGERPRINT_PATTERNS:
+        sql = pattern.sub(replacement, sql)
+    return sql.strip()
+
+
+def current_profile() -> Optional['RequestProfile']:
+    return _current_profile.get()
+
+
+def record_cache_lookup(hit: bool) -> None:
+    """Counts a cache lookup against the current request, if any."""
+    profile = _current_profile.get()
+    if profile is not None:
+        if hit:
+            profile.cache_hits += 1
+        else:
+            profile.cache_misses += 1
+
+
+class RequestProfile:
+    """Queries, DB time, cache lookups and render time of one request."""
+
+    def __init__(self):
+        self.query_count = 0
+        self.db_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.serialization_time = 0.0
+        # fingerprint -> [count, seconds, first SQL seen]
+        self._queries: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        """Database execute wrapper."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.record_query(sql, time.perf_counter() - started)
+
+    def record_query(self, sql: str, duration: float) -> None:
+        key = fingerprint(sql)
+        with self._lock:
+            self.query_count += 1
+            self.db_time += duration
+            entry = self._queries.setdefault(key, [0, 0.0, sql])
+            entry[0] += 1
+            entry[1] += duration
+
+    @property
+    def duplicate_queries(self) -> int:
+        return sum(count - 1 for count, _, _ in self._queries.values())
+
+    def top_queries(self, limit: int = TOP_QUERIES) -> List[dict]:
+        """Fingerprints costing the most time, with how often they ran."""
+        ranked = sorted(self._queries.items(), key=lambda item: (item[1][1], item[1][0]), reverse=True)
+        return [
+            {'fingerprint': key, 'count': count, 'time_ms': round(seconds * 1000, 2), 'sql': sql}
+            for key, (count, seconds, sql) in ranked[:limit]
+        ]
+
+    @contextmanager
+    def capture(self):
+        """Profiles queries on every connection and cache lookups made in this context."""
+        token = _current_profile.set(self)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(self))
+                yield self
+        finally:
+            _current_profile.reset(token)
+
+
+def slow_reasons(duration: float, profile: RequestProfile) -> List[str]:
+    reasons = []
+    if duration >= getattr(settings, 'PERF_SLOW_REQUEST_SECONDS', 1.0):
+        reasons.append('duration')
+    if profile.query_count >= getattr(settings, 'PERF_SLOW_QUERY_COUNT', 50):
+        reasons.append('queries')
+    if profile.duplicate_queries >= getattr(settings, 'PERF_DUPLICATE_QUERY_THRESHOLD', 10):
+        reasons.append('duplicates')
+    return reasons
+
+
+def record_request(request, response, duration: float, profile: RequestProfile) -> Optional[dict]:
+    """Records a finished request's metrics; returns its trace if one was captured."""
+    match = getattr(request, 'resolver_match', None)
+    # Router (regex) routes end in '$'
+    route = match.route.removesuffix('$') if match is not None else 'unmatched'
+
+    REQUESTS.inc(method=request.method, route=route, status=response.status_code)
+    REQUEST_DURATION.observe(duration, method=request.method, route=route)
+    DB_QUERIES.observe(profile.query_count, route=route)
+    DB_TIME.observe(profile.db_time, route=route)
+    if profile.duplicate_queries:
+        DUPLICATE_QUERIES.inc(profile.duplicate_queries, route=route)
+    if profile.serialization_time:
+        SERIALIZATION_TIME.observe(profile.serialization_time, route=route)
+    if profile.cache_hits:
+        REQUEST_CACHE_LOOKUPS.inc(profile.cache_hits, route=route, result='hit')
+    if profile.cache_misses:
+        REQUEST_CACHE_LOOKUPS.inc(profile.cache_misses, route=route, result='miss')
+    tenant_time = getattr(request, 'tenant_resolution_time', None)
+    if tenant_time is not None:
+        TENANT_RESOLUTION_TIME.observe(tenant_time)
+
+    reasons = slow_reasons(duration, profile)
+    for reason in reasons:
+        SLOW_REQUESTS.inc(route=route, reason=reason)
+    if not reasons or random.random() >= getattr(settings, 'PERF_TRACE_SAMPLE_RATE', 1.0):
+        return None
+
+    trace = {
+        'method': request.method,
+        'path': request.path,
+        'route': route,
+        'status': response.status_code,
+        'reasons': reasons,
+        'duration_ms': round(duration * 1000, 2),
+        'query_count': profile.query_count,
+        'db_time_ms': round(profile.db_time * 1000, 2),
+        'duplicate_queries': profile.duplicate_queries,
+        'top_queries': profile.top_queries(),
+    }
+    with _traces_lock:
+        _traces.append(trace)
+    worst = trace['top_queries'][0] if trace['top_queries'] else None
+    logger.warning(
+        f"Slow request ({', '.join(reasons)}): {request.method} {request.path} {trace['duration_ms']}ms, "
+        f"{profile.query_count} queries ({profile.duplicate_queries} duplicate), DB {trace['db_time_ms']}ms"
+        + (f"; top query x{worst['count']} {worst['time_ms']}ms: {worst['fingerprint'][:200]}" if worst else "")
+    )
+    return trace
+
+
+def recent_traces() -> List[dict]:
+    """Slow-request traces captured by this process, oldest first."""
+    with _traces_lock:
+        return list(_traces)
+
+
+def clear_traces() -> None:
+    with _traces_lock:
+        _traces.clear()
+
+
+def _cache_lookup_metrics():
+    from .cache import cache_metrics
+
+    lookups = Counter('lms_cache_lookups', 'Lookups through cached(), by namespace and tier.', ['namespace', 'result'])
+    for namespace, counts in cache_metrics().items():
+        for result, value in counts.items():
+            lookups.inc(value, namespace=namespace, result=result)
+    return [lookups]
+
+
+registry.register_collector(_cache_lookup_metrics)
@@ -7,3 +7,41 @@ class TimestampedSerializer(serializers.ModelSerializer):
     updated_at = serializers.DateTimeField(read_only=True)
 
     # Meta class should be defined in inheriting serializers
+
+
+class SparseFieldsetMixin:
+    """
+    Serializer mixin for sparse fieldsets.
+
+    Reads 'sparse_fields' and 'sparse_expand' from the serializer context
+    (set by SparseFieldsetViewMixin from ?fields= and ?expand=):
+    - fields=a,b limits output to those fields; unknown names are ignored.
+    - Fields listed in Meta.expandable_fields are left out unless named in
+      expand= or fields=.
+    Without those context keys every field is rendered, and nested serializers
+    declared on the class are unaffected either way.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if 'sparse_fields' not in self.context:
+            # Not driven by a sparse-fieldset view: render every field
+            return
+        keep = self.get_sparse_field_names(
+            self.fields.keys(),
+            self.context.get('sparse_fields'),
+            self.context.get('sparse_expand'),
+        )
+        for name in list(self.fields):
+            if name not in keep:
+                self.fields.pop(name)
+
+    @classmethod
+    def get_sparse_field_names(cls, field_names, fields=None, expand=None) -> set:
+        """Returns the subset of field_names to render for the requested fieldset."""
+        expandable = set(getattr(cls.Meta, 'expandable_fields', ()))
+        expand = set(expand or ())
+        if fields:
+            requested = set(fields)
+            return {name for name in field_names if name in requested or name in (expand & expandable)}
+        return {name for name in field_names if name not in expandable or name in expand}
@@ -0,0 +1,183 @@
+"""
+Query-budget assertions and bulk fixture builders for performance tests.
+
+`assert_query_budget()` profiles everything run inside it (see
+apps.common.perf) and fails when the SQL query count or the number of
+duplicate queries (repeats of one fingerprint, the signature of an N+1)
+goes over its limits. Budgets for the API endpoints live in
+query_budgets.json next to this module; QueryBudgetTestMixin checks an
+endpoint's uncached cost against its entry, so a change that adds per-row
+queries fails the test suite. When an endpoint legitimately needs more
+queries, raise its budget in the same change.
+
+The builders create realistically sized data sets with bulk_create, so
+save() and post_save signals (slug generation, search indexing, profile
+and preference creation) do not run for the rows they make.
+"""
+
+import json
+from contextlib import contextmanager
+from itertools import islice, product
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from django.contrib.auth.hashers import make_password
+from django.utils.text import slugify
+
+from .perf import RequestProfile
+
+QUERY_BUDGETS_FILE = Path(__file__).with_name('query_budgets.json')
+BATCH_SIZE = 1000
+
+_budgets: Optional[Dict[str, dict]] = None
+
+
+def load_query_budgets() -> Dict[str, dict]:
+    global _budgets
+    if _budgets is None:
+        with open(QUERY_BUDGETS_FILE) as handle:
+            _budgets = json.load(handle)
+    return _budgets
+
+
+def _budget_report(profile: RequestProfile) -> str:
+    lines = [f"  x{query['count']} {query['time_ms']}ms: {query['fingerprint'][:300]}" for query in profile.top_queries()]
+    return "\n".join(lines)
+
+
+@contextmanager
+def assert_query_budget(max_queries: Optional[int] = None, max_duplicates: Optional[int] = None, name: str = ''):
+    """Fails if the block runs more than `max_queries` queries or `max_duplicates` repeated ones."""
+    with RequestProfile().capture() as profile:
+        yield profile
+
+    label = f"{name}: " if name else ''
+    errors = []
+    if max_queries is not None and profile.query_count > max_queries:
+        errors.append(f"{profile.query_count} queries (budget {max_queries})")
+    if max_duplicates is not None and profile.duplicate_queries > max_duplicates:
+        errors.append(f"{profile.duplicate_queries} duplicate queries (budget {max_duplicates})")
+    if errors:
+        raise AssertionError(f"{label}{' and '.join(errors)}; top queries:\n{_budget_report(profile)}")
+
+
+def query_budget(name: str):
+    """assert_query_budget() with the limits committed for `name` in query_budgets.json."""
+    budget = load_query_budgets()[name]
+    return assert_query_budget(budget.get('max_queries'), budget.get('max_duplicates'), name=name)
+
+
+class QueryBudgetTestMixin:
+    """
+    TestCase helpers for checking API calls against their committed budgets.
+
+    Only the lookups every request makes (the tenant and its platform
+    settings, for `self.tenant`) are warmed before measuring; the endpoint's
+    own caches, such as dashboard sections, must be cold so the budget
+    covers the work behind them. Clear the cache in setUp.
+    """
+
+    def warm_query_budget_caches(self):
+        from apps.core.models import PlatformSettings
+        from apps.core.services import TenantService
+
+        tenant = getattr(self, 'tenant', None)
+        if tenant is not None:
+            # Settings first: creating a missing settings row invalidates the tenant snapshot
+            PlatformSettings.get_cached_settings(tenant)
+            TenantService.get_tenant_by_slug(tenant.slug)
+
+    def assertQueryBudget(self, name: str, call, *args, **kwargs):
+        """Runs `call` within the budget for `name` and returns its result."""
+        self.warm_query_budget_caches()
+        with query_budget(name):
+            return call(*args, **kwargs)
+
+
+def _bulk_create(model, objects: List) -> List:
+    return model.objects.bulk_create(objects, batch_size=BATCH_SIZE)
+
+
+def build_users(tenant, count: int, role: Optional[str] = None, prefix: str = 'learner') -> List:
+    """`count` users with profiles and a shared unusable password."""
+    from apps.users.models import User, UserProfile
+
+    password = make_password(None)
+    users = _bulk_create(User, [
+        User(
+            email=f"{prefix}{index}@{tenant.slug}.example.com", tenant=tenant,
+            role=role or User.Role.LEARNER, password=password,
+        )
+        for index in range(count)
+    ])
+    _bulk_create(UserProfile, [UserProfile(user=user) for user in users])
+    return users
+
+
+def build_catalog(tenant, instructor, courses: int = 50, modules: int = 10, items: int = 20) -> List:
+    """Published courses, each with `modules` modules of `items` content items."""
+    from apps.courses.models import ContentItem, Course, Module
+
+    course_rows = _bulk_create(Course, [
+        Course(
+            tenant=tenant, instructor=instructor, title=f"Course {index}",
+            slug=slugify(f"{tenant.slug}-course-{index}"), status=Course.Status.PUBLISHED,
+        )
+        for index in range(courses)
+    ])
+    module_rows = _bulk_create(Module, [
+        Module(course=course, title=f"Module {order}", order=order)
+        for course, order in product(course_rows, range(1, modules + 1))
+    ])
+    _bulk_create(ContentItem, [
+        ContentItem(
+            module=module, title=f"Item {order}", content_type=ContentItem.ContentType.TEXT,
+            text_content="Lorem ipsum", order=order, is_published=True,
+        )
+        for module, order in product(module_rows, range(1, items + 1))
+    ])
+    return course_rows
+
+
+def build_enrollments(users: Sequence, courses: Sequence, count: Optional[int] = None) -> List:
+    """Active enrollments for the first `count` (user, course) pairs, by default all of them."""
+    from apps.enrollments.models import Enrollment
+
+    pairs = product(users, courses)
+    if count is not None:
+        pairs = islice(pairs, count)
+    return _bulk_create(Enrollment, [
+        Enrollment(user=user, course=course, status=Enrollment.Status.ACTIVE) for user, course in pairs
+    ])
+
+
+def build_discussion(course, authors: Sequence, threads: int = 20, replies: int = 5) -> List:
+    """Threads in a course, each with `replies` replies, authored round-robin."""
+    from apps.discussions.models import DiscussionReply, DiscussionThread
+
+    thread_rows = _bulk_create(DiscussionThread, [
+        DiscussionThread(
+            tenant=course.tenant, course=course, author=authors[index % len(authors)],
+            title=f"Thread {index}", content="Question", reply_count=replies,
+        )
+        for index in range(threads)
+    ])
+    _bulk_create(DiscussionReply, [
+        DiscussionReply(thread=thread, author=authors[index % len(authors)], content=f"Reply {index}")
+        for thread, index in product(thread_rows, range(replies))
+    ])
+    return thread_rows
+
+
+def build_notifications(recipient, count: int = 50) -> List:
+    """In-app notifications for one user, half of them read."""
+    from apps.notifications.models import Notification, NotificationType
+
+    return _bulk_create(Notification, [
+        Notification(
+            recipient=recipient, notification_type=NotificationType.COURSE_ENROLLMENT,
+            status=Notification.Status.READ if index % 2 else Notification.Status.SENT,
+            subject=f"Notification {index}", message="Message",
+        )
+        for index in range(count)
+    ])
@@ -0,0 +1,177 @@
+"""Tests for the two-tier cache-aside helpers and their adoption by tenant and settings lookups."""
+
+import threading
+import time
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.common import cache as cache_module
+from apps.common.cache import cache_metrics, cached, clear_local_cache, invalidate_tags
+from apps.core.models import PlatformSettings, Tenant, TenantDomain
+from apps.core.services import TenantService
+
+
+class CacheTestMixin:
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        clear_local_cache()
+        cache_module.metrics.reset()
+        self.addCleanup(cache.clear)
+        self.addCleanup(clear_local_cache)
+
+
+class CachedDecoratorTests(CacheTestMixin, SimpleTestCase):
+    """Tests for cached()."""
+
+    def setUp(self):
+        super().setUp()
+        self.calls = []
+
+        @cached(ttl=60, tags=lambda name: ['greetings', f'greeting:{name}'], namespace='test.greet')
+        def greet(name):
+            self.calls.append(name)
+            return f"hello {name}"
+
+        self.greet = greet
+
+    def test_repeat_calls_are_served_from_local_then_shared_tier(self):
+        self.assertEqual(self.greet('ada'), "hello ada")
+        self.assertEqual(self.greet('ada'), "hello ada")
+        clear_local_cache()
+        self.assertEqual(self.greet('ada'), "hello ada")
+
+        self.assertEqual(self.calls, ['ada'])
+        self.assertEqual(cache_metrics()['test.greet'], {'local_hits': 1, 'hits': 1, 'misses': 1, 'waits': 0})
+
+    def test_tag_invalidation_expires_matching_entries_only(self):
+        self.greet('ada')
+        self.greet('bob')
+
+        invalidate_tags('greeting:ada')
+        self.greet('ada')
+        self.greet('bob')
+        self.assertEqual(self.calls, ['ada', 'bob', 'ada'])
+
+        invalidate_tags('greetings')
+        self.greet('bob')
+        self.assertEqual(self.calls, ['ada', 'bob', 'ada', 'bob'])
+
+    def test_tag_invalidation_reaches_other_processes(self):
+        self.greet('ada')
+        # Another process bumps the tag; this one still holds a local copy until it expires
+        cache.incr(f"{cache_module.TAG_PREFIX}:greetings")
+        clear_local_cache()
+
+        self.greet('ada')
+
+        self.assertEqual(self.calls, ['ada', 'ada'])
+
+    def test_invalidation_during_compute_discards_result(self):
+        @cached(ttl=60, tags=['rows'], namespace='test.rows')
+        def rows():
+            self.calls.append('rows')
+            invalidate_tags('rows')
+            return len(self.calls)
+
+        rows()
+        clear_local_cache()
+        rows()
+
+        self.assertEqual(self.calls, ['rows', 'rows'])
+
+    def test_none_results_are_cached(self):
+        @cached(ttl=60, none_ttl=30, namespace='test.missing')
+        def missing(key):
+            self.calls.append(key)
+            return None
+
+        self.assertIsNone(missing('x'))
+        clear_local_cache()
+        self.assertIsNone(missing('x'))
+
+        self.assertEqual(self.calls, ['x'])
+
+    def test_invalidate_drops_one_key(self):
+        self.greet('ada')
+        self.greet('bob')
+
+        self.greet.invalidate('ada')
+        self.greet('ada')
+        self.greet('bob')
+
+        self.assertEqual(self.calls, ['ada', 'bob', 'ada'])
+
+    def test_concurrent_misses_compute_once(self):
+        started = threading.Event()
+
+        @cached(ttl=60, namespace='test.slow')
+        def slow():
+            started.set()
+            time.sleep(0.1)
+            self.calls.append('slow')
+            return 42
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(slow())) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, [42] * 5)
+        self.assertEqual(self.calls, ['slow'])
+
+    @patch.object(cache_module, 'LOCK_WAIT', 0.1)
+    def test_waits_for_other_process_then_computes(self):
+        cache.add(f"{cache_module.KEY_PREFIX}:test.greet:ada:lock", 1)
+
+        self.assertEqual(self.greet('ada'), "hello ada")
+
+        self.assertEqual(self.calls, ['ada'])
+        self.assertEqual(cache_metrics()['test.greet']['waits'], 1)
+
+
+class CachedLookupTests(CacheTestMixin, TestCase):
+    """Tenant hostname and platform settings lookups go through the cache."""
+
+    def setUp(self):
+        super().setUp()
+        self.tenant = Tenant.objects.create(name="Test Tenant", slug="test-tenant")
+        TenantDomain.objects.create(tenant=self.tenant, domain="learn.example.com")
+
+    def test_hostname_lookup_is_cached_until_domains_change(self):
+        self.assertEqual(TenantService.get_tenant_by_hostname("learn.example.com"), self.tenant)
+        self.assertIsNone(TenantService.get_tenant_by_hostname("other.example.com"))
+
+        with CaptureQueriesContext(connection) as queries:
+            TenantService.get_tenant_by_hostname("learn.example.com")
+            TenantService.get_tenant_by_hostname("other.example.com")
+        self.assertEqual(len(queries), 0)
+
+        other = Tenant.objects.create(name="Other", slug="other")
+        TenantDomain.objects.create(tenant=other, domain="other.example.com")
+        self.assertEqual(TenantService.get_tenant_by_hostname("other.example.com"), other)
+
+    def test_deactivated_tenant_is_not_returned(self):
+        TenantService.get_tenant_by_hostname("learn.example.com")
+        self.tenant.is_active = False
+        self.tenant.save()
+
+        self.assertIsNone(TenantService.get_tenant_by_hostname("learn.example.com"))
+
+    def test_cached_settings_refresh_when_saved(self):
+        self.assertEqual(PlatformSettings.get_cached_settings(self.tenant).timezone, "UTC")
+
+        settings = PlatformSettings.get_settings(self.tenant)
+        settings.timezone = "Europe/Paris"
+        settings.save()
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(PlatformSettings.get_cached_settings(self.tenant).timezone, "Europe/Paris")
+            PlatformSettings.get_cached_settings(self.tenant)
+        self.assertEqual(len(queries), 1)
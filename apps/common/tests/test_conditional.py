@@ -0,0 +1,140 @@
+"""Tests for ConditionalGetMixin (ETag / If-None-Match) on read-heavy endpoints."""
+
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.core.models import Tenant
+from apps.courses.models import Course, Module
+from apps.enrollments.models import Enrollment
+from apps.learning_paths.models import LearningPath, LearningPathStep
+from apps.notifications.models import Notification, NotificationType
+from apps.skills.models import Skill
+from apps.users.models import User
+
+
+class ConditionalGetTests(TestCase):
+    """Exercises the mixin through the viewsets that use it."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.tenant = Tenant.objects.create(name="Test Tenant", slug="test-tenant")
+        self.instructor = User.objects.create_user(
+            email="instructor@example.com",
+            password="testpass123",
+            role=User.Role.INSTRUCTOR,
+            tenant=self.tenant
+        )
+        self.learner = User.objects.create_user(
+            email="learner@example.com", password="testpass123", tenant=self.tenant
+        )
+        self.course = Course.objects.create(
+            tenant=self.tenant, title="Course", instructor=self.instructor, status=Course.Status.PUBLISHED
+        )
+        self.notification = Notification.objects.create(
+            recipient=self.learner,
+            notification_type=NotificationType.SYSTEM_ALERT,
+            subject="Hello",
+            message="",
+            status=Notification.Status.SENT,
+        )
+        self.client.force_authenticate(user=self.learner)
+
+    def _get(self, url, etag=None):
+        headers = {'HTTP_X_TENANT_SLUG': self.tenant.slug}
+        if etag:
+            headers['HTTP_IF_NONE_MATCH'] = etag
+        return self.client.get(url, **headers)
+
+    def test_matching_etag_returns_304_without_body(self):
+        url = reverse('notifications:notification-list')
+        response = self._get(url)
+        etag = response['ETag']
+
+        revalidated = self._get(url, etag)
+
+        self.assertEqual(revalidated.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(revalidated['ETag'], etag)
+        self.assertEqual(revalidated['Cache-Control'], 'private, no-cache')
+        self.assertFalse(revalidated.content)
+
+    def test_strong_form_and_wildcard_match(self):
+        url = reverse('notifications:notification-list')
+        etag = self._get(url)['ETag']
+
+        self.assertEqual(self._get(url, etag[2:]).status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(self._get(url, '*').status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(self._get(url, 'W/"stale"').status_code, status.HTTP_200_OK)
+
+    def test_etag_varies_by_query_string_and_user(self):
+        url = reverse('notifications:notification-list')
+        etag = self._get(url)['ETag']
+
+        self.assertNotEqual(self._get(f"{url}?status=READ")['ETag'], etag)
+        self.client.force_authenticate(user=self.instructor)
+        self.assertEqual(self._get(url, etag).status_code, status.HTTP_200_OK)
+
+    def test_mark_all_read_changes_list_etag(self):
+        url = reverse('notifications:notification-list')
+        etag = self._get(url)['ETag']
+
+        self.client.post(reverse('notifications:notification-mark-all-read'))
+
+        self.assertEqual(self._get(url, etag).status_code, status.HTTP_200_OK)
+
+    def test_mark_read_changes_detail_etag(self):
+        url = reverse('notifications:notification-detail', kwargs={'pk': self.notification.pk})
+        etag = self._get(url)['ETag']
+
+        self.client.post(reverse('notifications:notification-mark-read', kwargs={'pk': self.notification.pk}))
+
+        response = self._get(url, etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], Notification.Status.READ)
+
+    def test_course_list_etag_tracks_enrollment_counts(self):
+        url = reverse('courses:course-list')
+        etag = self._get(url)['ETag']
+        other = User.objects.create_user(email="other@example.com", password="testpass123", tenant=self.tenant)
+
+        Enrollment.objects.create(user=other, course=self.course, status=Enrollment.Status.ACTIVE)
+
+        self.assertEqual(self._get(url, etag).status_code, status.HTTP_200_OK)
+
+    def test_course_detail_etag_tracks_modules(self):
+        Enrollment.objects.create(user=self.learner, course=self.course, status=Enrollment.Status.ACTIVE)
+        url = reverse('courses:course-detail', kwargs={'slug': self.course.slug})
+        etag = self._get(url)['ETag']
+        self.assertEqual(self._get(url, etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        Module.objects.create(course=self.course, title="New module", order=1)
+
+        response = self._get(url, etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['modules']), 1)
+
+    def test_learning_path_detail_etag_tracks_steps(self):
+        path = LearningPath.objects.create(
+            tenant=self.tenant, title="Path", status=LearningPath.Status.PUBLISHED
+        )
+        url = reverse('learning_paths:learningpath-detail', kwargs={'slug': path.slug})
+        etag = self._get(url)['ETag']
+
+        LearningPathStep.objects.create(
+            learning_path=path, order=1,
+            content_type=ContentType.objects.get_for_model(Course), object_id=self.course.id
+        )
+
+        self.assertEqual(self._get(url, etag).status_code, status.HTTP_200_OK)
+
+    def test_skill_list_etag_tracks_tenant_skills(self):
+        Skill.objects.create(tenant=self.tenant, name="Python")
+        url = reverse('skills:skill-list')
+        etag = self._get(url)['ETag']
+        self.assertEqual(self._get(url, etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        Skill.objects.create(tenant=self.tenant, name="Django")
+
+        self.assertEqual(self._get(url, etag).status_code, status.HTTP_200_OK)
@@ -0,0 +1,101 @@
+"""Tests for keyset (cursor) pagination."""
+
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.core.models import Tenant
+from apps.notifications.models import Notification, NotificationType
+from apps.users.models import User
+
+
+class KeysetPaginationTests(TestCase):
+    """Exercises KeysetPagination through the notification inbox."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.tenant = Tenant.objects.create(name="Test Tenant", slug="test-tenant")
+        self.user = User.objects.create_user(
+            email="learner@example.com", password="testpass123", tenant=self.tenant
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("notifications:notification-list")
+
+        now = timezone.now()
+        notifications = Notification.objects.bulk_create([
+            Notification(
+                recipient=self.user,
+                notification_type=NotificationType.SYSTEM_ALERT,
+                subject=f"Notice {index}",
+                message="",
+                status=Notification.Status.SENT,
+            )
+            for index in range(25)
+        ])
+        # Pairs share a timestamp so the id tie-breaker matters
+        for index, notification in enumerate(notifications):
+            notification.created_at = now - timedelta(minutes=index // 2)
+        Notification.objects.bulk_update(notifications, ["created_at"])
+        self.expected = [
+            str(pk) for pk in Notification.objects.order_by("-created_at", "-id").values_list("id", flat=True)
+        ]
+
+    def _walk(self, url, key="next"):
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(item["id"] for item in response.data["results"])
+            url = response.data[key]
+        return ids, response
+
+    def test_forward_pages_cover_every_row_once_in_order(self):
+        ids, response = self._walk(f"{self.url}?page_size=4")
+
+        self.assertEqual(ids, self.expected)
+        self.assertNotIn("count", response.data)
+
+    def test_previous_link_returns_preceding_page(self):
+        first = self.client.get(self.url, {"page_size": 10}).data
+        second = self.client.get(first["next"]).data
+        self.assertIsNone(first["previous"])
+
+        back = self.client.get(second["previous"]).data
+
+        self.assertEqual(
+            [item["id"] for item in back["results"]], [item["id"] for item in first["results"]]
+        )
+
+    def test_deep_page_costs_same_queries_as_first(self):
+        """Test that page depth doesn't add COUNT or OFFSET work."""
+        with CaptureQueriesContext(connection) as first_page:
+            response = self.client.get(self.url, {"page_size": 2})
+        url = response.data["next"]
+        for _ in range(8):
+            url = self.client.get(url).data["next"]
+
+        with CaptureQueriesContext(connection) as deep_page:
+            self.client.get(url)
+
+        self.assertEqual(len(deep_page), len(first_page))
+        self.assertFalse(any("COUNT(" in q["sql"].upper() for q in deep_page.captured_queries))
+        self.assertFalse(any(" OFFSET " in q["sql"].upper() for q in deep_page.captured_queries))
+
+    def test_count_is_opt_in(self):
+        response = self.client.get(self.url, {"count": "estimate"})
+
+        # SQLite has no planner statistics, so the estimate is exact here
+        self.assertEqual(response.data["count"], 25)
+        self.assertTrue(response.data["count_estimated"])
+        self.assertFalse(self.client.get(self.url, {"count": "exact"}).data["count_estimated"])
+
+    def test_invalid_cursor_is_not_found(self):
+        response = self.client.get(self.url, {"cursor": "not-a-cursor"})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
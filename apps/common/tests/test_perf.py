@@ -0,0 +1,162 @@
+"""Tests for request profiling, Prometheus metrics and slow-request traces."""
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.common import perf
+from apps.common.cache import clear_local_cache
+from apps.common.metrics import Registry, registry, worker_id
+from apps.common.perf import RequestProfile, fingerprint
+from apps.core.models import Tenant
+from apps.courses.models import Course
+from apps.users.models import User
+
+COURSE_LIST_ROUTE = 'api/v1/courses/courses/'
+
+
+class FingerprintTests(TestCase):
+    """Tests for SQL fingerprints and query grouping."""
+
+    def test_literals_and_in_lists_are_normalised(self):
+        self.assertEqual(
+            fingerprint("SELECT * FROM t WHERE id IN (%s, %s, %s) AND name = 'x''y' LIMIT 21"),
+            "SELECT * FROM t WHERE id IN (...) AND name = ? LIMIT ?",
+        )
+        self.assertEqual(
+            fingerprint('SELECT  "t"."id" FROM "t" WHERE "t"."id" = %s'),
+            fingerprint('SELECT "t"."id"\nFROM "t" WHERE "t"."id" = 42'),
+        )
+
+    def test_repeated_fingerprints_count_as_duplicates(self):
+        tenant = Tenant.objects.create(name="Test Tenant", slug="test-tenant")
+
+        with RequestProfile().capture() as profile:
+            for _ in range(3):
+                Tenant.objects.get(pk=tenant.pk)
+            Course.objects.count()
+
+        self.assertEqual(profile.query_count, 4)
+        self.assertEqual(profile.duplicate_queries, 2)
+        top = profile.top_queries()
+        self.assertEqual(sorted(query['count'] for query in top), [1, 3])
+        self.assertGreater(profile.db_time, 0)
+
+    def test_histogram_and_counter_render_exposition_format(self):
+        metrics = Registry()
+        requests = metrics.counter('test_requests', 'Requests.', ['route'])
+        latency = metrics.histogram('test_latency_seconds', 'Latency.', buckets=(0.1, 1))
+        requests.inc(route='a"b')
+        latency.observe(0.5)
+
+        output = metrics.render()
+
+        worker = worker_id()
+        self.assertIn('# TYPE test_requests counter', output)
+        self.assertIn(f'test_requests_total{{route="a\\"b",worker="{worker}"}} 1', output)
+        self.assertIn(f'test_latency_seconds_bucket{{worker="{worker}",le="0.1"}} 0', output)
+        self.assertIn(f'test_latency_seconds_bucket{{worker="{worker}",le="1.0"}} 1', output)
+        self.assertIn(f'test_latency_seconds_bucket{{worker="{worker}",le="+Inf"}} 1', output)
+        self.assertIn(f'test_latency_seconds_count{{worker="{worker}"}} 1', output)
+
+
+class MetricsMiddlewareTests(TestCase):
+    """MetricsMiddleware records each request by route."""
+
+    def setUp(self):
+        cache.clear()
+        clear_local_cache()
+        registry.reset()
+        perf.clear_traces()
+        self.addCleanup(cache.clear)
+        self.addCleanup(clear_local_cache)
+        self.addCleanup(registry.reset)
+        self.addCleanup(perf.clear_traces)
+
+        self.client = APIClient()
+        self.tenant = Tenant.objects.create(name="Test Tenant", slug="test-tenant")
+        self.instructor = User.objects.create_user(
+            email="instructor@example.com", password="testpass123", role=User.Role.INSTRUCTOR, tenant=self.tenant
+        )
+        for index in range(3):
+            Course.objects.create(
+                tenant=self.tenant, title=f"Course {index}", instructor=self.instructor,
+                status=Course.Status.PUBLISHED,
+            )
+        self.client.force_authenticate(user=self.instructor)
+
+    def _list_courses(self):
+        return self.client.get(reverse('courses:course-list'), HTTP_X_TENANT_SLUG=self.tenant.slug)
+
+    def test_request_metrics_are_recorded_by_route(self):
+        self._list_courses()
+
+        self.assertEqual(perf.REQUESTS.value(method='GET', route=COURSE_LIST_ROUTE, status=200), 1)
+        self.assertEqual(perf.DB_QUERIES.count(route=COURSE_LIST_ROUTE), 1)
+        self.assertEqual(perf.SERIALIZATION_TIME.count(route=COURSE_LIST_ROUTE), 1)
+        self.assertEqual(perf.TENANT_RESOLUTION_TIME.count(), 1)
+        self.assertGreater(perf.REQUEST_CACHE_LOOKUPS.value(route=COURSE_LIST_ROUTE, result='miss'), 0)
+
+    @override_settings(PERF_QUERY_HEADERS=True)
+    def test_query_headers(self):
+        response = self._list_courses()
+
+        self.assertGreater(int(response['X-DB-Query-Count']), 0)
+        self.assertIn('X-DB-Duplicate-Queries', response)
+        self.assertIn('db;dur=', response['Server-Timing'])
+
+    @override_settings(PERF_QUERY_HEADERS=False)
+    def test_query_headers_can_be_disabled(self):
+        self.assertNotIn('X-DB-Query-Count', self._list_courses())
+
+    @override_settings(PERF_SLOW_QUERY_COUNT=1, PERF_TRACE_SAMPLE_RATE=1.0)
+    def test_slow_request_trace_lists_top_queries(self):
+        with self.assertLogs('apps.common.perf', level='WARNING'):
+            self._list_courses()
+
+        trace = perf.recent_traces()[-1]
+        self.assertEqual(trace['route'], COURSE_LIST_ROUTE)
+        self.assertIn('queries', trace['reasons'])
+        self.assertTrue(trace['top_queries'])
+        self.assertEqual(perf.SLOW_REQUESTS.value(route=COURSE_LIST_ROUTE, reason='queries'), 1)
+
+    @override_settings(PERF_SLOW_QUERY_COUNT=1, PERF_TRACE_SAMPLE_RATE=0)
+    def test_unsampled_slow_requests_are_counted_not_traced(self):
+        self._list_courses()
+
+        self.assertEqual(perf.recent_traces(), [])
+        self.assertEqual(perf.SLOW_REQUESTS.value(route=COURSE_LIST_ROUTE, reason='queries'), 1)
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_metrics_endpoint(self):
+        self._list_courses()
+
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer secret')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        body = response.content.decode()
+        self.assertIn(
+            f'lms_http_requests_total{{method="GET",route="{COURSE_LIST_ROUTE}",status="200",worker="{worker_id()}"}} 1',
+            body,
+        )
+        self.assertIn('lms_cache_lookups_total{namespace="core.tenant_slug",result="misses",worker=', body)
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_metrics_endpoint_requires_token_when_configured(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 401)
+        self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer secret').status_code, 200)
+
+    @override_settings(METRICS_TOKEN='', DEBUG=False)
+    def test_metrics_endpoint_denied_without_token_outside_debug(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+
+        with self.settings(DEBUG=True):
+            self.assertEqual(self.client.get('/metrics').status_code, 200)
+
+    def test_profiling_does_not_leak_wrappers(self):
+        self._list_courses()
+
+        self.assertEqual(connection.execute_wrappers, [])
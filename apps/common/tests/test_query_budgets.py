@@ -0,0 +1,144 @@
+"""
+Query budgets for the main API endpoints (see apps/common/query_budgets.json).
+
+Each endpoint is called with its own caches cold against a realistically
+sized tenant: 50 courses of 10 modules x 20 items and 5,000 enrollments.
+A failure here usually means a change added per-row queries (an N+1); the
+message lists the offending query fingerprints.
+"""
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.common.cache import clear_local_cache
+from apps.common.testing import (
+    QueryBudgetTestMixin,
+    assert_query_budget,
+    build_catalog,
+    build_discussion,
+    build_enrollments,
+    build_notifications,
+    build_users,
+    load_query_budgets,
+)
+from apps.core.models import Tenant
+from apps.users.models import User
+
+
+class QueryBudgetHarnessTests(TestCase):
+    """Tests for assert_query_budget()."""
+
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Test Tenant", slug="test-tenant")
+
+    def test_within_budget_passes(self):
+        with assert_query_budget(max_queries=1) as profile:
+            Tenant.objects.count()
+
+        self.assertEqual(profile.query_count, 1)
+
+    def test_over_budget_lists_duplicated_fingerprints(self):
+        with self.assertRaises(AssertionError) as context:
+            with assert_query_budget(max_queries=10, max_duplicates=1, name='loop'):
+                for _ in range(3):
+                    Tenant.objects.get(pk=self.tenant.pk)
+
+        self.assertIn('loop: 2 duplicate queries (budget 1)', str(context.exception))
+        self.assertIn('x3', str(context.exception))
+
+    def test_every_budget_sets_both_limits(self):
+        for name, budget in load_query_budgets().items():
+            self.assertEqual(set(budget), {'max_queries', 'max_duplicates'}, name)
+
+
+class EndpointQueryBudgetTests(QueryBudgetTestMixin, TestCase):
+    """The budgeted endpoints stay within their committed query budgets."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tenant = Tenant.objects.create(name="Budget Tenant", slug="budget-tenant")
+        cls.instructor = User.objects.create_user(
+            email="instructor@budget.example.com", password="testpass123",
+            role=User.Role.INSTRUCTOR, tenant=cls.tenant,
+        )
+        cls.admin = User.objects.create_user(
+            email="admin@budget.example.com", password="testpass123", role=User.Role.ADMIN, tenant=cls.tenant,
+        )
+        cls.learner = User.objects.create_user(
+            email="learner@budget.example.com", password="testpass123", tenant=cls.tenant,
+        )
+        cls.courses = build_catalog(cls.tenant, cls.instructor, courses=50, modules=10, items=20)
+        learners = build_users(cls.tenant, 100)
+        build_enrollments(learners, cls.courses, count=5000)
+        build_enrollments([cls.learner], cls.courses[:10])
+        cls.threads = build_discussion(cls.courses[0], [cls.learner, cls.instructor, *learners[:5]])
+        build_notifications(cls.learner, count=50)
+
+    def setUp(self):
+        cache.clear()
+        clear_local_cache()
+        self.addCleanup(cache.clear)
+        self.addCleanup(clear_local_cache)
+        self.client = APIClient()
+
+    def _get(self, user, url, **params):
+        self.client.force_authenticate(user=user)
+        response = self.client.get(url, params, HTTP_X_TENANT_SLUG=self.tenant.slug)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content[:500])
+        return response
+
+    def test_course_list(self):
+        self.assertQueryBudget('course-list', self._get, self.learner, reverse('courses:course-list'))
+
+    def test_course_detail(self):
+        url = reverse('courses:course-detail', kwargs={'slug': self.courses[0].slug})
+        self.assertQueryBudget('course-detail', self._get, self.learner, url)
+
+    def test_learner_dashboard(self):
+        url = reverse('learner_core_api:learner-dashboard-stats')
+        self.assertQueryBudget('learner-dashboard', self._get, self.learner, url)
+
+    def test_instructor_dashboard(self):
+        self.assertQueryBudget(
+            'instructor-dashboard', self._get, self.instructor, reverse('instructor-dashboard-stats')
+        )
+
+    def test_discussion_threads(self):
+        self.assertQueryBudget(
+            'discussion-thread-list', self._get, self.learner, reverse('discussion-thread-list'),
+            course_id=self.courses[0].id,
+        )
+
+    def test_discussion_replies(self):
+        self.assertQueryBudget(
+            'discussion-reply-list', self._get, self.learner, reverse('discussion-reply-list'),
+            thread_id=self.threads[0].id,
+        )
+
+    def test_notifications(self):
+        self.assertQueryBudget(
+            'notification-list', self._get, self.learner, reverse('notifications:notification-list')
+        )
+
+    def test_instructor_analytics(self):
+        response = self.assertQueryBudget(
+            'instructor-analytics', self._get, self.instructor, reverse('analytics:instructor-analytics')
+        )
+
+        performance = {course['id']: course for course in response.data['coursePerformance']}
+        self.assertEqual(len(performance), 50)
+        self.assertEqual(performance[str(self.courses[0].id)]['students'], 101)
+        self.assertEqual(performance[str(self.courses[-1].id)]['students'], 100)
+
+    def test_admin_analytics(self):
+        response = self.assertQueryBudget(
+            'admin-analytics', self._get, self.admin, reverse('analytics:admin-analytics')
+        )
+
+        self.assertEqual(response.data['tenantComparison'][0]['enrollments'], 5010)
+
+    def test_instructor_reports(self):
+        self.assertQueryBudget('instructor-reports', self._get, self.instructor, reverse('instructor-reports'))
@@ -0,0 +1,731 @@
+"""
+Learner and instructor dashboard statistics, built section by section.
+
+Each section is cached per user with its own TTL (see apps.analytics.dashboard
+for the composer). Domain events invalidate only the sections they affect
+(see signals.py and DASHBOARD_EVENTS), and the views accept ?sections= so a
+single panel can be refreshed without recomputing the others.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Iterable
+
+from django.db import transaction
+from django.db.models import Avg, Count, Exists, Max, Min, OuterRef, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from apps.analytics.dashboard import DashboardComposer, DashboardSection
+from apps.analytics.models import RevenueAnalytics
+from apps.analytics.timewindow import TimeWindow, local_today, tenant_timezone
+from apps.assessments.models import Assessment, AssessmentAttempt
+from apps.courses.models import ContentItem, Course
+from apps.enrollments.models import Certificate, Enrollment, LearnerProgress
+from apps.learning_paths.models import LearningPathProgress, LearningPathStepProgress
+from apps.users.models import User
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class UserDashboardContext:
+    user: User
+
+    @property
+    def cache_scope(self) -> str:
+        return str(self.user.pk)
+
+
+def _start_of_today():
+    return timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+# --- Learner sections ---
+
+
+def learner_overview(context: UserDashboardContext) -> dict:
+    user = context.user
+    counts = Enrollment.objects.filter(user=user).aggregate(
+        active=Count('id', filter=Q(status=Enrollment.Status.ACTIVE)),
+        completed=Count('id', filter=Q(status=Enrollment.Status.COMPLETED)),
+        # Overall progress includes both active and completed enrollments
+        avg_progress=Avg('progress', filter=Q(status__in=[Enrollment.Status.ACTIVE, Enrollment.Status.COMPLETED])),
+    )
+    return {
+        "activeCourses": counts['active'],
+        "completedCourses": counts['completed'],
+        "certificatesEarned": Certificate.objects.filter(user=user, status=Certificate.Status.ISSUED).count(),
+        "overallProgress": round(counts['avg_progress'] or 0),
+    }
+
+
+def calculate_learning_streak(user) -> int:
+    """Consecutive tenant-local days (ending today or yesterday) with a completed item."""
+    tz = tenant_timezone(user.tenant_id)
+    recent_dates = list(LearnerProgress.objects.filter(
+        enrollment__user=user,
+        status=LearnerProgress.Status.COMPLETED
+    ).annotate(day=TruncDate('updated_at', tzinfo=tz)).values_list('day', flat=True).distinct().order_by('-day')[:30])
+
+    current_date = local_today(tz)
+    if not recent_dates or recent_dates[0] not in (current_date, current_date - timedelta(days=1)):
+        return 0
+
+    streak = 1
+    last_date = recent_dates[0]
+    for activity_date in recent_dates[1:]:
+        if last_date - activity_date != timedelta(days=1):
+            break
+        streak += 1
+        last_date = activity_date
+    return streak
+
+
+def learner_progress(context: UserDashboardContext) -> dict:
+    user = context.user
+    completed_content_count = LearnerProgress.objects.filter(
+        enrollment__user=user, status=LearnerProgress.Status.COMPLETED
+    ).count()
+
+    recent_activity_qs = LearnerProgress.objects.filter(
+        enrollment__user=user
+    ).select_related('content_item', 'enrollment__course').order_by('-updated_at')[:5]
+
+    recent_activity = []
+    for item in recent_activity_qs:
+        activity_type = "Completed" if item.status == LearnerProgress.Status.COMPLETED else "Started"
+        recent_activity.append({
+            "description": f"{activity_type} '{item.content_item.title}' in '{item.enrollment.course.title}'",
+            "timestamp": item.updated_at.strftime("%b %d, %Y at %I:%M %p")
+        })
+
+    return {
+        "learningStreak": calculate_learning_streak(user),
+        "totalStudyHours": round(completed_content_count * 0.25, 1),  # Assume 15 minutes per item
+        "lessonsCompleted": completed_content_count,
+        "recentActivity": recent_activity,
+    }
+
+
+def learner_assessments(context: UserDashboardContext) -> dict:
+    """Average percentage score over submitted and graded attempts."""
+    scores = AssessmentAttempt.objects.filter(
+        user=context.user,
+        status__in=[AssessmentAttempt.AttemptStatus.SUBMITTED, AssessmentAttempt.AttemptStatus.GRADED],
+        score__isnull=False,
+        max_score__isnull=False,
+        max_score__gt=0
+    ).values_list('score', 'max_score')
+
+    percentages = [float(score) / float(max_score) * 100 for score, max_score in scores]
+    average = sum(percentages) / len(percentages) if percentages else 0
+    return {"averageAssessmentScore": round(average)}
+
+
+def learner_learning_paths(context: UserDashboardContext) -> dict:
+    path_progress = LearningPathProgress.objects.filter(
+        user=context.user,
+        status__in=[LearningPathProgress.Status.IN_PROGRESS, LearningPathProgress.Status.COMPLETED]
+    ).select_related('learning_path').annotate(
+        total_steps=Count('learning_path__steps', distinct=True),
+        completed_steps=Count(
+            'step_progress',
+            filter=Q(step_progress__status=LearningPathStepProgress.Status.COMPLETED),
+            distinct=True,
+        ),
+    )[:4]
+
+    return {"learningPaths": [
+        {
+            "title": progress.learning_path.title,
+            # Same figure as LearningPathProgress.progress_percentage, from the annotations
+            "progressPercentage": round(progress.completed_steps / progress.total_steps * 100)
+            if progress.total_steps else 0,
+            "completedSteps": progress.completed_steps,
+            "totalSteps": progress.total_steps,
+        }
+        for progress in path_progress
+    ]}
+
+
+def learner_weekly(context: UserDashboardContext) -> dict:
+    user = context.user
+    tz = tenant_timezone(user.tenant_id)
+    today = local_today(tz)
+    this_week = TimeWindow(today - timedelta(days=today.weekday()), None, tz)
+
+    weekly_lessons = LearnerProgress.objects.filter(
+        enrollment__user=user,
+        status=LearnerProgress.Status.COMPLETED,
+        **this_week.lookups('updated_at')
+    ).count()
+    weekly_assessments = AssessmentAttempt.objects.filter(
+        user=user,
+        **this_week.lookups('start_time'),
+        status__in=[AssessmentAttempt.AttemptStatus.SUBMITTED, AssessmentAttempt.AttemptStatus.GRADED]
+    ).count()
+
+    return {
+        "weeklyLessonsCompleted": weekly_lessons,
+        "weeklyAssessmentsTaken": weekly_assessments,
+        "weeklyStudyHours": round(weekly_lessons * 0.25, 1),  # Estimated
+    }
+
+
+def learner_deadlines(context: UserDashboardContext) -> dict:
+    """Next three open assessments in active courses that the user has not passed yet."""
+    user = context.user
+    upcoming = Assessment.objects.filter(
+        course__enrollments__user=user,
+        course__enrollments__status__in=[Enrollment.Status.ACTIVE],
+        due_date__gte=_start_of_today(),
+        is_published=True
+    ).exclude(
+        Exists(AssessmentAttempt.objects.filter(assessment=OuterRef('pk'), user=user, is_passed=True))
+    ).select_related('course').order_by('due_date')[:3]
+
+    return {"upcomingDeadlines": [
+        {
+            "title": assessment.title,
+            "course": assessment.course.title,
+            "dueDate": assessment.due_date.strftime("%b %d, %Y"),
+        }
+        for assessment in upcoming
+    ]}
+
+
+def learner_achievements(context: UserDashboardContext) -> dict:
+    recent_certs = Certificate.objects.filter(
+        user=context.user,
+        status=Certificate.Status.ISSUED
+    ).select_related('course').order_by('-issued_at')[:4]
+
+    return {"recentAchievements": [
+        {"title": f"Certificate: {cert.course.title}", "earnedDate": cert.issued_at.strftime("%b %d, %Y")}
+        for cert in recent_certs
+    ]}
+
+
+def learner_continue_learning(context: UserDashboardContext) -> dict:
+    """The most recently touched active course and its next unfinished item."""
+    user = context.user
+    recent_enrollment = Enrollment.objects.filter(
+        user=user,
+        status=Enrollment.Status.ACTIVE
+    ).select_related('course').order_by('-updated_at').first()
+
+    if not recent_enrollment:
+        return {"continueLearning": None}
+
+    course = recent_enrollment.course
+    # All published items decide what comes next; only required ones count towards progress
+    all_content_items = list(ContentItem.objects.filter(
+        module__course=course,
+        is_published=True
+    ).select_related('module').order_by('module__order', 'order'))
+
+    completed_item_ids = set(
+        LearnerProgress.objects.filter(
+            enrollment=recent_enrollment,
+            status=LearnerProgress.Status.COMPLETED
+        ).values_list('content_item_id', flat=True)
+    )
+
+    next_item = next((item for item in all_content_items if item.id not in completed_item_ids), None)
+    required_item_ids = {item.id for item in all_content_items if item.is_required}
+    total_items = len(required_item_ids)
+    completed_count = len(completed_item_ids & required_item_ids)
+    progress_percentage = round((completed_count / total_items) * 100) if total_items > 0 else 0
+
+    return {"continueLearning": {
+        "courseId": course.id,
+        "courseTitle": course.title,
+        "courseSlug": course.slug,
+        "courseThumbnail": course.thumbnail.url if course.thumbnail else None,
+        "progressPercentage": progress_percentage,
+        "completedLessons": completed_count,
+        "totalLessons": total_items,
+        "nextLesson": {
+            "id": next_item.id,
+            "title": next_item.title,
+            "moduleTitle": next_item.module.title,
+            "contentType": next_item.content_type,
+        } if next_item else None
+    }}
+
+
+def learner_courses_in_progress(context: UserDashboardContext) -> dict:
+    """Up to six active courses with progress over required, published items (three queries)."""
+    active_enrollments = list(Enrollment.objects.filter(
+        user=context.user,
+        status=Enrollment.Status.ACTIVE
+    ).select_related('course').order_by('-updated_at')[:6])
+
+    required = Q(is_published=True, is_required=True)
+    course_ids = [enrollment.course_id for enrollment in active_enrollments]
+    totals = dict(
+        ContentItem.objects.filter(required, module__course_id__in=course_ids)
+        .values_list('module__course_id').annotate(total=Count('id'))
+    )
+    completed = dict(
+        LearnerProgress.objects.filter(
+            enrollment__in=active_enrollments,
+            status=LearnerProgress.Status.COMPLETED,
+            content_item__is_published=True,
+            content_item__is_required=True,
+        ).values_list('enrollment_id').annotate(completed=Count('id'))
+    )
+
+    courses = []
+    for enrollment in active_enrollments:
+        course = enrollment.course
+        total_items = totals.get(course.id, 0)
+        completed_items = completed.get(enrollment.id, 0)
+        courses.append({
+            "courseId": course.id,
+            "courseTitle": course.title,
+            "courseSlug": course.slug,
+            "courseThumbnail": course.thumbnail.url if course.thumbnail else None,
+            "progressPercentage": round((completed_items / total_items) * 100) if total_items > 0 else 0,
+            "completedLessons": completed_items,
+            "totalLessons": total_items,
+            "lastAccessedAt": enrollment.updated_at.strftime("%b %d, %Y")
+        })
+    return {"coursesInProgress": courses}
+
+
+LEARNER_DASHBOARD = DashboardComposer("learner_stats", [
+    DashboardSection("overview", learner_overview, cache_timeout=600, default={
+        "activeCourses": 0, "completedCourses": 0, "certificatesEarned": 0, "overallProgress": 0,
+    }),
+    DashboardSection("progress", learner_progress, cache_timeout=300, default={
+        "learningStreak": 0, "totalStudyHours": 0, "lessonsCompleted": 0, "recentActivity": [],
+    }),
+    DashboardSection("assessments", learner_assessments, cache_timeout=900, default={"averageAssessmentScore": 0}),
+    DashboardSection("learning_paths", learner_learning_paths, cache_timeout=600, default={"learningPaths": []}),
+    DashboardSection("weekly", learner_weekly, cache_timeout=300, default={
+        "weeklyLessonsCompleted": 0, "weeklyAssessmentsTaken": 0, "weeklyStudyHours": 0,
+    }),
+    DashboardSection("deadlines", learner_deadlines, cache_timeout=900, default={"upcomingDeadlines": []}),
+    DashboardSection("achievements", learner_achievements, cache_timeout=3600, default={"recentAchievements": []}),
+    DashboardSection("continue_learning", learner_continue_learning, cache_timeout=300,
+                     default={"continueLearning": None}),
+    DashboardSection("courses_in_progress", learner_courses_in_progress, cache_timeout=300,
+                     default={"coursesInProgress": []}),
+], parallel=False)
+
+
+# --- Instructor sections ---
+
+
+def instructor_overview(context: UserDashboardContext) -> dict:
+    """Course and enrollment counts, completion rates and top courses (three queries)."""
+    user = context.user
+    courses = list(Course.objects.filter(instructor=user).annotate(
+        enrollment_total=Count('enrollments'),
+        enrollment_active=Count('enrollments', filter=Q(enrollments__status=Enrollment.Status.ACTIVE)),
+        enrollment_completed=Count('enrollments', filter=Q(enrollments__status=Enrollment.Status.COMPLETED)),
+    ).values('title', 'status', 'enrollment_total', 'enrollment_active', 'enrollment_completed'))
+
+    draft_courses = sum(1 for course in courses if course['status'] == Course.Status.DRAFT)
+    active_students = User.objects.filter(
+        enrollments__course__instructor=user,
+        enrollments__status=Enrollment.Status.ACTIVE
+    ).distinct().count()
+
+    completion_rates = [
+        course['enrollment_completed'] / course['enrollment_total'] * 100
+        for course in courses if course['enrollment_total'] > 0
+    ]
+    top_courses = sorted(
+        (
+            {
+                "title": course['title'],
+                "enrollments": course['enrollment_total'],
+                "completionRate": round(
+                    course['enrollment_completed'] / course['enrollment_total'] * 100
+                    if course['enrollment_total'] > 0 else 0, 1
+                ),
+            }
+            for course in courses
+        ),
+        key=lambda item: item['completionRate'],
+        reverse=True,
+    )[:5]
+
+    return {
+        "totalCourses": len(courses),
+        "publishedCourses": sum(1 for course in courses if course['status'] == Course.Status.PUBLISHED),
+        "draftCourses": draft_courses,
+        "totalEnrollments": sum(course['enrollment_total'] for course in courses),
+        "activeEnrollments": sum(course['enrollment_active'] for course in courses),
+        "activeStudents": active_students,
+        "avgCompletionRate": round(sum(completion_rates) / len(completion_rates), 1) if completion_rates else 0,
+        "topCourses": top_courses,
+        # Content progress data (simplified)
+        "contentProgress": {
+            "drafts": draft_courses,
+            "publishedThisMonth": 0,
+            "modulesCreated": 0,
+            "contentItems": 0
+        },
+    }
+
+
+def instructor_grading(context: UserDashboardContext) -> dict:
+    user = context.user
+    pending_grading = AssessmentAttempt.objects.filter(
+        assessment__course__instructor=user,
+        status=AssessmentAttempt.AttemptStatus.SUBMITTED
+    ).count()
+
+    recent_assessments = Assessment.objects.filter(
+        course__instructor=user
+    ).select_related('course').order_by('-created_at')[:5]
+
+    upcoming_deadlines = Assessment.objects.filter(
+        course__instructor=user,
+        due_date__gte=_start_of_today()
+    ).select_related('course').order_by('due_date')[:5]
+
+    return {
+        "pendingGrading": pending_grading,
+        "recentAssessments": [{
+            "title": assessment.title,
+            "course": assessment.course.title,
+            "dueDate": assessment.due_date.strftime("%Y-%m-%d") if assessment.due_date else None,
+            "createdAt": assessment.created_at.isoformat()
+        } for assessment in recent_assessments],
+        "upcomingDeadlines": [{
+            "title": assessment.title,
+            "course": assessment.course.title,
+            "dueDate": assessment.due_date.strftime("%Y-%m-%d")
+        } for assessment in upcoming_deadlines],
+    }
+
+
+def instructor_activity(context: UserDashboardContext) -> dict:
+    user = context.user
+    recent_activity_qs = LearnerProgress.objects.filter(
+        enrollment__course__instructor=user
+    ).select_related('content_item', 'enrollment__course', 'enrollment__user').order_by('-updated_at')[:10]
+
+    # Students with the most completed items in the instructor's courses over the last week
+    top_students_qs = LearnerProgress.objects.filter(
+        enrollment__course__instructor=user,
+        status=LearnerProgress.Status.COMPLETED,
+        completed_at__gte=timezone.now() - timedelta(days=7)
+    ).values(
+        'enrollment__user__id',
+        'enrollment__user__first_name',
+        'enrollment__user__last_name',
+        'enrollment__user__email',
+        'enrollment__course__title'
+    ).annotate(
+        completed_count=Count('id')
+    ).order_by('-completed_count')[:5]
+
+    top_students = []
+    for student in top_students_qs:
+        name = f"{student['enrollment__user__first_name'] or ''} {student['enrollment__user__last_name'] or ''}".strip()
+        top_students.append({
+            "name": name or student['enrollment__user__email'].split('@')[0],
+            "course": student['enrollment__course__title'],
+            # Estimate: 0.5 hours per completed item
+            "hoursSpent": round(student['completed_count'] * 0.5, 1),
+        })
+
+    return {
+        "recentActivity": [{
+            "description": f"{item.enrollment.user.get_full_name() or item.enrollment.user.email} completed '{item.content_item.title}' in '{item.enrollment.course.title}'",
+            "timestamp": item.updated_at.isoformat()
+        } for item in recent_activity_qs],
+        "topStudents": top_students,
+    }
+
+
+def instructor_course_health(context: UserDashboardContext) -> dict:
+    """Published courses with low enrollment, high attrition, stagnant engagement or low completion."""
+    two_weeks_ago = timezone.now() - timedelta(days=14)
+    courses = Course.objects.filter(
+        instructor=context.user, status=Course.Status.PUBLISHED
+    ).annotate(
+        enrollment_total=Count('enrollments'),
+        enrollment_active=Count('enrollments', filter=Q(enrollments__status=Enrollment.Status.ACTIVE)),
+        enrollment_cancelled=Count('enrollments', filter=Q(enrollments__status=Enrollment.Status.CANCELLED)),
+        enrollment_completed=Count('enrollments', filter=Q(enrollments__status=Enrollment.Status.COMPLETED)),
+        recent_progress=Exists(LearnerProgress.objects.filter(
+            enrollment__course=OuterRef('pk'), updated_at__gte=two_weeks_ago
+        )),
+    )
+
+    courses_needing_attention = []
+    for course in courses:
+        issues = []
+        severity = "low"  # low, medium, high
+        total = course.enrollment_total
+
+        if total < 3:
+            issues.append({
+                "type": "low_enrollment",
+                "message": f"Only {total} enrollment(s)",
+                "suggestion": "Consider promoting this course or reviewing its description"
+            })
+            severity = "medium"
+
+        if total > 0:
+            attrition_rate = (course.enrollment_cancelled / total) * 100
+            if attrition_rate > 30:
+                issues.append({
+                    "type": "high_attrition",
+                    "message": f"{round(attrition_rate)}% dropout rate",
+                    "suggestion": "Review course content and gather student feedback"
+                })
+                severity = "high"
+
+        if course.enrollment_active > 0 and not course.recent_progress:
+            issues.append({
+                "type": "stagnant_engagement",
+                "message": "No student activity in 2 weeks",
+                "suggestion": "Send a reminder or add new engaging content"
+            })
+            if severity == "low":
+                severity = "medium"
+
+        if total >= 5:
+            completion_rate = (course.enrollment_completed / total) * 100
+            if completion_rate < 20:
+                issues.append({
+                    "type": "low_completion",
+                    "message": f"Only {round(completion_rate)}% completion rate",
+                    "suggestion": "Review course difficulty and structure"
+                })
+                if severity == "low":
+                    severity = "medium"
+
+        if issues:
+            courses_needing_attention.append({
+                "courseId": str(course.id),
+                "courseTitle": course.title,
+                "courseSlug": course.slug,
+                "enrollments": total,
+                "activeEnrollments": course.enrollment_active,
+                "issues": issues,
+                "severity": severity
+            })
+
+    severity_order = {"high": 0, "medium": 1, "low": 2}
+    courses_needing_attention.sort(key=lambda item: severity_order.get(item['severity'], 3))
+    return {"coursesNeedingAttention": courses_needing_attention[:5]}
+
+
+def instructor_at_risk(context: UserDashboardContext) -> dict:
+    """Active enrollments inactive for a week or more, or with low progress after two weeks."""
+    now = timezone.now()
+    enrollments = Enrollment.objects.filter(
+        course__instructor=context.user,
+        status=Enrollment.Status.ACTIVE
+    ).select_related('user', 'course').annotate(last_progress_at=Max('progress_items__updated_at'))
+
+    at_risk_students = []
+    for enrollment in enrollments:
+        risk_factors = []
+        risk_level = "low"  # low, medium, high
+
+        last_activity_date = enrollment.last_progress_at or enrollment.enrolled_at
+        days_inactive = (now - last_activity_date).days
+        if days_inactive >= 14:
+            risk_factors.append({"type": "long_inactive", "message": f"No activity for {days_inactive} days"})
+            risk_level = "high"
+        elif days_inactive >= 7:
+            risk_factors.append({"type": "inactive", "message": f"No activity for {days_inactive} days"})
+            risk_level = "medium"
+
+        days_enrolled = (now - enrollment.enrolled_at).days
+        if days_enrolled >= 14 and enrollment.progress < 20:
+            risk_factors.append({
+                "type": "low_progress",
+                "message": f"Only {enrollment.progress}% complete after {days_enrolled} days"
+            })
+            if risk_level == "low":
+                risk_level = "medium"
+
+        if risk_factors:
+            at_risk_students.append({
+                "studentId": str(enrollment.user.id),
+                "studentName": enrollment.user.get_full_name() or enrollment.user.email.split('@')[0],
+                "studentEmail": enrollment.user.email,
+                "courseId": str(enrollment.course.id),
+                "courseTitle": enrollment.course.title,
+                "courseSlug": enrollment.course.slug,
+                "progress": enrollment.progress,
+                "lastActivity": last_activity_date.isoformat(),
+                "daysInactive": days_inactive,
+                "riskFactors": risk_factors,
+                "riskLevel": risk_level
+            })
+
+    risk_order = {"high": 0, "medium": 1, "low": 2}
+    at_risk_students.sort(key=lambda item: (risk_order.get(item['riskLevel'], 3), -item['daysInactive']))
+    return {"atRiskStudents": at_risk_students[:10]}
+
+
+def instructor_alerts(context: UserDashboardContext) -> dict:
+    user = context.user
+    now = timezone.now()
+    urgent_alerts = []
+
+    # Overdue grading (submissions older than 3 days)
+    overdue = AssessmentAttempt.objects.filter(
+        assessment__course__instructor=user,
+        status=AssessmentAttempt.AttemptStatus.SUBMITTED,
+        end_time__lt=now - timedelta(days=3)
+    ).aggregate(count=Count('id'), oldest=Min('end_time'))
+    if overdue['count']:
+        urgent_alerts.append({
+            "type": "overdue_grading",
+            "severity": "high",
+            "title": f"{overdue['count']} submission(s) awaiting grading",
+            "message": f"Oldest submission is {(now - overdue['oldest']).days} days old",
+            "actionUrl": "/instructor/grading",
+            "actionLabel": "Go to Grading"
+        })
+
+    # Assessments due within 48 hours
+    upcoming_assessments = Assessment.objects.filter(
+        course__instructor=user,
+        due_date__lte=now + timedelta(hours=48),
+        due_date__gte=_start_of_today()
+    ).select_related('course')[:3]
+    for assessment in upcoming_assessments:
+        urgent_alerts.append({
+            "type": "upcoming_deadline",
+            "severity": "medium",
+            "title": f"'{assessment.title}' deadline approaching",
+            "message": f"Due on {assessment.due_date.strftime('%b %d, %Y')} for {assessment.course.title}",
+            "actionUrl": f"/instructor/courses/{assessment.course.slug}/assessments",
+            "actionLabel": "View Assessment"
+        })
+
+    # Published courses not updated for 30 days
+    stale_titles = list(Course.objects.filter(
+        instructor=user,
+        status=Course.Status.PUBLISHED,
+        updated_at__lt=now - timedelta(days=30)
+    ).values_list('title', flat=True))
+    if stale_titles:
+        urgent_alerts.append({
+            "type": "stale_content",
+            "severity": "low",
+            "title": f"{len(stale_titles)} course(s) haven't been updated recently",
+            "message": f"Consider refreshing: {', '.join(stale_titles[:2])}",
+            "actionUrl": "/instructor/courses",
+            "actionLabel": "View Courses"
+        })
+
+    return {"urgentAlerts": urgent_alerts}
+
+
+def instructor_revenue(context: UserDashboardContext) -> dict:
+    user = context.user
+    now = timezone.now()
+    month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+    instructor_revenue = RevenueAnalytics.objects.filter(instructor=user).order_by('-period_end')
+    total_revenue = instructor_revenue.aggregate(total=Sum('total_revenue'))['total'] or 0
+    # Records whose period covers this month
+    this_month_revenue = instructor_revenue.filter(
+        period_start__lte=now.date(),
+        period_end__gte=month_start.date()
+    ).aggregate(monthly=Sum('monthly_revenue'))['monthly'] or 0
+
+    course_count = Course.objects.filter(instructor=user).count()
+    avg_per_course = float(total_revenue) / course_count if course_count > 0 else 0
+    latest_revenue = instructor_revenue.first()
+    growth_rate = float(latest_revenue.growth_rate) if latest_revenue else 0
+
+    return {"revenue": {
+        "thisMonth": float(this_month_revenue),
+        "total": float(total_revenue),
+        "avgPerCourse": round(avg_per_course, 2),
+        "growth": round(growth_rate, 1)
+    }}
+
+
+INSTRUCTOR_STATS_DASHBOARD = DashboardComposer("instructor_stats", [
+    DashboardSection("overview", instructor_overview, cache_timeout=600, default={
+        "totalCourses": 0, "publishedCourses": 0, "draftCourses": 0, "totalEnrollments": 0,
+        "activeEnrollments": 0, "activeStudents": 0, "avgCompletionRate": 0, "topCourses": [],
+        "contentProgress": {"drafts": 0, "publishedThisMonth": 0, "modulesCreated": 0, "contentItems": 0},
+    }),
+    DashboardSection("grading", instructor_grading, cache_timeout=300, default={
+        "pendingGrading": 0, "recentAssessments": [], "upcomingDeadlines": [],
+    }),
+    DashboardSection("activity", instructor_activity, cache_timeout=300, default={
+        "recentActivity": [], "topStudents": [],
+    }),
+    DashboardSection("course_health", instructor_course_health, cache_timeout=1800,
+                     default={"coursesNeedingAttention": []}),
+    DashboardSection("at_risk", instructor_at_risk, cache_timeout=1800, default={"atRiskStudents": []}),
+    DashboardSection("alerts", instructor_alerts, cache_timeout=600, default={"urgentAlerts": []}),
+    DashboardSection("revenue", instructor_revenue, cache_timeout=3600, default={
+        "revenue": {"thisMonth": 0, "total": 0, "avgPerCourse": 0, "growth": 0},
+    }),
+], parallel=False)
+
+
+# Sections each domain event makes stale, per dashboard
+DASHBOARD_EVENTS = {
+    'progress_updated': {
+        LEARNER_DASHBOARD: ('progress', 'weekly', 'continue_learning', 'courses_in_progress'),
+        INSTRUCTOR_STATS_DASHBOARD: ('activity', 'course_health', 'at_risk'),
+    },
+    'attempt_updated': {
+        LEARNER_DASHBOARD: ('assessments', 'weekly', 'deadlines'),
+        INSTRUCTOR_STATS_DASHBOARD: ('grading', 'alerts'),
+    },
+    'enrollment_changed': {
+        LEARNER_DASHBOARD: ('overview', 'deadlines', 'continue_learning', 'courses_in_progress'),
+        INSTRUCTOR_STATS_DASHBOARD: ('overview', 'course_health', 'at_risk'),
+    },
+    'certificate_issued': {
+        LEARNER_DASHBOARD: ('overview', 'achievements'),
+    },
+    'learning_path_progress_updated': {
+        LEARNER_DASHBOARD: ('learning_paths',),
+    },
+    'course_changed': {
+        INSTRUCTOR_STATS_DASHBOARD: ('overview', 'course_health', 'alerts'),
+    },
+    'assessment_changed': {
+        LEARNER_DASHBOARD: ('deadlines',),
+        INSTRUCTOR_STATS_DASHBOARD: ('grading', 'alerts'),
+    },
+}
+
+
+def invalidate_dashboard_sections(event: str, learner_ids: Iterable = (), instructor_ids: Iterable = ()) -> None:
+    """Drops the sections `event` affects for the given users once the transaction commits."""
+    targets = {
+        LEARNER_DASHBOARD: [str(user_id) for user_id in learner_ids if user_id],
+        INSTRUCTOR_STATS_DASHBOARD: [str(user_id) for user_id in instructor_ids if user_id],
+    }
+
+    def invalidate():
+        for composer, sections in DASHBOARD_EVENTS[event].items():
+            if targets[composer]:
+                composer.invalidate(targets[composer], sections)
+
+    transaction.on_commit(invalidate)
+
+
+def build_dashboard(composer: DashboardComposer, user, sections: Iterable[str] = ()) -> dict:
+    """Flat stats for the requested sections (all by default), served from cache where fresh."""
+    selected = composer.select(sections)
+    results, _ = composer.compose(UserDashboardContext(user), selected)
+    stats = {}
+    for section in selected:
+        stats.update(results[section.name])
+    return stats
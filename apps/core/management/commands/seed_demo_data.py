@@ -1473,6 +1473,8 @@ In this lesson, you learned about {item_title.lower()}. Make sure to complete th
     def _create_discussion_interactions(self, tenant, learners, courses):
         """Create discussion interaction records for social learning analytics."""
         from apps.analytics.models import DiscussionInteraction
+        from apps.discussions.models import DiscussionActivity
+        from apps.discussions.services import DiscussionActivityService
 
         interaction_types = ["post", "reply", "like", "view"]
         interaction_count = 0
@@ -1508,6 +1510,15 @@ In this lesson, you learned about {item_title.lower()}. Make sure to complete th
                         course=course,
                         **defaults,
                     )
+                    # Social learning dashboards read the discussion activity log
+                    activity_type = DiscussionActivityService.INTERACTION_ACTIVITY_TYPES.get(interaction_type)
+                    if activity_type:
+                        DiscussionActivity.objects.create(
+                            tenant=tenant,
+                            course=course,
+                            actor=learner,
+                            activity_type=activity_type,
+                        )
                     interaction_count += 1
 
         self.stdout.write(f"Created {interaction_count} discussion interactions.")
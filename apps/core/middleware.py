@@ -1,10 +1,13 @@
 import logging
 import time
 
+from django.conf import settings
 from django.core.cache import cache
 from django.utils.deprecation import MiddlewareMixin
 from django.utils.functional import SimpleLazyObject
 
+from apps.common.perf import RequestProfile, current_profile, record_request
+
 from .services import TenantService  # Assuming TenantService exists
 
 logger = logging.getLogger(__name__)
@@ -16,20 +19,21 @@ def get_tenant(request):
     Supports tenant resolution via:
     1. X-Tenant-Slug header (useful for testing and API clients)
     2. Hostname-based lookup (production default)
+
+    Both are served from cached tenant snapshots, so warm lookups run no
+    queries. The time taken is kept on the request for MetricsMiddleware.
     """
     if not hasattr(request, "_cached_tenant"):
+        started = time.perf_counter()
         # First, try X-Tenant-Slug header (useful for testing and API clients)
         tenant_slug = request.META.get("HTTP_X_TENANT_SLUG")
         if tenant_slug:
-            from .models import Tenant
-            try:
-                request._cached_tenant = Tenant.objects.get(slug=tenant_slug, is_active=True)
-            except Tenant.DoesNotExist:
-                request._cached_tenant = None
+            request._cached_tenant = TenantService.get_tenant_by_slug(tenant_slug)
         else:
             # Fall back to hostname-based lookup
             hostname = request.get_host().split(":")[0]
             request._cached_tenant = TenantService.get_tenant_by_hostname(hostname)
+        request.tenant_resolution_time = time.perf_counter() - started
     return request._cached_tenant
 
 
@@ -52,26 +56,50 @@ class TenantMiddleware(MiddlewareMixin):
         #     # Handle error appropriately, maybe return 404 or 500
 
 
-class MetricsMiddleware(MiddlewareMixin):
+class MetricsMiddleware:
     """
-    Basic middleware to track request processing time.
+    Profiles each request (apps.common.perf): wall time, SQL query count and
+    time, duplicate query fingerprints, cache lookups and render time. The
+    numbers go to the Prometheus registry served at /metrics, slow requests
+    are traced, and with PERF_QUERY_HEADERS the response carries them too.
     """
 
-    def process_request(self, request):
-        request.start_time = time.time()
+    def __init__(self, get_response):
+        self.get_response = get_response
 
-    def process_response(self, request, response):
-        if hasattr(request, "start_time"):
-            duration = time.time() - request.start_time
-            status_code = response.status_code
-            method = request.method
-            path = request.path_info
+    def __call__(self, request):
+        request.start_time = time.time()
+        with RequestProfile().capture() as profile:
+            response = self.get_response(request)
+        duration = time.time() - request.start_time
+        record_request(request, response, duration, profile)
 
-            # Log metrics (e.g., to console, Prometheus, Datadog)
-            logger.info(
-                f"Request Metrics: {method} {path} Status:{status_code} Duration:{duration:.4f}s"
+        if getattr(settings, "PERF_QUERY_HEADERS", False):
+            response["X-DB-Query-Count"] = str(profile.query_count)
+            response["X-DB-Duplicate-Queries"] = str(profile.duplicate_queries)
+            response["Server-Timing"] = (
+                f"db;dur={profile.db_time * 1000:.1f}, render;dur={profile.serialization_time * 1000:.1f}, "
+                f"total;dur={duration * 1000:.1f}"
             )
-            # You could push metrics to a dedicated system here
+
+        tenant_time = getattr(request, "tenant_resolution_time", None)
+        tenant_metric = f" Tenant:{tenant_time:.4f}s" if tenant_time is not None else ""
+        logger.info(
+            f"Request Metrics: {request.method} {request.path_info} Status:{response.status_code} "
+            f"Duration:{duration:.4f}s Queries:{profile.query_count} DB:{profile.db_time:.4f}s{tenant_metric}"
+        )
+        return response
+
+    def process_template_response(self, request, response):
+        # Called just before DRF/template responses are rendered
+        profile = current_profile()
+        if profile is not None:
+            started = time.perf_counter()
+
+            def finished(rendered):
+                profile.serialization_time += time.perf_counter() - started
+
+            response.add_post_render_callback(finished)
         return response
 
 
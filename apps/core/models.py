@@ -3,6 +3,7 @@ import uuid
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
+from apps.common.cache import cached
 from apps.common.models import TimestampedModel
 
 
@@ -37,6 +38,11 @@ class Tenant(TimestampedModel):
             self.slug = generate_unique_slug(self, source_field="name")
         super().save(*args, **kwargs)
 
+    @staticmethod
+    def cache_tag(tenant_id) -> str:
+        """Cache tag of everything cached from a tenant row."""
+        return f"tenant:{tenant_id}"
+
     # Add methods to easily check feature flags, e.g.:
     # def has_feature(self, feature_name):
     #     return self.feature_flags.get(feature_name, False)
@@ -587,3 +593,29 @@ class PlatformSettings(TimestampedModel):
         # Get or create global settings
         settings, _ = cls.objects.get_or_create(tenant__isnull=True)
         return settings
+
+    @classmethod
+    def get_cached_settings(cls, tenant=None):
+        """
+        get_settings() for read-only use, served from the cache until the
+        settings row is saved or deleted (see apps/core/signals.py).
+        """
+        return _cached_platform_settings(getattr(tenant, 'pk', tenant))
+
+    @staticmethod
+    def cache_tag(tenant_id=None) -> str:
+        """Cache tag of a tenant's settings row (None for the global row)."""
+        return f"platform_settings:{tenant_id or 'global'}"
+
+
+@cached(
+    key_fn=lambda tenant_id: str(tenant_id or 'global'),
+    ttl=3600,
+    tags=lambda tenant_id: [PlatformSettings.cache_tag(tenant_id)],
+    namespace='core.platform_settings',
+)
+def _cached_platform_settings(tenant_id):
+    if tenant_id:
+        settings, _ = PlatformSettings.objects.get_or_create(tenant_id=tenant_id)
+        return settings
+    return PlatformSettings.get_settings()
@@ -1,19 +1,25 @@
+import copy
 import hashlib
 import logging
 import secrets
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
 from typing import Any
 from urllib.parse import urlencode
 
 from django.conf import settings
 from django.contrib.auth import login as django_login
 from django.core.cache import cache
-from django.core.exceptions import ObjectDoesNotExist
-from django.db import transaction
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from apps.common.cache import cached
 
 from .models import (
     LTIDeployment,
     LTIPlatform,
     LTIResourceLink,
+    PlatformSettings,
     SSOConfiguration,
     Tenant,
     TenantDomain,
@@ -520,59 +526,108 @@ class AGSService:
         return success_count
 
 
+@dataclass(frozen=True)
+class TenantSnapshot:
+    """
+    An immutable copy of a tenant row and its non-secret platform settings,
+    cached so requests resolve their tenant without queries. to_tenant()
+    rebuilds a Tenant instance usable in ORM filters from it.
+    """
+
+    id: uuid.UUID
+    name: str
+    slug: str
+    is_active: bool
+    theme_config: dict
+    feature_flags: dict
+    created_at: datetime
+    updated_at: datetime
+    settings: dict = field(default_factory=dict)
+
+    # PlatformSettings fields carried in the snapshot; credentials are left out
+    SETTINGS_FIELDS = (
+        "site_name", "default_language", "timezone", "logo_url", "favicon_url",
+        "support_email", "terms_url", "privacy_url", "max_file_size_mb", "allowed_extensions",
+    )
+
+    @classmethod
+    def from_tenant(cls, tenant: Tenant, platform_settings: dict | None = None) -> "TenantSnapshot":
+        return cls(
+            id=tenant.id,
+            name=tenant.name,
+            slug=tenant.slug,
+            is_active=tenant.is_active,
+            theme_config=tenant.theme_config,
+            feature_flags=tenant.feature_flags,
+            created_at=tenant.created_at,
+            updated_at=tenant.updated_at,
+            settings=platform_settings or {},
+        )
+
+    def to_tenant(self) -> Tenant:
+        """A Tenant instance marked as loaded from the database, with its own copies of the JSON fields."""
+        tenant = Tenant(
+            id=self.id,
+            name=self.name,
+            slug=self.slug,
+            is_active=self.is_active,
+            theme_config=copy.deepcopy(self.theme_config),
+            feature_flags=copy.deepcopy(self.feature_flags),
+            created_at=self.created_at,
+            updated_at=self.updated_at,
+        )
+        tenant._state.adding = False
+        tenant._state.db = DEFAULT_DB_ALIAS
+        return tenant
+
+
 class TenantService:
     """
     Service layer for handling tenant-related logic.
     """
 
     CACHE_TIMEOUT = 3600  # Cache tenant lookups for 1 hour
-    CACHE_KEY_PREFIX = "tenant_lookup_"
+    NOT_FOUND_CACHE_TIMEOUT = 60
+    # Invalidated whenever a tenant or domain changes (see apps/core/signals.py)
+    HOSTNAME_CACHE_TAG = "tenant_hosts"
 
     @classmethod
     def get_tenant_by_hostname(cls, hostname: str) -> Tenant | None:
         """
         Retrieves the active tenant associated with a given hostname.
-        Caches the result for performance.
+        Served from the cached hostname mapping and tenant snapshot.
         """
         if not hostname:
             return None
+        return cls._resolve(_tenant_id_for_hostname, hostname)
 
-        cache_key = f"{cls.CACHE_KEY_PREFIX}{hostname}"
-        cached_tenant_id = cache.get(cache_key)
+    @classmethod
+    def get_tenant_by_slug(cls, slug: str) -> Tenant | None:
+        """Retrieves the active tenant with the given slug, served from the cache."""
+        if not slug:
+            return None
+        return cls._resolve(_tenant_id_for_slug, slug)
 
-        if cached_tenant_id is not None:
-            # Check if cached value is placeholder for 'not found'
-            if cached_tenant_id == "NOT_FOUND":
-                return None
-            try:
-                # Fetch tenant by cached ID
-                return Tenant.objects.get(pk=cached_tenant_id, is_active=True)
-            except Tenant.DoesNotExist:
-                # Cached ID is stale, force lookup
-                cache.delete(cache_key)
-                pass  # Fall through to database lookup
-
-        # Cache miss or stale cache, query the database
+    @staticmethod
+    def get_snapshot(tenant_id) -> TenantSnapshot | None:
+        """The cached snapshot of a tenant, or None if it does not exist."""
+        return _tenant_snapshot(str(tenant_id))
+
+    @classmethod
+    def _resolve(cls, lookup, value: str) -> Tenant | None:
         try:
-            domain_entry = TenantDomain.objects.select_related("tenant").get(
-                domain=hostname, tenant__is_active=True
-            )
-            tenant = domain_entry.tenant
-            # Cache the tenant's ID
-            cache.set(cache_key, tenant.id, timeout=cls.CACHE_TIMEOUT)
-            logger.info(
-                f"Tenant cache set for {hostname} -> {tenant.name} ({tenant.id})"
-            )
-            return tenant
-        except ObjectDoesNotExist:
-            logger.debug(f"No active tenant domain found for hostname: {hostname}")
-            # Cache the negative result briefly
-            cache.set(cache_key, "NOT_FOUND", timeout=60)
-            return None
+            tenant_id = lookup(value)
+            snapshot = tenant_id and cls.get_snapshot(tenant_id)
+            if tenant_id and snapshot is None:
+                # Cached ID is stale (changed without signals, e.g. QuerySet.update()); look it up again
+                lookup.invalidate(value)
+                tenant_id = lookup(value)
+                snapshot = tenant_id and cls.get_snapshot(tenant_id)
+            if not snapshot or not snapshot.is_active:
+                return None
+            return snapshot.to_tenant()
         except Exception as e:
-            logger.error(
-                f"Error retrieving tenant for hostname {hostname}: {e}", exc_info=True
-            )
+            logger.error(f"Error retrieving tenant for {value}: {e}", exc_info=True)
             return None
 
     @staticmethod
@@ -602,6 +657,52 @@ class TenantService:
         return settings
 
 
+@cached(
+    ttl=TenantService.CACHE_TIMEOUT,
+    tags=[TenantService.HOSTNAME_CACHE_TAG],
+    namespace="core.tenant_hostname",
+    none_ttl=TenantService.NOT_FOUND_CACHE_TIMEOUT,
+)
+def _tenant_id_for_hostname(hostname: str) -> str | None:
+    tenant_id = (
+        TenantDomain.objects.filter(domain=hostname, tenant__is_active=True)
+        .values_list("tenant_id", flat=True)
+        .first()
+    )
+    if tenant_id is None:
+        logger.debug(f"No active tenant domain found for hostname: {hostname}")
+        return None
+    logger.info(f"Tenant cache set for {hostname} -> {tenant_id}")
+    return str(tenant_id)
+
+
+@cached(
+    ttl=TenantService.CACHE_TIMEOUT,
+    tags=[TenantService.HOSTNAME_CACHE_TAG],
+    namespace="core.tenant_slug",
+    none_ttl=TenantService.NOT_FOUND_CACHE_TIMEOUT,
+)
+def _tenant_id_for_slug(slug: str) -> str | None:
+    tenant_id = Tenant.objects.filter(slug=slug, is_active=True).values_list("id", flat=True).first()
+    return str(tenant_id) if tenant_id else None
+
+
+@cached(
+    ttl=TenantService.CACHE_TIMEOUT,
+    tags=lambda tenant_id: [Tenant.cache_tag(tenant_id), PlatformSettings.cache_tag(tenant_id)],
+    namespace="core.tenant_snapshot",
+    none_ttl=TenantService.NOT_FOUND_CACHE_TIMEOUT,
+)
+def _tenant_snapshot(tenant_id: str) -> TenantSnapshot | None:
+    tenant = Tenant.objects.filter(pk=tenant_id).first()
+    if tenant is None:
+        return None
+    platform_settings = (
+        PlatformSettings.objects.filter(tenant_id=tenant_id).values(*TenantSnapshot.SETTINGS_FIELDS).first()
+    )
+    return TenantSnapshot.from_tenant(tenant, platform_settings)
+
+
 # --- LTI / SSO Service Classes ---
 
 
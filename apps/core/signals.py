@@ -0,0 +1,118 @@
+"""
+Signal handlers for the Core app.
+
+Keeps the cached learner and instructor dashboard sections fresh: each
+change drops only the sections it affects (see dashboards.DASHBOARD_EVENTS),
+for the learner and the course instructor involved, once it commits.
+Platform settings changes invalidate the cached settings row and the
+tenant timezone used for analytics date windows; tenant and domain changes
+invalidate cached tenant snapshots and hostname lookups. These tags are
+invalidated again once the change commits, so a concurrent read of the
+old row cannot stay cached under the new tag version.
+"""
+
+import logging
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.assessments.models import Assessment, AssessmentAttempt
+from apps.common.cache import invalidate_tags
+from apps.courses.models import Course
+from apps.enrollments.models import Certificate, Enrollment, LearnerProgress
+from apps.learning_paths.models import LearningPathProgress
+
+from .dashboards import invalidate_dashboard_sections
+from .models import PlatformSettings, Tenant, TenantDomain
+from .services import TenantService
+
+logger = logging.getLogger(__name__)
+
+
+def _invalidate_tags_on_commit(*tags) -> None:
+    # Now, so the writing transaction reads its own change; and after commit,
+    # since a concurrent request can re-cache the still-committed old row
+    # under the version bumped here
+    invalidate_tags(*tags)
+    transaction.on_commit(lambda: invalidate_tags(*tags))
+
+
+def _course_instructor(course_id):
+    return Course.objects.filter(pk=course_id).values_list('instructor_id', flat=True).first()
+
+
+@receiver(post_save, sender=LearnerProgress)
+@receiver(post_delete, sender=LearnerProgress)
+def invalidate_dashboards_on_progress_change(sender, instance: LearnerProgress, **kwargs):
+    row = Enrollment.objects.filter(pk=instance.enrollment_id).values_list('user_id', 'course__instructor_id').first()
+    if row:
+        invalidate_dashboard_sections('progress_updated', learner_ids=[row[0]], instructor_ids=[row[1]])
+
+
+@receiver(post_save, sender=AssessmentAttempt)
+@receiver(post_delete, sender=AssessmentAttempt)
+def invalidate_dashboards_on_attempt_change(sender, instance: AssessmentAttempt, **kwargs):
+    instructor_id = Assessment.objects.filter(
+        pk=instance.assessment_id
+    ).values_list('course__instructor_id', flat=True).first()
+    invalidate_dashboard_sections('attempt_updated', learner_ids=[instance.user_id], instructor_ids=[instructor_id])
+
+
+@receiver(post_save, sender=Enrollment)
+@receiver(post_delete, sender=Enrollment)
+def invalidate_dashboards_on_enrollment_change(sender, instance: Enrollment, **kwargs):
+    invalidate_dashboard_sections(
+        'enrollment_changed',
+        learner_ids=[instance.user_id],
+        instructor_ids=[_course_instructor(instance.course_id)],
+    )
+
+
+@receiver(post_save, sender=Certificate)
+@receiver(post_delete, sender=Certificate)
+def invalidate_dashboards_on_certificate_change(sender, instance: Certificate, **kwargs):
+    invalidate_dashboard_sections('certificate_issued', learner_ids=[instance.user_id])
+
+
+@receiver(post_save, sender=LearningPathProgress)
+@receiver(post_delete, sender=LearningPathProgress)
+def invalidate_dashboards_on_path_progress_change(sender, instance: LearningPathProgress, **kwargs):
+    invalidate_dashboard_sections('learning_path_progress_updated', learner_ids=[instance.user_id])
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+def invalidate_dashboards_on_course_change(sender, instance: Course, **kwargs):
+    invalidate_dashboard_sections('course_changed', instructor_ids=[instance.instructor_id])
+
+
+@receiver(post_save, sender=Assessment)
+@receiver(post_delete, sender=Assessment)
+def invalidate_dashboards_on_assessment_change(sender, instance: Assessment, **kwargs):
+    learner_ids = Enrollment.objects.filter(
+        course_id=instance.course_id, status=Enrollment.Status.ACTIVE
+    ).values_list('user_id', flat=True)
+    invalidate_dashboard_sections(
+        'assessment_changed',
+        learner_ids=list(learner_ids),
+        instructor_ids=[_course_instructor(instance.course_id)],
+    )
+
+
+@receiver(post_save, sender=PlatformSettings)
+@receiver(post_delete, sender=PlatformSettings)
+def invalidate_cached_settings(sender, instance: PlatformSettings, **kwargs):
+    _invalidate_tags_on_commit(PlatformSettings.cache_tag(instance.tenant_id))
+
+
+@receiver(post_save, sender=Tenant)
+@receiver(post_delete, sender=Tenant)
+def invalidate_cached_tenant(sender, instance: Tenant, **kwargs):
+    _invalidate_tags_on_commit(TenantService.HOSTNAME_CACHE_TAG, Tenant.cache_tag(instance.pk))
+
+
+@receiver(post_save, sender=TenantDomain)
+@receiver(post_delete, sender=TenantDomain)
+def invalidate_hostname_lookups(sender, instance: TenantDomain, **kwargs):
+    _invalidate_tags_on_commit(TenantService.HOSTNAME_CACHE_TAG)
@@ -0,0 +1,204 @@
+"""Tests for the sectioned learner and instructor dashboard statistics."""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.assessments.models import Assessment, AssessmentAttempt
+from apps.core.dashboards import INSTRUCTOR_STATS_DASHBOARD, LEARNER_DASHBOARD, UserDashboardContext
+from apps.core.models import Tenant
+from apps.courses.models import ContentItem, Course, Module
+from apps.enrollments.models import Enrollment, LearnerProgress
+from apps.users.models import User
+
+
+class DashboardStatsTestBase(TestCase):
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        self.client = APIClient()
+        self.tenant = Tenant.objects.create(name="Test Tenant", slug="test-tenant")
+        self.instructor = User.objects.create_user(
+            email="instructor@example.com",
+            password="testpass123",
+            role=User.Role.INSTRUCTOR,
+            tenant=self.tenant
+        )
+        self.learner = User.objects.create_user(
+            email="learner@example.com",
+            password="testpass123",
+            role=User.Role.LEARNER,
+            tenant=self.tenant
+        )
+        self.course = Course.objects.create(
+            tenant=self.tenant,
+            title="Published Course",
+            instructor=self.instructor,
+            status=Course.Status.PUBLISHED
+        )
+        self.module = Module.objects.create(course=self.course, title="Intro", order=1)
+        self.lesson = ContentItem.objects.create(
+            module=self.module, title="Lesson", content_type=ContentItem.ContentType.TEXT,
+            text_content="Hello", order=1, is_published=True, is_required=True
+        )
+        ContentItem.objects.create(
+            module=self.module, title="Extra", content_type=ContentItem.ContentType.TEXT,
+            text_content="More", order=2, is_published=True, is_required=True
+        )
+        self.enrollment = Enrollment.objects.create(
+            user=self.learner, course=self.course, status=Enrollment.Status.ACTIVE
+        )
+
+    def tearDown(self):
+        cache.clear()
+
+    def _get(self, url, user, **params):
+        self.client.force_authenticate(user=user)
+        return self.client.get(url, params, HTTP_X_TENANT_SLUG=self.tenant.slug)
+
+    def _cached_sections(self, composer, user):
+        return {
+            name for name, section in composer.sections.items()
+            if cache.get(composer.cache_key(str(user.pk), section)) is not None
+        }
+
+
+class LearnerDashboardStatsTests(DashboardStatsTestBase):
+    """Tests for LearnerDashboardStatsView."""
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('learner_core_api:learner-dashboard-stats')
+
+    def test_full_response_contains_every_section(self):
+        response = self._get(self.url, self.learner)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['activeCourses'], 1)
+        self.assertEqual(response.data['coursesInProgress'][0]['totalLessons'], 2)
+        self.assertEqual(response.data['continueLearning']['nextLesson']['title'], "Lesson")
+        self.assertEqual(self._cached_sections(LEARNER_DASHBOARD, self.learner), set(LEARNER_DASHBOARD.sections))
+
+    def test_sections_parameter_limits_response(self):
+        response = self._get(self.url, self.learner, sections="overview,weekly")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data), {
+            "activeCourses", "completedCourses", "certificatesEarned", "overallProgress",
+            "weeklyLessonsCompleted", "weeklyAssessmentsTaken", "weeklyStudyHours",
+        })
+        self.assertEqual(self._cached_sections(LEARNER_DASHBOARD, self.learner), {"overview", "weekly"})
+
+    def test_unknown_section_is_rejected(self):
+        response = self._get(self.url, self.learner, sections="overview,bogus")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("bogus", response.data['detail'])
+
+    def test_cached_sections_are_not_rebuilt(self):
+        self._get(self.url, self.learner)
+
+        with patch('apps.core.dashboards.calculate_learning_streak') as streak:
+            with self.assertNumQueries(0):
+                results, timings = LEARNER_DASHBOARD.compose(
+                    UserDashboardContext(self.learner), LEARNER_DASHBOARD.select()
+                )
+        streak.assert_not_called()
+        self.assertEqual({timing['status'] for timing in timings.values()}, {'cached'})
+        self.assertEqual(results['overview']['activeCourses'], 1)
+
+    def test_progress_change_invalidates_only_affected_sections(self):
+        self._get(self.url, self.learner)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            LearnerProgress.objects.create(
+                enrollment=self.enrollment, content_item=self.lesson, status=LearnerProgress.Status.COMPLETED
+            )
+
+        self.assertEqual(
+            self._cached_sections(LEARNER_DASHBOARD, self.learner),
+            {"overview", "assessments", "learning_paths", "deadlines", "achievements"},
+        )
+        response = self._get(self.url, self.learner, sections="courses_in_progress,progress")
+        self.assertEqual(response.data['coursesInProgress'][0]['completedLessons'], 1)
+        self.assertEqual(response.data['lessonsCompleted'], 1)
+
+    def test_attempt_change_invalidates_assessment_sections(self):
+        assessment = Assessment.objects.create(course=self.course, title="Quiz", is_published=True)
+        self._get(self.url, self.learner)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            AssessmentAttempt.objects.create(assessment=assessment, user=self.learner)
+
+        self.assertEqual(
+            self._cached_sections(LEARNER_DASHBOARD, self.learner),
+            {"overview", "progress", "learning_paths", "achievements", "continue_learning", "courses_in_progress"},
+        )
+
+    def test_deadlines_skip_passed_assessments_before_limiting(self):
+        due = timezone.now() + timedelta(days=2)
+        passed = [
+            Assessment.objects.create(course=self.course, title=f"Passed {i}", is_published=True, due_date=due)
+            for i in range(3)
+        ]
+        for assessment in passed:
+            AssessmentAttempt.objects.create(assessment=assessment, user=self.learner, is_passed=True)
+        Assessment.objects.create(
+            course=self.course, title="Open", is_published=True, due_date=due + timedelta(days=1)
+        )
+
+        response = self._get(self.url, self.learner, sections="deadlines")
+
+        self.assertEqual([item['title'] for item in response.data['upcomingDeadlines']], ["Open"])
+
+
+class InstructorDashboardStatsTests(DashboardStatsTestBase):
+    """Tests for InstructorDashboardStatsView."""
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('instructor-dashboard-stats')
+        Course.objects.create(
+            tenant=self.tenant, title="Draft Course", instructor=self.instructor, status=Course.Status.DRAFT
+        )
+        finisher = User.objects.create_user(
+            email="finisher@example.com", password="testpass123", tenant=self.tenant
+        )
+        Enrollment.objects.create(user=finisher, course=self.course, status=Enrollment.Status.COMPLETED)
+
+    def test_overview_counts(self):
+        response = self._get(self.url, self.instructor, sections="overview")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['totalCourses'], 2)
+        self.assertEqual(response.data['publishedCourses'], 1)
+        self.assertEqual(response.data['draftCourses'], 1)
+        self.assertEqual(response.data['totalEnrollments'], 2)
+        self.assertEqual(response.data['activeEnrollments'], 1)
+        self.assertEqual(response.data['activeStudents'], 1)
+        self.assertEqual(response.data['avgCompletionRate'], 50.0)
+        self.assertEqual(response.data['topCourses'][0], {
+            "title": "Published Course", "enrollments": 2, "completionRate": 50.0
+        })
+
+    def test_enrollment_change_invalidates_instructor_sections(self):
+        self._get(self.url, self.instructor)
+        newcomer = User.objects.create_user(
+            email="newcomer@example.com", password="testpass123", tenant=self.tenant
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Enrollment.objects.create(user=newcomer, course=self.course, status=Enrollment.Status.ACTIVE)
+
+        self.assertEqual(
+            self._cached_sections(INSTRUCTOR_STATS_DASHBOARD, self.instructor),
+            {"grading", "activity", "alerts", "revenue"},
+        )
+        response = self._get(self.url, self.instructor, sections="overview")
+        self.assertEqual(response.data['totalEnrollments'], 3)
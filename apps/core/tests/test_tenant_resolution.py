@@ -0,0 +1,116 @@
+"""Tests for cached tenant resolution in TenantMiddleware."""
+
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from apps.common.cache import clear_local_cache
+from apps.core.middleware import MetricsMiddleware, TenantMiddleware, get_tenant
+from apps.core.models import PlatformSettings, Tenant, TenantDomain
+from apps.core.services import TenantService
+from apps.courses.models import Course
+
+
+@override_settings(ALLOWED_HOSTS=[".example.com"])
+class TenantResolutionTests(TestCase):
+    """Tests for get_tenant() and the tenant snapshots behind it."""
+
+    def setUp(self):
+        cache.clear()
+        clear_local_cache()
+        self.addCleanup(cache.clear)
+        self.addCleanup(clear_local_cache)
+        self.factory = RequestFactory()
+        self.tenant = Tenant.objects.create(
+            name="Test Tenant", slug="test-tenant", feature_flags={"assessments": True}
+        )
+        TenantDomain.objects.create(tenant=self.tenant, domain="learn.example.com")
+        PlatformSettings.objects.create(tenant=self.tenant, timezone="Europe/Paris")
+
+    def _resolve(self, **extra):
+        request = self.factory.get("/", **extra)
+        TenantMiddleware(lambda request: HttpResponse()).process_request(request)
+        return request, get_tenant(request)
+
+    def test_warm_lookups_run_no_queries(self):
+        self._resolve(HTTP_X_TENANT_SLUG="test-tenant")
+        self._resolve(HTTP_HOST="learn.example.com")
+
+        with CaptureQueriesContext(connection) as queries:
+            _, by_slug = self._resolve(HTTP_X_TENANT_SLUG="test-tenant")
+            _, by_host = self._resolve(HTTP_HOST="learn.example.com")
+
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(by_slug, self.tenant)
+        self.assertEqual(by_host, self.tenant)
+        self.assertEqual(by_slug.feature_flags, {"assessments": True})
+
+    def test_resolved_tenant_works_in_queries(self):
+        _, tenant = self._resolve(HTTP_X_TENANT_SLUG="test-tenant")
+
+        self.assertFalse(tenant._state.adding)
+        self.assertEqual(Course.objects.filter(tenant=tenant).count(), 0)
+
+    def test_snapshot_carries_settings_but_not_credentials(self):
+        snapshot = TenantService.get_snapshot(self.tenant.id)
+
+        self.assertEqual(snapshot.settings["timezone"], "Europe/Paris")
+        self.assertNotIn("smtp_password", snapshot.settings)
+
+    def test_tenant_save_invalidates_snapshot(self):
+        self._resolve(HTTP_X_TENANT_SLUG="test-tenant")
+
+        self.tenant.feature_flags = {"assessments": False}
+        self.tenant.save()
+
+        _, tenant = self._resolve(HTTP_X_TENANT_SLUG="test-tenant")
+        self.assertEqual(tenant.feature_flags, {"assessments": False})
+
+    def test_deactivation_stops_resolution_once_committed(self):
+        committed = Tenant.objects.get(pk=self.tenant.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                self.tenant.is_active = False
+                self.tenant.save()
+
+                # A concurrent request still reads the committed, active row and caches it
+                with patch.object(Tenant.objects, "filter") as stale_filter:
+                    stale_filter.return_value.first.return_value = committed
+                    stale_filter.return_value.values_list.return_value.first.return_value = committed.id
+                    self.assertEqual(TenantService.get_tenant_by_slug("test-tenant"), committed)
+
+        self.assertIsNone(self._resolve(HTTP_X_TENANT_SLUG="test-tenant")[1])
+        self.assertIsNone(self._resolve(HTTP_HOST="learn.example.com")[1])
+
+    def test_mutating_resolved_tenant_does_not_change_snapshot(self):
+        _, tenant = self._resolve(HTTP_X_TENANT_SLUG="test-tenant")
+        tenant.feature_flags["assessments"] = False
+
+        _, again = self._resolve(HTTP_X_TENANT_SLUG="test-tenant")
+        self.assertEqual(again.feature_flags, {"assessments": True})
+
+    def test_unknown_and_inactive_tenants_resolve_to_none(self):
+        Tenant.objects.create(name="Closed", slug="closed", is_active=False)
+
+        self.assertIsNone(self._resolve(HTTP_X_TENANT_SLUG="missing")[1])
+        self.assertIsNone(self._resolve(HTTP_X_TENANT_SLUG="closed")[1])
+        self.assertIsNone(self._resolve(HTTP_HOST="other.example.com")[1])
+
+    def test_resolution_time_is_logged_with_request_metrics(self):
+        def view(request):
+            get_tenant(request)
+            return HttpResponse()
+
+        request = self.factory.get("/", HTTP_X_TENANT_SLUG="test-tenant")
+        TenantMiddleware(view).process_request(request)
+
+        with self.assertLogs("apps.core.middleware", level="INFO") as logs:
+            MetricsMiddleware(view)(request)
+
+        self.assertGreaterEqual(request.tenant_resolution_time, 0)
+        self.assertIn("Tenant:", logs.output[0])
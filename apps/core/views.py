@@ -1,9 +1,10 @@
 import logging
 from django.conf import settings
-from django.http import JsonResponse # Can be used for simple views
+from django.http import HttpResponse, JsonResponse # Can be used for simple views
+from django.utils.crypto import constant_time_compare
 from django.utils import timezone
-from datetime import timedelta, date
-from django.db.models import Count, Q, Avg, Sum
+from datetime import timedelta
+from django.db.models import Count, Q
 from django.db.models.functions import TruncMonth
 
 from rest_framework import generics, permissions, status
@@ -13,12 +14,15 @@ from rest_framework.permissions import IsAuthenticated # Django REST Framework's
 
 from apps.core.models import Tenant # Assuming Tenant is in core.models
 from apps.users.models import User
-from apps.courses.models import Course, ContentItem
-from apps.analytics.models import Event, Report, RevenueAnalytics # Assuming Event and Report are in analytics.models
+from apps.courses.models import Course
+from apps.analytics.models import Event, Report # Assuming Event and Report are in analytics.models
 from apps.analytics.serializers import ReportSerializer, InstructorReportSerializer
-from apps.enrollments.models import Enrollment, LearnerProgress
-from apps.assessments.models import Assessment, AssessmentAttempt
+from apps.enrollments.models import Enrollment
+from apps.assessments.models import AssessmentAttempt
+from apps.common.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, registry as metrics_registry
+from apps.common.mixins import parse_field_list
 from .models import Tenant, TenantDomain
+from .dashboards import INSTRUCTOR_STATS_DASHBOARD, LEARNER_DASHBOARD, build_dashboard
 from .serializers import TenantSerializer, TenantDomainSerializer
 from apps.users.permissions import IsAdminOrTenantAdmin, IsLearner, IsInstructorOrAdmin, IsAdmin, is_admin_user
 from drf_spectacular.utils import extend_schema, OpenApiParameter
@@ -32,6 +36,22 @@ def health_check_view(request):
     return JsonResponse({"status": "ok", "timestamp": timezone.now().isoformat()})
 
 
+def metrics_view(request):
+    """
+    Prometheus scrape endpoint for this worker process's metrics.
+
+    Requires `Authorization: Bearer <METRICS_TOKEN>`. Without a configured
+    token the endpoint is only open when DEBUG is on.
+    """
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if not token:
+        if not settings.DEBUG:
+            return HttpResponse(status=403)
+    elif not constant_time_compare(request.headers.get('Authorization', ''), f"Bearer {token}"):
+        return HttpResponse(status=401)
+    return HttpResponse(metrics_registry.render(), content_type=METRICS_CONTENT_TYPE)
+
+
 # --- Admin Dashboard Statistics View ---
 class AdminDashboardStatsView(APIView):
     """
@@ -444,850 +464,49 @@ class LearnerRecommendationsView(APIView):
             )
 
 
-class LearnerDashboardStatsView(APIView):
+class DashboardStatsView(APIView):
     """
-    Provides statistics for the learner dashboard.
+    Base for per-user dashboard statistics built from cached sections.
+
+    `?sections=overview,weekly` limits the response to those sections, so a
+    client can refresh one panel without recomputing the rest.
     """
-    permission_classes = [IsAuthenticated, IsLearner]
+    composer = None
+    error_label = "dashboard"
 
     def get(self, request, format=None):
         user = request.user
-        
-        try:
-            # Enrollments
-            enrollments = Enrollment.objects.filter(user=user).select_related('course')
-            
-            active_courses = enrollments.filter(status=Enrollment.Status.ACTIVE).count()
-            completed_courses = enrollments.filter(status=Enrollment.Status.COMPLETED).count()
-            
-            # Certificates earned
-            certificates_earned = 0
-            try:
-                from apps.enrollments.models import Certificate
-                certificates_earned = Certificate.objects.filter(user=user, status=Certificate.Status.ISSUED).count()
-            except ImportError:
-                pass
-            
-            # Learning streak - consecutive days with learning activity
-            learning_streak = self.calculate_learning_streak(user)
-            
-            # Overall Progress - Include both active and completed enrollments
-            aggregation = enrollments.filter(status__in=[Enrollment.Status.ACTIVE, Enrollment.Status.COMPLETED]).aggregate(avg_progress=Avg('progress'))
-            overall_progress = aggregation['avg_progress'] or 0
-
-            # Total study hours - Based on completed content items (estimate)
-            completed_content_count = LearnerProgress.objects.filter(enrollment__user=user, status=LearnerProgress.Status.COMPLETED).count()
-            total_study_hours = round(completed_content_count * 0.25, 1)  # Assume 15 minutes per item
-            
-            # Lessons completed (individual content items)
-            lessons_completed = completed_content_count
-            
-            # Average assessment score
-            average_assessment_score = self.calculate_average_assessment_score(user)
-
-            # Learning paths progress
-            learning_paths = self.get_learning_paths_progress(user)
-            
-            # Weekly goals tracking
-            weekly_stats = self.get_weekly_stats(user)
-
-            # Recent Activity
-            recent_activity_qs = LearnerProgress.objects.filter(
-                enrollment__user=user
-            ).select_related('content_item', 'enrollment__course').order_by('-updated_at')[:5]
-            
-            recent_activity = []
-            for item in recent_activity_qs:
-                activity_type = "Completed" if item.status == LearnerProgress.Status.COMPLETED else "Started"
-                recent_activity.append({
-                    "description": f"{activity_type} '{item.content_item.title}' in '{item.enrollment.course.title}'",
-                    "timestamp": item.updated_at.strftime("%b %d, %Y at %I:%M %p")
-                })
-
-            # Upcoming Deadlines
-            # Use start of today (timezone-aware) for DateTimeField comparison
-            today_start = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
-            upcoming_deadlines_qs = Assessment.objects.filter(
-                course__enrollments__user=user,
-                course__enrollments__status__in=[Enrollment.Status.ACTIVE],
-                due_date__gte=today_start,
-                is_published=True
-            ).select_related('course').order_by('due_date')[:3]
-            
-            upcoming_deadlines = []
-            for assessment in upcoming_deadlines_qs:
-                # Check if user has already completed this assessment
-                has_passed = AssessmentAttempt.objects.filter(
-                    assessment=assessment,
-                    user=user,
-                    is_passed=True
-                ).exists()
-                
-                if not has_passed:
-                    upcoming_deadlines.append({
-                        "title": assessment.title,
-                        "course": assessment.course.title,
-                        "dueDate": assessment.due_date.strftime("%b %d, %Y")
-                    })
-
-            # Recent achievements (certificates and milestones)
-            recent_achievements = self.get_recent_achievements(user)
-
-            # Continue learning - get most recently accessed active course with next lesson
-            continue_learning = self.get_continue_learning(user)
-            
-            # In-progress courses with progress details
-            courses_in_progress = self.get_courses_in_progress(user)
-
-            stats = {
-                "activeCourses": active_courses,
-                "completedCourses": completed_courses,
-                "certificatesEarned": certificates_earned,
-                "learningStreak": learning_streak,
-                "overallProgress": round(overall_progress),
-                "totalStudyHours": total_study_hours,
-                "lessonsCompleted": lessons_completed,
-                "averageAssessmentScore": round(average_assessment_score),
-                "learningPaths": learning_paths,
-                "weeklyLessonsCompleted": weekly_stats['lessons'],
-                "weeklyAssessmentsTaken": weekly_stats['assessments'],
-                "weeklyStudyHours": weekly_stats['study_hours'],
-                "recentActivity": recent_activity,
-                "upcomingDeadlines": upcoming_deadlines,
-                "recentAchievements": recent_achievements,
-                "continueLearning": continue_learning,
-                "coursesInProgress": courses_in_progress,
-            }
-            return Response(stats)
-        except Exception as e:
-            logger.error(f"Error generating learner dashboard stats for user {user.id}: {e}", exc_info=True)
-            return Response({"detail": "Could not retrieve dashboard statistics."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-    def calculate_learning_streak(self, user):
-        """Calculate consecutive days of learning activity."""
-        try:
-            # Get recent learning progress ordered by date
-            recent_dates = LearnerProgress.objects.filter(
-                enrollment__user=user,
-                status=LearnerProgress.Status.COMPLETED
-            ).values_list('updated_at__date', flat=True).distinct().order_by('-updated_at__date')[:30]
-            
-            if not recent_dates:
-                return 0
-                
-            streak = 0
-            current_date = timezone.now().date()
-            
-            # Check if there's activity today or yesterday to start streak
-            recent_dates_list = list(recent_dates)
-            if recent_dates_list and (recent_dates_list[0] == current_date or recent_dates_list[0] == current_date - timedelta(days=1)):
-                streak = 1
-                last_date = recent_dates_list[0]
-                
-                for activity_date in recent_dates_list[1:]:
-                    if last_date - activity_date == timedelta(days=1):
-                        streak += 1
-                        last_date = activity_date
-                    else:
-                        break
-            
-            return streak
-        except Exception as e:
-            logger.error(f"Error calculating learning streak for user {user.id}: {e}")
-            return 0
-
-    def calculate_average_assessment_score(self, user):
-        """Calculate average assessment score from completed attempts."""
-        try:
-            attempts = AssessmentAttempt.objects.filter(
-                user=user,
-                status__in=[AssessmentAttempt.AttemptStatus.SUBMITTED, AssessmentAttempt.AttemptStatus.GRADED],
-                score__isnull=False,
-                max_score__isnull=False,
-                max_score__gt=0
+        sections = parse_field_list(request.query_params.get('sections'))
+        unknown = [name for name in sections if name not in self.composer.sections]
+        if unknown:
+            return Response(
+                {"detail": f"Unknown sections: {', '.join(unknown)}. Valid sections: {', '.join(self.composer.sections)}."},
+                status=status.HTTP_400_BAD_REQUEST
             )
-            
-            if not attempts.exists():
-                return 0
-                
-            total_percentage = 0
-            count = 0
-            
-            for attempt in attempts:
-                percentage = (float(attempt.score) / float(attempt.max_score)) * 100
-                total_percentage += percentage
-                count += 1
-                
-            return total_percentage / count if count > 0 else 0
-        except Exception as e:
-            logger.error(f"Error calculating average assessment score for user {user.id}: {e}")
-            return 0
 
-    def get_learning_paths_progress(self, user):
-        """Get learning paths progress for the user."""
         try:
-            from apps.learning_paths.models import LearningPathProgress, LearningPathStepProgress
-            
-            path_progress = LearningPathProgress.objects.filter(
-                user=user,
-                status__in=[LearningPathProgress.Status.IN_PROGRESS, LearningPathProgress.Status.COMPLETED]
-            ).select_related('learning_path').prefetch_related('step_progress')[:4]
-            
-            learning_paths = []
-            for progress in path_progress:
-                total_steps = progress.learning_path.steps.count()
-                completed_steps = progress.step_progress.filter(
-                    status=LearningPathStepProgress.Status.COMPLETED
-                ).count()
-                
-                learning_paths.append({
-                    "title": progress.learning_path.title,
-                    "progressPercentage": round(progress.progress_percentage),
-                    "completedSteps": completed_steps,
-                    "totalSteps": total_steps
-                })
-            
-            return learning_paths
-        except ImportError:
-            # Learning paths not available
-            return []
-        except Exception as e:
-            logger.error(f"Error fetching learning paths for user {user.id}: {e}", exc_info=True)
-            return []
-
-    def get_weekly_stats(self, user):
-        """Get weekly learning statistics."""
-        try:
-            week_start = timezone.now().date() - timedelta(days=timezone.now().weekday())
-            
-            # Weekly lessons completed
-            weekly_lessons = LearnerProgress.objects.filter(
-                enrollment__user=user,
-                status=LearnerProgress.Status.COMPLETED,
-                updated_at__date__gte=week_start
-            ).count()
-            
-            # Weekly assessments taken
-            weekly_assessments = AssessmentAttempt.objects.filter(
-                user=user,
-                start_time__date__gte=week_start,
-                status__in=[AssessmentAttempt.AttemptStatus.SUBMITTED, AssessmentAttempt.AttemptStatus.GRADED]
-            ).count()
-            
-            # Weekly study hours (estimated)
-            weekly_study_hours = round(weekly_lessons * 0.25, 1)
-            
-            return {
-                'lessons': weekly_lessons,
-                'assessments': weekly_assessments,
-                'study_hours': weekly_study_hours
-            }
+            return Response(build_dashboard(self.composer, user, sections))
         except Exception as e:
-            logger.error(f"Error calculating weekly stats for user {user.id}: {e}")
-            return {'lessons': 0, 'assessments': 0, 'study_hours': 0}
-
-    def get_recent_achievements(self, user):
-        """Get recent achievements and certificates."""
-        try:
-            from apps.enrollments.models import Certificate
-            
-            recent_certs = Certificate.objects.filter(
-                user=user,
-                status=Certificate.Status.ISSUED
-            ).select_related('course').order_by('-issued_at')[:4]
-            
-            achievements = []
-            for cert in recent_certs:
-                achievements.append({
-                    "title": f"Certificate: {cert.course.title}",
-                    "earnedDate": cert.issued_at.strftime("%b %d, %Y")
-                })
-            
-            return achievements
-        except ImportError:
-            return []
-        except Exception as e:
-            logger.error(f"Error fetching achievements for user {user.id}: {e}")
-            return []
+            logger.error(f"Error generating {self.error_label} stats for user {user.id}: {e}", exc_info=True)
+            return Response({"detail": "Could not retrieve dashboard statistics."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-    def get_continue_learning(self, user):
-        """Get the most recently accessed active course with next lesson info."""
-        try:
-            # Get most recently accessed active enrollment
-            recent_enrollment = Enrollment.objects.filter(
-                user=user,
-                status=Enrollment.Status.ACTIVE
-            ).select_related('course').order_by('-updated_at').first()
-            
-            if not recent_enrollment:
-                return None
-            
-            course = recent_enrollment.course
-            
-            # Get all content items for this course ordered by module and position
-            # Used for finding next item to continue (includes all published items)
-            all_content_items = ContentItem.objects.filter(
-                module__course=course,
-                is_published=True
-            ).select_related('module').order_by('module__order', 'order')
-            
-            # Get only required items for progress calculation (consistent with enrollment.progress)
-            required_content_items = all_content_items.filter(is_required=True)
-            
-            # Get completed content item IDs for this enrollment
-            completed_item_ids = set(
-                LearnerProgress.objects.filter(
-                    enrollment=recent_enrollment,
-                    status=LearnerProgress.Status.COMPLETED
-                ).values_list('content_item_id', flat=True)
-            )
-            
-            # Find the next incomplete item (the one to continue with) - check all items
-            next_item = None
-            for item in all_content_items:
-                if item.id not in completed_item_ids:
-                    next_item = item
-                    break
-            
-            # Calculate progress using only required items (consistent with courses page)
-            required_item_ids = set(required_content_items.values_list('id', flat=True))
-            total_items = len(required_item_ids)
-            completed_count = len(completed_item_ids & required_item_ids)
-            progress_percentage = round((completed_count / total_items) * 100) if total_items > 0 else 0
-            
-            return {
-                "courseId": course.id,
-                "courseTitle": course.title,
-                "courseSlug": course.slug,
-                "courseThumbnail": course.thumbnail.url if course.thumbnail else None,
-                "progressPercentage": progress_percentage,
-                "completedLessons": completed_count,
-                "totalLessons": total_items,
-                "nextLesson": {
-                    "id": next_item.id,
-                    "title": next_item.title,
-                    "moduleTitle": next_item.module.title,
-                    "contentType": next_item.content_type,
-                } if next_item else None
-            }
-        except Exception as e:
-            logger.error(f"Error getting continue learning for user {user.id}: {e}")
-            return None
 
-    def get_courses_in_progress(self, user):
-        """Get all in-progress courses with progress details."""
-        try:
-            # Get active enrollments ordered by most recently updated
-            active_enrollments = Enrollment.objects.filter(
-                user=user,
-                status=Enrollment.Status.ACTIVE
-            ).select_related('course').order_by('-updated_at')[:6]
-            
-            courses = []
-            for enrollment in active_enrollments:
-                course = enrollment.course
-                
-                # Get only required, published content items for progress calculation
-                # This is consistent with enrollment.progress and courses page
-                required_items = ContentItem.objects.filter(
-                    module__course=course,
-                    is_published=True,
-                    is_required=True
-                )
-                total_items = required_items.count()
-                
-                # Count completed items that are also required
-                completed_items = LearnerProgress.objects.filter(
-                    enrollment=enrollment,
-                    status=LearnerProgress.Status.COMPLETED,
-                    content_item__in=required_items
-                ).count()
-                
-                progress_percentage = round((completed_items / total_items) * 100) if total_items > 0 else 0
-                
-                courses.append({
-                    "courseId": course.id,
-                    "courseTitle": course.title,
-                    "courseSlug": course.slug,
-                    "courseThumbnail": course.thumbnail.url if course.thumbnail else None,
-                    "progressPercentage": progress_percentage,
-                    "completedLessons": completed_items,
-                    "totalLessons": total_items,
-                    "lastAccessedAt": enrollment.updated_at.strftime("%b %d, %Y")
-                })
-            
-            return courses
-        except Exception as e:
-            logger.error(f"Error getting courses in progress for user {user.id}: {e}")
-            return []
+class LearnerDashboardStatsView(DashboardStatsView):
+    """
+    Provides statistics for the learner dashboard.
+    """
+    permission_classes = [IsAuthenticated, IsLearner]
+    composer = LEARNER_DASHBOARD
+    error_label = "learner dashboard"
 
 
-class InstructorDashboardStatsView(APIView):
+class InstructorDashboardStatsView(DashboardStatsView):
     """
     Provides statistics for the instructor dashboard.
     """
     permission_classes = [IsAuthenticated, IsInstructorOrAdmin]
-
-    def get(self, request, format=None):
-        user = request.user
-        
-        try:
-            # Courses taught by this instructor
-            instructor_courses = Course.objects.filter(instructor=user).select_related('tenant')
-            
-            total_courses = instructor_courses.count()
-            published_courses = instructor_courses.filter(status=Course.Status.PUBLISHED).count()
-            draft_courses = instructor_courses.filter(status=Course.Status.DRAFT).count()
-            
-            # Total enrollments across all instructor's courses
-            total_enrollments = Enrollment.objects.filter(course__instructor=user).count()
-            active_enrollments = Enrollment.objects.filter(course__instructor=user, status=Enrollment.Status.ACTIVE).count()
-            
-            # Active students count (distinct users enrolled in instructor's courses)
-            active_students = User.objects.filter(
-                enrollments__course__instructor=user,
-                enrollments__status=Enrollment.Status.ACTIVE
-            ).distinct().count()
-
-            # Pending grading count
-            pending_grading = 0
-            try:
-                pending_grading = AssessmentAttempt.objects.filter(
-                    assessment__course__instructor=user,
-                    status=AssessmentAttempt.AttemptStatus.SUBMITTED
-                ).count()
-            except Exception:
-                pass  # If AssessmentAttempt model has issues
-
-            # Average completion rate across all courses
-            avg_completion_rate = 0
-            try:
-                course_completion_rates = []
-                for course in instructor_courses:
-                    total_enrollments_course = Enrollment.objects.filter(course=course).count()
-                    completed_enrollments = Enrollment.objects.filter(
-                        course=course, 
-                        status=Enrollment.Status.COMPLETED
-                    ).count()
-                    if total_enrollments_course > 0:
-                        completion_rate = (completed_enrollments / total_enrollments_course) * 100
-                        course_completion_rates.append(completion_rate)
-                
-                avg_completion_rate = round(sum(course_completion_rates) / len(course_completion_rates), 1) if course_completion_rates else 0
-            except Exception:
-                pass
-
-            # Recent assessments and average scores
-            recent_assessments_data = []
-            try:
-                recent_assessments = Assessment.objects.filter(
-                    course__instructor=user
-                ).select_related('course').order_by('-created_at')[:5]
-                
-                recent_assessments_data = [{
-                    "title": assessment.title,
-                    "course": assessment.course.title,
-                    "dueDate": assessment.due_date.strftime("%Y-%m-%d") if assessment.due_date else None,
-                    "createdAt": assessment.created_at.isoformat()
-                } for assessment in recent_assessments]
-            except Exception:
-                pass
-            
-            # Recent student activity across instructor's courses
-            recent_activity = []
-            try:
-                recent_activity_qs = LearnerProgress.objects.filter(
-                    enrollment__course__instructor=user
-                ).select_related('content_item', 'enrollment__course', 'enrollment__user').order_by('-updated_at')[:10]
-                
-                recent_activity = [{
-                    "description": f"{item.enrollment.user.get_full_name() or item.enrollment.user.email} completed '{item.content_item.title}' in '{item.enrollment.course.title}'",
-                    "timestamp": item.updated_at.isoformat()
-                } for item in recent_activity_qs]
-            except Exception:
-                pass
-            
-            # Upcoming assessment deadlines
-            upcoming_deadlines = []
-            try:
-                # Use start of today (timezone-aware) for DateTimeField comparison
-                today_start = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
-                upcoming_deadlines_qs = Assessment.objects.filter(
-                    course__instructor=user,
-                    due_date__gte=today_start
-                ).select_related('course').order_by('due_date')[:5]
-                
-                upcoming_deadlines = [{
-                    "title": assessment.title,
-                    "course": assessment.course.title,
-                    "dueDate": assessment.due_date.strftime("%Y-%m-%d")
-                } for assessment in upcoming_deadlines_qs]
-            except Exception:
-                pass
-
-            # Top courses by enrollment and completion rate
-            top_courses = []
-            try:
-                for course in instructor_courses:
-                    enrollments = Enrollment.objects.filter(course=course).count()
-                    completed = Enrollment.objects.filter(course=course, status=Enrollment.Status.COMPLETED).count()
-                    completion_rate = (completed / enrollments * 100) if enrollments > 0 else 0
-                    
-                    top_courses.append({
-                        "title": course.title,
-                        "enrollments": enrollments,
-                        "completionRate": round(completion_rate, 1)
-                    })
-                
-                # Sort by completion rate and limit to top 5
-                top_courses.sort(key=lambda x: x['completionRate'], reverse=True)
-                top_courses = top_courses[:5]
-            except Exception:
-                pass
-
-            # Top students by activity (based on completed content items in the last week)
-            top_students = []
-            try:
-                one_week_ago = timezone.now() - timedelta(days=7)
-                
-                # Get students with most completed content items in instructor's courses
-                top_students_qs = LearnerProgress.objects.filter(
-                    enrollment__course__instructor=user,
-                    status=LearnerProgress.Status.COMPLETED,
-                    completed_at__gte=one_week_ago
-                ).values(
-                    'enrollment__user__id',
-                    'enrollment__user__first_name',
-                    'enrollment__user__last_name',
-                    'enrollment__user__email',
-                    'enrollment__course__title'
-                ).annotate(
-                    completed_count=Count('id')
-                ).order_by('-completed_count')[:5]
-                
-                for student in top_students_qs:
-                    # Calculate approximate hours spent (estimate: 0.5 hours per completed item)
-                    hours_spent = round(student['completed_count'] * 0.5, 1)
-                    name = f"{student['enrollment__user__first_name'] or ''} {student['enrollment__user__last_name'] or ''}".strip()
-                    if not name:
-                        name = student['enrollment__user__email'].split('@')[0]
-                    
-                    top_students.append({
-                        "name": name,
-                        "course": student['enrollment__course__title'],
-                        "hoursSpent": hours_spent
-                    })
-            except Exception:
-                pass  # If LearnerProgress model has issues, return empty list
-
-            # ============================================================
-            # PROACTIVE DASHBOARD METRICS - Course Health & Alerts
-            # ============================================================
-            
-            # Courses needing attention (low enrollment, high attrition, stagnant)
-            courses_needing_attention = []
-            try:
-                two_weeks_ago = timezone.now() - timedelta(days=14)
-                thirty_days_ago = timezone.now() - timedelta(days=30)
-                
-                for course in instructor_courses.filter(status=Course.Status.PUBLISHED):
-                    issues = []
-                    severity = "low"  # low, medium, high
-                    
-                    # Get enrollment stats
-                    total_course_enrollments = Enrollment.objects.filter(course=course).count()
-                    active_course_enrollments = Enrollment.objects.filter(
-                        course=course, 
-                        status=Enrollment.Status.ACTIVE
-                    ).count()
-                    cancelled_enrollments = Enrollment.objects.filter(
-                        course=course, 
-                        status=Enrollment.Status.CANCELLED
-                    ).count()
-                    
-                    # Issue 1: Low enrollment (published course with < 3 enrollments)
-                    if total_course_enrollments < 3:
-                        issues.append({
-                            "type": "low_enrollment",
-                            "message": f"Only {total_course_enrollments} enrollment(s)",
-                            "suggestion": "Consider promoting this course or reviewing its description"
-                        })
-                        severity = "medium"
-                    
-                    # Issue 2: High attrition rate (> 30% cancelled/dropped)
-                    if total_course_enrollments > 0:
-                        attrition_rate = (cancelled_enrollments / total_course_enrollments) * 100
-                        if attrition_rate > 30:
-                            issues.append({
-                                "type": "high_attrition",
-                                "message": f"{round(attrition_rate)}% dropout rate",
-                                "suggestion": "Review course content and gather student feedback"
-                            })
-                            severity = "high"
-                    
-                    # Issue 3: Stagnant engagement (no progress in 2 weeks)
-                    recent_progress = LearnerProgress.objects.filter(
-                        enrollment__course=course,
-                        updated_at__gte=two_weeks_ago
-                    ).exists()
-                    
-                    if active_course_enrollments > 0 and not recent_progress:
-                        issues.append({
-                            "type": "stagnant_engagement",
-                            "message": "No student activity in 2 weeks",
-                            "suggestion": "Send a reminder or add new engaging content"
-                        })
-                        if severity == "low":
-                            severity = "medium"
-                    
-                    # Issue 4: Low completion rate (< 20% for courses with > 5 enrollments)
-                    completed_enrollments = Enrollment.objects.filter(
-                        course=course, 
-                        status=Enrollment.Status.COMPLETED
-                    ).count()
-                    if total_course_enrollments >= 5:
-                        completion_rate = (completed_enrollments / total_course_enrollments) * 100
-                        if completion_rate < 20:
-                            issues.append({
-                                "type": "low_completion",
-                                "message": f"Only {round(completion_rate)}% completion rate",
-                                "suggestion": "Review course difficulty and structure"
-                            })
-                            if severity == "low":
-                                severity = "medium"
-                    
-                    if issues:
-                        courses_needing_attention.append({
-                            "courseId": str(course.id),
-                            "courseTitle": course.title,
-                            "courseSlug": course.slug,
-                            "enrollments": total_course_enrollments,
-                            "activeEnrollments": active_course_enrollments,
-                            "issues": issues,
-                            "severity": severity
-                        })
-                
-                # Sort by severity (high first, then medium, then low)
-                severity_order = {"high": 0, "medium": 1, "low": 2}
-                courses_needing_attention.sort(key=lambda x: severity_order.get(x['severity'], 3))
-                courses_needing_attention = courses_needing_attention[:5]  # Limit to top 5
-            except Exception as e:
-                logger.warning(f"Error calculating courses needing attention: {e}")
-            
-            # At-risk students (no progress in 7+ days, low completion progress)
-            at_risk_students = []
-            try:
-                seven_days_ago = timezone.now() - timedelta(days=7)
-                
-                # Get active enrollments with their last activity
-                active_enrollments_qs = Enrollment.objects.filter(
-                    course__instructor=user,
-                    status=Enrollment.Status.ACTIVE
-                ).select_related('user', 'course')
-                
-                for enrollment in active_enrollments_qs:
-                    risk_factors = []
-                    risk_level = "low"  # low, medium, high
-                    
-                    # Get last activity date
-                    last_activity = LearnerProgress.objects.filter(
-                        enrollment=enrollment
-                    ).order_by('-updated_at').first()
-                    
-                    last_activity_date = last_activity.updated_at if last_activity else enrollment.enrolled_at
-                    days_inactive = (timezone.now() - last_activity_date).days
-                    
-                    # Risk factor 1: No activity in 7+ days
-                    if days_inactive >= 14:
-                        risk_factors.append({
-                            "type": "long_inactive",
-                            "message": f"No activity for {days_inactive} days"
-                        })
-                        risk_level = "high"
-                    elif days_inactive >= 7:
-                        risk_factors.append({
-                            "type": "inactive",
-                            "message": f"No activity for {days_inactive} days"
-                        })
-                        risk_level = "medium"
-                    
-                    # Risk factor 2: Very low progress (< 20%) after 14+ days enrolled
-                    days_enrolled = (timezone.now() - enrollment.enrolled_at).days
-                    if days_enrolled >= 14 and enrollment.progress < 20:
-                        risk_factors.append({
-                            "type": "low_progress",
-                            "message": f"Only {enrollment.progress}% complete after {days_enrolled} days"
-                        })
-                        if risk_level == "low":
-                            risk_level = "medium"
-                    
-                    if risk_factors:
-                        student_name = enrollment.user.get_full_name() or enrollment.user.email.split('@')[0]
-                        at_risk_students.append({
-                            "studentId": str(enrollment.user.id),
-                            "studentName": student_name,
-                            "studentEmail": enrollment.user.email,
-                            "courseId": str(enrollment.course.id),
-                            "courseTitle": enrollment.course.title,
-                            "courseSlug": enrollment.course.slug,
-                            "progress": enrollment.progress,
-                            "lastActivity": last_activity_date.isoformat(),
-                            "daysInactive": days_inactive,
-                            "riskFactors": risk_factors,
-                            "riskLevel": risk_level
-                        })
-                
-                # Sort by risk level and days inactive
-                risk_order = {"high": 0, "medium": 1, "low": 2}
-                at_risk_students.sort(key=lambda x: (risk_order.get(x['riskLevel'], 3), -x['daysInactive']))
-                at_risk_students = at_risk_students[:10]  # Limit to top 10
-            except Exception as e:
-                logger.warning(f"Error calculating at-risk students: {e}")
-            
-            # Urgent alerts (immediate action needed)
-            urgent_alerts = []
-            try:
-                # Alert 1: Overdue grading (submissions older than 3 days)
-                three_days_ago = timezone.now() - timedelta(days=3)
-                overdue_grading = AssessmentAttempt.objects.filter(
-                    assessment__course__instructor=user,
-                    status=AssessmentAttempt.AttemptStatus.SUBMITTED,
-                    end_time__lt=three_days_ago
-                ).select_related('assessment__course', 'user')
-                
-                overdue_count = overdue_grading.count()
-                if overdue_count > 0:
-                    oldest_submission = overdue_grading.order_by('end_time').first()
-                    days_overdue = (timezone.now() - oldest_submission.end_time).days
-                    urgent_alerts.append({
-                        "type": "overdue_grading",
-                        "severity": "high",
-                        "title": f"{overdue_count} submission(s) awaiting grading",
-                        "message": f"Oldest submission is {days_overdue} days old",
-                        "actionUrl": "/instructor/grading",
-                        "actionLabel": "Go to Grading"
-                    })
-                
-                # Alert 2: Assessments with upcoming deadlines (within 48 hours)
-                forty_eight_hours = timezone.now() + timedelta(hours=48)
-                today_start = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
-                upcoming_assessments = Assessment.objects.filter(
-                    course__instructor=user,
-                    due_date__lte=forty_eight_hours,
-                    due_date__gte=today_start
-                ).select_related('course')
-                
-                for assessment in upcoming_assessments[:3]:  # Limit to 3
-                    urgent_alerts.append({
-                        "type": "upcoming_deadline",
-                        "severity": "medium",
-                        "title": f"'{assessment.title}' deadline approaching",
-                        "message": f"Due on {assessment.due_date.strftime('%b %d, %Y')} for {assessment.course.title}",
-                        "actionUrl": f"/instructor/courses/{assessment.course.slug}/assessments",
-                        "actionLabel": "View Assessment"
-                    })
-                
-                # Alert 3: Courses with no recent content updates (published > 30 days, no updates)
-                thirty_days_ago = timezone.now() - timedelta(days=30)
-                stale_courses = instructor_courses.filter(
-                    status=Course.Status.PUBLISHED,
-                    updated_at__lt=thirty_days_ago
-                )
-                
-                if stale_courses.count() > 0:
-                    course_list = ", ".join([c.title for c in stale_courses[:2]])
-                    urgent_alerts.append({
-                        "type": "stale_content",
-                        "severity": "low",
-                        "title": f"{stale_courses.count()} course(s) haven't been updated recently",
-                        "message": f"Consider refreshing: {course_list}",
-                        "actionUrl": "/instructor/courses",
-                        "actionLabel": "View Courses"
-                    })
-                
-            except Exception as e:
-                logger.warning(f"Error calculating urgent alerts: {e}")
-
-            # Revenue data from RevenueAnalytics
-            revenue_data = {
-                "thisMonth": 0,
-                "total": 0,
-                "avgPerCourse": 0,
-                "growth": 0
-            }
-            try:
-                # Get current month boundaries
-                now = timezone.now()
-                month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-                
-                # Get revenue analytics for this instructor
-                instructor_revenue = RevenueAnalytics.objects.filter(
-                    instructor=user
-                ).order_by('-period_end')
-                
-                # Calculate total revenue across all records
-                total_revenue = instructor_revenue.aggregate(
-                    total=Sum('total_revenue')
-                )['total'] or 0
-                
-                # Get this month's revenue (records where period covers this month)
-                this_month_revenue = instructor_revenue.filter(
-                    period_start__lte=now.date(),
-                    period_end__gte=month_start.date()
-                ).aggregate(
-                    monthly=Sum('monthly_revenue')
-                )['monthly'] or 0
-                
-                # Calculate average per course
-                course_count = instructor_courses.count()
-                avg_per_course = float(total_revenue) / course_count if course_count > 0 else 0
-                
-                # Get growth rate from most recent record
-                latest_revenue = instructor_revenue.first()
-                growth_rate = float(latest_revenue.growth_rate) if latest_revenue else 0
-                
-                revenue_data = {
-                    "thisMonth": float(this_month_revenue),
-                    "total": float(total_revenue),
-                    "avgPerCourse": round(avg_per_course, 2),
-                    "growth": round(growth_rate, 1)
-                }
-            except Exception as e:
-                logger.warning(f"Error calculating revenue data: {e}")
-
-            # Content progress data (simplified)
-            content_progress = {
-                "drafts": draft_courses,
-                "publishedThisMonth": 0,
-                "modulesCreated": 0,
-                "contentItems": 0
-            }
-
-            stats = {
-                "totalCourses": total_courses,
-                "publishedCourses": published_courses,
-                "draftCourses": draft_courses,
-                "totalEnrollments": total_enrollments,
-                "activeEnrollments": active_enrollments,
-                "activeStudents": active_students,
-                "pendingGrading": pending_grading,
-                "avgCompletionRate": avg_completion_rate,
-                "recentAssessments": recent_assessments_data,
-                "recentActivity": recent_activity,
-                "upcomingDeadlines": upcoming_deadlines,
-                "topCourses": top_courses,
-                "topStudents": top_students,
-                "revenue": revenue_data,
-                "contentProgress": content_progress,
-                # Proactive dashboard metrics
-                "coursesNeedingAttention": courses_needing_attention,
-                "atRiskStudents": at_risk_students,
-                "urgentAlerts": urgent_alerts
-            }
-            return Response(stats)
-        except Exception as e:
-            logger.error(f"Error generating instructor dashboard stats for user {user.id}: {e}", exc_info=True)
-            return Response({"detail": "Could not retrieve dashboard statistics."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    composer = INSTRUCTOR_STATS_DASHBOARD
+    error_label = "instructor dashboard"
 
 
 @extend_schema(tags=['Admin - Tenants'])
@@ -214,13 +214,18 @@ class PlatformSettingsViewSet(viewsets.ViewSet):
         tenant = getattr(request.user, 'tenant', None)
         return PlatformSettings.get_settings(tenant)
 
+    def _read_settings(self, request):
+        """Cached settings for the read-only endpoints; updates go through _get_settings()."""
+        tenant = getattr(request.user, 'tenant', None)
+        return PlatformSettings.get_cached_settings(tenant)
+
     @extend_schema(
         summary="Get all platform settings",
         responses={200: PlatformSettingsSerializer}
     )
     def list(self, request):
         """Retrieve all platform settings."""
-        settings = self._get_settings(request)
+        settings = self._read_settings(request)
         serializer = PlatformSettingsSerializer(settings)
         return Response(serializer.data)
 
@@ -245,7 +250,7 @@ class PlatformSettingsViewSet(viewsets.ViewSet):
     @action(detail=False, methods=['get'], url_path='general')
     def general(self, request):
         """Retrieve general platform settings."""
-        settings = self._get_settings(request)
+        settings = self._read_settings(request)
         serializer = GeneralSettingsSerializer(settings)
         return Response(serializer.data)
 
@@ -271,7 +276,7 @@ class PlatformSettingsViewSet(viewsets.ViewSet):
     @action(detail=False, methods=['get'], url_path='storage')
     def storage(self, request):
         """Retrieve storage settings."""
-        settings = self._get_settings(request)
+        settings = self._read_settings(request)
         serializer = StorageSettingsSerializer(settings)
         return Response(serializer.data)
 
@@ -300,7 +305,7 @@ class PlatformSettingsViewSet(viewsets.ViewSet):
     @action(detail=False, methods=['post'], url_path='storage/test')
     def test_storage(self, request):
         """Test storage connection with current settings."""
-        settings = self._get_settings(request)
+        settings = self._read_settings(request)
         
         try:
             if settings.storage_backend == PlatformSettings.StorageBackend.LOCAL:
@@ -429,7 +434,7 @@ class PlatformSettingsViewSet(viewsets.ViewSet):
     @action(detail=False, methods=['get'], url_path='email')
     def email(self, request):
         """Retrieve email/SMTP settings."""
-        settings = self._get_settings(request)
+        settings = self._read_settings(request)
         serializer = EmailSettingsSerializer(settings)
         return Response(serializer.data)
 
@@ -5,3 +5,7 @@ class CoursesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.courses"
     verbose_name = "Course Management"
+
+    def ready(self):
+        """Import signal handlers when the app is ready."""
+        import apps.courses.signals  # noqa: F401
@@ -0,0 +1,278 @@
+"""
+Prerequisite graphs.
+
+A PrerequisiteGraph holds every course (or module) prerequisite edge of one
+tenant, loaded in a single query, with the transitive closure and a
+topological order precomputed. Ancestor/descendant, chain and cycle questions
+are then answered in memory.
+
+Graphs are cached in-process per (kind, tenant). Each cached graph carries a
+version token kept in the Django cache; edge saves/deletes replace the token
+(see signals.py), so stale graphs are rebuilt on next use in every process
+sharing that cache. When no graph is cached yet, single-node ancestor lookups
+use a recursive CTE instead of building the whole graph.
+"""
+
+import logging
+import threading
+import uuid
+from collections import OrderedDict, deque
+from typing import Iterable, Optional
+
+from django.core.cache import cache
+from django.db import connection
+
+from apps.core.models import Tenant
+
+from .models import CoursePrerequisite, ModulePrerequisite
+
+logger = logging.getLogger(__name__)
+
+COURSE = "course"
+MODULE = "module"
+
+# Maximum number of tenant graphs kept per process
+GRAPH_CACHE_SIZE = 64
+VERSION_CACHE_TIMEOUT = None  # Tokens never expire; a missing token just forces a rebuild
+
+# kind -> (edge model, node column, prerequisite column, tenant lookup)
+_EDGE_SOURCES = {
+    COURSE: (CoursePrerequisite, "course_id", "prerequisite_course_id", "course__tenant_id"),
+    MODULE: (ModulePrerequisite, "module_id", "prerequisite_module_id", "module__course__tenant_id"),
+}
+
+
+class PrerequisiteGraph:
+    """Immutable in-memory prerequisite graph for one tenant."""
+
+    def __init__(self, edges: Iterable[tuple], version: str = ""):
+        """
+        Args:
+            edges: (node_id, prerequisite_id, prerequisite_type) tuples
+            version: Cache version token the graph was built for
+        """
+        self.version = version
+        self.prerequisites = {}  # node -> [(prerequisite, type), ...]
+        self.nodes = set()
+        for node, prerequisite, prerequisite_type in edges:
+            self.prerequisites.setdefault(node, []).append((prerequisite, prerequisite_type))
+            self.nodes.update((node, prerequisite))
+
+        self.topological_order, self.cyclic_nodes = self._topological_sort()
+        self._position = {node: index for index, node in enumerate(self.topological_order)}
+        # prerequisite_type (None = any) -> {node: frozenset(ancestors)}
+        self._closures = {}
+        for prerequisite_type in (None, CoursePrerequisite.PrerequisiteType.REQUIRED):
+            self._closure(prerequisite_type)
+
+    # --- Queries ---
+
+    def ancestors(self, node, prerequisite_type: Optional[str] = None) -> frozenset:
+        """All direct and indirect prerequisites of node."""
+        return self._closure(prerequisite_type).get(node, frozenset())
+
+    def direct_prerequisites(self, node, prerequisite_type: Optional[str] = None) -> list:
+        return [
+            prerequisite for prerequisite, edge_type in self.prerequisites.get(node, ())
+            if prerequisite_type is None or edge_type == prerequisite_type
+        ]
+
+    def descendants(self, node, prerequisite_type: Optional[str] = None) -> frozenset:
+        """All nodes that directly or indirectly require node."""
+        return frozenset(
+            other for other, ancestors in self._closure(prerequisite_type).items()
+            if node in ancestors
+        )
+
+    def chain(self, node, prerequisite_type: Optional[str] = CoursePrerequisite.PrerequisiteType.REQUIRED) -> list:
+        """Ancestors of node in the order they should be taken."""
+        return sorted(
+            self.ancestors(node, prerequisite_type),
+            key=lambda other: self._position.get(other, len(self._position)),
+        )
+
+    def would_create_cycle(self, node, prerequisite) -> bool:
+        """True if adding the edge node -> prerequisite would close a cycle."""
+        return node == prerequisite or node in self.ancestors(prerequisite)
+
+    # --- Construction ---
+
+    def _topological_sort(self) -> tuple:
+        """Kahn's algorithm, prerequisites first. Nodes on cycles are returned separately."""
+        in_degree = {node: 0 for node in self.nodes}
+        dependents = {}
+        for node, edges in self.prerequisites.items():
+            for prerequisite, _ in edges:
+                dependents.setdefault(prerequisite, []).append(node)
+                in_degree[node] += 1
+
+        queue = deque(sorted((n for n, d in in_degree.items() if d == 0), key=str))
+        order = []
+        while queue:
+            current = queue.popleft()
+            order.append(current)
+            for dependent in dependents.get(current, ()):
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    queue.append(dependent)
+
+        cyclic = frozenset(self.nodes) - frozenset(order)
+        if cyclic:
+            logger.warning(f"Prerequisite graph contains {len(cyclic)} nodes on cycles")
+        return tuple(order), cyclic
+
+    def _closure(self, prerequisite_type: Optional[str]) -> dict:
+        closure = self._closures.get(prerequisite_type)
+        if closure is not None:
+            return closure
+
+        closure = {}
+        # Prerequisites come first, so each node's ancestors are already known
+        for node in self.topological_order:
+            ancestors = set()
+            for prerequisite in self.direct_prerequisites(node, prerequisite_type):
+                ancestors.add(prerequisite)
+                ancestors |= closure.get(prerequisite, frozenset())
+            closure[node] = frozenset(ancestors)
+        # Nodes on (legacy) cycles fall back to a plain traversal
+        for node in self.cyclic_nodes:
+            closure[node] = self._reachable(node, prerequisite_type)
+
+        self._closures[prerequisite_type] = closure
+        return closure
+
+    def _reachable(self, node, prerequisite_type) -> frozenset:
+        seen = set()
+        stack = list(self.direct_prerequisites(node, prerequisite_type))
+        while stack:
+            current = stack.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            stack.extend(self.direct_prerequisites(current, prerequisite_type))
+        return frozenset(seen)
+
+
+# --- Cache ---
+
+_graph_cache: "OrderedDict[tuple, PrerequisiteGraph]" = OrderedDict()
+_graph_cache_lock = threading.Lock()
+
+
+def _version_key(kind: str, tenant_id) -> str:
+    return f"courses:prerequisite_graph:{kind}:{tenant_id}"
+
+
+def _current_version(kind: str, tenant_id) -> str:
+    key = _version_key(kind, tenant_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, timeout=VERSION_CACHE_TIMEOUT)
+        version = cache.get(key)
+    return version
+
+
+def load_graph(kind: str, tenant_id, version: str = "") -> PrerequisiteGraph:
+    """Builds a tenant's graph from its edges (one query)."""
+    model, node_column, prerequisite_column, tenant_lookup = _EDGE_SOURCES[kind]
+    edges = model.objects.filter(**{tenant_lookup: tenant_id}).values_list(
+        node_column, prerequisite_column, "prerequisite_type"
+    )
+    return PrerequisiteGraph(edges, version=version)
+
+
+def get_prerequisite_graph(kind: str, tenant_id) -> PrerequisiteGraph:
+    """Returns the cached graph for a tenant, rebuilding it if edges changed."""
+    graph = get_cached_graph(kind, tenant_id)
+    if graph is not None:
+        return graph
+
+    version = _current_version(kind, tenant_id)
+    graph = load_graph(kind, tenant_id, version)
+    with _graph_cache_lock:
+        _graph_cache[(kind, tenant_id)] = graph
+        _graph_cache.move_to_end((kind, tenant_id))
+        while len(_graph_cache) > GRAPH_CACHE_SIZE:
+            _graph_cache.popitem(last=False)
+    return graph
+
+
+def get_cached_graph(kind: str, tenant_id) -> Optional[PrerequisiteGraph]:
+    """Returns the cached graph if it is current, without building one."""
+    with _graph_cache_lock:
+        graph = _graph_cache.get((kind, tenant_id))
+    if graph is None or graph.version != _current_version(kind, tenant_id):
+        return None
+    with _graph_cache_lock:
+        if (kind, tenant_id) in _graph_cache:
+            _graph_cache.move_to_end((kind, tenant_id))
+    return graph
+
+
+def invalidate_prerequisite_graph(kind: str, tenant_id=None) -> None:
+    """
+    Marks a tenant's graph stale in every process.
+
+    Without a tenant (the edge's owner could not be resolved) every tenant's
+    graph of that kind is marked stale, so no process keeps serving a graph
+    that may still contain the edge.
+    """
+    if tenant_id is None:
+        tenant_ids = [None, *Tenant.objects.values_list("id", flat=True)]
+        cache.set_many(
+            {_version_key(kind, tenant): uuid.uuid4().hex for tenant in tenant_ids},
+            timeout=VERSION_CACHE_TIMEOUT,
+        )
+        with _graph_cache_lock:
+            for key in [k for k in _graph_cache if k[0] == kind]:
+                del _graph_cache[key]
+        return
+    cache.set(_version_key(kind, tenant_id), uuid.uuid4().hex, timeout=VERSION_CACHE_TIMEOUT)
+    with _graph_cache_lock:
+        _graph_cache.pop((kind, tenant_id), None)
+
+
+def get_ancestor_ids(kind: str, tenant_id, node_id, prerequisite_type: Optional[str] = None) -> set:
+    """
+    All direct and indirect prerequisite ids of one node.
+
+    Served from the cached graph when warm; otherwise answered with a single
+    recursive CTE so cold lookups don't pay for loading the whole tenant graph.
+    """
+    graph = get_cached_graph(kind, tenant_id)
+    if graph is not None:
+        return set(graph.ancestors(node_id, prerequisite_type))
+    return _ancestor_ids_cte(kind, node_id, prerequisite_type)
+
+
+def _ancestor_ids_cte(kind: str, node_id, prerequisite_type: Optional[str] = None) -> set:
+    model, node_column, prerequisite_column, _ = _EDGE_SOURCES[kind]
+    table = connection.ops.quote_name(model._meta.db_table)
+    node_col = connection.ops.quote_name(node_column)
+    prereq_col = connection.ops.quote_name(prerequisite_column)
+    type_col = connection.ops.quote_name("prerequisite_type")
+
+    type_filter = f" AND {type_col} = %s" if prerequisite_type else ""
+    recursive_type_filter = f" AND e.{type_col} = %s" if prerequisite_type else ""
+    # UNION (not UNION ALL) de-duplicates rows, so the recursion terminates on cycles
+    sql = (
+        f"WITH RECURSIVE ancestors(id) AS ("
+        f" SELECT {prereq_col} FROM {table} WHERE {node_col} = %s{type_filter}"
+        f" UNION"
+        f" SELECT e.{prereq_col} FROM {table} e"
+        f" INNER JOIN ancestors a ON e.{node_col} = a.id{recursive_type_filter}"
+        f") SELECT id FROM ancestors"
+    )
+    node_value = model._meta.get_field(node_column[:-3]).target_field.get_db_prep_value(
+        node_id, connection
+    )
+    params = [node_value]
+    if prerequisite_type:
+        params = [node_value, prerequisite_type, prerequisite_type]
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return {
+            value if isinstance(value, uuid.UUID) else uuid.UUID(str(value))
+            for (value,) in cursor.fetchall()
+        }
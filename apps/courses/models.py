@@ -106,34 +106,16 @@ class Course(TimestampedModel):
         Returns:
             QuerySet of Course objects that are prerequisites
         """
-        from apps.courses.models import CoursePrerequisite
-        
-        prereq_qs = CoursePrerequisite.objects.filter(course=self)
-        if prerequisite_type:
-            prereq_qs = prereq_qs.filter(prerequisite_type=prerequisite_type)
-        
-        direct_prereqs = prereq_qs.values_list('prerequisite_course_id', flat=True)
+        from apps.courses.graph import COURSE, get_ancestor_ids
         
         if not include_indirect:
-            return Course.objects.filter(id__in=direct_prereqs)
-        
-        # Recursively gather all prerequisites
-        all_prereq_ids = set(direct_prereqs)
-        to_process = list(direct_prereqs)
-        
-        while to_process:
-            current_id = to_process.pop(0)
-            indirect_prereqs = CoursePrerequisite.objects.filter(
-                course_id=current_id
-            )
+            prereq_qs = CoursePrerequisite.objects.filter(course=self)
             if prerequisite_type:
-                indirect_prereqs = indirect_prereqs.filter(prerequisite_type=prerequisite_type)
-            
-            for prereq_id in indirect_prereqs.values_list('prerequisite_course_id', flat=True):
-                if prereq_id not in all_prereq_ids:
-                    all_prereq_ids.add(prereq_id)
-                    to_process.append(prereq_id)
+                prereq_qs = prereq_qs.filter(prerequisite_type=prerequisite_type)
+            return Course.objects.filter(id__in=prereq_qs.values('prerequisite_course_id'))
         
+        # Transitive prerequisites come from the tenant's prerequisite graph
+        all_prereq_ids = get_ancestor_ids(COURSE, self.tenant_id, self.id, prerequisite_type)
         return Course.objects.filter(id__in=all_prereq_ids)
 
     def are_prerequisites_met(self, user, check_type: str = 'REQUIRED') -> tuple[bool, list]:
@@ -146,45 +128,12 @@ class Course(TimestampedModel):
             
         Returns:
             Tuple of (bool: all met, list: unmet prerequisite info)
-        """
-        from apps.courses.models import CoursePrerequisite
-        from apps.enrollments.models import Enrollment
-        
-        prerequisites = CoursePrerequisite.objects.filter(
-            course=self,
-            prerequisite_type=check_type
-        ).select_related('prerequisite_course')
-        
-        unmet = []
         
-        for prereq in prerequisites:
-            prereq_course = prereq.prerequisite_course
-            
-            # Get enrollment for the prerequisite course
-            try:
-                enrollment = Enrollment.objects.get(
-                    user=user,
-                    course=prereq_course,
-                    status__in=[Enrollment.Status.ACTIVE, Enrollment.Status.COMPLETED]
-                )
-            except Enrollment.DoesNotExist:
-                unmet.append({
-                    'course': prereq_course,
-                    'reason': 'not_enrolled',
-                    'required_completion': prereq.minimum_completion_percentage
-                })
-                continue
-            
-            # Check completion percentage
-            if enrollment.progress < prereq.minimum_completion_percentage:
-                unmet.append({
-                    'course': prereq_course,
-                    'reason': 'not_completed',
-                    'current_progress': enrollment.progress,
-                    'required_completion': prereq.minimum_completion_percentage
-                })
+        Use PrerequisiteService.evaluate_courses to check many courses at once.
+        """
+        from apps.courses.services import PrerequisiteService
         
-        return (len(unmet) == 0, unmet)
+        return PrerequisiteService.evaluate_courses(user, [self], check_type)[self.id]
 
     def get_prerequisite_chain(self) -> list:
         """
@@ -193,44 +142,13 @@ class Course(TimestampedModel):
         Returns a list of courses in the order they should be taken,
         considering all required prerequisites.
         """
-        from apps.courses.models import CoursePrerequisite
-        
-        # Build dependency graph
-        all_prereqs = self.get_all_prerequisites(prerequisite_type='REQUIRED', include_indirect=True)
-        
-        # Topological sort using Kahn's algorithm
-        in_degree = {course.id: 0 for course in all_prereqs}
-        in_degree[self.id] = 0
-        
-        graph = {course.id: [] for course in all_prereqs}
-        graph[self.id] = []
-        
-        for course in list(all_prereqs) + [self]:
-            prereqs = CoursePrerequisite.objects.filter(
-                course=course,
-                prerequisite_type='REQUIRED'
-            ).values_list('prerequisite_course_id', flat=True)
-            
-            for prereq_id in prereqs:
-                if prereq_id in graph:
-                    graph[prereq_id].append(course.id)
-                    in_degree[course.id] = in_degree.get(course.id, 0) + 1
+        from apps.courses.graph import COURSE, get_prerequisite_graph
         
-        # Process nodes with in_degree 0
-        queue = [cid for cid, degree in in_degree.items() if degree == 0]
-        result = []
-        
-        while queue:
-            current_id = queue.pop(0)
-            if current_id != self.id:  # Don't include self in chain
-                result.append(current_id)
-            
-            for dependent_id in graph.get(current_id, []):
-                in_degree[dependent_id] -= 1
-                if in_degree[dependent_id] == 0:
-                    queue.append(dependent_id)
-        
-        return list(Course.objects.filter(id__in=result).order_by('title'))
+        chain_ids = get_prerequisite_graph(COURSE, self.tenant_id).chain(
+            self.id, CoursePrerequisite.PrerequisiteType.REQUIRED
+        )
+        courses = Course.objects.in_bulk(chain_ids)
+        return [courses[course_id] for course_id in chain_ids if course_id in courses]
 
 
 class Module(TimestampedModel):
@@ -262,34 +180,16 @@ class Module(TimestampedModel):
         Returns:
             QuerySet of Module objects that are prerequisites
         """
-        from apps.courses.models import ModulePrerequisite
-        
-        prereq_qs = ModulePrerequisite.objects.filter(module=self)
-        if prerequisite_type:
-            prereq_qs = prereq_qs.filter(prerequisite_type=prerequisite_type)
-        
-        direct_prereqs = prereq_qs.values_list('prerequisite_module_id', flat=True)
+        from apps.courses.graph import MODULE, get_ancestor_ids
         
         if not include_indirect:
-            return Module.objects.filter(id__in=direct_prereqs)
-        
-        # Recursively gather all prerequisites
-        all_prereq_ids = set(direct_prereqs)
-        to_process = list(direct_prereqs)
-        
-        while to_process:
-            current_id = to_process.pop(0)
-            indirect_prereqs = ModulePrerequisite.objects.filter(
-                module_id=current_id
-            )
+            prereq_qs = ModulePrerequisite.objects.filter(module=self)
             if prerequisite_type:
-                indirect_prereqs = indirect_prereqs.filter(prerequisite_type=prerequisite_type)
-            
-            for prereq_id in indirect_prereqs.values_list('prerequisite_module_id', flat=True):
-                if prereq_id not in all_prereq_ids:
-                    all_prereq_ids.add(prereq_id)
-                    to_process.append(prereq_id)
+                prereq_qs = prereq_qs.filter(prerequisite_type=prerequisite_type)
+            return Module.objects.filter(id__in=prereq_qs.values('prerequisite_module_id'))
         
+        # Transitive prerequisites come from the tenant's prerequisite graph
+        all_prereq_ids = get_ancestor_ids(MODULE, self.course.tenant_id, self.id, prerequisite_type)
         return Module.objects.filter(id__in=all_prereq_ids)
 
     def are_prerequisites_met(self, user, check_type: str = 'REQUIRED') -> tuple[bool, list]:
@@ -302,92 +202,12 @@ class Module(TimestampedModel):
             
         Returns:
             Tuple of (bool: all met, list: unmet prerequisite info)
-        """
-        from apps.courses.models import ModulePrerequisite
-        from apps.enrollments.models import Enrollment, LearnerProgress
-        
-        prerequisites = ModulePrerequisite.objects.filter(
-            module=self,
-            prerequisite_type=check_type
-        ).select_related('prerequisite_module')
         
-        unmet = []
-        
-        for prereq in prerequisites:
-            prereq_module = prereq.prerequisite_module
-            
-            # Get enrollment for the prerequisite module's course
-            try:
-                enrollment = Enrollment.objects.get(
-                    user=user,
-                    course=prereq_module.course,
-                    status__in=[Enrollment.Status.ACTIVE, Enrollment.Status.COMPLETED]
-                )
-            except Enrollment.DoesNotExist:
-                unmet.append({
-                    'module': prereq_module,
-                    'reason': 'not_enrolled',
-                    'required_score': prereq.minimum_score
-                })
-                continue
-            
-            # Calculate module completion percentage
-            total_required_items = prereq_module.content_items.filter(
-                is_required=True, is_published=True
-            ).count()
-            
-            if total_required_items == 0:
-                # Module has no required content - consider it completable
-                continue
-            
-            completed_items = LearnerProgress.objects.filter(
-                enrollment=enrollment,
-                content_item__module=prereq_module,
-                content_item__is_required=True,
-                content_item__is_published=True,
-                status=LearnerProgress.Status.COMPLETED
-            ).count()
-            
-            completion_percentage = (completed_items / total_required_items) * 100
-            
-            # Check minimum score if specified
-            if prereq.minimum_score is not None:
-                # Get average score from assessments in this module
-                scores = LearnerProgress.objects.filter(
-                    enrollment=enrollment,
-                    content_item__module=prereq_module,
-                    content_item__content_type='QUIZ',
-                    status=LearnerProgress.Status.COMPLETED
-                ).values_list('progress_details', flat=True)
-                
-                avg_score = 0
-                score_count = 0
-                for details in scores:
-                    if isinstance(details, dict) and 'score' in details:
-                        avg_score += details['score']
-                        score_count += 1
-                
-                if score_count > 0:
-                    avg_score = avg_score / score_count
-                
-                if avg_score < prereq.minimum_score:
-                    unmet.append({
-                        'module': prereq_module,
-                        'reason': 'score_not_met',
-                        'current_score': avg_score,
-                        'required_score': prereq.minimum_score
-                    })
-                    continue
-            
-            # Check completion (100% required)
-            if completion_percentage < 100:
-                unmet.append({
-                    'module': prereq_module,
-                    'reason': 'not_completed',
-                    'completion_percentage': completion_percentage
-                })
+        Use PrerequisiteService.evaluate_modules to check many modules at once.
+        """
+        from apps.courses.services import PrerequisiteService
         
-        return (len(unmet) == 0, unmet)
+        return PrerequisiteService.evaluate_modules(user, [self], check_type)[self.id]
 
 
 class ContentItem(TimestampedModel):
@@ -541,6 +361,14 @@ class ModulePrerequisite(TimestampedModel):
                     "Prerequisite module must be from the same course or from a prerequisite course."
                 )
 
+        # Check for circular dependencies
+        from apps.courses.graph import MODULE, get_prerequisite_graph
+        graph = get_prerequisite_graph(MODULE, self.module.course.tenant_id)
+        if graph.would_create_cycle(self.module_id, self.prerequisite_module_id):
+            raise ValidationError(
+                "Adding this prerequisite would create a circular dependency."
+            )
+
     def save(self, *args, **kwargs):
         self.full_clean()
         super().save(*args, **kwargs)
@@ -612,28 +440,10 @@ class CoursePrerequisite(TimestampedModel):
 
     def _creates_circular_dependency(self):
         """Check if adding this prerequisite creates a circular dependency."""
-        visited = set()
-        
-        def has_cycle(course_id, target_id):
-            if course_id == target_id:
-                return True
-            if course_id in visited:
-                return False
-            visited.add(course_id)
-            
-            # Get all prerequisites of this course
-            prereqs = CoursePrerequisite.objects.filter(
-                course_id=course_id
-            ).values_list('prerequisite_course_id', flat=True)
-            
-            for prereq_id in prereqs:
-                if has_cycle(prereq_id, target_id):
-                    return True
-            return False
+        from apps.courses.graph import COURSE, get_prerequisite_graph
         
-        # Check if the prerequisite course (or any of its prerequisites) 
-        # eventually leads back to the current course
-        return has_cycle(self.prerequisite_course_id, self.course_id)
+        graph = get_prerequisite_graph(COURSE, self.course.tenant_id)
+        return graph.would_create_cycle(self.course_id, self.prerequisite_course_id)
 
     def save(self, *args, **kwargs):
         self.full_clean()
@@ -1,9 +1,12 @@
 from rest_framework import serializers
 
+from apps.common.serializers import SparseFieldsetMixin
 from apps.users.serializers import UserSerializer  # For instructor info
 from apps.files.models import File
 
+from .graph import COURSE, MODULE, get_prerequisite_graph
 from .models import ContentItem, ContentVersion, Course, CoursePrerequisite, Module, ModulePrerequisite
+from .services import PrerequisiteService
 
 
 # --- Nested File Serializer for ContentItem ---
@@ -111,6 +114,13 @@ class ModulePrerequisiteSerializer(serializers.ModelSerializer):
                     raise serializers.ValidationError({
                         "prerequisite_module": "Prerequisite module must be from the same course or from a prerequisite course."
                     })
+
+            # Check for circular dependencies
+            graph = get_prerequisite_graph(MODULE, module.course.tenant_id)
+            if graph.would_create_cycle(module.id, prereq_module.id):
+                raise serializers.ValidationError({
+                    "prerequisite_module": "Adding this prerequisite would create a circular dependency."
+                })
         
         # Validate minimum_score if provided
         minimum_score = attrs.get('minimum_score')
@@ -195,25 +205,8 @@ class CoursePrerequisiteSerializer(serializers.ModelSerializer):
 
     def _creates_circular_dependency(self, course, prereq_course):
         """Check if adding this prerequisite creates a circular dependency."""
-        visited = set()
-        
-        def has_cycle(current_course_id, target_id):
-            if current_course_id == target_id:
-                return True
-            if current_course_id in visited:
-                return False
-            visited.add(current_course_id)
-            
-            prereqs = CoursePrerequisite.objects.filter(
-                course_id=current_course_id
-            ).values_list('prerequisite_course_id', flat=True)
-            
-            for prereq_id in prereqs:
-                if has_cycle(prereq_id, target_id):
-                    return True
-            return False
-        
-        return has_cycle(prereq_course.id, course.id)
+        graph = get_prerequisite_graph(COURSE, course.tenant_id)
+        return graph.would_create_cycle(course.id, prereq_course.id)
 
 
 class ModulePrerequisiteListSerializer(serializers.ModelSerializer):
@@ -360,10 +353,34 @@ class ContentItemSerializer(serializers.ModelSerializer):
         return super().update(instance, validated_data)
 
 
+# --- Prerequisite Helpers ---
+
+
+def _batched_prerequisite_result(serializer, obj, user, evaluate, fallback_siblings=None):
+    """
+    Returns the REQUIRED prerequisite result for obj, evaluating all of its
+    siblings in the surrounding list in one batch and caching the results in
+    the serializer context.
+    """
+    cache = serializer.context.setdefault(f"_prerequisites_{evaluate.__name__}", {})
+    if obj.id not in cache:
+        siblings = None
+        if isinstance(serializer.parent, serializers.ListSerializer):
+            siblings = serializer.parent.instance
+            if siblings is None and fallback_siblings is not None:
+                # Nested list field (e.g. modules inside a course)
+                siblings = fallback_siblings()
+        siblings = list(siblings) if siblings is not None else []
+        if obj not in siblings:
+            siblings.append(obj)
+        cache.update(evaluate(user, siblings, check_type='REQUIRED'))
+    return cache[obj.id]
+
+
 # --- Module Serializers ---
 
 
-class ModuleSerializer(serializers.ModelSerializer):
+class ModuleSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     # Nested listing of content items (read-only in module list/detail)
     content_items = ContentItemSerializer(many=True, read_only=True)
     # Nested listing of prerequisites (read-only)
@@ -403,7 +420,10 @@ class ModuleSerializer(serializers.ModelSerializer):
         if not request or not request.user or not request.user.is_authenticated:
             return None
         
-        is_met, unmet = obj.are_prerequisites_met(request.user, check_type='REQUIRED')
+        is_met, unmet = _batched_prerequisite_result(
+            self, obj, request.user, PrerequisiteService.evaluate_modules,
+            fallback_siblings=lambda: obj.course.modules.all(),
+        )
         if is_met:
             return {"met": True, "unmet_count": 0, "unmet_modules": []}
         
@@ -424,7 +444,7 @@ class ModuleSerializer(serializers.ModelSerializer):
 # --- Course Serializers ---
 
 
-class CourseSerializer(serializers.ModelSerializer):
+class CourseSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     # Nested listing of modules (read-only in course list/detail)
     modules = ModuleSerializer(many=True, read_only=True)
     instructor = UserSerializer(read_only=True)  # Display instructor details
@@ -620,7 +640,9 @@ class CourseSerializer(serializers.ModelSerializer):
         if not request or not request.user or not request.user.is_authenticated:
             return None
         
-        is_met, unmet = obj.are_prerequisites_met(request.user, check_type='REQUIRED')
+        is_met, unmet = _batched_prerequisite_result(
+            self, obj, request.user, PrerequisiteService.evaluate_courses
+        )
         if is_met:
             return {"met": True, "unmet_count": 0, "unmet_courses": []}
         
@@ -639,3 +661,22 @@ class CourseSerializer(serializers.ModelSerializer):
                 for item in unmet
             ]
         }
+
+
+class CourseListSerializer(CourseSerializer):
+    """
+    Catalog representation used by course list views.
+
+    Leaves out the module tree entirely; prerequisite details are only
+    rendered when requested with ?expand=prerequisites_list,prerequisites_met.
+    """
+    modules = None
+
+    class Meta(CourseSerializer.Meta):
+        fields = tuple(
+            name for name in CourseSerializer.Meta.fields if name != "modules"
+        )
+        read_only_fields = tuple(
+            name for name in CourseSerializer.Meta.read_only_fields if name != "modules"
+        )
+        expandable_fields = ("prerequisites_list", "prerequisites_met")
@@ -0,0 +1,189 @@
+import logging
+from typing import Iterable, NamedTuple
+
+from django.db.models import Avg, Count, FloatField
+from django.db.models.fields.json import KT
+from django.db.models.functions import Cast
+
+from apps.enrollments.models import Enrollment, LearnerProgress
+
+from .models import ContentItem, Course, CoursePrerequisite, Module, ModulePrerequisite
+
+logger = logging.getLogger(__name__)
+
+
+class PrerequisiteResult(NamedTuple):
+    """Outcome of a prerequisite check; unpacks like (is_met, unmet)."""
+
+    met: bool
+    unmet: list
+
+
+class PrerequisiteService:
+    """
+    Batched prerequisite evaluation.
+
+    Resolves every prerequisite edge for a set of courses or modules with a
+    fixed number of grouped queries (edges, enrollments, item counts, quiz
+    scores), regardless of how many rows or edges are involved. Results are
+    keyed by course/module id and match `are_prerequisites_met` on the models.
+    """
+
+    ACTIVE_STATUSES = [Enrollment.Status.ACTIVE, Enrollment.Status.COMPLETED]
+
+    @classmethod
+    def evaluate_courses(
+        cls, user, courses: Iterable[Course], check_type: str = 'REQUIRED'
+    ) -> dict:
+        """Returns {course_id: PrerequisiteResult} for the given courses."""
+        course_ids = {course.id for course in courses}
+        results = {course_id: PrerequisiteResult(True, []) for course_id in course_ids}
+        if not course_ids:
+            return results
+
+        edges = list(
+            CoursePrerequisite.objects.filter(
+                course_id__in=course_ids, prerequisite_type=check_type
+            ).select_related('prerequisite_course')
+        )
+        if not edges:
+            return results
+
+        progress_by_course = dict(
+            Enrollment.objects.filter(
+                user=user,
+                course_id__in={edge.prerequisite_course_id for edge in edges},
+                status__in=cls.ACTIVE_STATUSES,
+            ).values_list('course_id', 'progress')
+        )
+
+        for edge in edges:
+            unmet = results[edge.course_id].unmet
+            progress = progress_by_course.get(edge.prerequisite_course_id)
+            if progress is None:
+                unmet.append({
+                    'course': edge.prerequisite_course,
+                    'reason': 'not_enrolled',
+                    'required_completion': edge.minimum_completion_percentage
+                })
+            elif progress < edge.minimum_completion_percentage:
+                unmet.append({
+                    'course': edge.prerequisite_course,
+                    'reason': 'not_completed',
+                    'current_progress': progress,
+                    'required_completion': edge.minimum_completion_percentage
+                })
+
+        return {
+            course_id: PrerequisiteResult(not result.unmet, result.unmet)
+            for course_id, result in results.items()
+        }
+
+    @classmethod
+    def evaluate_modules(
+        cls, user, modules: Iterable[Module], check_type: str = 'REQUIRED'
+    ) -> dict:
+        """Returns {module_id: PrerequisiteResult} for the given modules."""
+        module_ids = {module.id for module in modules}
+        results = {module_id: PrerequisiteResult(True, []) for module_id in module_ids}
+        if not module_ids:
+            return results
+
+        edges = list(
+            ModulePrerequisite.objects.filter(
+                module_id__in=module_ids, prerequisite_type=check_type
+            ).select_related('prerequisite_module')
+        )
+        if not edges:
+            return results
+
+        prereq_modules = {edge.prerequisite_module_id: edge.prerequisite_module for edge in edges}
+        enrollment_by_course = dict(
+            Enrollment.objects.filter(
+                user=user,
+                course_id__in={module.course_id for module in prereq_modules.values()},
+                status__in=cls.ACTIVE_STATUSES,
+            ).values_list('course_id', 'id')
+        )
+        enrolled_modules = [
+            module_id for module_id, module in prereq_modules.items()
+            if module.course_id in enrollment_by_course
+        ]
+
+        required_counts = {}
+        completed_counts = {}
+        quiz_scores = {}
+        if enrolled_modules:
+            required_counts = dict(
+                ContentItem.objects.filter(
+                    module_id__in=enrolled_modules, is_required=True, is_published=True
+                ).values('module_id').annotate(total=Count('id')).values_list('module_id', 'total')
+            )
+            completed = LearnerProgress.objects.filter(
+                enrollment_id__in=enrollment_by_course.values(),
+                content_item__module_id__in=enrolled_modules,
+                status=LearnerProgress.Status.COMPLETED,
+            )
+            completed_counts = dict(
+                completed.filter(
+                    content_item__is_required=True, content_item__is_published=True
+                ).values('content_item__module_id')
+                .annotate(done=Count('id'))
+                .values_list('content_item__module_id', 'done')
+            )
+            scored_modules = {
+                edge.prerequisite_module_id for edge in edges if edge.minimum_score is not None
+            } & set(enrolled_modules)
+            if scored_modules:
+                # Average quiz score per module from progress_details['score']
+                quiz_scores = dict(
+                    completed.filter(
+                        content_item__module_id__in=scored_modules,
+                        content_item__content_type='QUIZ',
+                        progress_details__has_key='score',
+                    ).values('content_item__module_id')
+                    .annotate(avg=Avg(Cast(KT('progress_details__score'), FloatField())))
+                    .values_list('content_item__module_id', 'avg')
+                )
+
+        for edge in edges:
+            unmet = results[edge.module_id].unmet
+            prereq_module = edge.prerequisite_module
+            if prereq_module.course_id not in enrollment_by_course:
+                unmet.append({
+                    'module': prereq_module,
+                    'reason': 'not_enrolled',
+                    'required_score': edge.minimum_score
+                })
+                continue
+
+            total_required_items = required_counts.get(prereq_module.id, 0)
+            if total_required_items == 0:
+                # Module has no required content - consider it completable
+                continue
+
+            if edge.minimum_score is not None:
+                avg_score = quiz_scores.get(prereq_module.id) or 0
+                if avg_score < edge.minimum_score:
+                    unmet.append({
+                        'module': prereq_module,
+                        'reason': 'score_not_met',
+                        'current_score': avg_score,
+                        'required_score': edge.minimum_score
+                    })
+                    continue
+
+            completion_percentage = (
+                completed_counts.get(prereq_module.id, 0) / total_required_items
+            ) * 100
+            if completion_percentage < 100:
+                unmet.append({
+                    'module': prereq_module,
+                    'reason': 'not_completed',
+                    'completion_percentage': completion_percentage
+                })
+
+        return {
+            module_id: PrerequisiteResult(not result.unmet, result.unmet)
+            for module_id, result in results.items()
+        }
@@ -0,0 +1,117 @@
+"""
+Signal handlers for the Courses app.
+
+Keeps cached prerequisite graphs fresh: saving or deleting a course or module
+prerequisite edge invalidates the owning tenant's graph (see graph.py), right
+away for the writing transaction and again once the change commits. The
+tenant of a deleted edge is resolved in pre_delete, before a cascade removes
+the course or module it belongs to.
+Course structure snapshots (see structure.py) are dropped once a change to
+the course, its modules, items or module prerequisites commits.
+"""
+
+import logging
+
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .graph import COURSE, MODULE, invalidate_prerequisite_graph
+from .models import ContentItem, Course, CoursePrerequisite, Module, ModulePrerequisite
+from .structure import invalidate_structure
+
+logger = logging.getLogger(__name__)
+
+
+def _edge_tenant_id(instance, resolve):
+    """The edge's tenant as resolved in pre_delete, else looked up now (None if gone)."""
+    if hasattr(instance, '_graph_tenant_id'):
+        return instance._graph_tenant_id
+    try:
+        return resolve(instance)
+    except ObjectDoesNotExist:
+        return None
+
+
+def _course_edge_tenant(edge: CoursePrerequisite):
+    return edge.course.tenant_id
+
+
+def _module_edge_tenant(edge: ModulePrerequisite):
+    return edge.module.course.tenant_id
+
+
+# Cascade deletes remove the course or module an edge hangs off before the
+# edge's post_delete runs, so the tenant is resolved while it still exists
+@receiver(pre_delete, sender=CoursePrerequisite)
+def remember_course_edge_tenant(sender, instance: CoursePrerequisite, **kwargs):
+    instance._graph_tenant_id = _edge_tenant_id(instance, _course_edge_tenant)
+
+
+@receiver(pre_delete, sender=ModulePrerequisite)
+def remember_module_edge_tenant(sender, instance: ModulePrerequisite, **kwargs):
+    instance._graph_tenant_id = _edge_tenant_id(instance, _module_edge_tenant)
+
+
+def _invalidate_graph(kind: str, tenant_id) -> None:
+    invalidate_prerequisite_graph(kind, tenant_id)
+    # And after commit: a concurrent read between the two may have cached the
+    # old edges under the new version
+    transaction.on_commit(lambda: invalidate_prerequisite_graph(kind, tenant_id))
+
+
+@receiver(post_save, sender=CoursePrerequisite)
+@receiver(post_delete, sender=CoursePrerequisite)
+def invalidate_course_graph_on_edge_change(sender, instance: CoursePrerequisite, **kwargs):
+    """Invalidate the course prerequisite graph of the edge's tenant (every tenant's if unknown)."""
+    tenant_id = _edge_tenant_id(instance, _course_edge_tenant)
+    _invalidate_graph(COURSE, tenant_id)
+    logger.debug(f"Course prerequisite graph invalidated for tenant {tenant_id}")
+
+
+@receiver(post_save, sender=ModulePrerequisite)
+@receiver(post_delete, sender=ModulePrerequisite)
+def invalidate_module_graph_on_edge_change(sender, instance: ModulePrerequisite, **kwargs):
+    """Invalidate the module prerequisite graph of the edge's tenant (every tenant's if unknown)."""
+    tenant_id = _edge_tenant_id(instance, _module_edge_tenant)
+    _invalidate_graph(MODULE, tenant_id)
+    logger.debug(f"Module prerequisite graph invalidated for tenant {tenant_id}")
+
+
+def _invalidate_structure_on_commit(course_id) -> None:
+    # After commit, so a concurrent read cannot re-cache the old tree
+    transaction.on_commit(lambda: invalidate_structure(course_id))
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+def invalidate_structure_on_course_change(sender, instance: Course, **kwargs):
+    _invalidate_structure_on_commit(instance.pk)
+
+
+@receiver(post_save, sender=Module)
+@receiver(post_delete, sender=Module)
+def invalidate_structure_on_module_change(sender, instance: Module, **kwargs):
+    _invalidate_structure_on_commit(instance.course_id)
+
+
+@receiver(post_save, sender=ContentItem)
+@receiver(post_delete, sender=ContentItem)
+def invalidate_structure_on_item_change(sender, instance: ContentItem, **kwargs):
+    try:
+        course_id = instance.module.course_id
+    except ObjectDoesNotExist:
+        # Module deleted with the item; its own signal covers the course
+        return
+    _invalidate_structure_on_commit(course_id)
+
+
+@receiver(post_save, sender=ModulePrerequisite)
+@receiver(post_delete, sender=ModulePrerequisite)
+def invalidate_structure_on_module_edge_change(sender, instance: ModulePrerequisite, **kwargs):
+    try:
+        course_id = instance.module.course_id
+    except ObjectDoesNotExist:
+        return
+    _invalidate_structure_on_commit(course_id)
@@ -0,0 +1,219 @@
+"""
+Course structure snapshots for the learner course player.
+
+A snapshot is the serialised module/content tree of a course (published
+items only, with module prerequisite edges), built with a fixed number of
+queries and stored in the Django cache. Its version is a hash of its
+content, so it doubles as a strong ETag and an unchanged rebuild keeps the
+same validator. Snapshots are rebuilt when a course is published and
+invalidated when the course, a module, an item or a module prerequisite
+changes (see signals.py, and ModuleViewSet.bulk_update for its queryset
+updates); the next read rebuilds them. Snapshots also expire after
+STRUCTURE_CACHE_TIMEOUT, bounding staleness from a write that bypasses the
+signals or a per-process cache that never saw the invalidation.
+
+Things that vary per request are kept out of the snapshot: file data (URLs
+may be signed, processing status changes) is resolved when serving, and
+each learner's progress and prerequisite state is merged in from a separate
+small overlay. Both are part of the response's ETag.
+"""
+
+import hashlib
+import json
+import logging
+import uuid
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch
+
+from apps.enrollments.models import LearnerProgress
+from apps.files.models import File
+
+from .models import ContentItem, Course, Module, ModulePrerequisite
+from .services import PrerequisiteService
+
+logger = logging.getLogger(__name__)
+
+STRUCTURE_CACHE_PREFIX = "courses:structure"
+STRUCTURE_CACHE_TIMEOUT = 60 * 60
+
+
+def _cache_key(course_id) -> str:
+    return f"{STRUCTURE_CACHE_PREFIX}:{course_id}"
+
+
+def build_structure(course: Course) -> dict:
+    """Serialises the course tree (three queries) and stamps it with a content hash."""
+    modules = Module.objects.filter(course=course).order_by('order').prefetch_related(
+        Prefetch(
+            'content_items',
+            queryset=ContentItem.objects.filter(is_published=True).order_by('order'),
+        ),
+        Prefetch(
+            'prerequisites',
+            queryset=ModulePrerequisite.objects.select_related('prerequisite_module').order_by(
+                'prerequisite_module__order'
+            ),
+        ),
+    )
+    tree = {
+        'course': {'id': str(course.id), 'slug': course.slug, 'title': course.title},
+        'modules': [
+            {
+                'id': str(module.id),
+                'title': module.title,
+                'description': module.description,
+                'order': module.order,
+                'prerequisites': [
+                    {
+                        'prerequisite_module': str(edge.prerequisite_module_id),
+                        'title': edge.prerequisite_module.title,
+                        'prerequisite_type': edge.prerequisite_type,
+                        'minimum_score': edge.minimum_score,
+                    }
+                    for edge in module.prerequisites.all()
+                ],
+                'content_items': [
+                    {
+                        'id': str(item.id),
+                        'title': item.title,
+                        'order': item.order,
+                        'content_type': item.content_type,
+                        'text_content': item.text_content,
+                        'external_url': item.external_url,
+                        'metadata': item.metadata,
+                        'is_required': item.is_required,
+                        'file_id': str(item.file_id) if item.file_id else None,
+                    }
+                    for item in module.content_items.all()
+                ],
+            }
+            for module in modules
+        ],
+    }
+    encoded = json.dumps(tree, cls=DjangoJSONEncoder, sort_keys=True)
+    # Round-trip so cached and freshly built snapshots are identical plain data
+    snapshot = json.loads(encoded)
+    snapshot['version'] = hashlib.sha256(encoded.encode()).hexdigest()[:32]
+    return snapshot
+
+
+def rebuild_structure(course: Course) -> dict:
+    """Builds the snapshot and replaces the cached copy."""
+    snapshot = build_structure(course)
+    cache.set(_cache_key(course.id), snapshot, STRUCTURE_CACHE_TIMEOUT)
+    logger.debug(f"Course structure for {course.id} rebuilt (version {snapshot['version']})")
+    return snapshot
+
+
+def get_structure(course: Course) -> dict:
+    """The cached snapshot, built on a miss."""
+    snapshot = cache.get(_cache_key(course.id))
+    if snapshot is None:
+        snapshot = rebuild_structure(course)
+    return snapshot
+
+
+def invalidate_structure(course_id) -> None:
+    cache.delete(_cache_key(course_id))
+
+
+def learner_overlay(snapshot: dict, user) -> dict:
+    """
+    The user's progress and module prerequisite state for a snapshot.
+
+    One query for progress; prerequisite evaluation only runs when the
+    snapshot has REQUIRED module edges.
+    """
+    course_id = snapshot['course']['id']
+    progress = {
+        str(content_item_id): status
+        for content_item_id, status in LearnerProgress.objects.filter(
+            enrollment__user=user, enrollment__course_id=course_id
+        ).values_list('content_item_id', 'status')
+    }
+
+    blocked = {}
+    gated = [
+        module['id'] for module in snapshot['modules']
+        if any(edge['prerequisite_type'] == ModulePrerequisite.PrerequisiteType.REQUIRED
+               for edge in module['prerequisites'])
+    ]
+    if gated:
+        results = PrerequisiteService.evaluate_modules(user, [Module(id=uuid.UUID(module_id)) for module_id in gated])
+        blocked = {
+            str(module_id): sorted(str(item['module'].id) for item in result.unmet)
+            for module_id, result in results.items()
+            if not result.met
+        }
+    return {'progress': progress, 'blocked_modules': blocked}
+
+
+def overlay_digest(overlay: dict) -> str:
+    encoded = json.dumps(overlay, sort_keys=True, cls=DjangoJSONEncoder)
+    return hashlib.sha256(encoded.encode()).hexdigest()[:16]
+
+
+def resolve_files(snapshot: dict) -> dict:
+    """The served file data for each file the snapshot references (one query)."""
+    file_ids = {
+        item['file_id']
+        for module in snapshot['modules']
+        for item in module['content_items']
+        if item['file_id']
+    }
+    if not file_ids:
+        return {}
+    return {
+        str(file.id): {
+            'id': str(file.id),
+            'original_filename': file.original_filename,
+            'file_url': file.file_url,
+            'file_size': file.file_size,
+            'mime_type': file.mime_type,
+            'status': file.status,
+        }
+        for file in File.objects.filter(id__in=file_ids)
+    }
+
+
+def structure_etag(snapshot: dict, overlay: dict, files: dict) -> str:
+    """Strong ETag over the snapshot version, the learner overlay and the live file data."""
+    return f'"{snapshot["version"]}.{overlay_digest(overlay)}.{overlay_digest(files)}"'
+
+
+def render_structure(snapshot: dict, overlay: dict = None, files: dict = None) -> dict:
+    """
+    The response body: snapshot plus resolved file data and, when given,
+    the learner overlay merged onto modules and items.
+    """
+    if files is None:
+        files = resolve_files(snapshot)
+
+    modules = []
+    for module in snapshot['modules']:
+        items = []
+        for item in module['content_items']:
+            rendered = {key: value for key, value in item.items() if key != 'file_id'}
+            rendered['file'] = files.get(item['file_id'])
+            if overlay is not None:
+                rendered['progress_status'] = overlay['progress'].get(
+                    item['id'], LearnerProgress.Status.NOT_STARTED
+                )
+            items.append(rendered)
+        rendered_module = dict(module, content_items=items)
+        if overlay is not None:
+            unmet = overlay['blocked_modules'].get(module['id'], [])
+            rendered_module['prerequisites_met'] = {'met': not unmet, 'unmet_modules': unmet}
+        modules.append(rendered_module)
+
+    body = {'course': snapshot['course'], 'version': snapshot['version'], 'modules': modules}
+    if overlay is not None:
+        item_ids = [item['id'] for module in snapshot['modules'] for item in module['content_items']]
+        completed = sum(
+            1 for item_id in item_ids
+            if overlay['progress'].get(item_id) == LearnerProgress.Status.COMPLETED
+        )
+        body['progress'] = {'completed_items': completed, 'total_items': len(item_ids)}
+    return body
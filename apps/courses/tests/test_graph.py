@@ -0,0 +1,174 @@
+"""Tests for materialized prerequisite graphs."""
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+
+from apps.core.models import Tenant
+from apps.courses.graph import (
+    COURSE,
+    MODULE,
+    PrerequisiteGraph,
+    _ancestor_ids_cte,
+    _version_key,
+    get_ancestor_ids,
+    get_cached_graph,
+    get_prerequisite_graph,
+    invalidate_prerequisite_graph,
+)
+from apps.courses.models import Course, CoursePrerequisite, Module, ModulePrerequisite
+from apps.users.models import User
+
+
+class PrerequisiteGraphTests(TestCase):
+    """Tests for the in-memory graph itself."""
+
+    def setUp(self):
+        # d -> c -> b -> a (REQUIRED), d -> x (RECOMMENDED)
+        self.graph = PrerequisiteGraph([
+            ("b", "a", "REQUIRED"),
+            ("c", "b", "REQUIRED"),
+            ("d", "c", "REQUIRED"),
+            ("d", "x", "RECOMMENDED"),
+        ])
+
+    def test_ancestors_and_descendants(self):
+        """Test transitive closure by prerequisite type."""
+        self.assertEqual(self.graph.ancestors("d"), {"a", "b", "c", "x"})
+        self.assertEqual(self.graph.ancestors("d", "REQUIRED"), {"a", "b", "c"})
+        self.assertEqual(self.graph.descendants("b"), {"c", "d"})
+        self.assertEqual(self.graph.ancestors("unknown"), frozenset())
+
+    def test_chain_is_topological(self):
+        """Test that chains list prerequisites before the courses needing them."""
+        self.assertEqual(self.graph.chain("d"), ["a", "b", "c"])
+
+    def test_would_create_cycle(self):
+        """Test cycle detection for proposed edges."""
+        self.assertTrue(self.graph.would_create_cycle("a", "d"))
+        self.assertTrue(self.graph.would_create_cycle("a", "a"))
+        self.assertFalse(self.graph.would_create_cycle("d", "a"))
+
+    def test_existing_cycle_is_tolerated(self):
+        """Test that legacy cyclic data doesn't break closure computation."""
+        graph = PrerequisiteGraph([("a", "b", "REQUIRED"), ("b", "a", "REQUIRED")])
+        self.assertEqual(graph.cyclic_nodes, {"a", "b"})
+        self.assertEqual(graph.ancestors("a"), {"a", "b"})
+
+
+class PrerequisiteGraphCacheTests(TestCase):
+    """Tests for cached tenant graphs and the model/serializer integration."""
+
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Test Tenant", slug="test-tenant")
+        self.instructor = User.objects.create_user(
+            email="instructor@example.com",
+            password="testpass123",
+            role=User.Role.INSTRUCTOR,
+            tenant=self.tenant
+        )
+        self.courses = [self._course(title) for title in ("Zeta", "Mid", "Alpha", "Top")]
+        # Top -> Alpha -> Mid -> Zeta
+        for course, prereq in zip(self.courses[1:], self.courses):
+            CoursePrerequisite.objects.create(course=course, prerequisite_course=prereq)
+
+    def _course(self, title):
+        return Course.objects.create(
+            tenant=self.tenant,
+            title=title,
+            instructor=self.instructor,
+            status=Course.Status.PUBLISHED
+        )
+
+    def test_prerequisite_chain_in_take_order(self):
+        """Test that the chain is ordered by dependency rather than title."""
+        zeta, mid, alpha, top = self.courses
+
+        self.assertEqual(top.get_prerequisite_chain(), [zeta, mid, alpha])
+
+    def test_cycle_rejected_on_save(self):
+        """Test that closing a cycle is rejected through the graph."""
+        zeta, _, _, top = self.courses
+
+        with self.assertRaises(ValidationError):
+            CoursePrerequisite.objects.create(course=zeta, prerequisite_course=top)
+
+    def test_edge_change_invalidates_graph(self):
+        """Test that saving and deleting edges rebuilds the cached graph."""
+        zeta, mid, alpha, top = self.courses
+        get_prerequisite_graph(COURSE, self.tenant.id)
+
+        extra = self._course("Extra")
+        edge = CoursePrerequisite.objects.create(course=zeta, prerequisite_course=extra)
+        self.assertIsNone(get_cached_graph(COURSE, self.tenant.id))
+        self.assertIn(extra.id, get_prerequisite_graph(COURSE, self.tenant.id).ancestors(top.id))
+
+        edge.delete()
+        self.assertNotIn(extra.id, get_prerequisite_graph(COURSE, self.tenant.id).ancestors(top.id))
+
+    def test_cascade_delete_invalidates_graph_in_every_process(self):
+        """Test that deleting a course bumps its tenant's shared version, not only the local cache."""
+        zeta, mid, _, top = self.courses
+        graph = get_prerequisite_graph(COURSE, self.tenant.id)
+
+        mid.delete()
+
+        self.assertNotEqual(cache.get(_version_key(COURSE, self.tenant.id)), graph.version)
+        self.assertNotIn(zeta.id, get_prerequisite_graph(COURSE, self.tenant.id).ancestors(top.id))
+
+    def test_edge_change_invalidates_graph_again_after_commit(self):
+        """Test that a graph cached before the edge change commits is dropped on commit."""
+        zeta, _, _, top = self.courses
+        extra = self._course("Extra")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            CoursePrerequisite.objects.create(course=zeta, prerequisite_course=extra)
+            # Stands in for a concurrent reader caching pre-commit edges under the new version
+            stale = get_prerequisite_graph(COURSE, self.tenant.id)
+
+        self.assertNotEqual(cache.get(_version_key(COURSE, self.tenant.id)), stale.version)
+        self.assertIsNone(get_cached_graph(COURSE, self.tenant.id))
+        self.assertIn(extra.id, get_prerequisite_graph(COURSE, self.tenant.id).ancestors(top.id))
+
+    def test_unknown_tenant_invalidates_every_tenant_graph(self):
+        """Test that an edge whose tenant can't be resolved stales every shared graph version."""
+        graph = get_prerequisite_graph(COURSE, self.tenant.id)
+
+        invalidate_prerequisite_graph(COURSE)
+
+        self.assertNotEqual(cache.get(_version_key(COURSE, self.tenant.id)), graph.version)
+
+    def test_warm_graph_answers_without_queries(self):
+        """Test that ancestor and cycle lookups don't hit the database once loaded."""
+        zeta, _, _, top = self.courses
+        get_prerequisite_graph(COURSE, self.tenant.id)
+
+        with self.assertNumQueries(0):
+            ancestors = get_ancestor_ids(COURSE, self.tenant.id, top.id)
+            graph = get_prerequisite_graph(COURSE, self.tenant.id)
+            self.assertTrue(graph.would_create_cycle(zeta.id, top.id))
+        self.assertEqual(ancestors, {course.id for course in self.courses[:3]})
+
+    def test_cold_lookup_uses_single_cte_query(self):
+        """Test that the recursive CTE matches the graph in one query."""
+        top = self.courses[-1]
+
+        with self.assertNumQueries(1):
+            cte_ids = _ancestor_ids_cte(COURSE, top.id, "REQUIRED")
+
+        graph = get_prerequisite_graph(COURSE, self.tenant.id)
+        self.assertEqual(cte_ids, set(graph.ancestors(top.id, "REQUIRED")))
+        self.assertEqual(
+            set(top.get_all_prerequisites(include_indirect=True)), set(self.courses[:3])
+        )
+
+    def test_module_cycle_rejected(self):
+        """Test that module prerequisites are checked for cycles too."""
+        course = self.courses[0]
+        first = Module.objects.create(course=course, title="First", order=1)
+        second = Module.objects.create(course=course, title="Second", order=2)
+        ModulePrerequisite.objects.create(module=second, prerequisite_module=first)
+
+        self.assertEqual(get_ancestor_ids(MODULE, self.tenant.id, second.id), {first.id})
+        with self.assertRaises(ValidationError):
+            ModulePrerequisite.objects.create(module=first, prerequisite_module=second)
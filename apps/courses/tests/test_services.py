@@ -0,0 +1,176 @@
+"""Tests for courses app services."""
+
+from django.test import TestCase
+
+from apps.core.models import Tenant
+from apps.courses.models import ContentItem, Course, CoursePrerequisite, Module, ModulePrerequisite
+from apps.courses.services import PrerequisiteService
+from apps.enrollments.models import Enrollment, LearnerProgress
+from apps.users.models import User
+
+
+class PrerequisiteServiceTestCase(TestCase):
+    """Base setup for prerequisite evaluation tests."""
+
+    def setUp(self):
+        self.tenant = Tenant.objects.create(name="Test Tenant", slug="test-tenant")
+        self.instructor = User.objects.create_user(
+            email="instructor@example.com",
+            password="testpass123",
+            role=User.Role.INSTRUCTOR,
+            tenant=self.tenant
+        )
+        self.learner = User.objects.create_user(
+            email="learner@example.com",
+            password="testpass123",
+            role=User.Role.LEARNER,
+            tenant=self.tenant
+        )
+
+    def _course(self, title):
+        return Course.objects.create(
+            tenant=self.tenant,
+            title=title,
+            instructor=self.instructor,
+            status=Course.Status.PUBLISHED
+        )
+
+
+class EvaluateCoursesTests(PrerequisiteServiceTestCase):
+    """Tests for PrerequisiteService.evaluate_courses."""
+
+    def setUp(self):
+        super().setUp()
+        self.basics = self._course("Basics")
+        self.intermediate = self._course("Intermediate")
+        self.advanced = self._course("Advanced")
+        CoursePrerequisite.objects.create(course=self.intermediate, prerequisite_course=self.basics)
+        CoursePrerequisite.objects.create(
+            course=self.advanced,
+            prerequisite_course=self.intermediate,
+            minimum_completion_percentage=80
+        )
+
+    def test_reports_each_unmet_reason(self):
+        """Test not-enrolled, not-completed and met prerequisites in one call."""
+        Enrollment.objects.create(
+            user=self.learner, course=self.intermediate, status=Enrollment.Status.ACTIVE, progress=50
+        )
+
+        results = PrerequisiteService.evaluate_courses(
+            self.learner, [self.basics, self.intermediate, self.advanced]
+        )
+
+        self.assertEqual(results[self.basics.id], (True, []))
+        is_met, unmet = results[self.intermediate.id]
+        self.assertFalse(is_met)
+        self.assertEqual(unmet[0]['reason'], 'not_enrolled')
+        is_met, unmet = results[self.advanced.id]
+        self.assertFalse(is_met)
+        self.assertEqual(unmet[0]['reason'], 'not_completed')
+        self.assertEqual(unmet[0]['current_progress'], 50)
+
+    def test_query_count_is_constant(self):
+        """Test that evaluation doesn't issue queries per course or edge."""
+        courses = [self.basics, self.intermediate, self.advanced]
+        for index in range(10):
+            course = self._course(f"Elective {index}")
+            CoursePrerequisite.objects.create(course=course, prerequisite_course=self.basics)
+            courses.append(course)
+
+        # Edges, then enrollments
+        with self.assertNumQueries(2):
+            PrerequisiteService.evaluate_courses(self.learner, courses)
+
+    def test_model_method_matches_service(self):
+        """Test that Course.are_prerequisites_met delegates to the service."""
+        Enrollment.objects.create(
+            user=self.learner, course=self.basics, status=Enrollment.Status.COMPLETED, progress=100
+        )
+
+        self.assertEqual(self.intermediate.are_prerequisites_met(self.learner), (True, []))
+
+
+class EvaluateModulesTests(PrerequisiteServiceTestCase):
+    """Tests for PrerequisiteService.evaluate_modules."""
+
+    def setUp(self):
+        super().setUp()
+        self.course = self._course("Course")
+        self.enrollment = Enrollment.objects.create(
+            user=self.learner, course=self.course, status=Enrollment.Status.ACTIVE
+        )
+        self.intro = Module.objects.create(course=self.course, title="Intro", order=1)
+        self.reading = ContentItem.objects.create(
+            module=self.intro, title="Reading", content_type=ContentItem.ContentType.TEXT,
+            order=1, is_required=True, is_published=True
+        )
+        self.quiz = ContentItem.objects.create(
+            module=self.intro, title="Quiz", content_type=ContentItem.ContentType.QUIZ,
+            order=2, is_required=True, is_published=True
+        )
+        self.next_module = Module.objects.create(course=self.course, title="Next", order=2)
+        self.scored_module = Module.objects.create(course=self.course, title="Scored", order=3)
+        ModulePrerequisite.objects.create(module=self.next_module, prerequisite_module=self.intro)
+        ModulePrerequisite.objects.create(
+            module=self.scored_module, prerequisite_module=self.intro, minimum_score=70
+        )
+
+    def _complete(self, item, **details):
+        LearnerProgress.objects.create(
+            enrollment=self.enrollment,
+            content_item=item,
+            status=LearnerProgress.Status.COMPLETED,
+            progress_details=details,
+        )
+
+    def test_not_completed_and_score_not_met(self):
+        """Test completion and quiz score requirements."""
+        self._complete(self.quiz, score=60)
+
+        results = PrerequisiteService.evaluate_modules(
+            self.learner, [self.intro, self.next_module, self.scored_module]
+        )
+
+        self.assertTrue(results[self.intro.id].met)
+        unmet = results[self.next_module.id].unmet
+        self.assertEqual(unmet[0]['reason'], 'not_completed')
+        self.assertEqual(unmet[0]['completion_percentage'], 50)
+        unmet = results[self.scored_module.id].unmet
+        self.assertEqual(unmet[0]['reason'], 'score_not_met')
+        self.assertEqual(unmet[0]['current_score'], 60)
+
+    def test_all_met_when_completed_with_score(self):
+        """Test that completing every item with a passing score meets both edges."""
+        self._complete(self.reading)
+        self._complete(self.quiz, score=90)
+
+        results = PrerequisiteService.evaluate_modules(
+            self.learner, [self.next_module, self.scored_module]
+        )
+
+        self.assertTrue(results[self.next_module.id].met)
+        self.assertTrue(results[self.scored_module.id].met)
+
+    def test_not_enrolled(self):
+        """Test that a learner without an enrollment doesn't meet module prerequisites."""
+        self.enrollment.delete()
+
+        is_met, unmet = self.next_module.are_prerequisites_met(self.learner)
+
+        self.assertFalse(is_met)
+        self.assertEqual(unmet[0]['reason'], 'not_enrolled')
+
+    def test_query_count_is_constant(self):
+        """Test that evaluation uses grouped queries regardless of module count."""
+        modules = [self.next_module, self.scored_module]
+        for index in range(10):
+            module = Module.objects.create(course=self.course, title=f"Extra {index}", order=10 + index)
+            ModulePrerequisite.objects.create(
+                module=module, prerequisite_module=self.intro, minimum_score=50
+            )
+            modules.append(module)
+
+        # Edges, enrollments, required counts, completed counts, quiz scores
+        with self.assertNumQueries(5):
+            PrerequisiteService.evaluate_modules(self.learner, modules)
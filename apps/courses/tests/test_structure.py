@@ -0,0 +1,186 @@
+"""Tests for course structure snapshots and the structure endpoint."""
+
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.core.models import Tenant
+from apps.courses.models import ContentItem, Course, Module, ModulePrerequisite
+from apps.courses.structure import _cache_key
+from apps.enrollments.models import Enrollment, LearnerProgress
+from apps.files.models import File
+from apps.users.models import User
+
+
+# Search indexing is queued on the same commits and isn't under test here
+@override_settings(SEARCH_AUTO_INDEX=False)
+class CourseStructureTests(TestCase):
+    """Tests for the structure snapshot served by CourseViewSet.structure."""
+
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        self.client = APIClient()
+        self.tenant = Tenant.objects.create(name="Test Tenant", slug="test-tenant")
+        self.instructor = User.objects.create_user(
+            email="instructor@example.com",
+            password="testpass123",
+            role=User.Role.INSTRUCTOR,
+            tenant=self.tenant
+        )
+        self.learner = User.objects.create_user(
+            email="learner@example.com",
+            password="testpass123",
+            tenant=self.tenant
+        )
+        self.course = Course.objects.create(
+            tenant=self.tenant,
+            title="Published Course",
+            instructor=self.instructor,
+            status=Course.Status.PUBLISHED
+        )
+        self.intro = Module.objects.create(course=self.course, title="Intro", order=1)
+        self.advanced = Module.objects.create(course=self.course, title="Advanced", order=2)
+        ModulePrerequisite.objects.create(module=self.advanced, prerequisite_module=self.intro)
+        self.lesson = ContentItem.objects.create(
+            module=self.intro, title="Lesson", content_type=ContentItem.ContentType.TEXT,
+            text_content="Hello", order=1, is_published=True, is_required=True
+        )
+        ContentItem.objects.create(
+            module=self.intro, title="Draft", content_type=ContentItem.ContentType.TEXT,
+            text_content="WIP", order=2, is_published=False
+        )
+        ContentItem.objects.create(
+            module=self.advanced, title="Deep Dive", content_type=ContentItem.ContentType.TEXT,
+            text_content="More", order=1, is_published=True
+        )
+        self.enrollment = Enrollment.objects.create(
+            user=self.learner, course=self.course, status=Enrollment.Status.ACTIVE
+        )
+        self.client.force_authenticate(user=self.learner)
+        self.url = reverse('courses:course-structure', kwargs={'slug': self.course.slug})
+
+    def tearDown(self):
+        cache.clear()
+
+    def _get(self, **headers):
+        return self.client.get(self.url, HTTP_X_TENANT_SLUG=self.tenant.slug, **headers)
+
+    def test_structure_lists_published_items_with_learner_overlay(self):
+        response = self._get()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        intro, advanced = response.data['modules']
+        self.assertEqual([item['title'] for item in intro['content_items']], ["Lesson"])
+        self.assertEqual(intro['content_items'][0]['progress_status'], LearnerProgress.Status.NOT_STARTED)
+        self.assertTrue(intro['prerequisites_met']['met'])
+        self.assertEqual(advanced['prerequisites_met'], {'met': False, 'unmet_modules': [str(self.intro.id)]})
+        self.assertEqual(response.data['progress'], {'completed_items': 0, 'total_items': 2})
+
+    def test_matching_if_none_match_returns_304(self):
+        etag = self._get()['ETag']
+
+        response = self._get(HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_warm_snapshot_is_not_rebuilt(self):
+        self._get()
+
+        with patch('apps.courses.structure.build_structure') as build:
+            response = self._get()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        build.assert_not_called()
+
+    def test_content_edit_changes_etag(self):
+        etag = self._get()['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.lesson.title = "Lesson, revised"
+            self.lesson.save()
+
+        response = self._get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['modules'][0]['content_items'][0]['title'], "Lesson, revised")
+
+    def test_file_status_change_changes_etag(self):
+        file = File.objects.create(
+            tenant=self.tenant, uploaded_by=self.instructor, original_filename="slides.pdf",
+            file_size=100, mime_type="application/pdf", status=File.FileStatus.PROCESSING,
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.lesson.file = file
+            self.lesson.save()
+        etag = self._get()['ETag']
+
+        File.objects.filter(pk=file.pk).update(status=File.FileStatus.AVAILABLE)
+        response = self._get(HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data['modules'][0]['content_items'][0]['file']['status'], File.FileStatus.AVAILABLE
+        )
+
+    def test_bulk_update_drops_snapshot(self):
+        etag = self._get()['ETag']
+        self.client.force_authenticate(user=self.instructor)
+        modules = [
+            {'id': str(self.advanced.id), 'order': 1, 'title': "Advanced, first",
+             'content_items': [{'id': str(item.id), 'order': item.order} for item in self.advanced.content_items.all()]},
+            {'id': str(self.intro.id), 'order': 2,
+             'content_items': [{'id': str(item.id), 'order': item.order} for item in self.intro.content_items.all()]},
+        ]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put(
+                reverse('courses:course-modules-bulk-update', kwargs={'course_slug': self.course.slug}),
+                {'modules': modules}, format='json', HTTP_X_TENANT_SLUG=self.tenant.slug,
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.client.force_authenticate(user=self.learner)
+        response = self._get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['modules'][0]['title'], "Advanced, first")
+
+    def test_learner_progress_changes_etag_and_unlocks_module(self):
+        etag = self._get()['ETag']
+
+        LearnerProgress.objects.create(
+            enrollment=self.enrollment, content_item=self.lesson, status=LearnerProgress.Status.COMPLETED
+        )
+        response = self._get(HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertTrue(response.data['modules'][1]['prerequisites_met']['met'])
+        self.assertEqual(response.data['progress']['completed_items'], 1)
+
+    def test_publish_builds_snapshot(self):
+        draft = Course.objects.create(
+            tenant=self.tenant, title="Draft Course", instructor=self.instructor, status=Course.Status.DRAFT
+        )
+        self.client.force_authenticate(user=self.instructor)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse('courses:course-publish', kwargs={'slug': draft.slug}),
+                HTTP_X_TENANT_SLUG=self.tenant.slug
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(cache.get(_cache_key(draft.id))['course']['title'], "Draft Course")
+
+    def test_unenrolled_learner_is_forbidden(self):
+        outsider = User.objects.create_user(
+            email="outsider@example.com", password="testpass123", tenant=self.tenant
+        )
+        self.client.force_authenticate(user=outsider)
+
+        self.assertEqual(self._get().status_code, status.HTTP_403_FORBIDDEN)
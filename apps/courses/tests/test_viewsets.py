@@ -1,6 +1,8 @@
 """Tests for courses app viewsets."""
 
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -8,6 +10,7 @@ from rest_framework.test import APIClient
 from apps.courses.models import Course, Module, ContentItem, ContentVersion, CoursePrerequisite, ModulePrerequisite
 from apps.enrollments.models import Enrollment
 from apps.core.models import Tenant
+from apps.core.services import TenantService
 from apps.users.models import User
 
 
@@ -256,6 +259,22 @@ class CourseViewSetTests(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['title'], 'Updated Draft Course')
 
+    def test_update_ignores_fields_parameter(self):
+        """Test that ?fields= neither drops input nor trims the response of a write."""
+        self.client.force_authenticate(user=self.instructor)
+        response = self.client.patch(
+            self._get_url('detail', slug=self.draft_course.slug) + '?fields=id',
+            {'title': 'Updated Draft Course', 'description': 'Updated description'},
+            format='json',
+            HTTP_X_TENANT_SLUG=self.tenant.slug
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.draft_course.refresh_from_db()
+        self.assertEqual(self.draft_course.title, 'Updated Draft Course')
+        self.assertEqual(self.draft_course.description, 'Updated description')
+        self.assertIn('description', response.data)
+
     def test_update_course_as_other_instructor_fails(self):
         """Test that other instructors cannot update the course."""
         self.client.force_authenticate(user=self.other_instructor)
@@ -366,6 +385,125 @@ class CourseViewSetTests(TestCase):
         
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
+    # --- Catalog / Sparse Fieldset Tests ---
+    def _add_structure(self, course, modules=2, items=2):
+        for module_index in range(modules):
+            module = Module.objects.create(course=course, title=f"Module {module_index}", order=module_index)
+            for item_index in range(items):
+                ContentItem.objects.create(
+                    module=module,
+                    title=f"Item {item_index}",
+                    content_type=ContentItem.ContentType.TEXT,
+                    order=item_index,
+                )
+
+    def test_list_uses_catalog_representation(self):
+        """Test that list responses omit the module tree and prerequisite details."""
+        self._add_structure(self.published_course)
+        self.client.force_authenticate(user=self.learner)
+        response = self.client.get(
+            self._get_url('list'),
+            HTTP_X_TENANT_SLUG=self.tenant.slug
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        course = response.data.get('results', response.data)[0]
+        self.assertNotIn('modules', course)
+        self.assertNotIn('prerequisites_met', course)
+        self.assertTrue(course['is_enrolled'])
+
+    def test_list_expand_adds_prerequisite_fields(self):
+        """Test that expand= opts into prerequisite fields on the catalog."""
+        self.client.force_authenticate(user=self.learner)
+        response = self.client.get(
+            self._get_url('list') + '?expand=prerequisites_met',
+            HTTP_X_TENANT_SLUG=self.tenant.slug
+        )
+
+        course = response.data.get('results', response.data)[0]
+        self.assertEqual(course['prerequisites_met']['met'], True)
+        self.assertNotIn('prerequisites_list', course)
+
+    def test_list_fields_limits_output(self):
+        """Test that fields= returns only the requested fields."""
+        self.client.force_authenticate(user=self.instructor)
+        response = self.client.get(
+            self._get_url('list') + '?fields=id,title,slug,bogus',
+            HTTP_X_TENANT_SLUG=self.tenant.slug
+        )
+
+        course = response.data.get('results', response.data)[0]
+        self.assertEqual(set(course), {'id', 'title', 'slug'})
+
+    def test_list_query_count_is_constant(self):
+        """Test that catalog queries don't grow with the number of courses."""
+        self.client.force_authenticate(user=self.instructor)
+        url = self._get_url('list')
+
+        self._add_structure(self.draft_course)
+        baseline = self._count_queries(url)
+
+        for index in range(5):
+            course = Course.objects.create(
+                tenant=self.tenant,
+                title=f"Extra Course {index}",
+                instructor=self.other_instructor,
+                status=Course.Status.PUBLISHED,
+            )
+            self._add_structure(course)
+
+        self.assertEqual(self._count_queries(url), baseline)
+
+    def test_list_prerequisites_met_is_batched(self):
+        """Test that expanding prerequisites_met doesn't add queries per course."""
+        self.client.force_authenticate(user=self.instructor)
+        url = self._get_url('list') + '?expand=prerequisites_met'
+        CoursePrerequisite.objects.create(course=self.draft_course, prerequisite_course=self.published_course)
+        baseline = self._count_queries(url)
+
+        for index in range(5):
+            course = Course.objects.create(
+                tenant=self.tenant,
+                title=f"Extra Course {index}",
+                instructor=self.other_instructor,
+                status=Course.Status.PUBLISHED,
+            )
+            CoursePrerequisite.objects.create(course=course, prerequisite_course=self.published_course)
+
+        self.assertEqual(self._count_queries(url), baseline)
+
+    def _count_queries(self, url):
+        # Resolve the tenant first so filling its cache isn't counted
+        TenantService.get_tenant_by_slug(self.tenant.slug)
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(url, HTTP_X_TENANT_SLUG=self.tenant.slug)
+        return len(context.captured_queries)
+
+    def test_detail_includes_module_tree(self):
+        """Test that detail responses still include modules and content items."""
+        self._add_structure(self.draft_course, modules=2, items=3)
+        self.client.force_authenticate(user=self.instructor)
+        response = self.client.get(
+            self._get_url('detail', slug=self.draft_course.slug),
+            HTTP_X_TENANT_SLUG=self.tenant.slug
+        )
+
+        self.assertEqual(len(response.data['modules']), 2)
+        self.assertEqual(len(response.data['modules'][0]['content_items']), 3)
+
+    def test_detail_fields_skips_module_prefetch(self):
+        """Test that trimming detail fields avoids loading the module tree."""
+        self._add_structure(self.draft_course)
+        self.client.force_authenticate(user=self.instructor)
+        url = self._get_url('detail', slug=self.draft_course.slug)
+
+        full = self._count_queries(url)
+        trimmed = self._count_queries(url + '?fields=id,title')
+        response = self.client.get(url + '?fields=id,title', HTTP_X_TENANT_SLUG=self.tenant.slug)
+
+        self.assertEqual(set(response.data), {'id', 'title'})
+        self.assertLess(trimmed, full)
+
 
 class ModuleViewSetTests(TestCase):
     """Tests for ModuleViewSet."""
@@ -2,14 +2,16 @@ from rest_framework import viewsets, permissions, status, serializers
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
-from django.db.models import Prefetch, Max, Count, Exists, OuterRef, Subquery, Value
+from django.db.models import Prefetch, Max, Count, Exists, OuterRef, Q, Subquery, Value
 from django.db.models.functions import Coalesce
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 import uuid  # Add uuid import for instructor filtering
 import logging
 from .models import Course, Module, ContentItem, ContentVersion, CoursePrerequisite, ModulePrerequisite
-from apps.enrollments.models import Enrollment
+from apps.enrollments.models import Enrollment, LearnerProgress
 from .serializers import (
+    CourseListSerializer,
     CourseSerializer,
     ModuleSerializer,
     ContentItemSerializer,
@@ -17,9 +19,20 @@ from .serializers import (
     CoursePrerequisiteSerializer,
     ModulePrerequisiteSerializer,
 )
+from apps.common.mixins import ConditionalGetMixin, SparseFieldsetViewMixin, etag_matches
 from apps.users.models import User  # Import User for role check
 from apps.users.permissions import IsAdminOrTenantAdmin, IsInstructorOrAdmin
 from .permissions import IsCourseInstructorOrAdmin, IsEnrolledOrInstructorOrAdmin
+from .services import PrerequisiteService
+from .structure import (
+    get_structure,
+    invalidate_structure,
+    learner_overlay,
+    rebuild_structure,
+    render_structure,
+    resolve_files,
+    structure_etag,
+)
 from apps.notifications.models import NotificationType
 from apps.notifications.services import NotificationService
 from drf_spectacular.utils import extend_schema, OpenApiParameter
@@ -28,15 +41,55 @@ from drf_spectacular.types import OpenApiTypes
 logger = logging.getLogger(__name__)
 
 @extend_schema(tags=['Courses'])
-class CourseViewSet(viewsets.ModelViewSet):
+@extend_schema(
+    parameters=[
+        OpenApiParameter(name='fields', description='Comma-separated fields to include', required=False, type=OpenApiTypes.STR, location=OpenApiParameter.QUERY),
+        OpenApiParameter(name='expand', description='Comma-separated optional fields to add (list: prerequisites_list, prerequisites_met)', required=False, type=OpenApiTypes.STR, location=OpenApiParameter.QUERY),
+    ]
+)
+class CourseViewSet(ConditionalGetMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """
     API endpoint for managing Courses. Instructors/Admins can create/edit.
     Learners can list/retrieve published courses they are enrolled in (logic might vary).
+    List responses use the lightweight catalog representation; the module tree
+    is only included on detail views.
     """
     serializer_class = CourseSerializer
     lookup_field = 'slug'
     permission_classes = [permissions.IsAuthenticated] # Base permission, refined in methods
 
+    # Only fetched when the field is rendered (see SparseFieldsetViewMixin)
+    field_prefetches = {
+        'modules': [
+            Prefetch('modules', queryset=Module.objects.order_by('order')),
+            Prefetch('modules__content_items', queryset=ContentItem.objects.select_related('file').order_by('order')),
+            'modules__prerequisites__prerequisite_module',
+        ],
+        'prerequisites_list': ['prerequisites__prerequisite_course'],
+    }
+
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return CourseListSerializer
+        return CourseSerializer
+
+    def get_etag_dependencies(self, scope):
+        course_ids = scope.values('pk')
+        dependencies = [
+            # Enrollment counts, the user's enrollment/progress and prerequisite state
+            Enrollment.objects.filter(Q(course_id__in=course_ids) | Q(user=self.request.user)),
+            CoursePrerequisite.objects.filter(course_id__in=course_ids),
+            User.objects.filter(pk__in=scope.values('instructor_id')),
+        ]
+        if self.action == 'retrieve':
+            dependencies += [
+                Module.objects.filter(course_id__in=course_ids),
+                ContentItem.objects.filter(module__course_id__in=course_ids),
+                ModulePrerequisite.objects.filter(module__course_id__in=course_ids),
+                LearnerProgress.objects.filter(enrollment__user=self.request.user, enrollment__course_id__in=course_ids),
+            ]
+        return dependencies
+
     def get_queryset(self):
         # Handle schema generation request
         if getattr(self, 'swagger_fake_view', False):
@@ -55,6 +108,10 @@ class CourseViewSet(viewsets.ModelViewSet):
         else:
             queryset = Course.objects.none() # Should not happen if tenant middleware works
 
+        if self.action == 'structure':
+            # Served from the structure snapshot; only the course row is needed
+            return queryset.select_related('instructor')
+
         # Handle instructor filter parameter
         instructor_filter = self.request.query_params.get('instructor')
         if instructor_filter == 'me':
@@ -117,36 +174,40 @@ class CourseViewSet(viewsets.ModelViewSet):
 
         # Annotate enrollment data to avoid N+1 queries in serializer
         # These annotations are used by CourseSerializer's get_* methods
+        requested = self.get_requested_fields()
         user_enrollment_subquery = Enrollment.objects.filter(
             course=OuterRef('pk'),
             user=user,
             status__in=[Enrollment.Status.ACTIVE, Enrollment.Status.COMPLETED]
         )
-        
-        queryset = queryset.annotate(
+        annotations = {}
+        if 'enrollment_count' in requested:
             # Count of distinct students enrolled (any status) for enrollment_count field
             # This is consistent with Analytics page which counts distinct users per course
-            _enrollment_count=Count(
-                'enrollments__user',
-                distinct=True
-            ),
+            annotations['_enrollment_count'] = Count('enrollments__user', distinct=True)
+        if 'is_enrolled' in requested:
             # Whether current user is enrolled (for is_enrolled field)
-            _is_enrolled=Exists(user_enrollment_subquery),
+            annotations['_is_enrolled'] = Exists(user_enrollment_subquery)
+        if 'enrollment_id' in requested:
             # Current user's enrollment ID (for enrollment_id field)
-            _enrollment_id=Subquery(
-                user_enrollment_subquery.values('id')[:1]
-            ),
+            annotations['_enrollment_id'] = Subquery(user_enrollment_subquery.values('id')[:1])
+        if 'progress_percentage' in requested:
             # Current user's progress percentage (for progress_percentage field)
-            _progress_percentage=Subquery(
+            annotations['_progress_percentage'] = Subquery(
                 user_enrollment_subquery.values('progress')[:1]
-            ),
-        )
+            )
+        if annotations:
+            queryset = queryset.annotate(**annotations)
+
+        select_related = ['tenant']
+        if 'instructor' in requested:
+            select_related += ['instructor__profile', 'instructor__tenant']
+        else:
+            select_related.append('instructor')
 
-        # Prefetch related data for efficiency
-        return queryset.select_related('tenant', 'instructor').prefetch_related(
-             Prefetch('modules', queryset=Module.objects.order_by('order')),
-             Prefetch('modules__content_items', queryset=ContentItem.objects.select_related('file').order_by('order'))
-        ).order_by('title')
+        # Prefetch only what the rendered fields need
+        queryset = queryset.select_related(*select_related)
+        return self.apply_field_prefetches(queryset, requested).order_by('title')
 
 
     def get_permissions(self):
@@ -157,6 +218,8 @@ class CourseViewSet(viewsets.ModelViewSet):
         elif self.action in ['create']:
             # Check if user has role INSTRUCTOR or ADMIN/STAFF
             return [permissions.IsAuthenticated(), IsInstructorOrAdmin()]
+        elif self.action == 'structure':
+            return [permissions.IsAuthenticated(), IsEnrolledOrInstructorOrAdmin()]
         elif self.action in ['update', 'partial_update', 'destroy', 'publish', 'archive']:
             # Check if user is instructor of *this specific course* or admin
             return [permissions.IsAuthenticated(), IsCourseInstructorOrAdmin()]
@@ -194,6 +257,8 @@ class CourseViewSet(viewsets.ModelViewSet):
              return Response({'detail': 'Course is already published.'}, status=status.HTTP_400_BAD_REQUEST)
         course.status = Course.Status.PUBLISHED
         course.save(update_fields=['status', 'updated_at'])
+        # Build the learner structure snapshot up front (after the save's invalidation)
+        transaction.on_commit(lambda: rebuild_structure(course))
         
         # Send notification to all enrolled learners
         try:
@@ -217,6 +282,24 @@ class CourseViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(course)
         return Response(serializer.data)
 
+    @extend_schema(
+        request=None,
+        responses={200: OpenApiTypes.OBJECT, 304: None},
+        description="Module/content tree for the course player, with the caller's progress and "
+                    "prerequisite state. Send If-None-Match with the last ETag to get 304 when unchanged.",
+    )
+    @action(detail=True, methods=['get'])
+    def structure(self, request, slug=None):
+        course = self.get_object()
+        snapshot = get_structure(course)
+        overlay = learner_overlay(snapshot, request.user)
+        files = resolve_files(snapshot)
+        etag = structure_etag(snapshot, overlay, files)
+        headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+        if etag_matches(request, etag):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(render_structure(snapshot, overlay, files), headers=headers)
+
     @extend_schema(request=None, responses={200: CourseSerializer})
     @action(detail=True, methods=['post'], permission_classes=[IsCourseInstructorOrAdmin])
     def archive(self, request, slug=None):
@@ -230,7 +313,7 @@ class CourseViewSet(viewsets.ModelViewSet):
 
 
 @extend_schema(tags=['Courses']) # Add to Courses tag group
-class ModuleViewSet(viewsets.ModelViewSet):
+class ModuleViewSet(ConditionalGetMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """
     API endpoint for managing Modules within a specific Course.
     Accessed via nested routes like /api/v1/courses/{course_slug}/modules/
@@ -239,6 +322,13 @@ class ModuleViewSet(viewsets.ModelViewSet):
     serializer_class = ModuleSerializer
     permission_classes = [permissions.IsAuthenticated, IsCourseInstructorOrAdmin] # Check permission on parent course
 
+    field_prefetches = {
+        'content_items': [
+            Prefetch('content_items', queryset=ContentItem.objects.select_related('file').order_by('order')),
+        ],
+        'prerequisites_list': ['prerequisites__prerequisite_module'],
+    }
+
     def get_queryset(self):
         # Handle schema generation request
         if getattr(self, 'swagger_fake_view', False):
@@ -249,10 +339,20 @@ class ModuleViewSet(viewsets.ModelViewSet):
         if not course_slug: return Module.objects.none() # Should not happen with nested router
 
         # Filter modules by course slug. Tenant check happens implicitly via parent permission.
-        # Prefetch content items for nested serialization
-        return Module.objects.filter(course__slug=course_slug).prefetch_related(
-            Prefetch('content_items', queryset=ContentItem.objects.select_related('file').order_by('order'))
-        ).order_by('order')
+        # Prefetch content items for nested serialization when rendered
+        queryset = Module.objects.filter(course__slug=course_slug)
+        return self.apply_field_prefetches(queryset).order_by('order')
+
+    def get_etag_dependencies(self, scope):
+        module_ids = scope.values('pk')
+        return [
+            ContentItem.objects.filter(module_id__in=module_ids),
+            ModulePrerequisite.objects.filter(module_id__in=module_ids),
+            # prerequisites_met depends on the user's progress in the course
+            LearnerProgress.objects.filter(
+                enrollment__user=self.request.user, enrollment__course_id__in=scope.values('course_id')
+            ),
+        ]
 
     def perform_create(self, serializer):
         course_slug = self.kwargs.get('nested_1_slug')  # Updated to use the correct parameter name
@@ -363,7 +463,7 @@ class ModuleViewSet(viewsets.ModelViewSet):
                 
                 if module_id and new_order is not None:
                     # Update module order and title if provided
-                    update_fields = {'order': new_order}
+                    update_fields = {'order': new_order, 'updated_at': timezone.now()}
                     if 'title' in module_data:
                         update_fields['title'] = module_data['title']
                     
@@ -398,7 +498,10 @@ class ModuleViewSet(viewsets.ModelViewSet):
                         ContentItem.objects.filter(
                             id=item_id,
                             module_id=module_id
-                        ).update(order=item_order)
+                        ).update(order=item_order, updated_at=timezone.now())
+
+            # Queryset updates send no signals, so drop the structure snapshot here
+            transaction.on_commit(lambda: invalidate_structure(course.id))
 
             # Return updated modules
             updated_modules = self.get_queryset()
@@ -642,7 +745,9 @@ class CoursePrerequisiteViewSet(viewsets.ModelViewSet):
         Check if the current user has met all required prerequisites for this course.
         """
         course = self._get_parent_course()
-        is_met, unmet = course.are_prerequisites_met(request.user, check_type='REQUIRED')
+        is_met, unmet = PrerequisiteService.evaluate_courses(
+            request.user, [course], check_type='REQUIRED'
+        )[course.id]
         
         return Response({
             'met': is_met,
@@ -752,7 +857,9 @@ class ModulePrerequisiteViewSet(viewsets.ModelViewSet):
         Check if the current user has met all required prerequisites for this module.
         """
         module = self._get_parent_module()
-        is_met, unmet = module.are_prerequisites_met(request.user, check_type='REQUIRED')
+        is_met, unmet = PrerequisiteService.evaluate_modules(
+            request.user, [module], check_type='REQUIRED'
+        )[module.id]
         
         return Response({
             'met': is_met,
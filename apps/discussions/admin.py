@@ -5,6 +5,7 @@ Admin configuration for discussion forum models.
 from django.contrib import admin
 
 from .models import (
+    DiscussionActivity,
     DiscussionBookmark,
     DiscussionLike,
     DiscussionReply,
@@ -27,6 +28,7 @@ class DiscussionThreadAdmin(admin.ModelAdmin):
         'reply_count',
         'like_count',
         'view_count',
+        'participant_count',
         'created_at',
     ]
     list_filter = [
@@ -48,6 +50,7 @@ class DiscussionThreadAdmin(admin.ModelAdmin):
         'reply_count',
         'like_count',
         'view_count',
+        'participant_count',
         'last_activity_at',
         'created_at',
         'updated_at',
@@ -80,6 +83,7 @@ class DiscussionReplyAdmin(admin.ModelAdmin):
     ]
     readonly_fields = [
         'like_count',
+        'reply_count',
         'is_edited',
         'edited_at',
         'created_at',
@@ -162,3 +166,28 @@ class DiscussionViewAdmin(admin.ModelAdmin):
     @admin.display(description='Thread')
     def get_thread_title(self, obj):
         return obj.thread.title
+
+
+@admin.register(DiscussionActivity)
+class DiscussionActivityAdmin(admin.ModelAdmin):
+    """Read-only admin for the discussion activity log."""
+    
+    list_display = [
+        'activity_type',
+        'course',
+        'actor',
+        'created_at',
+    ]
+    list_filter = ['activity_type', 'tenant', 'created_at']
+    search_fields = [
+        'actor__email',
+        'course__title',
+    ]
+    raw_id_fields = ['tenant', 'course', 'thread', 'reply', 'actor']
+    ordering = ['-created_at']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.models import Tenant
+from apps.discussions.services import DiscussionActivityService
+
+
+class Command(BaseCommand):
+    help = 'Recompute denormalised discussion reply, like and participant counters'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tenant', help='Slug of the tenant to repair (default: all tenants)')
+        parser.add_argument('--batch-size', type=int, default=500, help='Threads per batch (default: 500)')
+        parser.add_argument(
+            '--backfill-activity', action='store_true',
+            help='Also log threads, replies and likes missing from the discussion activity log',
+        )
+
+    def handle(self, *args, **options):
+        tenant = None
+        if options['tenant']:
+            tenant = Tenant.objects.filter(slug=options['tenant']).first()
+            if tenant is None:
+                raise CommandError(f"Tenant '{options['tenant']}' not found")
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive')
+
+        corrected = DiscussionActivityService.repair_counters(tenant=tenant, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Corrected {corrected['threads']} threads and {corrected['replies']} replies"
+        ))
+
+        if options['backfill_activity']:
+            backfilled = DiscussionActivityService.backfill_activity(
+                tenant=tenant, batch_size=options['batch_size']
+            )
+            self.stdout.write(self.style.SUCCESS(
+                f"Backfilled activity for {backfilled['threads']} threads, "
+                f"{backfilled['replies']} replies and {backfilled['likes']} likes"
+            ))
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:35
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('discussions', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='discussionreply',
+            name='discussions_thread__00c16f_idx',
+        ),
+        migrations.AddIndex(
+            model_name='discussionreply',
+            index=models.Index(fields=['thread', 'created_at', 'id'], name='discussions_thread__fc81e6_idx'),
+        ),
+    ]
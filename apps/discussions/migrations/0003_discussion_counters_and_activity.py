@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:44
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_ltilineitem_ltigradesubmission'),
+        ('courses', '0005_add_prerequisite_models'),
+        ('discussions', '0002_keyset_pagination_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='discussionreply',
+            name='reply_count',
+            field=models.PositiveIntegerField(default=0, help_text='Number of direct child replies'),
+        ),
+        migrations.AddField(
+            model_name='discussionthread',
+            name='participant_count',
+            field=models.PositiveIntegerField(default=0, help_text='Distinct users who posted in the thread (author included)'),
+        ),
+        migrations.CreateModel(
+            name='DiscussionActivity',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('activity_type', models.CharField(choices=[('THREAD_CREATED', 'Thread Created'), ('REPLY_CREATED', 'Reply Created'), ('REPLY_DELETED', 'Reply Deleted'), ('LIKED', 'Liked'), ('UNLIKED', 'Unliked')], max_length=20)),
+                ('actor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='discussion_activities', to=settings.AUTH_USER_MODEL)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='discussion_activities', to='courses.course')),
+                ('reply', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='activities', to='discussions.discussionreply')),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='discussion_activities', to='core.tenant')),
+                ('thread', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='activities', to='discussions.discussionthread')),
+            ],
+            options={
+                'verbose_name_plural': 'Discussion activities',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['course', 'created_at'], name='discussions_course__255da3_idx'), models.Index(fields=['tenant', 'created_at'], name='discussions_tenant__113ecf_idx')],
+            },
+        ),
+    ]
@@ -68,10 +68,14 @@ class DiscussionThread(TimestampedModel):
         help_text="Announcement threads are highlighted"
     )
     
-    # Cached counts for performance
+    # Cached counts for performance, maintained by DiscussionActivityService
     reply_count = models.PositiveIntegerField(default=0)
     like_count = models.PositiveIntegerField(default=0)
     view_count = models.PositiveIntegerField(default=0)
+    participant_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Distinct users who posted in the thread (author included)"
+    )
     
     last_activity_at = models.DateTimeField(auto_now=True)
     
@@ -125,6 +129,10 @@ class DiscussionReply(TimestampedModel):
     
     # Cached counts
     like_count = models.PositiveIntegerField(default=0)
+    reply_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of direct child replies"
+    )
     
     # Edited tracking
     is_edited = models.BooleanField(default=False)
@@ -136,7 +144,7 @@ class DiscussionReply(TimestampedModel):
     class Meta:
         ordering = ['created_at']
         indexes = [
-            models.Index(fields=['thread', 'created_at']),
+            models.Index(fields=['thread', 'created_at', 'id']),
             models.Index(fields=['author', 'created_at']),
             models.Index(fields=['parent_reply']),
         ]
@@ -235,3 +243,60 @@ class DiscussionView(TimestampedModel):
     
     class Meta:
         unique_together = ['user', 'thread']
+
+
+class DiscussionActivity(TimestampedModel):
+    """
+    Append-only log of discussion activity per course.
+    
+    Written alongside the counter updates so analytics can aggregate
+    discussion activity over a date range from one indexed table.
+    """
+    
+    class ActivityType(models.TextChoices):
+        THREAD_CREATED = "THREAD_CREATED", _("Thread Created")
+        REPLY_CREATED = "REPLY_CREATED", _("Reply Created")
+        REPLY_DELETED = "REPLY_DELETED", _("Reply Deleted")
+        LIKED = "LIKED", _("Liked")
+        UNLIKED = "UNLIKED", _("Unliked")
+    
+    tenant = models.ForeignKey(
+        'core.Tenant',
+        on_delete=models.CASCADE,
+        related_name='discussion_activities'
+    )
+    course = models.ForeignKey(
+        'courses.Course',
+        on_delete=models.CASCADE,
+        related_name='discussion_activities'
+    )
+    thread = models.ForeignKey(
+        DiscussionThread,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='activities'
+    )
+    reply = models.ForeignKey(
+        DiscussionReply,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='activities'
+    )
+    actor = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='discussion_activities'
+    )
+    activity_type = models.CharField(max_length=20, choices=ActivityType.choices)
+    
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name_plural = "Discussion activities"
+        indexes = [
+            models.Index(fields=['course', 'created_at']),
+            models.Index(fields=['tenant', 'created_at']),
+        ]
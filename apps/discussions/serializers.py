@@ -15,6 +15,36 @@ from .models import (
 )
 
 
+def _is_bookmarked(serializer, thread) -> bool:
+    """Bookmark state from the queryset annotation, else a lookup."""
+    if hasattr(thread, 'user_has_bookmarked'):
+        return thread.user_has_bookmarked
+    request = serializer.context.get('request')
+    if request and request.user.is_authenticated:
+        return DiscussionBookmark.objects.filter(
+            user=request.user,
+            thread=thread
+        ).exists()
+    return False
+
+
+def _has_new_replies(serializer, thread) -> bool:
+    """Whether the thread changed since the user's last view (never viewed = new)."""
+    if hasattr(thread, 'user_last_viewed_at'):
+        last_viewed_at = thread.user_last_viewed_at
+    else:
+        request = serializer.context.get('request')
+        if not (request and request.user.is_authenticated):
+            return False
+        last_viewed_at = DiscussionView.objects.filter(
+            user=request.user,
+            thread=thread
+        ).values_list('last_viewed_at', flat=True).first()
+    if last_viewed_at is None:
+        return True
+    return thread.last_activity_at > last_viewed_at
+
+
 class DiscussionReplySerializer(serializers.ModelSerializer):
     """Serializer for discussion replies."""
     
@@ -32,6 +62,7 @@ class DiscussionReplySerializer(serializers.ModelSerializer):
             'content',
             'is_hidden',
             'like_count',
+            'reply_count',
             'is_edited',
             'edited_at',
             'is_liked',
@@ -44,6 +75,7 @@ class DiscussionReplySerializer(serializers.ModelSerializer):
             'author',
             'is_hidden',
             'like_count',
+            'reply_count',
             'is_edited',
             'edited_at',
             'created_at',
@@ -52,6 +84,8 @@ class DiscussionReplySerializer(serializers.ModelSerializer):
     
     def get_is_liked(self, obj) -> bool:
         """Check if current user has liked this reply."""
+        if hasattr(obj, 'user_has_liked'):
+            return obj.user_has_liked
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             return DiscussionLike.objects.filter(
@@ -63,8 +97,10 @@ class DiscussionReplySerializer(serializers.ModelSerializer):
     def get_child_replies(self, obj):
         """Get nested replies (one level deep)."""
         # Only include child replies for top-level replies
-        if obj.parent_reply is None:
-            children = obj.child_replies.filter(is_hidden=False)[:5]
+        if obj.parent_reply_id is None:
+            children = getattr(obj, 'visible_child_replies', None)
+            if children is None:
+                children = obj.child_replies.filter(is_hidden=False)[:5]
             return DiscussionReplySerializer(
                 children, 
                 many=True, 
@@ -115,6 +151,7 @@ class DiscussionThreadSerializer(serializers.ModelSerializer):
             'reply_count',
             'like_count',
             'view_count',
+            'participant_count',
             'is_liked',
             'is_bookmarked',
             'has_new_replies',
@@ -132,6 +169,7 @@ class DiscussionThreadSerializer(serializers.ModelSerializer):
             'reply_count',
             'like_count',
             'view_count',
+            'participant_count',
             'last_activity_at',
             'created_at',
             'updated_at',
@@ -139,6 +177,8 @@ class DiscussionThreadSerializer(serializers.ModelSerializer):
     
     def get_is_liked(self, obj) -> bool:
         """Check if current user has liked this thread."""
+        if hasattr(obj, 'user_has_liked'):
+            return obj.user_has_liked
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             return DiscussionLike.objects.filter(
@@ -149,33 +189,20 @@ class DiscussionThreadSerializer(serializers.ModelSerializer):
     
     def get_is_bookmarked(self, obj) -> bool:
         """Check if current user has bookmarked this thread."""
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return DiscussionBookmark.objects.filter(
-                user=request.user,
-                thread=obj
-            ).exists()
-        return False
+        return _is_bookmarked(self, obj)
     
     def get_has_new_replies(self, obj) -> bool:
         """Check if thread has new replies since user's last view."""
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            view = DiscussionView.objects.filter(
-                user=request.user,
-                thread=obj
-            ).first()
-            if view:
-                return obj.last_activity_at > view.last_viewed_at
-            return True  # Never viewed = has new content
-        return False
+        return _has_new_replies(self, obj)
     
     def get_recent_replies(self, obj):
         """Get first few replies for preview."""
-        replies = obj.replies.filter(
-            is_hidden=False,
-            parent_reply__isnull=True
-        )[:3]
+        replies = getattr(obj, 'recent_reply_list', None)
+        if replies is None:
+            replies = obj.replies.filter(
+                is_hidden=False,
+                parent_reply__isnull=True
+            )[:3]
         return DiscussionReplySerializer(
             replies,
             many=True,
@@ -222,6 +249,7 @@ class DiscussionThreadListSerializer(serializers.ModelSerializer):
             'reply_count',
             'like_count',
             'view_count',
+            'participant_count',
             'is_bookmarked',
             'has_new_replies',
             'last_activity_at',
@@ -229,25 +257,10 @@ class DiscussionThreadListSerializer(serializers.ModelSerializer):
         ]
     
     def get_is_bookmarked(self, obj) -> bool:
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return DiscussionBookmark.objects.filter(
-                user=request.user,
-                thread=obj
-            ).exists()
-        return False
+        return _is_bookmarked(self, obj)
     
     def get_has_new_replies(self, obj) -> bool:
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            view = DiscussionView.objects.filter(
-                user=request.user,
-                thread=obj
-            ).first()
-            if view:
-                return obj.last_activity_at > view.last_viewed_at
-            return True
-        return False
+        return _has_new_replies(self, obj)
 
 
 class DiscussionBookmarkSerializer(serializers.ModelSerializer):
@@ -0,0 +1,461 @@
+import logging
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Count, Exists, F, OuterRef, Prefetch, Q, Subquery, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import (
+    DiscussionActivity,
+    DiscussionBookmark,
+    DiscussionLike,
+    DiscussionReply,
+    DiscussionThread,
+    DiscussionView,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class DiscussionQueryService:
+    """
+    Per-user queryset annotations for discussion listings.
+
+    Serializers read `user_has_liked`, `user_has_bookmarked` and
+    `user_last_viewed_at` annotations, and the `recent_reply_list` /
+    `visible_child_replies` prefetches, instead of querying per row. Previews
+    are loaded with sliced prefetches, which Django runs as one windowed
+    (ROW_NUMBER() OVER (PARTITION BY ...)) query per level.
+    """
+
+    RECENT_REPLY_LIMIT = 3
+    CHILD_REPLY_LIMIT = 5
+
+    @classmethod
+    def annotate_threads(cls, queryset, user):
+        """Adds the user's like, bookmark and last-view state to each thread."""
+        return queryset.annotate(
+            user_has_liked=Exists(
+                DiscussionLike.objects.filter(user=user, thread=OuterRef('pk'))
+            ),
+            user_has_bookmarked=Exists(
+                DiscussionBookmark.objects.filter(user=user, thread=OuterRef('pk'))
+            ),
+            user_last_viewed_at=Subquery(
+                DiscussionView.objects.filter(
+                    user=user, thread=OuterRef('pk')
+                ).values('last_viewed_at')[:1]
+            ),
+        )
+
+    @classmethod
+    def annotate_replies(cls, queryset, user):
+        """Adds the user's like state to each reply."""
+        return queryset.annotate(
+            user_has_liked=Exists(
+                DiscussionLike.objects.filter(user=user, reply=OuterRef('pk'))
+            ),
+        )
+
+    @classmethod
+    def _visible_replies(cls, user):
+        return cls.annotate_replies(
+            DiscussionReply.objects.filter(is_hidden=False).select_related('author__profile'),
+            user,
+        ).order_by('created_at', 'id')
+
+    @classmethod
+    def child_reply_prefetch(cls, user, lookup='child_replies') -> Prefetch:
+        """First visible child replies of each reply, as `visible_child_replies`."""
+        return Prefetch(
+            lookup,
+            queryset=cls._visible_replies(user)[:cls.CHILD_REPLY_LIMIT],
+            to_attr='visible_child_replies',
+        )
+
+    @classmethod
+    def with_recent_replies(cls, queryset, user):
+        """Prefetches each thread's first top-level replies and their children."""
+        return queryset.prefetch_related(
+            Prefetch(
+                'replies',
+                queryset=cls._visible_replies(user).filter(
+                    parent_reply__isnull=True
+                )[:cls.RECENT_REPLY_LIMIT],
+                to_attr='recent_reply_list',
+            ),
+            cls.child_reply_prefetch(user, 'recent_reply_list__child_replies'),
+        )
+
+    @classmethod
+    def thread_prefetch(cls, user, lookup='thread') -> Prefetch:
+        """Annotated threads for querysets of related objects (e.g. bookmarks)."""
+        return Prefetch(
+            lookup,
+            queryset=cls.annotate_threads(
+                DiscussionThread.objects.select_related('author__profile'), user
+            ),
+        )
+
+
+class DiscussionActivityService:
+    """
+    Maintains denormalised discussion counters and the activity log.
+
+    Counters are updated with F() expressions so concurrent posts and likes
+    never overwrite each other, and every change appends a
+    DiscussionActivity row in the same transaction. Drift (e.g. rows
+    changed outside these methods) is fixed by `repair_counters`.
+    """
+
+    MESSAGE_TYPES = (
+        DiscussionActivity.ActivityType.THREAD_CREATED,
+        DiscussionActivity.ActivityType.REPLY_CREATED,
+    )
+
+    # Activity recorded for the analytics app's DiscussionInteraction types
+    INTERACTION_ACTIVITY_TYPES = {
+        'post': DiscussionActivity.ActivityType.THREAD_CREATED,
+        'reply': DiscussionActivity.ActivityType.REPLY_CREATED,
+        'like': DiscussionActivity.ActivityType.LIKED,
+    }
+
+    @staticmethod
+    def _log(activity_type, thread, actor, reply=None) -> DiscussionActivity:
+        return DiscussionActivity.objects.create(
+            tenant_id=thread.tenant_id,
+            course_id=thread.course_id,
+            thread=thread,
+            reply=reply,
+            actor=actor,
+            activity_type=activity_type,
+        )
+
+    @staticmethod
+    def _decrement(field: str):
+        return Greatest(F(field) - 1, Value(0))
+
+    @classmethod
+    def thread_created(cls, thread: DiscussionThread) -> None:
+        """Logs a new thread; its author is its first participant."""
+        with transaction.atomic():
+            DiscussionThread.objects.filter(pk=thread.pk).update(participant_count=1)
+            thread.participant_count = 1
+            cls._log(DiscussionActivity.ActivityType.THREAD_CREATED, thread, thread.author)
+
+    @classmethod
+    def reply_created(cls, reply: DiscussionReply) -> None:
+        """Bumps thread (and parent reply) counters for a newly saved reply."""
+        thread = reply.thread
+        now = timezone.now()
+        with transaction.atomic():
+            updates = {'reply_count': F('reply_count') + 1, 'last_activity_at': now}
+            if cls._is_new_participant(reply):
+                updates['participant_count'] = F('participant_count') + 1
+            DiscussionThread.objects.filter(pk=thread.pk).update(**updates)
+            if reply.parent_reply_id:
+                DiscussionReply.objects.filter(pk=reply.parent_reply_id).update(
+                    reply_count=F('reply_count') + 1
+                )
+            cls._log(DiscussionActivity.ActivityType.REPLY_CREATED, thread, reply.author, reply)
+        thread.refresh_from_db(fields=['reply_count', 'participant_count', 'last_activity_at'])
+
+    @staticmethod
+    def _is_new_participant(reply: DiscussionReply) -> bool:
+        if reply.author_id == reply.thread.author_id:
+            return False
+        return not DiscussionReply.objects.filter(
+            thread_id=reply.thread_id, author_id=reply.author_id
+        ).exclude(pk=reply.pk).exists()
+
+    @classmethod
+    def reply_deleted(cls, reply: DiscussionReply, actor=None) -> None:
+        """Deletes a reply (and its nested replies) and decrements counters."""
+        thread = reply.thread
+        with transaction.atomic():
+            removed = cls._subtree(reply)
+            authors = {author_id for _, author_id in removed} - {thread.author_id}
+            cls._log(DiscussionActivity.ActivityType.REPLY_DELETED, thread, actor or reply.author, reply)
+            parent_id = reply.parent_reply_id
+            reply.delete()
+
+            remaining_authors = set(
+                DiscussionReply.objects.filter(
+                    thread_id=thread.pk, author_id__in=authors
+                ).values_list('author_id', flat=True).distinct()
+            )
+            DiscussionThread.objects.filter(pk=thread.pk).update(
+                reply_count=Greatest(F('reply_count') - len(removed), Value(0)),
+                participant_count=Greatest(
+                    F('participant_count') - len(authors - remaining_authors), Value(0)
+                ),
+            )
+            if parent_id:
+                DiscussionReply.objects.filter(pk=parent_id).update(
+                    reply_count=cls._decrement('reply_count')
+                )
+        thread.refresh_from_db(fields=['reply_count', 'participant_count'])
+
+    @staticmethod
+    def _subtree(reply: DiscussionReply) -> list:
+        """(id, author_id) of the reply and every reply nested under it."""
+        rows = [(reply.pk, reply.author_id)]
+        frontier = [reply.pk]
+        while frontier:
+            children = list(
+                DiscussionReply.objects.filter(parent_reply_id__in=frontier).values_list('id', 'author_id')
+            )
+            rows.extend(children)
+            frontier = [pk for pk, _ in children]
+        return rows
+
+    @classmethod
+    def toggle_like(cls, user, thread: DiscussionThread, reply: DiscussionReply = None) -> tuple[bool, int]:
+        """
+        Likes or unlikes a thread, or a reply when one is given.
+
+        Returns (liked, like_count) with the count read back after the
+        atomic update.
+        """
+        target = reply or thread
+        model = type(target)
+        with transaction.atomic():
+            like, created = DiscussionLike.objects.get_or_create(
+                user=user,
+                thread=None if reply else thread,
+                reply=reply,
+            )
+            if created:
+                model.objects.filter(pk=target.pk).update(like_count=F('like_count') + 1)
+                activity_type = DiscussionActivity.ActivityType.LIKED
+            else:
+                like.delete()
+                model.objects.filter(pk=target.pk).update(like_count=cls._decrement('like_count'))
+                activity_type = DiscussionActivity.ActivityType.UNLIKED
+            cls._log(activity_type, thread, user, reply)
+        target.refresh_from_db(fields=['like_count'])
+        return created, target.like_count
+
+    @staticmethod
+    def record_view(thread: DiscussionThread) -> None:
+        """Counts a user's first view of a thread."""
+        DiscussionThread.objects.filter(pk=thread.pk).update(view_count=F('view_count') + 1)
+        thread.refresh_from_db(fields=['view_count'])
+
+    # --- Analytics ---
+
+    @staticmethod
+    def _activity_in_range(course_ids, start_date, end_date=None, tenant=None):
+        """Activity for the given courses between two dates (inclusive)."""
+        start = timezone.make_aware(datetime.combine(start_date, time.min))
+        queryset = DiscussionActivity.objects.filter(course_id__in=course_ids, created_at__gte=start)
+        if end_date:
+            end = timezone.make_aware(datetime.combine(end_date + timedelta(days=1), time.min))
+            queryset = queryset.filter(created_at__lt=end)
+        if tenant:
+            queryset = queryset.filter(tenant=tenant)
+        return queryset
+
+    @classmethod
+    def _summary_aggregates(cls) -> dict:
+        return {
+            'messages': Count('id', filter=Q(activity_type__in=cls.MESSAGE_TYPES)),
+            'participants': Count(
+                'actor', filter=Q(activity_type__in=cls.MESSAGE_TYPES), distinct=True
+            ),
+            'threads': Count(
+                'id', filter=Q(activity_type=DiscussionActivity.ActivityType.THREAD_CREATED)
+            ),
+        }
+
+    @classmethod
+    def summarize(cls, course_ids, start_date, end_date=None, tenant=None) -> dict:
+        """Messages posted, distinct posters and threads created across courses."""
+        return cls._activity_in_range(course_ids, start_date, end_date, tenant).aggregate(
+            **cls._summary_aggregates()
+        )
+
+    @classmethod
+    def summarize_by_course(cls, course_ids, start_date, end_date=None, tenant=None) -> dict:
+        """Per-course version of `summarize`, keyed by course id."""
+        rows = cls._activity_in_range(course_ids, start_date, end_date, tenant).values(
+            'course_id'
+        ).order_by().annotate(**cls._summary_aggregates())
+        return {row.pop('course_id'): row for row in rows}
+
+    # --- Repair ---
+
+    @classmethod
+    def repair_counters(cls, tenant=None, batch_size: int = 500) -> dict:
+        """
+        Recomputes thread and reply counters from their source tables.
+
+        Works through threads in primary-key batches so large forums are
+        repaired without loading everything at once. Returns the number of
+        rows corrected per model.
+        """
+        threads = DiscussionThread.objects.all()
+        if tenant:
+            threads = threads.filter(tenant=tenant)
+
+        corrected = {'threads': 0, 'replies': 0}
+        last_pk = None
+        while True:
+            batch = threads.order_by('pk')
+            if last_pk is not None:
+                batch = batch.filter(pk__gt=last_pk)
+            thread_ids = list(batch.values_list('pk', flat=True)[:batch_size])
+            if not thread_ids:
+                break
+            last_pk = thread_ids[-1]
+            with transaction.atomic():
+                corrected['threads'] += cls._repair_threads(thread_ids)
+                corrected['replies'] += cls._repair_replies(thread_ids)
+
+        logger.info(
+            f"Repaired discussion counters: {corrected['threads']} threads, "
+            f"{corrected['replies']} replies"
+        )
+        return corrected
+
+    @staticmethod
+    def _repair_threads(thread_ids) -> int:
+        reply_totals = dict(
+            DiscussionReply.objects.filter(thread_id__in=thread_ids).values('thread_id').order_by()
+            .annotate(total=Count('id')).values_list('thread_id', 'total')
+        )
+        like_totals = dict(
+            DiscussionLike.objects.filter(thread_id__in=thread_ids).values('thread_id').order_by()
+            .annotate(total=Count('id')).values_list('thread_id', 'total')
+        )
+        posters = {}
+        for thread_id, author_id in (
+            DiscussionReply.objects.filter(thread_id__in=thread_ids)
+            .values_list('thread_id', 'author_id').distinct()
+        ):
+            posters.setdefault(thread_id, set()).add(author_id)
+
+        changed = []
+        for thread in DiscussionThread.objects.filter(pk__in=thread_ids).only(
+            'id', 'author_id', 'reply_count', 'like_count', 'participant_count'
+        ):
+            expected = (
+                reply_totals.get(thread.pk, 0),
+                like_totals.get(thread.pk, 0),
+                len(posters.get(thread.pk, set()) | {thread.author_id}),
+            )
+            if (thread.reply_count, thread.like_count, thread.participant_count) != expected:
+                thread.reply_count, thread.like_count, thread.participant_count = expected
+                changed.append(thread)
+        # bulk_update issues a plain UPDATE, leaving last_activity_at untouched
+        DiscussionThread.objects.bulk_update(changed, ['reply_count', 'like_count', 'participant_count'])
+        return len(changed)
+
+    @staticmethod
+    def _repair_replies(thread_ids) -> int:
+        child_totals = dict(
+            DiscussionReply.objects.filter(thread_id__in=thread_ids, parent_reply__isnull=False)
+            .values('parent_reply_id').order_by().annotate(total=Count('id'))
+            .values_list('parent_reply_id', 'total')
+        )
+        like_totals = dict(
+            DiscussionLike.objects.filter(reply__thread_id__in=thread_ids).values('reply_id').order_by()
+            .annotate(total=Count('id')).values_list('reply_id', 'total')
+        )
+        changed = []
+        for reply in DiscussionReply.objects.filter(thread_id__in=thread_ids).only(
+            'id', 'reply_count', 'like_count'
+        ):
+            expected = (child_totals.get(reply.pk, 0), like_totals.get(reply.pk, 0))
+            if (reply.reply_count, reply.like_count) != expected:
+                reply.reply_count, reply.like_count = expected
+                changed.append(reply)
+        DiscussionReply.objects.bulk_update(changed, ['reply_count', 'like_count'])
+        return len(changed)
+
+    @classmethod
+    def backfill_activity(cls, tenant=None, batch_size: int = 500) -> dict:
+        """
+        Logs threads, replies and likes that have no activity row yet.
+
+        Discussions written before the activity log existed (or outside this
+        service) are otherwise missing from `summarize`. Backfilled rows keep
+        the source row's created_at, and a second run adds nothing. Returns
+        the number of rows written per source.
+        """
+        activity_type = DiscussionActivity.ActivityType
+        threads = DiscussionThread.objects.filter(~Exists(DiscussionActivity.objects.filter(
+            thread=OuterRef('pk'), activity_type=activity_type.THREAD_CREATED,
+        )))
+        replies = DiscussionReply.objects.select_related('thread').filter(~Exists(
+            DiscussionActivity.objects.filter(reply=OuterRef('pk'), activity_type=activity_type.REPLY_CREATED)
+        ))
+        thread_likes = DiscussionLike.objects.select_related('thread').filter(
+            thread__isnull=False,
+        ).filter(~Exists(DiscussionActivity.objects.filter(
+            thread=OuterRef('thread'), reply__isnull=True, actor=OuterRef('user'),
+            activity_type=activity_type.LIKED,
+        )))
+        reply_likes = DiscussionLike.objects.select_related('reply__thread').filter(
+            reply__isnull=False,
+        ).filter(~Exists(DiscussionActivity.objects.filter(
+            reply=OuterRef('reply'), actor=OuterRef('user'), activity_type=activity_type.LIKED,
+        )))
+        if tenant:
+            threads = threads.filter(tenant=tenant)
+            replies = replies.filter(thread__tenant=tenant)
+            thread_likes = thread_likes.filter(thread__tenant=tenant)
+            reply_likes = reply_likes.filter(reply__thread__tenant=tenant)
+
+        backfilled = {
+            'threads': cls._backfill(threads, batch_size, lambda thread: cls._activity(
+                activity_type.THREAD_CREATED, thread, thread.author_id,
+            )),
+            'replies': cls._backfill(replies, batch_size, lambda reply: cls._activity(
+                activity_type.REPLY_CREATED, reply.thread, reply.author_id, reply,
+            )),
+            'likes': cls._backfill(thread_likes, batch_size, lambda like: cls._activity(
+                activity_type.LIKED, like.thread, like.user_id,
+            )) + cls._backfill(reply_likes, batch_size, lambda like: cls._activity(
+                activity_type.LIKED, like.reply.thread, like.user_id, like.reply,
+            )),
+        }
+        logger.info(
+            f"Backfilled discussion activity: {backfilled['threads']} threads, "
+            f"{backfilled['replies']} replies, {backfilled['likes']} likes"
+        )
+        return backfilled
+
+    @staticmethod
+    def _activity(activity_type, thread, actor_id, reply=None) -> DiscussionActivity:
+        return DiscussionActivity(
+            tenant_id=thread.tenant_id,
+            course_id=thread.course_id,
+            thread=thread,
+            reply=reply,
+            actor_id=actor_id,
+            activity_type=activity_type,
+        )
+
+    @staticmethod
+    def _backfill(queryset, batch_size: int, to_activity) -> int:
+        written = 0
+        last_pk = None
+        while True:
+            batch = queryset.order_by('pk')
+            if last_pk is not None:
+                batch = batch.filter(pk__gt=last_pk)
+            sources = list(batch[:batch_size])
+            if not sources:
+                return written
+            last_pk = sources[-1].pk
+            activities = [to_activity(source) for source in sources]
+            with transaction.atomic():
+                DiscussionActivity.objects.bulk_create(activities)
+                # created_at is auto_now_add, so bulk_create stamped the current
+                # time; bulk_update writes the source timestamps back as given.
+                for activity, source in zip(activities, sources):
+                    activity.created_at = source.created_at
+                DiscussionActivity.objects.bulk_update(activities, ['created_at'])
+            written += len(activities)
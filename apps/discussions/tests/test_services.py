@@ -0,0 +1,176 @@
+"""
+Tests for discussion services - denormalised counters, activity log and repair.
+"""
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.core.models import Tenant
+from apps.courses.models import Course
+from apps.discussions.models import DiscussionActivity, DiscussionLike, DiscussionReply, DiscussionThread
+from apps.discussions.services import DiscussionActivityService
+from apps.enrollments.models import Enrollment
+from apps.users.models import User
+
+
+class DiscussionActivityServiceTests(TestCase):
+    """Tests for DiscussionActivityService."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.client = APIClient()
+        self.tenant = Tenant.objects.create(name="Test Tenant", slug="test-tenant")
+        self.instructor = User.objects.create_user(
+            email="instructor@example.com",
+            password="testpass123",
+            role=User.Role.INSTRUCTOR,
+            tenant=self.tenant
+        )
+        self.learners = [
+            User.objects.create_user(
+                email=f"learner{index}@example.com",
+                password="testpass123",
+                tenant=self.tenant
+            )
+            for index in range(2)
+        ]
+        self.course = Course.objects.create(
+            title="Python Programming",
+            slug="python-programming",
+            tenant=self.tenant,
+            status=Course.Status.PUBLISHED,
+            instructor=self.instructor,
+        )
+        for learner in self.learners:
+            Enrollment.objects.create(user=learner, course=self.course, status=Enrollment.Status.ACTIVE)
+        self.thread = DiscussionThread.objects.create(
+            tenant=self.tenant,
+            course=self.course,
+            author=self.instructor,
+            title="Welcome",
+            content="Introduce yourself",
+        )
+        DiscussionActivityService.thread_created(self.thread)
+
+    def _reply(self, author, parent=None):
+        self.client.force_authenticate(user=author)
+        response = self.client.post(
+            reverse('discussion-reply-list'),
+            {'thread': str(self.thread.id), 'parent_reply': str(parent.id) if parent else '', 'content': "Hi"},
+            format='json',
+            HTTP_X_TENANT_SLUG=self.tenant.slug
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        return DiscussionReply.objects.filter(author=author).latest('created_at')
+
+    def test_replies_update_thread_and_parent_counters(self):
+        first = self._reply(self.learners[0])
+        self._reply(self.learners[0], parent=first)
+        self._reply(self.instructor, parent=first)
+
+        self.thread.refresh_from_db()
+        first.refresh_from_db()
+        self.assertEqual(self.thread.reply_count, 3)
+        # Instructor authored the thread; learner 0 is the only new participant
+        self.assertEqual(self.thread.participant_count, 2)
+        self.assertEqual(first.reply_count, 2)
+        self.assertEqual(
+            DiscussionActivity.objects.filter(
+                course=self.course, activity_type=DiscussionActivity.ActivityType.REPLY_CREATED
+            ).count(),
+            3
+        )
+
+    def test_deleting_reply_removes_its_subtree_from_counters(self):
+        first = self._reply(self.learners[0])
+        self._reply(self.learners[1], parent=first)
+        self._reply(self.learners[1])
+
+        self.client.force_authenticate(user=self.learners[0])
+        response = self.client.delete(
+            reverse('discussion-reply-detail', args=[first.id]),
+            HTTP_X_TENANT_SLUG=self.tenant.slug
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.thread.refresh_from_db()
+        self.assertEqual(self.thread.reply_count, 1)
+        # Learner 1 still has a reply in the thread
+        self.assertEqual(self.thread.participant_count, 2)
+
+    def test_like_toggle_is_counted_and_logged(self):
+        self.client.force_authenticate(user=self.learners[0])
+        url = reverse('discussion-thread-toggle-like', args=[self.thread.id])
+
+        liked = self.client.post(url, HTTP_X_TENANT_SLUG=self.tenant.slug).data
+        unliked = self.client.post(url, HTTP_X_TENANT_SLUG=self.tenant.slug).data
+
+        self.assertEqual(liked, {'liked': True, 'like_count': 1})
+        self.assertEqual(unliked, {'liked': False, 'like_count': 0})
+        self.assertEqual(
+            list(DiscussionActivity.objects.order_by('created_at').values_list('activity_type', flat=True)),
+            ['THREAD_CREATED', 'LIKED', 'UNLIKED']
+        )
+
+    def test_summarize_by_course_counts_messages_and_posters(self):
+        self._reply(self.learners[0])
+        self._reply(self.learners[0])
+        self._reply(self.learners[1])
+        today = timezone.now().date()
+
+        summary = DiscussionActivityService.summarize_by_course([self.course.id], today - timedelta(days=1), today)
+
+        self.assertEqual(summary[self.course.id], {'messages': 4, 'participants': 3, 'threads': 1})
+        self.assertEqual(
+            DiscussionActivityService.summarize([self.course.id], today + timedelta(days=1))['messages'], 0
+        )
+
+    def test_repair_command_recomputes_drifted_counters(self):
+        reply = self._reply(self.learners[0])
+        DiscussionLike.objects.create(user=self.learners[1], reply=reply)
+        DiscussionThread.objects.filter(pk=self.thread.pk).update(
+            reply_count=9, like_count=4, participant_count=0
+        )
+        last_activity_at = DiscussionThread.objects.get(pk=self.thread.pk).last_activity_at
+
+        output = StringIO()
+        call_command('repair_discussion_counters', '--batch-size', '1', stdout=output)
+
+        self.thread.refresh_from_db()
+        reply.refresh_from_db()
+        self.assertEqual(
+            (self.thread.reply_count, self.thread.like_count, self.thread.participant_count), (1, 0, 2)
+        )
+        self.assertEqual(reply.like_count, 1)
+        self.assertEqual(self.thread.last_activity_at, last_activity_at)
+        self.assertIn("Corrected 1 threads and 1 replies", output.getvalue())
+
+    def test_backfill_logs_unrecorded_discussions_once(self):
+        posted_at = timezone.now() - timedelta(days=10)
+        reply = DiscussionReply.objects.create(thread=self.thread, author=self.learners[0], content="Hi")
+        DiscussionReply.objects.filter(pk=reply.pk).update(created_at=posted_at)
+        DiscussionLike.objects.create(user=self.learners[1], reply=reply)
+        DiscussionLike.objects.create(user=self.learners[1], thread=self.thread)
+
+        output = StringIO()
+        call_command('repair_discussion_counters', '--backfill-activity', '--batch-size', '1', stdout=output)
+        call_command('repair_discussion_counters', '--backfill-activity', stdout=StringIO())
+
+        self.assertIn("Backfilled activity for 0 threads, 1 replies and 2 likes", output.getvalue())
+        logged = DiscussionActivity.objects.get(
+            reply=reply, activity_type=DiscussionActivity.ActivityType.REPLY_CREATED
+        )
+        self.assertEqual(logged.created_at, posted_at)
+        self.assertEqual(DiscussionActivity.objects.filter(
+            activity_type=DiscussionActivity.ActivityType.LIKED, actor=self.learners[1]
+        ).count(), 2)
+        self.assertEqual(
+            DiscussionActivityService.summarize([self.course.id], (posted_at - timedelta(days=1)).date()),
+            {'messages': 2, 'participants': 2, 'threads': 1},
+        )
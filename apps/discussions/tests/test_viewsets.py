@@ -0,0 +1,165 @@
+"""
+Tests for discussion viewsets - per-user thread state and query counts.
+"""
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.core.models import Tenant
+from apps.core.services import TenantService
+from apps.courses.models import Course
+from apps.discussions.models import (
+    DiscussionBookmark,
+    DiscussionLike,
+    DiscussionReply,
+    DiscussionThread,
+    DiscussionView,
+)
+from apps.enrollments.models import Enrollment
+from apps.users.models import User
+
+
+class DiscussionThreadViewSetTests(TestCase):
+    """Tests for DiscussionThreadViewSet and friends."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.client = APIClient()
+        self.tenant = Tenant.objects.create(name="Test Tenant", slug="test-tenant")
+        self.instructor = User.objects.create_user(
+            email="instructor@example.com",
+            password="testpass123",
+            role=User.Role.INSTRUCTOR,
+            tenant=self.tenant
+        )
+        self.learner = User.objects.create_user(
+            email="learner@example.com",
+            password="testpass123",
+            tenant=self.tenant
+        )
+        self.course = Course.objects.create(
+            title="Python Programming",
+            slug="python-programming",
+            tenant=self.tenant,
+            status=Course.Status.PUBLISHED,
+            instructor=self.instructor,
+        )
+        Enrollment.objects.create(
+            user=self.learner,
+            course=self.course,
+            status=Enrollment.Status.ACTIVE,
+        )
+        self.client.force_authenticate(user=self.learner)
+        self.list_url = reverse('discussion-thread-list')
+
+    def _create_threads(self, count):
+        threads = []
+        for index in range(count):
+            thread = DiscussionThread.objects.create(
+                tenant=self.tenant,
+                course=self.course,
+                author=self.instructor if index % 2 else self.learner,
+                title=f"Thread {index}",
+                content="Body",
+            )
+            for reply_index in range(4):
+                reply = DiscussionReply.objects.create(
+                    thread=thread, author=self.instructor, content=f"Reply {reply_index}"
+                )
+                DiscussionReply.objects.create(
+                    thread=thread, author=self.learner, parent_reply=reply, content="Child"
+                )
+            DiscussionLike.objects.create(user=self.learner, thread=thread)
+            DiscussionBookmark.objects.create(user=self.learner, thread=thread)
+            DiscussionView.objects.create(user=self.learner, thread=thread)
+            threads.append(thread)
+        return threads
+
+    def _count_queries(self, url):
+        # Resolve the tenant first so filling its cache isn't counted
+        TenantService.get_tenant_by_slug(self.tenant.slug)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, HTTP_X_TENANT_SLUG=self.tenant.slug)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(context)
+
+    def test_list_query_count_does_not_grow_with_page_size(self):
+        self._create_threads(5)
+        small_page = self._count_queries(self.list_url)
+
+        self._create_threads(15)
+        full_page = self._count_queries(self.list_url)
+
+        self.assertEqual(full_page, small_page)
+
+    def test_bookmark_list_query_count_does_not_grow_with_page_size(self):
+        self._create_threads(3)
+        url = reverse('discussion-bookmark-list')
+        small_page = self._count_queries(url)
+
+        self._create_threads(12)
+
+        self.assertEqual(self._count_queries(url), small_page)
+
+    def test_reply_list_query_count_does_not_grow_with_page_size(self):
+        thread = self._create_threads(1)[0]
+        url = f"{reverse('discussion-reply-list')}?thread_id={thread.id}"
+        small_page = self._count_queries(url)
+
+        for index in range(6):
+            reply = DiscussionReply.objects.create(
+                thread=thread, author=self.instructor, content=f"Extra {index}"
+            )
+            DiscussionReply.objects.create(
+                thread=thread, author=self.learner, parent_reply=reply, content="Child"
+            )
+
+        self.assertEqual(self._count_queries(url), small_page)
+
+    def test_list_reports_bookmark_and_new_reply_state(self):
+        viewed, unviewed = DiscussionThread.objects.bulk_create([
+            DiscussionThread(tenant=self.tenant, course=self.course, author=self.instructor, title=title, content="")
+            for title in ("Viewed", "Unviewed")
+        ])
+        DiscussionBookmark.objects.create(user=self.learner, thread=viewed)
+        DiscussionView.objects.create(user=self.learner, thread=viewed)
+        DiscussionThread.objects.filter(pk=viewed.pk).update(
+            last_activity_at=timezone.now() - timedelta(hours=1)
+        )
+
+        response = self.client.get(self.list_url, HTTP_X_TENANT_SLUG=self.tenant.slug)
+
+        results = {item['title']: item for item in response.data['results']}
+        self.assertTrue(results['Viewed']['is_bookmarked'])
+        self.assertFalse(results['Viewed']['has_new_replies'])
+        self.assertFalse(results['Unviewed']['is_bookmarked'])
+        self.assertTrue(results['Unviewed']['has_new_replies'])
+
+    def test_retrieve_includes_user_state_and_reply_previews(self):
+        thread = self._create_threads(1)[0]
+        hidden = DiscussionReply.objects.create(
+            thread=thread, author=self.instructor, content="Hidden", is_hidden=True
+        )
+        first_reply = thread.replies.filter(parent_reply__isnull=True).order_by('created_at').first()
+        DiscussionLike.objects.create(user=self.learner, reply=first_reply)
+
+        response = self.client.get(
+            reverse('discussion-thread-detail', args=[thread.id]),
+            HTTP_X_TENANT_SLUG=self.tenant.slug
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['is_liked'])
+        self.assertTrue(response.data['is_bookmarked'])
+        recent = response.data['recent_replies']
+        self.assertEqual([reply['content'] for reply in recent], ["Reply 0", "Reply 1", "Reply 2"])
+        self.assertNotIn(str(hidden.id), [reply['id'] for reply in recent])
+        self.assertTrue(recent[0]['is_liked'])
+        self.assertFalse(recent[1]['is_liked'])
+        self.assertEqual([child['content'] for child in recent[0]['child_replies']], ["Child"])
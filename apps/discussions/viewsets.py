@@ -15,11 +15,11 @@ from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiResponse
 from drf_spectacular.types import OpenApiTypes
 
+from apps.common.pagination import OldestFirstKeysetPagination
 from apps.enrollments.models import Enrollment
 
 from .models import (
     DiscussionBookmark,
-    DiscussionLike,
     DiscussionReply,
     DiscussionThread,
     DiscussionView,
@@ -32,6 +32,7 @@ from .serializers import (
     DiscussionThreadListSerializer,
     DiscussionThreadSerializer,
 )
+from .services import DiscussionActivityService, DiscussionQueryService
 
 
 class IsEnrolledInCourse(permissions.BasePermission):
@@ -147,7 +148,13 @@ class DiscussionThreadViewSet(viewsets.ModelViewSet):
         if not include_archived:
             queryset = queryset.exclude(status=DiscussionThread.Status.ARCHIVED)
         
-        return queryset.select_related('author', 'course', 'content_item').prefetch_related('replies')
+        queryset = queryset.select_related('author__profile', 'course', 'content_item')
+        if self.action == 'list':
+            return DiscussionQueryService.annotate_threads(queryset, user)
+        if self.action == 'retrieve':
+            queryset = DiscussionQueryService.annotate_threads(queryset, user)
+            return DiscussionQueryService.with_recent_replies(queryset, user)
+        return queryset
     
     @extend_schema(
         parameters=[
@@ -162,7 +169,8 @@ class DiscussionThreadViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         """Set author and tenant when creating a thread."""
         tenant = getattr(self.request, 'tenant', None)
-        serializer.save(author=self.request.user, tenant=tenant)
+        thread = serializer.save(author=self.request.user, tenant=tenant)
+        DiscussionActivityService.thread_created(thread)
     
     def perform_update(self, serializer):
         """Only allow authors, instructors, and admins to update threads."""
@@ -202,23 +210,8 @@ class DiscussionThreadViewSet(viewsets.ModelViewSet):
     def toggle_like(self, request, pk=None):
         """Toggle like on a thread."""
         thread = self.get_object()
-        user = request.user
-        
-        like, created = DiscussionLike.objects.get_or_create(
-            user=user,
-            thread=thread,
-            defaults={'reply': None}
-        )
-        
-        if not created:
-            like.delete()
-            thread.like_count = max(0, thread.like_count - 1)
-            thread.save(update_fields=['like_count'])
-            return Response({'liked': False, 'like_count': thread.like_count})
-        
-        thread.like_count += 1
-        thread.save(update_fields=['like_count'])
-        return Response({'liked': True, 'like_count': thread.like_count})
+        liked, like_count = DiscussionActivityService.toggle_like(request.user, thread)
+        return Response({'liked': liked, 'like_count': like_count})
     
     @extend_schema(
         description="Toggle bookmark on a discussion thread",
@@ -259,8 +252,7 @@ class DiscussionThreadViewSet(viewsets.ModelViewSet):
         
         # Increment view count only on first view
         if created:
-            thread.view_count += 1
-            thread.save(update_fields=['view_count'])
+            DiscussionActivityService.record_view(thread)
         
         return Response({
             'viewed': True,
@@ -337,6 +329,7 @@ class DiscussionReplyViewSet(viewsets.ModelViewSet):
     """
     
     permission_classes = [permissions.IsAuthenticated, IsEnrolledInCourse]
+    pagination_class = OldestFirstKeysetPagination
     
     def get_serializer_class(self):
         if self.action == 'create':
@@ -381,7 +374,12 @@ class DiscussionReplyViewSet(viewsets.ModelViewSet):
                 Q(is_hidden=False) | Q(author=user)
             )
         
-        return queryset.select_related('author', 'thread', 'parent_reply')
+        queryset = queryset.select_related('author__profile', 'thread', 'parent_reply')
+        if self.action in ('list', 'retrieve'):
+            queryset = DiscussionQueryService.annotate_replies(queryset, user).prefetch_related(
+                DiscussionQueryService.child_reply_prefetch(user)
+            )
+        return queryset
     
     @extend_schema(
         parameters=[
@@ -402,10 +400,8 @@ class DiscussionReplyViewSet(viewsets.ModelViewSet):
         
         reply = serializer.save(author=self.request.user)
         
-        # Update thread reply count and last activity
-        thread.reply_count += 1
-        thread.last_activity_at = timezone.now()
-        thread.save(update_fields=['reply_count', 'last_activity_at'])
+        # Update thread reply count, participants and last activity
+        DiscussionActivityService.reply_created(reply)
     
     def perform_update(self, serializer):
         """Only allow authors, instructors, and admins to update replies."""
@@ -435,12 +431,7 @@ class DiscussionReplyViewSet(viewsets.ModelViewSet):
             from rest_framework.exceptions import PermissionDenied
             raise PermissionDenied("You don't have permission to delete this reply.")
         
-        thread = instance.thread
-        instance.delete()
-        
-        # Update thread reply count
-        thread.reply_count = max(0, thread.reply_count - 1)
-        thread.save(update_fields=['reply_count'])
+        DiscussionActivityService.reply_deleted(instance, actor=user)
     
     @extend_schema(
         description="Toggle like on a discussion reply",
@@ -450,23 +441,10 @@ class DiscussionReplyViewSet(viewsets.ModelViewSet):
     def toggle_like(self, request, pk=None):
         """Toggle like on a reply."""
         reply = self.get_object()
-        user = request.user
-        
-        like, created = DiscussionLike.objects.get_or_create(
-            user=user,
-            reply=reply,
-            defaults={'thread': None}
+        liked, like_count = DiscussionActivityService.toggle_like(
+            request.user, reply.thread, reply=reply
         )
-        
-        if not created:
-            like.delete()
-            reply.like_count = max(0, reply.like_count - 1)
-            reply.save(update_fields=['like_count'])
-            return Response({'liked': False, 'like_count': reply.like_count})
-        
-        reply.like_count += 1
-        reply.save(update_fields=['like_count'])
-        return Response({'liked': True, 'like_count': reply.like_count})
+        return Response({'liked': liked, 'like_count': like_count})
     
     @extend_schema(
         description="Hide or unhide a reply (instructors/admins only)",
@@ -519,4 +497,4 @@ class DiscussionBookmarkViewSet(viewsets.ReadOnlyModelViewSet):
         
         return DiscussionBookmark.objects.filter(
             user=self.request.user
-        ).select_related('thread', 'thread__author', 'thread__course')
+        ).prefetch_related(DiscussionQueryService.thread_prefetch(self.request.user))
@@ -63,10 +63,10 @@ class Enrollment(TimestampedModel):
             CertificateService.generate_certificate_for_enrollment(self)
             NotificationService.notify_course_completion(self)
             
-            # Sync with learning path progress
+            # Sync with learning path progress (queued to run after commit)
             try:
                 from apps.learning_paths.services import LearningPathService
-                LearningPathService.sync_course_completion_with_learning_paths(self)
+                LearningPathService.schedule_course_completion_sync(self)
             except ImportError:
                 import logging
                 logger = logging.getLogger(__name__)
@@ -144,7 +144,7 @@ class LearnerProgress(TimestampedModel):
         if self.status == self.Status.NOT_STARTED:
             self.status = self.Status.IN_PROGRESS
             self.started_at = timezone.now()
-            self.save(update_fields=["status", "started_at"])
+            self.save(update_fields=["status", "started_at", "updated_at"])
 
     def mark_as_completed(self, details: dict = None):
         """Mark content item as completed."""
@@ -161,6 +161,7 @@ class LearnerProgress(TimestampedModel):
                     "completed_at",
                     "started_at",
                     "progress_details",
+                    "updated_at",
                 ]
             )
             # Trigger course completion check
@@ -495,13 +495,8 @@ class ProgressTrackerService:
                 logger.info(
                     f"Marking enrollment {enrollment.id} as completed based on content and assessment progress."
                 )
-                enrollment.mark_as_completed()  # This saves and sets progress to 100
-                # Also trigger learning path sync since mark_as_completed may not always be called
-                try:
-                    from apps.learning_paths.services import LearningPathService
-                    LearningPathService.sync_course_completion_with_learning_paths(enrollment)
-                except ImportError:
-                    logger.warning("Learning paths app not available for synchronization")
+                # This saves, sets progress to 100 and queues the learning path sync
+                enrollment.mark_as_completed()
             else:
                 # Already complete, but we save the progress in case it was somehow not 100
                 enrollment.progress = 100
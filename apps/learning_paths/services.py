@@ -4,7 +4,7 @@ from datetime import timedelta
 from typing import Optional
 
 from django.db import transaction
-from django.db.models import QuerySet, Q
+from django.db.models import Count, FilteredRelation, Max, QuerySet, Q
 from django.utils import timezone
 from django.contrib.contenttypes.models import ContentType
 
@@ -204,13 +204,44 @@ class LearningPathService:
         # Update the overall learning path progress based on completed steps
         LearningPathService._update_learning_path_progress(progress)
 
+    @staticmethod
+    def schedule_course_completion_sync(enrollment: Enrollment) -> None:
+        """
+        Queues learning path synchronization for a completed enrollment.
+
+        The sync runs in a Celery task once the surrounding transaction commits,
+        so completion requests don't pay for path bookkeeping. If the task
+        cannot be dispatched (e.g. the broker is unavailable), the sync runs
+        inline instead so progress is never silently lost; publishing does
+        not retry, so that fallback kicks in immediately.
+        """
+        enrollment_id = enrollment.id
+
+        def _dispatch():
+            from .tasks import sync_course_completion_task
+
+            try:
+                sync_course_completion_task.apply_async(args=[str(enrollment_id)], retry=False)
+            except Exception as e:
+                logger.warning(
+                    f"Could not queue learning path sync for enrollment {enrollment_id}, "
+                    f"running inline: {e}"
+                )
+                LearningPathService.sync_course_completion_with_learning_paths(enrollment)
+
+        transaction.on_commit(_dispatch)
+
     @staticmethod
     @transaction.atomic
     def sync_course_completion_with_learning_paths(enrollment: Enrollment) -> bool:
         """
         Synchronizes course completion with learning path progress.
-        Called when a course enrollment is marked as completed.
-        
+        Called (usually from a Celery task) when a course enrollment is marked as completed.
+
+        All affected paths are handled in one batch: the referencing steps, existing
+        path/step progress rows and per-path completion counts are each resolved with
+        a single query, and new or changed rows are written with bulk operations.
+
         Returns True if any learning path progress was updated.
         """
         if enrollment.status != Enrollment.Status.COMPLETED:
@@ -219,134 +250,213 @@ class LearningPathService:
         course = enrollment.course
         user = enrollment.user
         course_content_type = ContentType.objects.get_for_model(Course)
-        
+
         # Find all learning path steps that reference this course
-        learning_path_steps = LearningPathStep.objects.filter(
-            content_type=course_content_type,
-            object_id=course.id,
-            learning_path__tenant=course.tenant,  # Ensure tenant consistency
-            learning_path__status=LearningPath.Status.PUBLISHED
-        ).select_related('learning_path')
+        learning_path_steps = list(
+            LearningPathStep.objects.filter(
+                content_type=course_content_type,
+                object_id=course.id,
+                learning_path__tenant=course.tenant,  # Ensure tenant consistency
+                learning_path__status=LearningPath.Status.PUBLISHED
+            )
+        )
+        if not learning_path_steps:
+            return False
 
-        updated_paths = []
-        
-        for step in learning_path_steps:
-            learning_path = step.learning_path
-            
-            # Get or create learning path progress for this user
-            path_progress, created = LearningPathProgress.objects.get_or_create(
-                user=user,
-                learning_path=learning_path,
-                defaults={
-                    'status': LearningPathProgress.Status.NOT_STARTED,
-                    'current_step_order': 0
-                }
+        path_ids = {step.learning_path_id for step in learning_path_steps}
+        now = timezone.now()
+
+        # Upsert path progress rows; existing rows keep their current state
+        LearningPathProgress.objects.bulk_create(
+            [
+                LearningPathProgress(
+                    user=user,
+                    learning_path_id=path_id,
+                    status=LearningPathProgress.Status.NOT_STARTED,
+                    current_step_order=0,
+                )
+                for path_id in path_ids
+            ],
+            ignore_conflicts=True,
+        )
+        progress_by_path = {
+            progress.learning_path_id: progress
+            for progress in LearningPathProgress.objects.filter(
+                user=user, learning_path_id__in=path_ids
             )
-            
-            # Get or create step progress for this specific step
-            step_progress, step_created = LearningPathStepProgress.objects.get_or_create(
-                user=user,
-                learning_path_progress=path_progress,
-                step=step,
-                defaults={
-                    'status': LearningPathStepProgress.Status.NOT_STARTED
-                }
+        }
+
+        # Upsert step progress rows, completing any that aren't completed yet
+        existing_step_progress = {
+            step_progress.step_id: step_progress
+            for step_progress in LearningPathStepProgress.objects.filter(
+                user=user, step__in=learning_path_steps
             )
-            
-            # Mark step as completed if not already completed
-            if step_progress.status != LearningPathStepProgress.Status.COMPLETED:
+        }
+        to_create = []
+        to_update = []
+        for step in learning_path_steps:
+            step_progress = existing_step_progress.get(step.id)
+            if step_progress is None:
+                to_create.append(
+                    LearningPathStepProgress(
+                        user=user,
+                        learning_path_progress=progress_by_path[step.learning_path_id],
+                        step=step,
+                        status=LearningPathStepProgress.Status.COMPLETED,
+                        started_at=now,
+                        completed_at=now,
+                    )
+                )
+            elif step_progress.status != LearningPathStepProgress.Status.COMPLETED:
                 step_progress.status = LearningPathStepProgress.Status.COMPLETED
-                step_progress.completed_at = timezone.now()
+                step_progress.completed_at = now
                 if not step_progress.started_at:
-                    step_progress.started_at = step_progress.completed_at
-                step_progress.save(update_fields=['status', 'completed_at', 'started_at', 'updated_at'])
-                
-                logger.info(
-                    f"Marked learning path step {step.id} as completed for user {user.id} "
-                    f"due to course {course.id} completion"
-                )
-            
-            # Update overall learning path progress
-            LearningPathService._update_learning_path_progress(path_progress)
-            updated_paths.append(learning_path.id)
+                    step_progress.started_at = now
+                step_progress.updated_at = now
+                to_update.append(step_progress)
 
-        if updated_paths:
+        if to_create:
+            LearningPathStepProgress.objects.bulk_create(
+                to_create,
+                update_conflicts=True,
+                unique_fields=['user', 'step'],
+                update_fields=['status', 'completed_at', 'updated_at'],
+            )
+        if to_update:
+            LearningPathStepProgress.objects.bulk_update(
+                to_update, ['status', 'completed_at', 'started_at', 'updated_at']
+            )
+        if to_create or to_update:
             logger.info(
-                f"Updated learning path progress for user {user.id} in paths: {updated_paths} "
-                f"due to course {course.id} completion"
+                f"Marked {len(to_create) + len(to_update)} learning path step(s) as completed "
+                f"for user {user.id} due to course {course.id} completion"
             )
-            return True
-            
-        return False
+
+        # Recompute overall status for every affected path in one grouped query
+        counts_by_path = LearningPathService._get_step_completion_counts(user, path_ids)
+        changed_progress = [
+            progress
+            for path_id, progress in progress_by_path.items()
+            if LearningPathService._apply_step_counts(progress, *counts_by_path.get(path_id, (0, 0, None)))
+        ]
+        if changed_progress:
+            LearningPathProgress.objects.bulk_update(
+                changed_progress,
+                ['status', 'started_at', 'completed_at', 'current_step_order', 'updated_at'],
+            )
+
+        logger.info(
+            f"Updated learning path progress for user {user.id} in paths: {sorted(map(str, path_ids))} "
+            f"due to course {course.id} completion"
+        )
+        return True
 
     @staticmethod
-    @transaction.atomic 
-    def _update_learning_path_progress(path_progress: LearningPathProgress) -> None:
+    def _get_step_completion_counts(user: User, path_ids) -> dict:
         """
-        Updates the overall learning path progress based on completed steps.
+        Returns {learning_path_id: (total_steps, completed_steps, highest_completed_order)}
+        for the given paths, computed with a single grouped aggregate over the steps
+        joined to this user's step progress.
         """
-        learning_path = path_progress.learning_path
-        user = path_progress.user
-        
-        # Get all steps in this learning path
-        all_steps = learning_path.steps.all().order_by('order')
-        total_steps = all_steps.count()
-        
+        rows = (
+            LearningPathStep.objects.filter(learning_path_id__in=path_ids)
+            .annotate(
+                learner_progress=FilteredRelation('user_progress', condition=Q(user_progress__user=user))
+            )
+            .values('learning_path_id')
+            .annotate(
+                total=Count('id'),
+                completed=Count(
+                    'id', filter=Q(learner_progress__status=LearningPathStepProgress.Status.COMPLETED)
+                ),
+                highest_completed=Max(
+                    'order', filter=Q(learner_progress__status=LearningPathStepProgress.Status.COMPLETED)
+                ),
+            )
+            .order_by()
+        )
+        return {
+            row['learning_path_id']: (row['total'], row['completed'], row['highest_completed'])
+            for row in rows
+        }
+
+    @staticmethod
+    def _apply_step_counts(
+        path_progress: LearningPathProgress,
+        total_steps: int,
+        completed_steps: int,
+        highest_completed_order: Optional[int],
+    ) -> bool:
+        """
+        Applies step completion counts to a path progress instance in memory.
+
+        Returns True if any field changed and the instance needs saving.
+        """
+        now = timezone.now()
+
         if total_steps == 0:
             # No steps, mark as completed
             if path_progress.status != LearningPathProgress.Status.COMPLETED:
                 path_progress.status = LearningPathProgress.Status.COMPLETED
-                path_progress.completed_at = timezone.now()
+                path_progress.completed_at = now
                 path_progress.current_step_order = 0
-                path_progress.save(update_fields=['status', 'completed_at', 'current_step_order', 'updated_at'])
-            return
-
-        # Count completed steps
-        completed_steps = LearningPathStepProgress.objects.filter(
-            user=user,
-            learning_path_progress=path_progress,
-            status=LearningPathStepProgress.Status.COMPLETED
-        ).count()
+                path_progress.updated_at = now
+                return True
+            return False
 
         # Update progress status and current step
         updated = False
-        
+
         if completed_steps >= total_steps:
             # All steps completed
             if path_progress.status != LearningPathProgress.Status.COMPLETED:
                 path_progress.status = LearningPathProgress.Status.COMPLETED
-                path_progress.completed_at = timezone.now()
+                path_progress.completed_at = now
                 path_progress.current_step_order = total_steps  # Set to last step order
                 updated = True
         elif completed_steps > 0:
             # Some steps completed
             if path_progress.status == LearningPathProgress.Status.NOT_STARTED:
                 path_progress.status = LearningPathProgress.Status.IN_PROGRESS
-                path_progress.started_at = timezone.now()
+                path_progress.started_at = now
                 updated = True
             elif path_progress.status != LearningPathProgress.Status.IN_PROGRESS:
                 path_progress.status = LearningPathProgress.Status.IN_PROGRESS
                 updated = True
-            
+
             # Update current step order to the highest completed step
-            highest_completed_step = LearningPathStepProgress.objects.filter(
-                user=user,
-                learning_path_progress=path_progress,
-                status=LearningPathStepProgress.Status.COMPLETED
-            ).select_related('step').order_by('-step__order').first()
-            
-            if highest_completed_step and path_progress.current_step_order != highest_completed_step.step.order:
-                path_progress.current_step_order = highest_completed_step.step.order
+            if highest_completed_order is not None and path_progress.current_step_order != highest_completed_order:
+                path_progress.current_step_order = highest_completed_order
                 updated = True
 
         if updated:
-            path_progress.save(update_fields=[
-                'status', 'started_at', 'completed_at', 'current_step_order', 'updated_at'
-            ])
+            path_progress.updated_at = now
             logger.info(
                 f"Updated learning path progress {path_progress.id}: "
                 f"status={path_progress.status}, completed_steps={completed_steps}/{total_steps}"
             )
+        return updated
+
+    @staticmethod
+    @transaction.atomic 
+    def _update_learning_path_progress(path_progress: LearningPathProgress) -> None:
+        """
+        Updates the overall learning path progress based on completed steps.
+        """
+        counts = LearningPathService._get_step_completion_counts(
+            path_progress.user, [path_progress.learning_path_id]
+        )
+        total_steps, completed_steps, highest_completed_order = counts.get(
+            path_progress.learning_path_id, (0, 0, None)
+        )
+
+        if LearningPathService._apply_step_counts(
+            path_progress, total_steps, completed_steps, highest_completed_order
+        ):
+            path_progress.save(update_fields=[
+                'status', 'started_at', 'completed_at', 'current_step_order', 'updated_at'
+            ])
 
     @staticmethod
     def sync_course_enrollment_with_learning_paths(enrollment: Enrollment) -> bool:
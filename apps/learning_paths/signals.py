@@ -30,6 +30,20 @@ def suggest_remedial_path_on_failed_assessment(sender, instance: AssessmentAttem
     The notification provides guidance without automatically generating a path,
     allowing the user to decide whether they want remediation.
     """
+    # Attempts graded by the submission pipeline get a dedicated stage instead
+    if getattr(instance, "_pipeline_managed", False):
+        return
+
+    suggest_remedial_path_for_attempt(instance)
+
+
+def suggest_remedial_path_for_attempt(instance: AssessmentAttempt) -> None:
+    """
+    Notify the learner about remedial path generation if the attempt failed.
+
+    Called from the post_save receiver and from the submission pipeline's
+    remedial path stage.
+    """
     # Only process graded attempts
     if instance.status != AssessmentAttempt.AttemptStatus.GRADED:
         return
@@ -0,0 +1,42 @@
+import logging
+import uuid
+
+from celery import shared_task
+
+# from .services import LearningPathService # Avoid circular import
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(
+    bind=True,
+    name="learning_paths.sync_course_completion",
+    max_retries=3,
+    default_retry_delay=60,
+)
+def sync_course_completion_task(self, enrollment_id: uuid.UUID):
+    """
+    Celery task that syncs a completed course enrollment with learning path progress.
+    Queued after commit by LearningPathService.schedule_course_completion_sync.
+    """
+    logger.info(f"Celery task received: Sync learning paths for enrollment {enrollment_id}")
+    from apps.enrollments.models import Enrollment
+
+    from .services import LearningPathService
+
+    try:
+        enrollment = Enrollment.objects.select_related("user", "course__tenant").get(
+            pk=enrollment_id
+        )
+    except Enrollment.DoesNotExist:
+        logger.warning(f"Enrollment {enrollment_id} not found for learning path sync.")
+        return
+
+    try:
+        LearningPathService.sync_course_completion_with_learning_paths(enrollment)
+    except Exception as e:
+        logger.error(
+            f"Celery task failed for learning path sync of enrollment {enrollment_id}: {e}",
+            exc_info=True,
+        )
+        self.retry(exc=e)
@@ -1,7 +1,11 @@
 """Tests for Learning Paths services."""
 
+from unittest.mock import patch
+
 from django.contrib.contenttypes.models import ContentType
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
 from apps.core.models import Tenant
 from apps.courses.models import Course
@@ -440,6 +444,69 @@ class SyncCourseCompletionTests(TestCase):
             ).exists()
         )
 
+    def test_sync_query_count_independent_of_path_count(self):
+        """Test that syncing many paths uses the same number of queries as one."""
+        self.enrollment.status = Enrollment.Status.COMPLETED
+        self.enrollment.save()
+
+        with CaptureQueriesContext(connection) as single_path:
+            LearningPathService.sync_course_completion_with_learning_paths(self.enrollment)
+
+        course_ct = ContentType.objects.get_for_model(Course)
+        for i in range(5):
+            path = LearningPath.objects.create(
+                tenant=self.tenant,
+                title=f"Extra Path {i}",
+                status=LearningPath.Status.PUBLISHED,
+            )
+            LearningPathStep.objects.create(
+                learning_path=path,
+                content_type=course_ct,
+                object_id=self.course.id,
+                order=1,
+            )
+        LearningPathProgress.objects.filter(user=self.learner).delete()
+
+        with CaptureQueriesContext(connection) as many_paths:
+            LearningPathService.sync_course_completion_with_learning_paths(self.enrollment)
+
+        self.assertEqual(len(many_paths), len(single_path))
+        self.assertEqual(
+            LearningPathProgress.objects.filter(
+                user=self.learner,
+                status=LearningPathProgress.Status.COMPLETED,
+            ).count(),
+            6,
+        )
+
+    def test_mark_as_completed_queues_sync_after_commit(self):
+        """Test that completing an enrollment queues the sync task on commit."""
+        with patch("apps.learning_paths.tasks.sync_course_completion_task") as mock_task:
+            with self.captureOnCommitCallbacks(execute=False) as callbacks:
+                self.enrollment.mark_as_completed()
+
+            # Nothing is synced until the transaction commits
+            self.assertFalse(
+                LearningPathProgress.objects.filter(user=self.learner).exists()
+            )
+            for callback in callbacks:
+                callback()
+
+        mock_task.apply_async.assert_called_once_with(args=[str(self.enrollment.id)], retry=False)
+
+    def test_mark_as_completed_syncs_inline_when_queue_unavailable(self):
+        """Test that the sync falls back to running inline if dispatch fails."""
+        with patch("apps.learning_paths.tasks.sync_course_completion_task") as mock_task:
+            mock_task.apply_async.side_effect = ConnectionError("broker down")
+            with self.captureOnCommitCallbacks(execute=True):
+                self.enrollment.mark_as_completed()
+
+        path_progress = LearningPathProgress.objects.get(
+            user=self.learner,
+            learning_path=self.learning_path
+        )
+        self.assertEqual(path_progress.status, LearningPathProgress.Status.COMPLETED)
+
 
 class SyncCourseIncompletionTests(TestCase):
     """Tests for handling course incompletion (reverting from completed)."""
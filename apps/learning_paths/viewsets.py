@@ -31,13 +31,14 @@ from .serializers import (
     PathPreviewResponseSerializer,
 )
 from .services import LearningPathService
+from apps.common.mixins import ConditionalGetMixin
 from apps.users.permissions import IsAdminOrTenantAdmin, IsInstructorOrAdmin
 from apps.courses.models import Course, Module
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiResponse # <-- IMPORTED OpenApiResponse
 from drf_spectacular.types import OpenApiTypes # <-- IMPORTED OpenApiTypes for consistency
 
 @extend_schema(tags=['Learning Paths'])
-class LearningPathViewSet(viewsets.ModelViewSet):
+class LearningPathViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """ API endpoint for managing Learning Paths. """
     serializer_class = LearningPathSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -69,6 +70,9 @@ class LearningPathViewSet(viewsets.ModelViewSet):
             )
         ).order_by('title')
 
+    def get_etag_dependencies(self, scope):
+        return [LearningPathStep.objects.filter(learning_path_id__in=scope.values('pk'))]
+
     def get_permissions(self):
         if self.action in ['list', 'retrieve']:
             return [permissions.IsAuthenticated()]
@@ -156,7 +160,7 @@ class LearningPathViewSet(viewsets.ModelViewSet):
              step.delete()
              LearningPathStep.objects.filter(
                  learning_path=learning_path, order__gt=step_order
-             ).update(order=models.F('order') - 1)
+             ).update(order=models.F('order') - 1, updated_at=timezone.now())
              return Response(status=status.HTTP_204_NO_CONTENT)
 
         partial = (request.method == 'PATCH')
@@ -210,7 +214,7 @@ class LearningPathViewSet(viewsets.ModelViewSet):
                 step.save()
             # Then, set them to the final values
             for index, step_id in enumerate(step_ids_in_order):
-                LearningPathStep.objects.filter(id=step_id, learning_path=learning_path).update(order=index + 1)
+                LearningPathStep.objects.filter(id=step_id, learning_path=learning_path).update(order=index + 1, updated_at=timezone.now())
             return Response({"detail": "Steps reordered successfully."}, status=status.HTTP_200_OK)
         else:
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
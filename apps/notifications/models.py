@@ -90,6 +90,10 @@ class Notification(TimestampedModel):
                 fields=["recipient", "status"], name="notif_recipient_status_idx"
             ),
             models.Index(fields=["created_at"]),
+            # Keyset pagination of the inbox
+            models.Index(
+                fields=["recipient", "created_at", "id"], name="notif_recipient_feed_idx"
+            ),
         ]
 
 
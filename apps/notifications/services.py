@@ -204,7 +204,7 @@ class NotificationService:
                 else "All delivery methods failed without specific error."
             )
 
-        notification.save(update_fields=["status", "sent_at", "fail_reason"])
+        notification.save(update_fields=["status", "sent_at", "fail_reason", "updated_at"])
 
     # --- Helper methods to generate message content based on type ---
     # These could live elsewhere or be more sophisticated using templates
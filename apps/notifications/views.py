@@ -6,6 +6,9 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
 
+from apps.common.mixins import ConditionalGetMixin
+from apps.common.pagination import KeysetPagination
+
 from .models import Announcement, Notification, NotificationPreference, NotificationType, UserDevice
 from .serializers import (
     AnnouncementSerializer,
@@ -20,10 +23,11 @@ from drf_spectacular.types import OpenApiTypes
 logger = logging.getLogger(__name__)
 
 @extend_schema(tags=['Notifications'])
-class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
+class NotificationViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """ API endpoint for listing and managing user notifications (mark read/dismiss). """
     serializer_class = NotificationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
 
     # Add parameters for documentation
     @extend_schema(
@@ -43,7 +47,7 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
         if not user.is_authenticated: return Notification.objects.none()
 
         # Users only see their own notifications
-        queryset = Notification.objects.filter(recipient=user)
+        queryset = Notification.objects.filter(recipient=user).select_related('recipient')
 
         # Filter by status query param
         status_filter = self.request.query_params.get('status')
@@ -66,7 +70,7 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
         if notification.status not in [Notification.Status.READ, Notification.Status.DISMISSED]:
             notification.status = Notification.Status.READ
             notification.read_at = timezone.now()
-            notification.save(update_fields=['status', 'read_at'])
+            notification.save(update_fields=['status', 'read_at', 'updated_at'])
             updated = True
             logger.info(f"Notification {pk} marked as read for user {request.user.id}")
         serializer = self.get_serializer(notification)
@@ -81,7 +85,7 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
         updated_count = Notification.objects.filter(
             recipient=request.user,
             status__in=[Notification.Status.SENT, Notification.Status.PENDING]
-        ).update(status=Notification.Status.READ, read_at=timezone.now())
+        ).update(status=Notification.Status.READ, read_at=timezone.now(), updated_at=timezone.now())
         logger.info(f"Marked {updated_count} notifications as read for user {request.user.id}")
         return Response({'updated_count': updated_count})
 
@@ -96,9 +100,9 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
             # Optionally set read_at if dismissing an unread notification
             if not notification.read_at:
                  notification.read_at = timezone.now()
-                 notification.save(update_fields=['status', 'read_at'])
+                 notification.save(update_fields=['status', 'read_at', 'updated_at'])
             else:
-                 notification.save(update_fields=['status'])
+                 notification.save(update_fields=['status', 'updated_at'])
             updated = True
             logger.info(f"Notification {pk} dismissed for user {request.user.id}")
         serializer = self.get_serializer(notification)
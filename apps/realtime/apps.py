@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class RealtimeConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "apps.realtime"
+    verbose_name = "Realtime Events"
+
+    def ready(self):
+        """Import signal handlers when the app is ready."""
+        import apps.realtime.signals  # noqa: F401
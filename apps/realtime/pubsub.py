@@ -0,0 +1,219 @@
+"""
+Publish/subscribe brokers for server-push events.
+
+Subscribers are SSE connections waiting on an asyncio queue; publishers are
+ordinary (usually synchronous) request or task code. The in-process broker
+fans messages out to the subscribers of the current worker; the Redis broker
+routes them through Redis pub/sub so every worker sees every message.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """A subscriber's queue of pending messages for a set of channels."""
+
+    def __init__(self, broker, channels, maxsize: int):
+        self.broker = broker
+        self.channels = frozenset(channels)
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.overflowed = False
+        try:
+            self.loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.loop = None
+
+    def deliver(self, message: dict) -> None:
+        """Queues message; safe to call from any thread."""
+        if self.loop is not None and self.loop.is_running():
+            try:
+                running = asyncio.get_running_loop()
+            except RuntimeError:
+                running = None
+            if running is not self.loop:
+                self.loop.call_soon_threadsafe(self._put, message)
+                return
+        self._put(message)
+
+    def _put(self, message: dict) -> None:
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Slow consumer: stop queueing and let the stream tell the client to resync
+            self.overflowed = True
+
+    async def get(self) -> dict:
+        return await self.queue.get()
+
+    def close(self) -> None:
+        self.broker.unsubscribe(self)
+
+
+class InProcessBroker:
+    """Fans messages out to subscribers in this worker process."""
+
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._subscribers = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def subscribe(self, channels) -> Subscription:
+        subscription = Subscription(self, channels, self.queue_size)
+        with self._lock:
+            for channel in subscription.channels:
+                self._subscribers.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            for channel in subscription.channels:
+                subscribers = self._subscribers.get(channel)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscribers[channel]
+
+    def subscriber_count(self, channel: str) -> int:
+        with self._lock:
+            return len(self._subscribers.get(channel, ()))
+
+    def build_message(self, channel: str, event: str, data: dict) -> dict:
+        return {
+            'id': f"{time.time_ns()}-{next(self._ids)}",
+            'channel': channel,
+            'event': event,
+            'data': data,
+            'published_at': time.time(),
+        }
+
+    def publish(self, channel: str, event: str, data: dict) -> None:
+        self.dispatch(self.build_message(channel, event, data))
+
+    def dispatch(self, message: dict) -> None:
+        """Delivers an already-built message to local subscribers."""
+        with self._lock:
+            subscribers = list(self._subscribers.get(message['channel'], ()))
+        for subscription in subscribers:
+            subscription.deliver(message)
+
+
+class RedisBroker(InProcessBroker):
+    """
+    Routes messages through Redis pub/sub.
+
+    Publishing is a synchronous PUBLISH; each worker runs one listener task
+    (started by its first subscriber) that pattern-subscribes to the prefix
+    and dispatches to local subscribers.
+    """
+
+    def __init__(self, url: str, prefix: str = 'lms:realtime:', queue_size: int = 100):
+        super().__init__(queue_size=queue_size)
+        import redis
+
+        self.url = url
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+        self._listener = None
+
+    def subscribe(self, channels) -> Subscription:
+        subscription = super().subscribe(channels)
+        if subscription.loop is not None and (self._listener is None or self._listener.done()):
+            self._listener = subscription.loop.create_task(self._listen())
+        return subscription
+
+    def publish(self, channel: str, event: str, data: dict) -> None:
+        message = self.build_message(channel, event, data)
+        try:
+            self._client.publish(f"{self.prefix}{channel}", json.dumps(message, cls=DjangoJSONEncoder))
+        except Exception as e:
+            logger.error(f"Redis publish to {channel} failed, delivering locally only: {e}")
+            self.dispatch(message)
+
+    async def _listen(self) -> None:
+        import redis.asyncio as aioredis
+
+        client = aioredis.Redis.from_url(self.url)
+        pubsub = client.pubsub()
+        await pubsub.psubscribe(f"{self.prefix}*")
+        try:
+            async for raw in pubsub.listen():
+                if raw.get('type') != 'pmessage':
+                    continue
+                try:
+                    self.dispatch(json.loads(raw['data']))
+                except (TypeError, ValueError, KeyError) as e:
+                    logger.warning(f"Dropping malformed realtime message: {e}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Realtime Redis listener stopped: {e}", exc_info=True)
+        finally:
+            await pubsub.aclose()
+            await client.aclose()
+
+
+class ConnectionLimiter:
+    """Caps concurrent stream connections in this worker process."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.active = 0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> bool:
+        with self._lock:
+            if self.active >= self.limit:
+                return False
+            self.active += 1
+            return True
+
+    def release(self) -> None:
+        with self._lock:
+            self.active = max(0, self.active - 1)
+
+
+_broker = None
+_limiter = None
+_singleton_lock = threading.Lock()
+
+
+def get_broker() -> InProcessBroker:
+    """The worker's broker, built from REALTIME_BROKER on first use."""
+    global _broker
+    if _broker is None:
+        with _singleton_lock:
+            if _broker is None:
+                queue_size = getattr(settings, 'REALTIME_QUEUE_SIZE', 100)
+                if getattr(settings, 'REALTIME_BROKER', 'memory') == 'redis':
+                    _broker = RedisBroker(settings.REALTIME_REDIS_URL, queue_size=queue_size)
+                else:
+                    _broker = InProcessBroker(queue_size=queue_size)
+    return _broker
+
+
+def get_connection_limiter() -> ConnectionLimiter:
+    global _limiter
+    if _limiter is None:
+        with _singleton_lock:
+            if _limiter is None:
+                _limiter = ConnectionLimiter(getattr(settings, 'REALTIME_MAX_CONNECTIONS', 1000))
+    return _limiter
+
+
+def reset() -> None:
+    """Drops the broker and limiter so they are rebuilt from settings (tests)."""
+    global _broker, _limiter
+    with _singleton_lock:
+        _broker = None
+        _limiter = None
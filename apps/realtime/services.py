@@ -0,0 +1,96 @@
+import logging
+import secrets
+import uuid
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .pubsub import get_broker
+
+logger = logging.getLogger(__name__)
+
+
+class RealtimeService:
+    """
+    Tenant-scoped channel names and transactional publishing.
+
+    Every channel starts with the tenant id, so a subscriber can only ever
+    be attached to channels of the tenant it was authorised for.
+    """
+
+    @staticmethod
+    def user_channel(tenant_id, user_id) -> str:
+        return f"tenant:{tenant_id}:user:{user_id}"
+
+    @staticmethod
+    def thread_channel(tenant_id, thread_id) -> str:
+        return f"tenant:{tenant_id}:thread:{thread_id}"
+
+    @staticmethod
+    def course_channel(tenant_id, course_id) -> str:
+        return f"tenant:{tenant_id}:course:{course_id}"
+
+    @staticmethod
+    def metrics_channel(tenant_id, instructor_id: Optional[uuid.UUID] = None) -> str:
+        """Per-instructor live metrics, or the tenant-wide feed without one."""
+        if instructor_id:
+            return f"tenant:{tenant_id}:metrics:{instructor_id}"
+        return f"tenant:{tenant_id}:metrics"
+
+    @staticmethod
+    def publish(channels, event: str, data: dict) -> None:
+        """
+        Publishes data to each channel once the current transaction commits.
+
+        Nothing is sent for rolled-back writes, and publishing failures are
+        logged rather than raised into the caller's request.
+        """
+        if not getattr(settings, 'REALTIME_PUBLISH', True):
+            return
+        if isinstance(channels, str):
+            channels = [channels]
+
+        def send():
+            broker = get_broker()
+            for channel in channels:
+                try:
+                    broker.publish(channel, event, data)
+                except Exception as e:
+                    logger.error(f"Failed to publish {event} to {channel}: {e}", exc_info=True)
+
+        transaction.on_commit(send)
+
+
+class StreamTicketService:
+    """
+    Short-lived, single-use tickets for opening event streams.
+
+    EventSource cannot send an Authorization header, so clients exchange
+    their JWT for a ticket and pass it as ?ticket=. Unlike an access token
+    in a URL (which ends up in proxy and server logs), a ticket expires
+    within seconds and is deleted on first use. Tickets live in the shared
+    cache so any worker can redeem them.
+    """
+
+    CACHE_PREFIX = 'realtime:ticket:'
+
+    @classmethod
+    def issue(cls, user) -> str:
+        ticket = secrets.token_urlsafe(32)
+        cache.set(
+            f"{cls.CACHE_PREFIX}{ticket}", str(user.pk),
+            timeout=getattr(settings, 'REALTIME_TICKET_TTL_SECONDS', 30),
+        )
+        return ticket
+
+    @classmethod
+    def redeem(cls, ticket: str) -> Optional[str]:
+        """The ticket's user id, or None if it is unknown, expired or already used."""
+        key = f"{cls.CACHE_PREFIX}{ticket}"
+        user_id = cache.get(key)
+        # delete() reports whether this caller removed the key, so only one redemption wins
+        if user_id is None or not cache.delete(key):
+            return None
+        return user_id
@@ -0,0 +1,124 @@
+"""
+Signal handlers for the Realtime app.
+
+Publishes new notifications, discussion threads and replies, and live
+metric snapshots to their tenant-scoped channels after the write commits.
+"""
+
+import logging
+
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from apps.analytics.models import RealTimeMetrics
+from apps.discussions.models import DiscussionReply, DiscussionThread
+from apps.notifications.models import Notification
+
+from .services import RealtimeService
+
+logger = logging.getLogger(__name__)
+
+METRIC_FIELDS = (
+    'active_users',
+    'current_sessions',
+    'live_engagement_rate',
+    'server_health',
+    'response_time',
+    'current_course_views',
+    'current_video_watches',
+    'current_quiz_attempts',
+)
+
+
+@receiver(post_save, sender=Notification)
+def publish_notification(sender, instance: Notification, created, raw=False, **kwargs):
+    if not created or raw:
+        return
+    tenant_id = instance.recipient.tenant_id
+    if not tenant_id:
+        return
+    RealtimeService.publish(
+        RealtimeService.user_channel(tenant_id, instance.recipient_id),
+        'notification.created',
+        {
+            'id': str(instance.id),
+            'notification_type': instance.notification_type,
+            'subject': instance.subject,
+            'action_url': instance.action_url,
+            'created_at': instance.created_at.isoformat(),
+        },
+    )
+
+
+@receiver(post_save, sender=DiscussionThread)
+def publish_thread(sender, instance: DiscussionThread, created, raw=False, **kwargs):
+    if not created or raw:
+        return
+    RealtimeService.publish(
+        RealtimeService.course_channel(instance.tenant_id, instance.course_id),
+        'discussion.thread_created',
+        {
+            'id': str(instance.id),
+            'course_id': str(instance.course_id),
+            'title': instance.title,
+            'author_id': str(instance.author_id),
+            'created_at': instance.created_at.isoformat(),
+        },
+    )
+
+
+@receiver(post_save, sender=DiscussionReply)
+def publish_reply(sender, instance: DiscussionReply, created, raw=False, **kwargs):
+    if not created or raw or instance.is_hidden:
+        return
+    thread = instance.thread
+    payload = {
+        'id': str(instance.id),
+        'thread_id': str(instance.thread_id),
+        'parent_reply_id': str(instance.parent_reply_id) if instance.parent_reply_id else None,
+        'author_id': str(instance.author_id),
+        'created_at': instance.created_at.isoformat(),
+    }
+    RealtimeService.publish(
+        [
+            RealtimeService.thread_channel(thread.tenant_id, thread.id),
+            RealtimeService.course_channel(thread.tenant_id, thread.course_id),
+        ],
+        'discussion.reply_created',
+        payload,
+    )
+
+
+@receiver(post_save, sender=RealTimeMetrics)
+def publish_metrics(sender, instance: RealTimeMetrics, created, raw=False, **kwargs):
+    """Publishes the snapshot and its change since the instructor's previous one."""
+    if not created or raw:
+        return
+    previous = RealTimeMetrics.objects.filter(
+        tenant_id=instance.tenant_id,
+        instructor_id=instance.instructor_id,
+        timestamp__lt=instance.timestamp,
+    ).order_by('-timestamp').values(*METRIC_FIELDS).first()
+
+    values = {field: float(getattr(instance, field)) for field in METRIC_FIELDS}
+    if previous is None:
+        delta = values
+    else:
+        delta = {
+            field: round(values[field] - float(previous[field]), 2)
+            for field in METRIC_FIELDS
+            if float(previous[field]) != values[field]
+        }
+    RealtimeService.publish(
+        [
+            RealtimeService.metrics_channel(instance.tenant_id, instance.instructor_id),
+            RealtimeService.metrics_channel(instance.tenant_id),
+        ],
+        'metrics.updated',
+        {
+            'instructor_id': str(instance.instructor_id),
+            'timestamp': instance.timestamp.isoformat(),
+            'metrics': values,
+            'delta': delta,
+        },
+    )
@@ -0,0 +1,254 @@
+"""
+Tests for the realtime app - brokers, publishing signals and the event stream.
+"""
+import asyncio
+import threading
+
+from asgiref.sync import sync_to_async
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.analytics.models import RealTimeMetrics
+from apps.core.models import Tenant
+from apps.courses.models import Course
+from apps.discussions.models import DiscussionReply, DiscussionThread
+from apps.notifications.models import Notification, NotificationType
+from apps.realtime import pubsub
+from apps.realtime.pubsub import ConnectionLimiter, InProcessBroker
+from apps.realtime.services import RealtimeService, StreamTicketService
+from apps.users.models import User
+
+
+class InProcessBrokerTests(SimpleTestCase):
+    """Tests for InProcessBroker and ConnectionLimiter."""
+
+    def test_publish_reaches_only_matching_subscribers(self):
+        broker = InProcessBroker()
+        subscription = broker.subscribe(['tenant:1:user:1'])
+
+        broker.publish('tenant:1:user:1', 'notification.created', {'id': 'a'})
+        broker.publish('tenant:1:user:2', 'notification.created', {'id': 'b'})
+
+        self.assertEqual(subscription.queue.qsize(), 1)
+        self.assertEqual(subscription.queue.get_nowait()['data'], {'id': 'a'})
+        subscription.close()
+        self.assertEqual(broker.subscriber_count('tenant:1:user:1'), 0)
+
+    async def test_publish_from_worker_thread_wakes_subscriber(self):
+        broker = InProcessBroker()
+        subscription = broker.subscribe(['metrics'])
+
+        thread = threading.Thread(target=broker.publish, args=('metrics', 'metrics.updated', {'active_users': 3}))
+        thread.start()
+        message = await asyncio.wait_for(subscription.get(), timeout=2)
+        thread.join()
+
+        self.assertEqual(message['event'], 'metrics.updated')
+
+    def test_full_queue_marks_subscription_overflowed(self):
+        broker = InProcessBroker(queue_size=1)
+        subscription = broker.subscribe(['channel'])
+
+        broker.publish('channel', 'event', {})
+        broker.publish('channel', 'event', {})
+
+        self.assertTrue(subscription.overflowed)
+        self.assertEqual(subscription.queue.qsize(), 1)
+
+    def test_connection_limiter_caps_and_releases(self):
+        limiter = ConnectionLimiter(limit=1)
+
+        self.assertTrue(limiter.acquire())
+        self.assertFalse(limiter.acquire())
+        limiter.release()
+        self.assertTrue(limiter.acquire())
+
+
+class RealtimeTestMixin:
+    def setUp(self):
+        pubsub.reset()
+        self.tenant = Tenant.objects.create(name="Test Tenant", slug="test-tenant")
+        self.instructor = User.objects.create_user(
+            email="instructor@example.com",
+            password="testpass123",
+            role=User.Role.INSTRUCTOR,
+            tenant=self.tenant
+        )
+        self.learner = User.objects.create_user(
+            email="learner@example.com",
+            password="testpass123",
+            tenant=self.tenant
+        )
+        self.course = Course.objects.create(
+            title="Python Programming",
+            slug="python-programming",
+            tenant=self.tenant,
+            status=Course.Status.PUBLISHED,
+            instructor=self.instructor,
+        )
+        self.thread = DiscussionThread.objects.create(
+            tenant=self.tenant, course=self.course, author=self.instructor, title="Welcome", content=""
+        )
+
+    def tearDown(self):
+        pubsub.reset()
+
+
+class PublishSignalTests(RealtimeTestMixin, TestCase):
+    """Tests that committed writes are published to tenant-scoped channels."""
+
+    def test_notification_is_published_to_recipient_after_commit(self):
+        subscription = pubsub.get_broker().subscribe(
+            [RealtimeService.user_channel(self.tenant.id, self.learner.id)]
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            notification = Notification.objects.create(
+                recipient=self.learner,
+                notification_type=NotificationType.SYSTEM_ALERT,
+                subject="Maintenance tonight",
+                message="",
+            )
+            self.assertTrue(subscription.queue.empty())
+
+        message = subscription.queue.get_nowait()
+        self.assertEqual(message['event'], 'notification.created')
+        self.assertEqual(message['data']['id'], str(notification.id))
+
+    def test_reply_is_published_to_thread_and_course_channels(self):
+        broker = pubsub.get_broker()
+        thread_subscription = broker.subscribe([RealtimeService.thread_channel(self.tenant.id, self.thread.id)])
+        course_subscription = broker.subscribe([RealtimeService.course_channel(self.tenant.id, self.course.id)])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            DiscussionReply.objects.create(thread=self.thread, author=self.learner, content="Hi")
+
+        self.assertEqual(thread_subscription.queue.get_nowait()['event'], 'discussion.reply_created')
+        self.assertEqual(course_subscription.queue.get_nowait()['event'], 'discussion.reply_created')
+
+    def test_metrics_snapshot_carries_delta_from_previous(self):
+        subscription = pubsub.get_broker().subscribe(
+            [RealtimeService.metrics_channel(self.tenant.id, self.instructor.id)]
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            RealTimeMetrics.objects.create(tenant=self.tenant, instructor_id=self.instructor.id, active_users=4)
+        with self.captureOnCommitCallbacks(execute=True):
+            RealTimeMetrics.objects.create(tenant=self.tenant, instructor_id=self.instructor.id, active_users=7)
+
+        subscription.queue.get_nowait()
+        update = subscription.queue.get_nowait()['data']
+        self.assertEqual(update['metrics']['active_users'], 7.0)
+        self.assertEqual(update['delta'], {'active_users': 3.0})
+
+    @override_settings(REALTIME_PUBLISH=False)
+    def test_publishing_can_be_disabled(self):
+        subscription = pubsub.get_broker().subscribe(
+            [RealtimeService.thread_channel(self.tenant.id, self.thread.id)]
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            DiscussionReply.objects.create(thread=self.thread, author=self.learner, content="Hi")
+
+        self.assertTrue(subscription.queue.empty())
+
+
+class EventStreamViewTests(RealtimeTestMixin, TestCase):
+    """Tests for EventStreamView."""
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('realtime:event-stream')
+
+    def _token(self, user):
+        return str(RefreshToken.for_user(user).access_token)
+
+    def _ticket(self, user):
+        return StreamTicketService.issue(user)
+
+    def test_requires_token(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_ticket_endpoint_issues_single_use_tickets(self):
+        api_client = APIClient()
+        self.assertEqual(api_client.post(reverse('realtime:stream-ticket')).status_code, 401)
+
+        api_client.force_authenticate(user=self.learner)
+        response = api_client.post(reverse('realtime:stream-ticket'))
+        self.assertEqual(response.status_code, 200)
+        ticket = response.data['ticket']
+
+        first = self.client.get(self.url, {'ticket': ticket, 'channels': 'metrics'})
+        second = self.client.get(self.url, {'ticket': ticket, 'channels': 'metrics'})
+        self.assertEqual(first.status_code, 403)  # authenticated, but not allowed on this channel
+        self.assertEqual(second.status_code, 401)
+
+    def test_access_tokens_are_not_accepted_in_the_url(self):
+        token = self._token(self.learner)
+
+        self.assertEqual(self.client.get(self.url, {'token': token}).status_code, 401)
+        self.assertEqual(self.client.get(self.url, {'ticket': token}).status_code, 401)
+
+    @override_settings(REALTIME_MAX_CONNECTIONS=0)
+    def test_authorization_header_is_accepted(self):
+        response = self.client.get(self.url, HTTP_AUTHORIZATION=f"Bearer {self._token(self.learner)}")
+
+        self.assertEqual(response.status_code, 503)
+
+    def test_rejects_channels_the_user_cannot_see(self):
+        metrics = self.client.get(self.url, {'ticket': self._ticket(self.learner), 'channels': 'metrics'})
+        thread = self.client.get(
+            self.url, {'ticket': self._ticket(self.learner), 'channels': f'thread:{self.thread.id}'}
+        )
+        unknown = self.client.get(self.url, {'ticket': self._ticket(self.learner), 'channels': 'everything'})
+
+        self.assertEqual(metrics.status_code, 403)
+        self.assertEqual(thread.status_code, 404)
+        self.assertEqual(unknown.status_code, 400)
+
+    @override_settings(REALTIME_MAX_CONNECTIONS=0)
+    def test_connection_limit_returns_503(self):
+        response = self.client.get(self.url, {'ticket': self._ticket(self.learner)})
+
+        self.assertEqual(response.status_code, 503)
+        self.assertIn('Retry-After', response)
+
+    async def test_streams_published_events(self):
+        ticket = await sync_to_async(self._ticket)(self.instructor)
+        response = await self.async_client.get(
+            self.url, {'ticket': ticket, 'channels': f'notifications,thread:{self.thread.id}'}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = response.streaming_content
+
+        self.assertTrue((await anext(stream)).startswith(b'retry:'))
+        pubsub.get_broker().publish(
+            RealtimeService.thread_channel(self.tenant.id, self.thread.id),
+            'discussion.reply_created',
+            {'id': 'r1'},
+        )
+        chunk = await asyncio.wait_for(anext(stream), timeout=2)
+
+        self.assertIn(b'event: discussion.reply_created', chunk)
+        self.assertIn(b'"id": "r1"', chunk)
+        self.assertEqual(pubsub.get_connection_limiter().active, 1)
+        await stream.aclose()
+
+    async def test_closing_unstarted_response_releases_slot(self):
+        ticket = await sync_to_async(self._ticket)(self.learner)
+        response = await self.async_client.get(self.url, {'ticket': ticket})
+        limiter = pubsub.get_connection_limiter()
+        self.assertEqual(limiter.active, 1)
+
+        response.close()
+        response.close()
+
+        self.assertEqual(limiter.active, 0)
+        self.assertEqual(
+            pubsub.get_broker().subscriber_count(RealtimeService.user_channel(self.tenant.id, self.learner.id)), 0
+        )
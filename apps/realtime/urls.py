@@ -0,0 +1,17 @@
+"""
+URL configuration for the Realtime app.
+
+Stream ticket:            POST        /api/v1/realtime/tickets/
+Event stream:             GET         /api/v1/realtime/events/?ticket=<ticket>&channels=notifications,thread:<id>
+"""
+
+from django.urls import path
+
+from .views import EventStreamView, StreamTicketView
+
+app_name = 'realtime'
+
+urlpatterns = [
+    path('tickets/', StreamTicketView.as_view(), name='stream-ticket'),
+    path('events/', EventStreamView.as_view(), name='event-stream'),
+]
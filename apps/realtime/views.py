@@ -0,0 +1,232 @@
+"""
+Server-sent events endpoint.
+
+POST /api/v1/realtime/tickets/
+GET /api/v1/realtime/events/?ticket=<ticket>&channels=notifications,thread:<id>,course:<id>,metrics
+
+EventSource cannot set headers, so browsers first exchange their JWT for a
+short-lived, single-use ticket and open the stream with ?ticket=; clients
+that can send an Authorization header may use their JWT directly.
+
+The connection is authenticated and its channels authorised once, up front;
+after that the handler only waits on its in-memory queue, so an idle client
+costs no database queries. Run under ASGI (lms_backend.asgi) so each open
+stream is a coroutine rather than a worker thread.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views import View
+from drf_spectacular.utils import extend_schema
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+
+from apps.courses.models import Course
+from apps.discussions.models import DiscussionThread
+from apps.enrollments.models import Enrollment
+from apps.users.models import User
+
+from .pubsub import get_broker, get_connection_limiter
+from .services import RealtimeService, StreamTicketService
+
+logger = logging.getLogger(__name__)
+
+RETRY_MILLISECONDS = 5000
+
+
+class StreamError(Exception):
+    def __init__(self, message: str, status: int):
+        super().__init__(message)
+        self.status = status
+
+
+def _authenticate(request):
+    """JWT from the Authorization header, or a single-use stream ticket from ?ticket=."""
+    authenticator = JWTAuthentication()
+    header = authenticator.get_header(request)
+    raw_token = authenticator.get_raw_token(header) if header is not None else None
+    if raw_token:
+        try:
+            return authenticator.get_user(authenticator.get_validated_token(raw_token))
+        except (InvalidToken, TokenError) as e:
+            raise StreamError(str(e), 401)
+
+    ticket = request.GET.get('ticket')
+    if not ticket:
+        raise StreamError("Authentication credentials were not provided.", 401)
+    user_id = StreamTicketService.redeem(ticket)
+    user = User.objects.filter(pk=user_id, is_active=True).first() if user_id else None
+    if user is None:
+        raise StreamError("Stream ticket is invalid or expired.", 401)
+    return user
+
+
+def _can_access_course(user, course_id) -> bool:
+    if user.is_staff or user.is_superuser:
+        return True
+    if Course.objects.filter(pk=course_id, instructor=user).exists():
+        return True
+    return Enrollment.objects.filter(
+        user=user,
+        course_id=course_id,
+        status__in=[Enrollment.Status.ACTIVE, Enrollment.Status.COMPLETED],
+    ).exists()
+
+
+def _resolve_channels(request) -> list:
+    """Authenticates the request and maps requested channel names to tenant-scoped ones."""
+    user = _authenticate(request)
+    tenant = getattr(request, 'tenant', None) or user.tenant
+    if tenant is None:
+        raise StreamError("Tenant could not be determined.", 400)
+    if user.tenant_id != tenant.id and not user.is_superuser:
+        raise StreamError("You do not belong to this tenant.", 403)
+
+    requested = [name.strip() for name in request.GET.get('channels', 'notifications').split(',') if name.strip()]
+    channels = []
+    for name in requested:
+        kind, _, object_id = name.partition(':')
+        if kind == 'notifications':
+            channels.append(RealtimeService.user_channel(tenant.id, user.id))
+        elif kind == 'metrics':
+            if user.is_staff or user.is_superuser or user.role == User.Role.ADMIN:
+                channels.append(RealtimeService.metrics_channel(tenant.id))
+            elif user.role == User.Role.INSTRUCTOR:
+                channels.append(RealtimeService.metrics_channel(tenant.id, user.id))
+            else:
+                raise StreamError("Live metrics are available to instructors and admins only.", 403)
+        elif kind in ('thread', 'course') and object_id:
+            if kind == 'thread':
+                course_id = DiscussionThread.objects.filter(
+                    pk=object_id, tenant=tenant
+                ).values_list('course_id', flat=True).first()
+            else:
+                course_id = Course.objects.filter(pk=object_id, tenant=tenant).values_list('id', flat=True).first()
+            if course_id is None or not _can_access_course(user, course_id):
+                raise StreamError(f"Channel '{name}' not found.", 404)
+            if kind == 'thread':
+                channels.append(RealtimeService.thread_channel(tenant.id, object_id))
+            else:
+                channels.append(RealtimeService.course_channel(tenant.id, object_id))
+        else:
+            raise StreamError(f"Unknown channel '{name}'.", 400)
+    return channels
+
+
+def format_event(message: dict) -> str:
+    data = dict(message['data'], published_at=message['published_at'])
+    return (
+        f"id: {message['id']}\n"
+        f"event: {message['event']}\n"
+        f"data: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n"
+    )
+
+
+class StreamTicketView(APIView):
+    """Issues a single-use ticket for opening an event stream."""
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    @extend_schema(
+        tags=['Realtime'], summary="Issue an event stream ticket",
+        description="Returns a short-lived, single-use ticket to pass as ?ticket= when opening /realtime/events/.",
+        request=None,
+    )
+    def post(self, request):
+        return Response({
+            'ticket': StreamTicketService.issue(request.user),
+            'expires_in': getattr(settings, 'REALTIME_TICKET_TTL_SECONDS', 30),
+        })
+
+
+class StreamLease:
+    """An open stream's subscription and connection slot, released exactly once."""
+
+    def __init__(self, subscription, limiter):
+        self.subscription = subscription
+        self.limiter = limiter
+        self._released = False
+        self._lock = threading.Lock()
+
+    def release(self) -> None:
+        with self._lock:
+            if self._released:
+                return
+            self._released = True
+        self.subscription.close()
+        self.limiter.release()
+
+
+class EventStreamResponse(StreamingHttpResponse):
+    """
+    Streaming response that releases its lease when the server closes it.
+
+    The generator's finally block only runs once the generator is started
+    and then closed; a client that disconnects before the first chunk is
+    sent would otherwise hold its connection slot forever.
+    """
+
+    def __init__(self, streaming_content, lease: StreamLease, **kwargs):
+        super().__init__(streaming_content, **kwargs)
+        self.lease = lease
+
+    def close(self):
+        try:
+            self.lease.release()
+        finally:
+            super().close()
+
+
+class EventStreamView(View):
+    """Streams events for the requested channels as text/event-stream."""
+
+    async def get(self, request):
+        try:
+            channels = await sync_to_async(_resolve_channels)(request)
+        except (ValidationError, ValueError):
+            # Malformed object ids in thread:/course: channel names
+            return JsonResponse({'detail': "Invalid channel id."}, status=400)
+        except StreamError as e:
+            return JsonResponse({'detail': str(e)}, status=e.status)
+
+        limiter = get_connection_limiter()
+        if not limiter.acquire():
+            response = JsonResponse({'detail': "Too many open streams, retry later."}, status=503)
+            response['Retry-After'] = str(RETRY_MILLISECONDS // 1000)
+            return response
+
+        lease = StreamLease(get_broker().subscribe(channels), limiter)
+        response = EventStreamResponse(self._stream(lease), lease, content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    async def _stream(self, lease):
+        subscription = lease.subscription
+        heartbeat = getattr(settings, 'REALTIME_HEARTBEAT_SECONDS', 15)
+        try:
+            yield f"retry: {RETRY_MILLISECONDS}\n\n"
+            while True:
+                try:
+                    message = await asyncio.wait_for(subscription.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield format_event(message)
+                if subscription.overflowed and subscription.queue.empty():
+                    # Messages were dropped; the client should refetch over REST
+                    yield "event: resync\ndata: {}\n\n"
+                    break
+        finally:
+            lease.release()
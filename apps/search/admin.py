@@ -0,0 +1,11 @@
+from django.contrib import admin
+
+from .models import SearchDocument
+
+
+@admin.register(SearchDocument)
+class SearchDocumentAdmin(admin.ModelAdmin):
+    list_display = ('title', 'object_type', 'tenant', 'is_public', 'updated_at')
+    list_filter = ('object_type', 'is_public', 'tenant')
+    search_fields = ('title',)
+    readonly_fields = ('object_type', 'object_id', 'tenant', 'course', 'search_vector')
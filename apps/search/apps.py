@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class SearchConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "apps.search"
+    verbose_name = "Catalog Search"
+
+    def ready(self):
+        """Import signal handlers when the app is ready."""
+        import apps.search.signals  # noqa: F401
@@ -0,0 +1,261 @@
+"""
+Search backends.
+
+PostgresSearchBackend ranks a weighted, GIN-indexed tsvector and falls back to
+trigram similarity on titles when a query matches nothing (typos).
+InvertedIndexSearchBackend is a pure-Python equivalent over SearchPosting rows
+for databases without full-text search (SQLite in development and tests).
+
+Both return a RankedResults sequence over an ordered SQL query, which supports
+len() (a COUNT) and slicing (LIMIT/OFFSET) so it can be handed straight to DRF
+pagination without ranking every match in Python.
+"""
+
+import difflib
+import logging
+import math
+import re
+from collections import Counter
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Case, Count, F, FloatField, Sum, Value, When
+
+from .models import SearchDocument, SearchPosting
+
+logger = logging.getLogger(__name__)
+
+# Relative weights of title, keywords and body (PostgreSQL's A, B and C defaults)
+FIELD_WEIGHTS = {"title": 1.0, "keywords": 0.4, "body": 0.2}
+POSTGRES_FIELD_LABELS = {"title": "A", "keywords": "B", "body": "C"}
+
+MAX_TERM_LENGTH = 64
+TRIGRAM_THRESHOLD = 0.3
+FUZZY_CUTOFF = 0.75
+FUZZY_MATCHES_PER_TERM = 3
+
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from how in is it of on or that the this to what with".split()
+)
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> list:
+    """Lowercased word tokens without stop words or single characters."""
+    return [
+        token[:MAX_TERM_LENGTH]
+        for token in _TOKEN_RE.findall((text or "").lower())
+        if len(token) > 1 and token not in STOP_WORDS
+    ]
+
+
+class RankedResults:
+    """Lazy, sliceable search results ordered by rank."""
+
+    def __init__(self, ranked_ids, queryset):
+        """
+        Args:
+            ranked_ids: ordered (document_id, rank) queryset, best first.
+                Slices run as LIMIT/OFFSET and len() as a COUNT query.
+            queryset: SearchDocument queryset used to load each page
+        """
+        self.ranked_ids = ranked_ids
+        self.queryset = queryset
+        self._count = None
+
+    def __len__(self):
+        return self.count()
+
+    def count(self):
+        if self._count is None:
+            self._count = self.ranked_ids.count()
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            page = list(self.ranked_ids[index])
+        else:
+            page = [self.ranked_ids[index]]
+        documents = self.queryset.in_bulk([document_id for document_id, _ in page])
+        results = []
+        for document_id, rank in page:
+            document = documents.get(document_id)
+            if document is not None:
+                document.rank = rank
+                results.append(document)
+        return results if isinstance(index, slice) else results[0]
+
+
+class BaseSearchBackend:
+    """Interface shared by search backends."""
+
+    name = "base"
+
+    def index(self, document: SearchDocument) -> None:
+        """Update backend-specific index data after a document is saved."""
+        raise NotImplementedError
+
+    def index_many(self, documents: Iterable[SearchDocument]) -> None:
+        for document in documents:
+            self.index(document)
+
+    def search(self, tenant_id, queryset, query: str) -> RankedResults:
+        """Rank documents in queryset (already scoped to the tenant) for query."""
+        raise NotImplementedError
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """tsvector ranking with a trigram fallback for misspelled queries."""
+
+    name = "postgres"
+
+    def __init__(self, config: Optional[str] = None):
+        self.config = config or getattr(settings, "SEARCH_CONFIG", "english")
+
+    def _vector(self):
+        from django.contrib.postgres.search import SearchVector
+
+        vector = None
+        for field, label in POSTGRES_FIELD_LABELS.items():
+            part = SearchVector(field, weight=label, config=self.config)
+            vector = part if vector is None else vector + part
+        return vector
+
+    def index(self, document: SearchDocument) -> None:
+        SearchDocument.objects.filter(pk=document.pk).update(search_vector=self._vector())
+
+    def index_many(self, documents: Iterable[SearchDocument]) -> None:
+        SearchDocument.objects.filter(
+            pk__in=[document.pk for document in documents]
+        ).update(search_vector=self._vector())
+
+    def search(self, tenant_id, queryset, query: str) -> RankedResults:
+        from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+
+        search_query = SearchQuery(query, search_type="websearch", config=self.config)
+        ranked = (
+            queryset.filter(search_vector=search_query)
+            .annotate(rank=SearchRank(F("search_vector"), search_query))
+            .order_by("-rank", "title", "id")
+            .values_list("id", "rank")
+        )
+        if not ranked.exists():
+            # Nothing matched the lexemes; try similar titles to absorb typos
+            ranked = (
+                queryset.annotate(rank=TrigramWordSimilarity(query, "title"))
+                .filter(rank__gte=TRIGRAM_THRESHOLD)
+                .order_by("-rank", "title", "id")
+                .values_list("id", "rank")
+            )
+        return RankedResults(ranked, queryset)
+
+
+class InvertedIndexSearchBackend(BaseSearchBackend):
+    """
+    Pure-Python inverted index stored in SearchPosting.
+
+    Documents are scored with field-weighted tf-idf; every query term must
+    match (like websearch queries). Unknown terms are replaced by close
+    vocabulary matches when the exact query finds nothing.
+    """
+
+    name = "python"
+
+    def _postings(self, document: SearchDocument) -> list:
+        weights = Counter()
+        for field, field_weight in FIELD_WEIGHTS.items():
+            for term in tokenize(getattr(document, field)):
+                weights[term] += field_weight
+        return [
+            SearchPosting(document=document, tenant_id=document.tenant_id, term=term, weight=weight)
+            for term, weight in weights.items()
+        ]
+
+    def index(self, document: SearchDocument) -> None:
+        self.index_many([document])
+
+    def index_many(self, documents: Iterable[SearchDocument]) -> None:
+        documents = list(documents)
+        SearchPosting.objects.filter(document__in=documents).delete()
+        postings = []
+        for document in documents:
+            postings.extend(self._postings(document))
+        SearchPosting.objects.bulk_create(postings, batch_size=1000)
+
+    def search(self, tenant_id, queryset, query: str) -> RankedResults:
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return RankedResults(SearchPosting.objects.none().values_list("document_id", "weight"), queryset)
+
+        ranked = self._rank(tenant_id, queryset, [[term] for term in terms])
+        if not ranked.exists():
+            expanded = [self._expand(tenant_id, term) for term in terms]
+            if any(alternatives != [term] for term, alternatives in zip(terms, expanded)):
+                ranked = self._rank(tenant_id, queryset, expanded)
+        return RankedResults(ranked, queryset)
+
+    def _rank(self, tenant_id, queryset, term_groups: list):
+        """
+        Scores documents containing a term from every group.
+
+        Only document frequencies are read up front; scoring, the
+        every-group filter and ordering run in one grouped query, so pages
+        are fetched with LIMIT/OFFSET instead of ranking every match here.
+        """
+        all_terms = {term for group in term_groups for term in group}
+        postings = SearchPosting.objects.filter(
+            tenant_id=tenant_id, term__in=all_terms, document__in=queryset.values("id")
+        )
+        document_frequency = dict(
+            postings.values("term").order_by().annotate(total=Count("document_id"))
+            .values_list("term", "total")
+        )
+        if not document_frequency:
+            return postings.none().values_list("document_id", "weight")
+
+        total_documents = queryset.count()
+        group_of = {term: index for index, group in enumerate(term_groups) for term in group}
+        score = Sum(Case(
+            *[
+                When(term=term, then=F("weight") * Value(math.log(1 + total_documents / frequency)))
+                for term, frequency in document_frequency.items()
+            ],
+            output_field=FloatField(),
+        ))
+        matched_groups = Count(
+            Case(*[When(term=term, then=Value(group_of[term])) for term in document_frequency]),
+            distinct=True,
+        )
+        return (
+            postings.values("document_id").order_by()
+            .annotate(score=score, matched_groups=matched_groups)
+            .filter(matched_groups=len(term_groups))
+            .order_by("-score", "document_id")
+            .values_list("document_id", "score")
+        )
+
+    def _expand(self, tenant_id, term: str) -> list:
+        """Close vocabulary matches for a possibly misspelled term."""
+        vocabulary = set(
+            SearchPosting.objects.filter(tenant_id=tenant_id, term__startswith=term[:1]).values_list("term", flat=True).distinct()
+        )
+        if term in vocabulary:
+            return [term]
+        return difflib.get_close_matches(
+            term, vocabulary, n=FUZZY_MATCHES_PER_TERM, cutoff=FUZZY_CUTOFF
+        ) or [term]
+
+
+BACKENDS = {
+    PostgresSearchBackend.name: PostgresSearchBackend,
+    InvertedIndexSearchBackend.name: InvertedIndexSearchBackend,
+}
+
+
+def get_search_backend() -> BaseSearchBackend:
+    """Backend named by settings.SEARCH_BACKEND, else chosen by database vendor."""
+    name = getattr(settings, "SEARCH_BACKEND", None)
+    if not name:
+        name = "postgres" if connection.vendor == "postgresql" else "python"
+    return BACKENDS[name]()
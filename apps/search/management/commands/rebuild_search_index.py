@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.models import Tenant
+from apps.search.services import SearchIndexService
+
+
+class Command(BaseCommand):
+    help = 'Rebuild catalog search documents for one tenant or all tenants'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tenant', help='Slug of the tenant to rebuild (default: all tenants)')
+
+    def handle(self, *args, **options):
+        tenants = Tenant.objects.all()
+        if options['tenant']:
+            tenants = tenants.filter(slug=options['tenant'])
+            if not tenants.exists():
+                raise CommandError(f"Tenant '{options['tenant']}' not found")
+
+        for tenant in tenants:
+            count = SearchIndexService.rebuild_tenant(tenant)
+            self.stdout.write(f"{tenant.slug}: indexed {count} documents")
+        self.stdout.write(self.style.SUCCESS('Search index rebuilt'))
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:30
+
+import django.contrib.postgres.search
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('core', '0004_ltilineitem_ltigradesubmission'),
+        ('courses', '0005_add_prerequisite_models'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('object_type', models.CharField(choices=[('COURSE', 'Course'), ('MODULE', 'Module'), ('CONTENT_ITEM', 'Content Item'), ('SKILL', 'Skill')], max_length=20)),
+                ('object_id', models.UUIDField()),
+                ('title', models.CharField(max_length=255)),
+                ('keywords', models.TextField(blank=True)),
+                ('body', models.TextField(blank=True)),
+                ('is_public', models.BooleanField(default=True, help_text='Visible to learners (published and active)')),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(editable=False, null=True)),
+                ('course', models.ForeignKey(blank=True, help_text='Owning course, for course, module and content item documents', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='courses.course')),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_documents', to='core.tenant')),
+            ],
+            options={
+                'ordering': ['title'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SearchPosting',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64)),
+                ('weight', models.FloatField()),
+                ('document', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='postings', to='search.searchdocument')),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.tenant')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='searchdocument',
+            index=models.Index(fields=['tenant', 'object_type'], name='search_sear_tenant__6a5219_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='searchdocument',
+            unique_together={('object_type', 'object_id')},
+        ),
+        migrations.AddIndex(
+            model_name='searchposting',
+            index=models.Index(fields=['tenant', 'term'], name='search_sear_tenant__df21dd_idx'),
+        ),
+    ]
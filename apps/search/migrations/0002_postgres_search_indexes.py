@@ -0,0 +1,45 @@
+"""
+PostgreSQL-only search indexes.
+
+GIN indexes on the weighted tsvector and on title trigrams (for typo-tolerant
+fallback matching). They are created here rather than in Model.Meta so other
+databases, which use SearchPosting instead, can still migrate.
+"""
+
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+GIN_INDEXES = [
+    GinIndex(fields=["search_vector"], name="search_doc_vector_gin"),
+    GinIndex(OpClass("title", name="gin_trgm_ops"), name="search_doc_title_trgm"),
+]
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    SearchDocument = apps.get_model("search", "SearchDocument")
+    for index in GIN_INDEXES:
+        schema_editor.add_index(SearchDocument, index)
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    SearchDocument = apps.get_model("search", "SearchDocument")
+    for index in GIN_INDEXES:
+        schema_editor.remove_index(SearchDocument, index)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("search", "0001_initial"),
+    ]
+
+    operations = [
+        # No-op on databases other than PostgreSQL
+        TrigramExtension(),
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
@@ -0,0 +1,73 @@
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from apps.common.models import TimestampedModel
+
+
+class SearchDocument(TimestampedModel):
+    """
+    One searchable catalog object (course, module, content item or skill).
+
+    Text is denormalised into three weighted fields: title, keywords (tags,
+    categories) and body (descriptions, text content). On PostgreSQL the
+    weighted tsvector lives in `search_vector` (GIN indexed, see migration
+    0002); other databases use SearchPosting rows instead.
+    """
+
+    class ObjectType(models.TextChoices):
+        COURSE = "COURSE", _("Course")
+        MODULE = "MODULE", _("Module")
+        CONTENT_ITEM = "CONTENT_ITEM", _("Content Item")
+        SKILL = "SKILL", _("Skill")
+
+    tenant = models.ForeignKey(
+        "core.Tenant", on_delete=models.CASCADE, related_name="search_documents"
+    )
+    object_type = models.CharField(max_length=20, choices=ObjectType.choices)
+    object_id = models.UUIDField()
+    course = models.ForeignKey(
+        "courses.Course",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="+",
+        help_text="Owning course, for course, module and content item documents",
+    )
+    title = models.CharField(max_length=255)
+    keywords = models.TextField(blank=True)
+    body = models.TextField(blank=True)
+    is_public = models.BooleanField(
+        default=True, help_text="Visible to learners (published and active)"
+    )
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    def __str__(self):
+        return f"{self.get_object_type_display()}: {self.title}"
+
+    class Meta:
+        unique_together = ("object_type", "object_id")
+        indexes = [
+            models.Index(fields=["tenant", "object_type"]),
+        ]
+        ordering = ["title"]
+
+
+class SearchPosting(models.Model):
+    """
+    Inverted-index entry used by the pure-Python search backend.
+
+    `weight` is the field-weighted term frequency of `term` in the document.
+    """
+
+    document = models.ForeignKey(
+        SearchDocument, on_delete=models.CASCADE, related_name="postings"
+    )
+    tenant = models.ForeignKey("core.Tenant", on_delete=models.CASCADE, related_name="+")
+    term = models.CharField(max_length=64)
+    weight = models.FloatField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["tenant", "term"]),
+        ]
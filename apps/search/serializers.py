@@ -0,0 +1,46 @@
+from rest_framework import serializers
+
+from .backends import tokenize
+from .models import SearchDocument
+
+
+class SearchResultSerializer(serializers.ModelSerializer):
+    """A ranked search hit."""
+
+    object_type_display = serializers.CharField(source="get_object_type_display", read_only=True)
+    course_slug = serializers.CharField(source="course.slug", read_only=True, default=None)
+    rank = serializers.FloatField(read_only=True)
+    snippet = serializers.SerializerMethodField()
+
+    SNIPPET_LENGTH = 200
+
+    class Meta:
+        model = SearchDocument
+        fields = (
+            "object_type",
+            "object_type_display",
+            "object_id",
+            "title",
+            "course",
+            "course_slug",
+            "rank",
+            "snippet",
+        )
+        read_only_fields = fields
+
+    def get_snippet(self, obj) -> str:
+        """Body text around the first query term, or its start."""
+        body = obj.body or ""
+        lowered = body.lower()
+        start = 0
+        for term in tokenize(self.context.get("query", "")):
+            position = lowered.find(term)
+            if position >= 0:
+                start = max(0, position - self.SNIPPET_LENGTH // 4)
+                break
+        snippet = body[start:start + self.SNIPPET_LENGTH].strip()
+        if start > 0:
+            snippet = f"…{snippet}"
+        if start + self.SNIPPET_LENGTH < len(body):
+            snippet = f"{snippet}…"
+        return snippet
@@ -0,0 +1,209 @@
+import logging
+from typing import Iterable, Optional
+
+from django.db import transaction
+from django.utils.html import strip_tags
+
+from apps.courses.models import ContentItem, Course, Module
+from apps.skills.models import Skill
+from apps.users.models import User
+
+from .backends import RankedResults, get_search_backend
+from .models import SearchDocument
+
+logger = logging.getLogger(__name__)
+
+ObjectType = SearchDocument.ObjectType
+
+
+def _join(*parts) -> str:
+    values = []
+    for part in parts:
+        if isinstance(part, (list, tuple)):
+            values.extend(str(item) for item in part if item)
+        elif part:
+            values.append(str(part))
+    return " ".join(values)
+
+
+class SearchIndexService:
+    """
+    Keeps SearchDocument rows in step with the catalog.
+
+    Each course, module, content item and skill has one document. Saves are
+    indexed incrementally via signals; rebuild_tenant re-creates a tenant's
+    documents in bulk (see the rebuild_search_index command).
+    """
+
+    MAX_BODY_LENGTH = 100_000
+    REBUILD_CHUNK_SIZE = 500
+
+    # --- Document builders ---
+
+    @classmethod
+    def course_fields(cls, course: Course) -> dict:
+        return {
+            "tenant_id": course.tenant_id,
+            "course_id": course.id,
+            "title": course.title,
+            "keywords": _join(course.tags, course.category, course.difficulty_level),
+            "body": _join(course.description, course.learning_objectives)[:cls.MAX_BODY_LENGTH],
+            "is_public": course.status == Course.Status.PUBLISHED,
+        }
+
+    @classmethod
+    def module_fields(cls, module: Module, course: Course) -> dict:
+        return {
+            "tenant_id": course.tenant_id,
+            "course_id": course.id,
+            "title": module.title,
+            "keywords": course.title,
+            "body": module.description[:cls.MAX_BODY_LENGTH],
+            "is_public": course.status == Course.Status.PUBLISHED,
+        }
+
+    @classmethod
+    def content_item_fields(cls, item: ContentItem, course: Course) -> dict:
+        return {
+            "tenant_id": course.tenant_id,
+            "course_id": course.id,
+            "title": item.title,
+            "keywords": _join(course.title, item.get_content_type_display()),
+            "body": strip_tags(item.text_content or "")[:cls.MAX_BODY_LENGTH],
+            "is_public": course.status == Course.Status.PUBLISHED and item.is_published,
+        }
+
+    @classmethod
+    def skill_fields(cls, skill: Skill) -> dict:
+        return {
+            "tenant_id": skill.tenant_id,
+            "course_id": None,
+            "title": skill.name,
+            "keywords": _join(skill.tags, skill.get_category_display()),
+            "body": skill.description[:cls.MAX_BODY_LENGTH],
+            "is_public": skill.is_active,
+        }
+
+    # --- Incremental updates ---
+
+    @classmethod
+    def _upsert(cls, object_type: str, object_id, fields: dict) -> SearchDocument:
+        document, _ = SearchDocument.objects.update_or_create(
+            object_type=object_type, object_id=object_id, defaults=fields
+        )
+        get_search_backend().index(document)
+        return document
+
+    @classmethod
+    def index_course(cls, course: Course) -> SearchDocument:
+        """Index a course; re-indexes its modules and items if title or status changed."""
+        previous = SearchDocument.objects.filter(
+            object_type=ObjectType.COURSE, object_id=course.id
+        ).values_list("title", "is_public").first()
+        fields = cls.course_fields(course)
+        document = cls._upsert(ObjectType.COURSE, course.id, fields)
+        if previous is not None and previous != (fields["title"], fields["is_public"]):
+            cls.index_course_tree(course)
+        return document
+
+    @classmethod
+    def index_course_tree(cls, course: Course) -> None:
+        """Re-index every module and content item of a course in bulk."""
+        documents = []
+        for module in course.modules.prefetch_related("content_items"):
+            documents.append((ObjectType.MODULE, module.id, cls.module_fields(module, course)))
+            for item in module.content_items.all():
+                documents.append(
+                    (ObjectType.CONTENT_ITEM, item.id, cls.content_item_fields(item, course))
+                )
+        cls._bulk_replace(documents, course.tenant_id)
+
+    @classmethod
+    def index_module(cls, module: Module) -> SearchDocument:
+        return cls._upsert(ObjectType.MODULE, module.id, cls.module_fields(module, module.course))
+
+    @classmethod
+    def index_content_item(cls, item: ContentItem) -> SearchDocument:
+        return cls._upsert(
+            ObjectType.CONTENT_ITEM, item.id, cls.content_item_fields(item, item.module.course)
+        )
+
+    @classmethod
+    def index_skill(cls, skill: Skill) -> SearchDocument:
+        return cls._upsert(ObjectType.SKILL, skill.id, cls.skill_fields(skill))
+
+    @classmethod
+    def index_object(cls, object_type: str, object_id) -> Optional[SearchDocument]:
+        """Loads and indexes an object by type; returns None if it no longer exists."""
+        model, indexer = {
+            ObjectType.COURSE: (Course, cls.index_course),
+            ObjectType.MODULE: (Module, cls.index_module),
+            ObjectType.CONTENT_ITEM: (ContentItem, cls.index_content_item),
+            ObjectType.SKILL: (Skill, cls.index_skill),
+        }[object_type]
+        instance = model.objects.filter(pk=object_id).first()
+        if instance is None:
+            return None
+        return indexer(instance)
+
+    @classmethod
+    def remove(cls, object_type: str, object_id) -> None:
+        SearchDocument.objects.filter(object_type=object_type, object_id=object_id).delete()
+
+    # --- Bulk rebuild ---
+
+    @classmethod
+    def rebuild_tenant(cls, tenant) -> int:
+        """Re-creates every search document of a tenant. Returns the document count."""
+        documents = []
+        courses = Course.objects.filter(tenant=tenant).prefetch_related("modules__content_items")
+        for course in courses:
+            documents.append((ObjectType.COURSE, course.id, cls.course_fields(course)))
+            for module in course.modules.all():
+                documents.append((ObjectType.MODULE, module.id, cls.module_fields(module, course)))
+                for item in module.content_items.all():
+                    documents.append(
+                        (ObjectType.CONTENT_ITEM, item.id, cls.content_item_fields(item, course))
+                    )
+        for skill in Skill.objects.filter(tenant=tenant):
+            documents.append((ObjectType.SKILL, skill.id, cls.skill_fields(skill)))
+
+        with transaction.atomic():
+            SearchDocument.objects.filter(tenant=tenant).delete()
+            cls._bulk_replace(documents, tenant.id)
+
+        logger.info(f"Rebuilt {len(documents)} search documents for tenant {tenant.id}")
+        return len(documents)
+
+    @classmethod
+    def _bulk_replace(cls, documents: Iterable[tuple], tenant_id) -> None:
+        """Replaces documents (object_type, object_id, fields) in chunks."""
+        documents = list(documents)
+        backend = get_search_backend()
+        for start in range(0, len(documents), cls.REBUILD_CHUNK_SIZE):
+            chunk = documents[start:start + cls.REBUILD_CHUNK_SIZE]
+            SearchDocument.objects.filter(
+                tenant_id=tenant_id, object_id__in=[object_id for _, object_id, _ in chunk]
+            ).delete()
+            created = SearchDocument.objects.bulk_create([
+                SearchDocument(object_type=object_type, object_id=object_id, **fields)
+                for object_type, object_id, fields in chunk
+            ])
+            backend.index_many(created)
+
+
+class SearchService:
+    """Ranked catalog search scoped to a tenant and the user's visibility."""
+
+    STAFF_ROLES = (User.Role.ADMIN, User.Role.INSTRUCTOR)
+
+    @classmethod
+    def search(
+        cls, tenant, user, query: str, object_types: Optional[Iterable[str]] = None
+    ) -> RankedResults:
+        queryset = SearchDocument.objects.filter(tenant=tenant).select_related("course")
+        if object_types:
+            queryset = queryset.filter(object_type__in=list(object_types))
+        if not (user.is_superuser or user.role in cls.STAFF_ROLES):
+            queryset = queryset.filter(is_public=True)
+        return get_search_backend().search(tenant.id, queryset, query)
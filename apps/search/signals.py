@@ -0,0 +1,86 @@
+"""
+Signal handlers for the Search app.
+
+Keeps the search index current: saving a course, module, content item or
+skill re-indexes its document, deleting one removes it. Course deletion
+removes its module and item documents through the document's course FK.
+Indexing is queued to Celery once the saving transaction commits (so a
+course title change re-indexes its tree off the request path), and runs
+inline if the broker is unavailable. An index failure never breaks the save.
+"""
+
+import logging
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.courses.models import ContentItem, Course, Module
+from apps.skills.models import Skill
+
+from .models import SearchDocument
+from .services import SearchIndexService
+
+logger = logging.getLogger(__name__)
+
+ObjectType = SearchDocument.ObjectType
+
+
+def _schedule_index(object_type: str, object_id) -> None:
+    """Index the object after commit unless auto-indexing is disabled (e.g. during bulk imports)."""
+    if not getattr(settings, "SEARCH_AUTO_INDEX", True):
+        return
+    object_id = str(object_id)
+
+    def _dispatch():
+        from .tasks import index_object_task
+
+        try:
+            # Don't retry publishing: a down broker should fall back inline at once
+            index_object_task.apply_async(args=[object_type, object_id], retry=False)
+        except Exception as e:
+            logger.warning(f"Could not queue indexing of {object_type} {object_id}, running inline: {e}")
+            try:
+                SearchIndexService.index_object(object_type, object_id)
+            except Exception as e:
+                logger.error(f"Error indexing {object_type} {object_id}: {e}", exc_info=True)
+
+    transaction.on_commit(_dispatch)
+
+
+# Raw saves (fixture loading) are skipped: related rows may not exist yet
+@receiver(post_save, sender=Course)
+def index_course_on_save(sender, instance: Course, raw=False, **kwargs):
+    if not raw:
+        _schedule_index(ObjectType.COURSE, instance.pk)
+
+
+@receiver(post_save, sender=Module)
+def index_module_on_save(sender, instance: Module, raw=False, **kwargs):
+    if not raw:
+        _schedule_index(ObjectType.MODULE, instance.pk)
+
+
+@receiver(post_save, sender=ContentItem)
+def index_content_item_on_save(sender, instance: ContentItem, raw=False, **kwargs):
+    if not raw:
+        _schedule_index(ObjectType.CONTENT_ITEM, instance.pk)
+
+
+@receiver(post_save, sender=Skill)
+def index_skill_on_save(sender, instance: Skill, raw=False, **kwargs):
+    if not raw:
+        _schedule_index(ObjectType.SKILL, instance.pk)
+
+
+@receiver(post_delete, sender=Module)
+@receiver(post_delete, sender=ContentItem)
+@receiver(post_delete, sender=Skill)
+def remove_document_on_delete(sender, instance, **kwargs):
+    object_type = {
+        Module: ObjectType.MODULE,
+        ContentItem: ObjectType.CONTENT_ITEM,
+        Skill: ObjectType.SKILL,
+    }[sender]
+    SearchIndexService.remove(object_type, instance.pk)
@@ -0,0 +1,25 @@
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(
+    bind=True,
+    name="search.index_object",
+    max_retries=3,
+    default_retry_delay=30,
+)
+def index_object_task(self, object_type: str, object_id: str):
+    """
+    Celery task that (re-)indexes one catalog object.
+    Queued after commit by the search signal handlers.
+    """
+    from .services import SearchIndexService
+
+    try:
+        SearchIndexService.index_object(object_type, object_id)
+    except Exception as e:
+        logger.error(f"Celery task failed to index {object_type} {object_id}: {e}", exc_info=True)
+        self.retry(exc=e)
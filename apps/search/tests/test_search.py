@@ -0,0 +1,263 @@
+"""Tests for catalog search indexing, ranking and the search endpoint."""
+
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.core.models import Tenant
+from apps.courses.models import ContentItem, Course, Module
+from apps.search.backends import tokenize
+from apps.search.models import SearchDocument, SearchPosting
+from apps.search.services import SearchService
+from apps.skills.models import Skill
+from apps.users.models import User
+
+
+class SearchTestCase(TestCase):
+    """Base setup with a small catalog."""
+
+    def setUp(self):
+        # No broker in tests: queued indexing falls back to running inline on commit
+        patcher = patch(
+            "apps.search.tasks.index_object_task.apply_async", side_effect=ConnectionError("broker down")
+        )
+        self.apply_async = patcher.start()
+        self.addCleanup(patcher.stop)
+        with self.captureOnCommitCallbacks(execute=True):
+            self._create_catalog()
+
+    def _create_catalog(self):
+        self.tenant = Tenant.objects.create(name="Test Tenant", slug="test-tenant")
+        self.other_tenant = Tenant.objects.create(name="Other Tenant", slug="other-tenant")
+        self.instructor = User.objects.create_user(
+            email="instructor@example.com",
+            password="testpass123",
+            role=User.Role.INSTRUCTOR,
+            tenant=self.tenant
+        )
+        self.learner = User.objects.create_user(
+            email="learner@example.com",
+            password="testpass123",
+            role=User.Role.LEARNER,
+            tenant=self.tenant
+        )
+        self.python = Course.objects.create(
+            tenant=self.tenant,
+            title="Python Programming",
+            description="Learn variables, loops and functions.",
+            tags=["coding", "backend"],
+            instructor=self.instructor,
+            status=Course.Status.PUBLISHED
+        )
+        self.draft = Course.objects.create(
+            tenant=self.tenant,
+            title="Advanced Python Internals",
+            instructor=self.instructor,
+            status=Course.Status.DRAFT
+        )
+        self.module = Module.objects.create(course=self.python, title="Loops", order=1)
+        self.item = ContentItem.objects.create(
+            module=self.module,
+            title="While statements",
+            content_type=ContentItem.ContentType.TEXT,
+            text_content="<p>A <b>generator</b> yields values lazily.</p>",
+            is_published=True
+        )
+        self.skill = Skill.objects.create(
+            tenant=self.tenant, name="Data Analysis", description="Working with pandas"
+        )
+        Course.objects.create(
+            tenant=self.other_tenant, title="Python for Others", status=Course.Status.PUBLISHED
+        )
+
+    def _search(self, query, user=None, object_types=None):
+        return list(SearchService.search(self.tenant, user or self.learner, query, object_types))
+
+
+class TokenizeTests(TestCase):
+    """Tests for the shared tokenizer."""
+
+    def test_lowercases_and_drops_stop_words(self):
+        self.assertEqual(tokenize("The Basics of SQL, and a Q&A"), ["basics", "sql"])
+
+
+class SearchIndexingTests(SearchTestCase):
+    """Tests for incremental indexing via signals."""
+
+    def test_documents_created_on_save(self):
+        """Test that every catalog object gets a document in its tenant."""
+        types = set(
+            SearchDocument.objects.filter(tenant=self.tenant).values_list("object_type", flat=True)
+        )
+        self.assertEqual(types, set(SearchDocument.ObjectType.values))
+        item_document = SearchDocument.objects.get(object_id=self.item.id)
+        self.assertEqual(item_document.body, "A generator yields values lazily.")
+        self.assertEqual(item_document.course_id, self.python.id)
+
+    def test_update_reindexes_document(self):
+        """Test that edited titles are searchable immediately."""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.module.title = "Iteration"
+            self.module.save()
+
+        self.assertEqual([d.object_id for d in self._search("iteration")], [self.module.id])
+        self.assertEqual(self._search("loops", object_types=["MODULE"]), [])
+
+    def test_course_status_change_updates_children(self):
+        """Test that unpublishing a course hides its modules and items from learners."""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.python.status = Course.Status.DRAFT
+            self.python.save()
+
+        self.assertEqual(self._search("generator"), [])
+        self.assertEqual(len(self._search("generator", user=self.instructor)), 1)
+
+    def test_delete_removes_documents(self):
+        """Test that deleting objects removes their documents and postings."""
+        self.python.delete()
+        self.skill.delete()
+
+        self.assertFalse(
+            SearchDocument.objects.filter(object_id__in=[self.python.id, self.item.id, self.skill.id]).exists()
+        )
+        self.assertFalse(SearchPosting.objects.filter(term="generator").exists())
+
+    def test_indexing_is_queued_after_commit(self):
+        """Test that saves queue an indexing task only once the transaction commits."""
+        self.apply_async.reset_mock(side_effect=True)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.module.title = "Iteration"
+            self.module.save()
+        self.apply_async.assert_not_called()
+
+        for callback in callbacks:
+            callback()
+
+        self.apply_async.assert_called_once_with(args=["MODULE", str(self.module.id)], retry=False)
+        self.assertEqual(self._search("iteration"), [])
+
+    @override_settings(SEARCH_AUTO_INDEX=False)
+    def test_rebuild_command_indexes_tenant(self):
+        """Test that rebuilding recreates documents skipped while auto-indexing was off."""
+        with self.captureOnCommitCallbacks(execute=True):
+            course = Course.objects.create(
+                tenant=self.tenant, title="Statistics", status=Course.Status.PUBLISHED
+            )
+        self.assertEqual(self._search("statistics"), [])
+
+        call_command("rebuild_search_index", tenant=self.tenant.slug, stdout=StringIO())
+
+        self.assertEqual([d.object_id for d in self._search("statistics")], [course.id])
+        self.assertEqual(SearchDocument.objects.filter(tenant=self.tenant).count(), 6)
+
+
+class SearchRankingTests(SearchTestCase):
+    """Tests for ranking, visibility and typo tolerance."""
+
+    def test_title_match_ranks_above_keyword_match(self):
+        """Test field weighting: title hits outrank course-title keywords on children."""
+        results = self._search("python")
+
+        self.assertEqual(results[0].object_id, self.python.id)
+        self.assertGreater(results[0].rank, results[-1].rank)
+
+    def test_scoped_to_tenant_and_visibility(self):
+        """Test that learners only see published documents of their tenant."""
+        learner_ids = {d.object_id for d in self._search("python")}
+        instructor_ids = {d.object_id for d in self._search("python", user=self.instructor)}
+
+        self.assertNotIn(self.draft.id, learner_ids)
+        self.assertIn(self.draft.id, instructor_ids)
+        self.assertFalse(
+            SearchDocument.objects.filter(object_id__in=learner_ids, tenant=self.other_tenant).exists()
+        )
+
+    def test_all_terms_must_match(self):
+        """Test that multi-word queries require every term."""
+        self.assertEqual(len(self._search("python backend", object_types=["COURSE"])), 1)
+        self.assertEqual(self._search("python pandas"), [])
+
+    def test_typo_falls_back_to_close_terms(self):
+        """Test that a misspelled term still finds the document."""
+        results = self._search("generater")
+
+        self.assertEqual([d.object_id for d in results], [self.item.id])
+
+
+class SearchViewTests(SearchTestCase):
+    """Tests for the /search endpoint."""
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.learner)
+        self.url = "/api/v1/search/"
+
+    def test_returns_paginated_ranked_results(self):
+        response = self.client.get(
+            self.url, {"q": "python", "page_size": 1}, HTTP_X_TENANT_SLUG=self.tenant.slug
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 3)
+        self.assertEqual(len(response.data["results"]), 1)
+        hit = response.data["results"][0]
+        self.assertEqual(hit["object_type"], "COURSE")
+        self.assertEqual(hit["course_slug"], self.python.slug)
+        self.assertIsNotNone(response.data["next"])
+
+    def test_pages_are_sliced_in_the_database(self):
+        """Test that a page loads only its own ranked ids rather than every match."""
+        with self.captureOnCommitCallbacks(execute=True):
+            for index in range(15):
+                Module.objects.create(course=self.python, title=f"Python part {index}", order=10 + index)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(
+                self.url, {"q": "python", "page_size": 5, "page": 2}, HTTP_X_TENANT_SLUG=self.tenant.slug
+            )
+
+        self.assertEqual(response.data["count"], 18)
+        self.assertEqual(len(response.data["results"]), 5)
+        self.assertTrue(any(
+            "LIMIT 5 OFFSET 5" in query["sql"] and "search_searchposting" in query["sql"]
+            for query in context.captured_queries
+        ))
+
+    def test_type_filter_and_snippet(self):
+        response = self.client.get(
+            self.url, {"q": "generator", "type": "content_item"}, HTTP_X_TENANT_SLUG=self.tenant.slug
+        )
+
+        self.assertEqual(response.data["count"], 1)
+        self.assertIn("generator", response.data["results"][0]["snippet"])
+
+    def test_rejects_missing_query_and_unknown_type(self):
+        response = self.client.get(self.url, HTTP_X_TENANT_SLUG=self.tenant.slug)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(
+            self.url, {"q": "python", "type": "PAGE"}, HTTP_X_TENANT_SLUG=self.tenant.slug
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_query_count_independent_of_result_count(self):
+        """Test that a page of results is loaded in a fixed number of queries."""
+        with self.captureOnCommitCallbacks(execute=True):
+            for index in range(15):
+                Module.objects.create(course=self.python, title=f"Python part {index}", order=10 + index)
+
+        self.client.get(self.url, {"q": "python"}, HTTP_X_TENANT_SLUG=self.tenant.slug)
+        with self.assertNumQueries(self._count_queries({"q": "python"})):
+            self.client.get(self.url, {"q": "python part"}, HTTP_X_TENANT_SLUG=self.tenant.slug)
+
+    def _count_queries(self, params):
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(self.url, params, HTTP_X_TENANT_SLUG=self.tenant.slug)
+        return len(context.captured_queries)
@@ -0,0 +1,15 @@
+"""
+URL configuration for the Search app.
+
+Search:                   GET         /api/v1/search/?q=...&type=COURSE,MODULE
+"""
+
+from django.urls import path
+
+from .views import SearchView
+
+app_name = 'search'
+
+urlpatterns = [
+    path('', SearchView.as_view(), name='search'),
+]
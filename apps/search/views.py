@@ -0,0 +1,54 @@
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework import generics, permissions
+from rest_framework.exceptions import ValidationError
+
+from apps.common.mixins import parse_field_list
+
+from .models import SearchDocument
+from .serializers import SearchResultSerializer
+from .services import SearchService
+
+MAX_QUERY_LENGTH = 200
+
+
+@extend_schema(
+    tags=['Search'], summary="Search the catalog",
+    description="Ranked full-text search over courses, modules, content items and skills in the tenant.",
+    parameters=[
+        OpenApiParameter(name='q', required=True, type=OpenApiTypes.STR, description='Search query'),
+        OpenApiParameter(
+            name='type', type=OpenApiTypes.STR,
+            description='Comma-separated object types: COURSE, MODULE, CONTENT_ITEM, SKILL',
+        ),
+    ],
+)
+class SearchView(generics.ListAPIView):
+    serializer_class = SearchResultSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    filter_backends = []
+
+    def get_query(self) -> str:
+        return self.request.query_params.get('q', '').strip()[:MAX_QUERY_LENGTH]
+
+    def get_queryset(self):
+        if getattr(self, 'swagger_fake_view', False): return SearchDocument.objects.none()
+        query = self.get_query()
+        if not query:
+            raise ValidationError({'q': 'A search query is required.'})
+        tenant = self.request.tenant
+        if not tenant:
+            return SearchDocument.objects.none()
+
+        object_types = parse_field_list(self.request.query_params.get('type'))
+        if object_types:
+            object_types = {object_type.upper() for object_type in object_types}
+            invalid = object_types - set(SearchDocument.ObjectType.values)
+            if invalid:
+                raise ValidationError({'type': f"Unknown object types: {', '.join(sorted(invalid))}"})
+        return SearchService.search(tenant, self.request.user, query, object_types)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['query'] = self.get_query()
+        return context
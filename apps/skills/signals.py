@@ -7,12 +7,11 @@ Handles automatic skill progress updates based on:
 """
 
 import logging
-from decimal import Decimal
 
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
-from apps.assessments.models import AssessmentAttempt, Question
+from apps.assessments.models import AssessmentAttempt
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +26,20 @@ def update_skills_on_assessment_completion(sender, instance: AssessmentAttempt,
     2. Extracts question results from the attempt
     3. Updates skill proficiency based on performance
     """
+    # Attempts graded by the submission pipeline get a dedicated stage instead
+    if getattr(instance, "_pipeline_managed", False):
+        return
+
+    update_skills_for_attempt(instance)
+
+
+def update_skills_for_attempt(instance: AssessmentAttempt) -> None:
+    """
+    Update learner skill progress from a graded assessment attempt.
+
+    Called from the post_save receiver and from the submission pipeline's
+    skill update stage.
+    """
     # Only process when attempt is graded
     if instance.status != AssessmentAttempt.AttemptStatus.GRADED:
         return
@@ -83,8 +96,8 @@ def _extract_question_results(
     """
     Extract question results from an assessment attempt.
     
-    Analyzes each answered question to determine if it was correct
-    and calculates the score achieved.
+    Reads the per-question result vector persisted at grading time, so
+    answers are never re-graded here.
     
     Args:
         attempt: The graded assessment attempt
@@ -95,53 +108,22 @@ def _extract_question_results(
     """
     from apps.assessments.services import GradingService
     
-    results = []
-    submitted_answers = attempt.answers or {}
-    
     # Get unique questions from skill mappings
-    question_ids = set(mapping.question_id for mapping in skill_mappings)
-    questions = Question.objects.filter(id__in=question_ids)
-    question_map = {str(q.id): q for q in questions}
+    question_ids = set(str(mapping.question_id) for mapping in skill_mappings)
     
-    for question_id_str, user_answer in submitted_answers.items():
-        question = question_map.get(question_id_str)
-        if not question:
+    results = []
+    for result in GradingService.get_question_results(attempt):
+        if result['question_id'] not in question_ids:
             continue
-        
-        # Determine if the answer was correct using GradingService helpers
-        is_correct = False
-        score = Decimal(0)
-        
-        try:
-            if question.question_type == Question.QuestionType.MULTIPLE_CHOICE:
-                score = GradingService._grade_multiple_choice(question, user_answer)
-            elif question.question_type == Question.QuestionType.TRUE_FALSE:
-                score = GradingService._grade_true_false(question, user_answer)
-            elif question.question_type == Question.QuestionType.SHORT_ANSWER:
-                score = GradingService._grade_short_answer(question, user_answer)
-            elif question.question_type == Question.QuestionType.MATCHING:
-                score = GradingService._grade_matching(question, user_answer)
-            elif question.question_type == Question.QuestionType.FILL_BLANKS:
-                score = GradingService._grade_fill_blanks(question, user_answer)
-            else:
-                # For manual grading types, we can't determine correctness here
-                # Skip or use a placeholder
-                continue
-            
-            # Question is correct if score equals full points
-            is_correct = score >= Decimal(question.points)
-            
-        except Exception as e:
-            logger.warning(
-                f"Error grading question {question_id_str} for skill calculation: {e}"
-            )
+        # Unanswered questions and those awaiting manual grading don't count
+        if not result.get('answered') or result['score'] is None:
             continue
         
         results.append({
-            'question_id': question_id_str,
-            'is_correct': is_correct,
-            'score': float(score),
-            'max_score': float(question.points)
+            'question_id': result['question_id'],
+            'is_correct': result['correct'],
+            'score': result['score'],
+            'max_score': result['max_points']
         })
     
     return results
@@ -205,6 +205,29 @@ class AssessmentSkillSignalTests(TestCase):
             # Python should have better progress due to partial correctness
             self.assertGreaterEqual(python_progress.proficiency_score, 0)
 
+    def test_signal_reuses_persisted_question_results(self):
+        """Test that skill updates read the grading vector instead of re-grading."""
+        answers = {
+            str(self.question1.id): 'a',
+            str(self.question2.id): 'true',
+            str(self.question3.id): 'b',
+        }
+        with patch(
+            'apps.assessments.grading.QuestionPlan.grade',
+            autospec=True,
+            side_effect=lambda plan, answer: Decimal(0),
+        ) as mock_grade, patch(
+            'apps.skills.services.SkillAnalysisService.update_skill_from_assessment',
+            return_value=[],
+        ) as mock_update:
+            self._create_and_submit_attempt(answers)
+
+        # Each answered question is graded exactly once
+        self.assertEqual(mock_grade.call_count, 3)
+        question_results = mock_update.call_args.kwargs['question_results']
+        self.assertEqual(len(question_results), 3)
+        self.assertTrue(all(r['max_score'] == 10.0 for r in question_results))
+
     def test_signal_does_not_run_for_non_graded_attempts(self):
         """Test that signal doesn't process IN_PROGRESS attempts."""
         # Create attempt without submitting
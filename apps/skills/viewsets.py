@@ -16,6 +16,7 @@ from rest_framework import permissions, serializers, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from apps.common.mixins import ConditionalGetMixin
 from apps.courses.models import Module
 from apps.users.models import User
 from apps.users.permissions import IsAdminOrTenantAdmin, IsInstructorOrAdmin
@@ -58,7 +59,7 @@ from .serializers import (
     partial_update=extend_schema(summary="Partially update a skill"),
     destroy=extend_schema(summary="Delete a skill"),
 )
-class SkillViewSet(viewsets.ModelViewSet):
+class SkillViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     API endpoint for managing Skills.
     
@@ -118,6 +119,16 @@ class SkillViewSet(viewsets.ModelViewSet):
             return SkillCreateUpdateSerializer
         return SkillDetailSerializer
 
+    def get_etag_dependencies(self, scope):
+        """Parents, children and ancestors are tenant skills; detail views also count mappings."""
+        dependencies = [Skill.objects.filter(tenant_id__in=scope.values('tenant_id'))]
+        if self.action == 'retrieve':
+            dependencies += [
+                ModuleSkill.objects.filter(skill_id__in=scope.values('pk')),
+                LearnerSkillProgress.objects.filter(skill_id__in=scope.values('pk')),
+            ]
+        return dependencies
+
     def get_permissions(self):
         """Assign permissions based on action."""
         if self.action in ['list', 'retrieve']:
@@ -65,6 +65,8 @@ INSTALLED_APPS = [
     "apps.analytics",
     "apps.discussions",
     "apps.skills",
+    "apps.search",
+    "apps.realtime",
 ]
 
 MIDDLEWARE = [
@@ -113,6 +115,25 @@ ASGI_APPLICATION = "lms_backend.asgi.application"  # For Channels/Async later
 DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{BASE_DIR / 'db.sqlite3'}")
 DATABASES = {"default": dj_database_url.config(default=DATABASE_URL, conn_max_age=600)}
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Redis shared by all workers when CACHE_URL is set; per-process memory otherwise
+CACHE_URL = os.getenv("CACHE_URL", "")
+if CACHE_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CACHE_URL,
+            "KEY_PREFIX": "lms",
+        }
+    }
+else:
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+# In-process LRU in front of the shared cache for apps.common.cache.cached(): entries, and seconds
+# an entry may be served after it was invalidated in another process
+CACHE_LOCAL_MAX_ENTRIES = int(os.getenv("CACHE_LOCAL_MAX_ENTRIES", 1024))
+CACHE_LOCAL_TTL = float(os.getenv("CACHE_LOCAL_TTL", 5))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -286,6 +307,14 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'notifications.send_deadline_reminders',
         'schedule': crontab(minute=0),  # Run every hour at minute 0
     },
+    'process-daily-analytics': {
+        'task': 'analytics.process_daily_events',
+        'schedule': crontab(minute=15, hour=1),  # Nightly; completed (tenant, day, stage) units are skipped
+    },
+    'run-item-analysis': {
+        'task': 'analytics.run_item_analysis',
+        'schedule': crontab(minute=30, hour=2),  # Nightly; only new attempts are folded in
+    },
 }
 
 
@@ -388,3 +417,48 @@ TWILIO_FROM_NUMBER = os.getenv("TWILIO_FROM_NUMBER")  # e.g., "+15551234567"
 # https://firebase.google.com/docs/cloud-messaging
 FCM_SERVER_KEY = os.getenv("FCM_SERVER_KEY")
 FCM_PROJECT_ID = os.getenv("FCM_PROJECT_ID")
+
+# Catalog Search Configuration
+# Backend: 'postgres' (tsvector + trigram) or 'python' (inverted index); empty picks by database
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "")
+# PostgreSQL text search configuration used for stemming and stop words
+SEARCH_CONFIG = os.getenv("SEARCH_CONFIG", "english")
+# Index catalog changes on save; disable for bulk imports and run rebuild_search_index afterwards
+SEARCH_AUTO_INDEX = os.getenv("SEARCH_AUTO_INDEX", "True") == "True"
+
+# Realtime (server-sent events) Configuration
+# Broker: 'memory' (single worker) or 'redis' (fan-out across workers and hosts)
+REALTIME_BROKER = os.getenv("REALTIME_BROKER", "memory")
+REALTIME_REDIS_URL = os.getenv("REALTIME_REDIS_URL", "redis://localhost:6379/2")
+# Open event streams allowed per worker process before new ones get 503
+REALTIME_MAX_CONNECTIONS = int(os.getenv("REALTIME_MAX_CONNECTIONS", 1000))
+# Seconds between keepalive comments on idle streams
+REALTIME_HEARTBEAT_SECONDS = int(os.getenv("REALTIME_HEARTBEAT_SECONDS", 15))
+# Pending events buffered per stream; a slower client is told to resync
+REALTIME_QUEUE_SIZE = int(os.getenv("REALTIME_QUEUE_SIZE", 100))
+# Lifetime of the single-use ?ticket= issued for opening an event stream
+REALTIME_TICKET_TTL_SECONDS = int(os.getenv("REALTIME_TICKET_TTL_SECONDS", 30))
+# Publish model changes to realtime channels
+REALTIME_PUBLISH = os.getenv("REALTIME_PUBLISH", "True") == "True"
+
+# Analytics Dashboard Configuration
+# Thread pool shared by dashboard section builders; 1 builds sections inline
+ANALYTICS_DASHBOARD_WORKERS = int(os.getenv("ANALYTICS_DASHBOARD_WORKERS", 4))
+# Seconds a section may run before the dashboard is returned without it
+# (also its PostgreSQL statement_timeout)
+ANALYTICS_DASHBOARD_SECTION_TIMEOUT = float(os.getenv("ANALYTICS_DASHBOARD_SECTION_TIMEOUT", 10))
+# Seconds a section may wait for a free worker before it is cancelled
+ANALYTICS_DASHBOARD_QUEUE_TIMEOUT = float(os.getenv("ANALYTICS_DASHBOARD_QUEUE_TIMEOUT", 5))
+
+# Performance Instrumentation
+# Requests over any of these thresholds are counted as slow and traced with their top queries
+PERF_SLOW_REQUEST_SECONDS = float(os.getenv("PERF_SLOW_REQUEST_SECONDS", 1.0))
+PERF_SLOW_QUERY_COUNT = int(os.getenv("PERF_SLOW_QUERY_COUNT", 50))
+# Queries repeating a fingerprint already seen in the request (N+1 patterns)
+PERF_DUPLICATE_QUERY_THRESHOLD = int(os.getenv("PERF_DUPLICATE_QUERY_THRESHOLD", 10))
+# Fraction of slow requests whose trace is logged and kept
+PERF_TRACE_SAMPLE_RATE = float(os.getenv("PERF_TRACE_SAMPLE_RATE", 1.0))
+# Add X-DB-Query-Count / Server-Timing headers to responses (on by default in development)
+PERF_QUERY_HEADERS = os.getenv("PERF_QUERY_HEADERS", "False") == "True"
+# Bearer token required by /metrics; when empty the endpoint is only served with DEBUG on
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
@@ -13,6 +13,9 @@ DEFAULT_FILE_STORAGE = 'django.core.files.storage.FileSystemStorage'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Show per-request query counts and timings in response headers
+PERF_QUERY_HEADERS = os.getenv("PERF_QUERY_HEADERS", "True") == "True"
+
 
 # Disable CORS restrictions for easier local development (use with caution)
 # CORS_ALLOW_ALL_ORIGINS = True
@@ -24,10 +24,11 @@ from drf_spectacular.views import (
     SpectacularRedocView,
     SpectacularSwaggerView,
 )
-from apps.core.views import AdminDashboardStatsView
+from apps.core.views import AdminDashboardStatsView, metrics_view
 
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("metrics", metrics_view, name="metrics"),  # Prometheus scrape endpoint
     # API V1 URLs
     path(
         "api/v1/",
@@ -50,6 +51,8 @@ urlpatterns = [
                 path("analytics/", include("apps.analytics.urls")),
                 path("discussions/", include("apps.discussions.urls")),
                 path("skills/", include("apps.skills.urls")),
+                path("search/", include("apps.search.urls")),
+                path("realtime/", include("apps.realtime.urls")),
 
                 # Learner-specific endpoints
                 path('learner/', include('apps.core.learner_api_urls')),
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+"""
+Load test for the realtime event stream (GET /api/v1/realtime/events/).
+
+Opens many concurrent SSE connections and reports how many were accepted,
+how many were refused by the per-worker connection limit (503), and the
+publish-to-receive latency of the events that arrived. Uses only the
+standard library so it can run from any box:
+
+    python scripts/sse_load_test.py --url http://localhost:8000 \\
+        --token <access-jwt> --tenant acme --connections 2000 --duration 60
+
+Run the server under ASGI (e.g. `uvicorn lms_backend.asgi:application`) and
+trigger events while the test runs (post replies, send notifications) to
+measure fan-out latency; with no traffic it measures idle connection cost.
+"""
+
+import argparse
+import asyncio
+import json
+import ssl
+import statistics
+import time
+from urllib.parse import urlencode, urlsplit
+
+
+class Stats:
+    def __init__(self):
+        self.connected = 0
+        self.refused = 0
+        self.failed = 0
+        self.events = 0
+        self.keepalives = 0
+        self.latencies = []
+
+
+async def open_stream(args, stats: Stats, deadline: float) -> None:
+    parts = urlsplit(args.url)
+    secure = parts.scheme == 'https'
+    port = parts.port or (443 if secure else 80)
+    query = urlencode({'token': args.token, 'channels': args.channels})
+    path = f"{parts.path.rstrip('/')}/api/v1/realtime/events/?{query}"
+    headers = [
+        f"GET {path} HTTP/1.1",
+        f"Host: {parts.hostname}",
+        "Accept: text/event-stream",
+        "Connection: keep-alive",
+    ]
+    if args.tenant:
+        headers.append(f"X-Tenant-Slug: {args.tenant}")
+
+    try:
+        reader, writer = await asyncio.open_connection(
+            parts.hostname, port, ssl=ssl.create_default_context() if secure else None
+        )
+    except OSError:
+        stats.failed += 1
+        return
+
+    try:
+        writer.write(("\r\n".join(headers) + "\r\n\r\n").encode())
+        await writer.drain()
+        status_line = await reader.readline()
+        status = int(status_line.split()[1]) if status_line else 0
+        if status == 503:
+            stats.refused += 1
+            return
+        if status != 200:
+            stats.failed += 1
+            return
+        stats.connected += 1
+
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                line = await asyncio.wait_for(reader.readline(), timeout=remaining)
+            except asyncio.TimeoutError:
+                return
+            if not line:
+                return
+            # Chunked transfer framing lines are skipped; only SSE fields matter
+            line = line.decode(errors='replace').strip()
+            if line.startswith(': keepalive'):
+                stats.keepalives += 1
+            elif line.startswith('data: '):
+                stats.events += 1
+                published_at = json.loads(line[6:]).get('published_at')
+                if published_at:
+                    stats.latencies.append(time.time() - published_at)
+    except (OSError, ValueError, IndexError):
+        stats.failed += 1
+    finally:
+        writer.close()
+
+
+async def run(args) -> Stats:
+    stats = Stats()
+    deadline = time.monotonic() + args.duration
+    tasks = []
+    for _ in range(args.connections):
+        tasks.append(asyncio.create_task(open_stream(args, stats, deadline)))
+        if args.ramp:
+            await asyncio.sleep(args.ramp / args.connections)
+    await asyncio.gather(*tasks)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://localhost:8000', help='Server base URL')
+    parser.add_argument('--token', required=True, help='JWT access token used by every connection')
+    parser.add_argument('--tenant', help='Tenant slug sent as X-Tenant-Slug')
+    parser.add_argument('--channels', default='notifications', help='Comma-separated channel list')
+    parser.add_argument('--connections', type=int, default=500, help='Concurrent streams to open')
+    parser.add_argument('--duration', type=float, default=30, help='Seconds to hold the streams open')
+    parser.add_argument('--ramp', type=float, default=5, help='Seconds over which to open connections')
+    args = parser.parse_args()
+
+    started = time.monotonic()
+    stats = asyncio.run(run(args))
+    elapsed = time.monotonic() - started
+
+    print(f"connections requested: {args.connections}")
+    print(f"accepted: {stats.connected}  refused (503): {stats.refused}  failed: {stats.failed}")
+    print(f"events received: {stats.events}  keepalives: {stats.keepalives}  elapsed: {elapsed:.1f}s")
+    if stats.latencies:
+        latencies = sorted(stats.latencies)
+        p95 = latencies[int(len(latencies) * 0.95) - 1] if len(latencies) >= 20 else latencies[-1]
+        print(
+            f"delivery latency: median {statistics.median(latencies) * 1000:.1f}ms  "
+            f"p95 {p95 * 1000:.1f}ms  max {latencies[-1] * 1000:.1f}ms"
+        )
+
+
+if __name__ == '__main__':
+    main()